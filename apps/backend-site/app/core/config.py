@@ -21,6 +21,19 @@ class Settings(BaseSettings):
     POSTGRES_PORT: str = "5433"
     DATABASE_URI: PostgresDsn | None = None  # calculada abaixo
 
+    # Cache em memória das respostas públicas (app/utils/cache.py)
+    CACHE_ENABLED: bool = True
+    CACHE_TTL_SECONDS: int = 60
+    CACHE_MAX_ENTRIES: int = 1024
+
+    # Uploads (app/utils/uploads.py / app/utils/images.py)
+    UPLOAD_MAX_BYTES: int = 10 * 1024 * 1024
+    UPLOAD_CHUNK_SIZE: int = 64 * 1024
+    UPLOAD_GC_GRACE_SECONDS: int = 300  # arquivo recém-gravado nunca é coletado
+    IMAGE_WORKERS: int = 2
+    IMAGE_QUALITY: int = 80
+    IMAGE_AVIF_ENABLED: bool = True  # só vale se o Pillow tiver encoder AVIF
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         if not self.DATABASE_URI:
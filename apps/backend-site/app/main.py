@@ -10,18 +10,23 @@ from app.routes.banner_route   import router as banner_router
 from app.routes.post_route     import router as post_router
 from app.routes.help_category_route import router as help_category_router
 from app.routes.help_post_route     import router as help_post_router
-from fastapi.staticfiles import StaticFiles
+from app.utils.static_files import CachedStaticFiles
+from app.utils.uploads import UploadLimitMiddleware
 import os
 
 app = FastAPI(title="Meu Backend")
 
-app.mount("/static", StaticFiles(directory=os.path.join("app", "static")), name="static")
+app.mount("/static", CachedStaticFiles(directory=os.path.join("app", "static")), name="static")
 
 # 1) Evento de startup (só em DEV, se usar Alembic remova depois)
 @app.on_event("startup")
 def on_startup():
     init_db()
 
+# uploads acima do limite recebem 413 antes de o corpo ser lido; registrado
+# antes do CORS (fica por dentro) para o 413 também levar os headers de CORS
+app.add_middleware(UploadLimitMiddleware)
+
 # 2) CORS
 app.add_middleware(
     CORSMiddleware,
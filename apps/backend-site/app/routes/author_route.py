@@ -1,4 +1,5 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from app.schemas.author import AuthorCreate, AuthorRead
 from app.services.author_service import (
@@ -7,25 +8,27 @@ from app.services.author_service import (
 )
 from app.db.deps import get_db
 from fastapi import UploadFile, File, Form
-from app.utils.file_utils import save_file, delete_file_by_url
+from app.utils.uploads import store_upload, release_file
 
 router = APIRouter(prefix="/authors", tags=["authors"])
 
 @router.post("/", response_model=AuthorRead, status_code=status.HTTP_201_CREATED)
-def create_author_endpoint(
+async def create_author_endpoint(
+    background_tasks: BackgroundTasks,
     name: str = Form(...),
     bio: str = Form(None),
     avatar: UploadFile = File(None),
     db: Session = Depends(get_db),
 ):
-    avatar_url = save_file(avatar, "authors") if avatar else None
+    avatar_url = await store_upload(avatar, "authors", background_tasks) if avatar else None
 
     author_in = AuthorCreate(
         name=name,
         bio=bio,
         avatar_url=avatar_url,
     )
-    return create_author(db, author_in)
+    author = await run_in_threadpool(create_author, db, author_in)
+    return AuthorRead.model_validate(author)
 
 @router.get("/{author_id}", response_model=AuthorRead)
 def read_author(
@@ -38,44 +41,49 @@ def read_author(
     return author
 
 @router.put("/{author_id}", response_model=AuthorRead)
-def update_author_endpoint(
+async def update_author_endpoint(
     author_id: str,
+    background_tasks: BackgroundTasks,
     name: str = Form(...),
     bio: str = Form(None),
     avatar: UploadFile = File(None),
     db: Session = Depends(get_db),
 ):
-    author = get_author(db, author_id)
+    author = await run_in_threadpool(get_author, db, author_id)
     if not author:
         raise HTTPException(status_code=404, detail="Author not found")
 
-    avatar_url = author.avatar_url
+    old_url = avatar_url = author.avatar_url
     if avatar:
-        if avatar_url:
-            delete_file_by_url(avatar_url)
-        avatar_url = save_file(avatar, "authors")
+        avatar_url = await store_upload(avatar, "authors", background_tasks)
 
     author_in = AuthorCreate(
         name=name,
         bio=bio,
         avatar_url=avatar_url,
     )
-    return update_author(db, author_id, author_in)
+    author = await run_in_threadpool(update_author, db, author_id, author_in)
+    # o avatar antigo só sai do disco depois do commit (e se ninguém mais o usa)
+    if old_url and avatar_url != old_url:
+        background_tasks.add_task(release_file, old_url)
+    return AuthorRead.model_validate(author)
 
 @router.delete("/{author_id}", response_model=AuthorRead)
 def delete_author_endpoint(
     author_id: str,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
 ):
     author = get_author(db, author_id)
     if not author:
         raise HTTPException(status_code=404, detail="Author not found")
 
+    avatar_url = author.avatar_url
+    deleted = delete_author(db, author_id)
     # Remove o avatar físico
-    if author.avatar_url:
-        delete_file_by_url(author.avatar_url)
-
-    return delete_author(db, author_id)
+    if avatar_url:
+        background_tasks.add_task(release_file, avatar_url)
+    return deleted
 
 
 @router.get("/", response_model=list[AuthorRead])
@@ -1,4 +1,5 @@
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, Form, File
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, UploadFile, Form, File
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from app.schemas.banner import BannerRead
 from app.services.banner_service import (
@@ -6,21 +7,23 @@ from app.services.banner_service import (
     update_banner, delete_banner,
     list_banners
 )
-from app.utils.file_utils import save_file, delete_file_by_url
+from app.utils.uploads import store_upload, release_file
 from app.db.deps import get_db
 
 router = APIRouter(prefix="/banners", tags=["banners"])
 
 @router.post("/", response_model=BannerRead, status_code=status.HTTP_201_CREATED)
-def create_banner_endpoint(
+async def create_banner_endpoint(
+    background_tasks: BackgroundTasks,
     title: str = Form(...),
     order: int = Form(0),
     link_url: str = Form(None),
     image: UploadFile = File(...),
     db: Session = Depends(get_db),
 ):
-    image_url = save_file(image, "banners")
-    return create_banner(db, title, image_url, link_url, order)
+    image_url = await store_upload(image, "banners", background_tasks)
+    banner = await run_in_threadpool(create_banner, db, title, image_url, link_url, order)
+    return BannerRead.model_validate(banner)
 
 @router.get("/{banner_id}", response_model=BannerRead)
 def read_banner(
@@ -33,38 +36,43 @@ def read_banner(
     return banner
 
 @router.put("/{banner_id}", response_model=BannerRead)
-def update_banner_endpoint(
+async def update_banner_endpoint(
     banner_id: str,
+    background_tasks: BackgroundTasks,
     title: str = Form(...),
     order: int = Form(0),
     link_url: str = Form(None),
     image: UploadFile = File(None),
     db: Session = Depends(get_db),
 ):
-    banner = get_banner(db, banner_id)
+    banner = await run_in_threadpool(get_banner, db, banner_id)
     if not banner:
         raise HTTPException(status_code=404, detail="Banner not found")
 
-    image_url = banner.image_url
+    old_url = image_url = banner.image_url
     if image:
-        delete_file_by_url(image_url)
-        image_url = save_file(image, "banners")
+        image_url = await store_upload(image, "banners", background_tasks)
 
-    return update_banner(db, banner_id, title, image_url, link_url, order)
+    banner = await run_in_threadpool(update_banner, db, banner_id, title, image_url, link_url, order)
+    # a imagem antiga só sai do disco depois do commit (e se ninguém mais a usa)
+    if image_url != old_url:
+        background_tasks.add_task(release_file, old_url)
+    return BannerRead.model_validate(banner)
 
 @router.delete("/{banner_id}", response_model=BannerRead)
 def delete_banner_endpoint(
     banner_id: str,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
 ):
     banner = get_banner(db, banner_id)
     if not banner:
         raise HTTPException(status_code=404, detail="Banner not found")
 
-    if banner.image_url:
-        delete_file_by_url(banner.image_url)
-
-    return delete_banner(db, banner_id)
+    image_url = banner.image_url
+    deleted = delete_banner(db, banner_id)
+    background_tasks.add_task(release_file, image_url)
+    return deleted
 
 @router.get("/", response_model=list[BannerRead])
 def list_banners_endpoint(db: Session = Depends(get_db)):
@@ -1,18 +1,20 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, Query, Response
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from app.schemas.post import PostCreate, PostRead, PostUpdate
 from app.services.post_service import (
-    create_post, get_post, get_post_by_slug, update_post, delete_post, search_posts, generate_unique_slug,
+    create_post, get_post, get_post_snapshot_by_slug, update_post, delete_post, search_posts, generate_unique_slug,
 )
 from app.db.deps import get_db
 from fastapi import UploadFile, File, Form
-from app.utils.file_utils import save_file, delete_file_by_url
+from app.utils.uploads import store_upload, release_file
 import json
 
 router = APIRouter(prefix="/posts", tags=["posts"])
 
 @router.post("/", response_model=PostRead, status_code=status.HTTP_201_CREATED)
-def create_post_endpoint(
+async def create_post_endpoint(
+    background_tasks: BackgroundTasks,
     title: str = Form(...),
     slug: str = Form(...),
     author_id: str = Form(...),
@@ -21,8 +23,8 @@ def create_post_endpoint(
     thumbnail: UploadFile = File(None),
     db: Session = Depends(get_db),
 ):
-    unique_slug = generate_unique_slug(db, slug)
-    thumbnail_url = save_file(thumbnail, "posts") if thumbnail else None
+    unique_slug = await run_in_threadpool(generate_unique_slug, db, slug)
+    thumbnail_url = await store_upload(thumbnail, "posts", background_tasks) if thumbnail else None
 
     post_data = PostCreate(
         title=title,
@@ -33,7 +35,8 @@ def create_post_endpoint(
         thumbnail_url=thumbnail_url,
     )
 
-    return create_post(db, post_data)
+    # serializa na thread: autor/categorias/blocos são carregados do banco
+    return await run_in_threadpool(lambda: PostRead.model_validate(create_post(db, post_data)))
 
 
 @router.get("/{post_id}", response_model=PostRead)
@@ -44,8 +47,9 @@ def read(post_id: str, db: Session = Depends(get_db)):
     return post
 
 @router.put("/{post_id}", response_model=PostRead)
-def update_post_endpoint(
+async def update_post_endpoint(
     post_id: str,
+    background_tasks: BackgroundTasks,
     title: str = Form(...),
     slug: str = Form(...),
     author_id: str = Form(...),
@@ -55,7 +59,7 @@ def update_post_endpoint(
     db: Session = Depends(get_db),
 ):
     # 1) Busca o post existente
-    post = get_post(db, post_id)
+    post = await run_in_threadpool(get_post, db, post_id)
     if not post:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -64,16 +68,14 @@ def update_post_endpoint(
 
     # 2) Gera um slug único se o usuário tiver modificado
     if slug and slug != post.slug:
-        unique_slug = generate_unique_slug(db, slug)
+        unique_slug = await run_in_threadpool(generate_unique_slug, db, slug)
     else:
         unique_slug = post.slug
 
-    # 3) Gerencia o thumbnail: deleta o antigo se houver e recebemos um novo
-    thumbnail_url = post.thumbnail_url
+    # 3) Gerencia o thumbnail: grava o novo; o antigo é liberado após o commit
+    old_url = thumbnail_url = post.thumbnail_url
     if thumbnail:
-        if thumbnail_url:
-            delete_file_by_url(thumbnail_url)
-        thumbnail_url = save_file(thumbnail, "posts")
+        thumbnail_url = await store_upload(thumbnail, "posts", background_tasks)
 
     # 4) Prepara os dados de atualização
     update_data = PostUpdate(
@@ -85,27 +87,34 @@ def update_post_endpoint(
         thumbnail_url=thumbnail_url,
     )
 
-    # 5) Executa o update via service
-    updated = update_post(db, post_id, update_data)
+    # 5) Executa o update via service (e serializa na thread, ver create)
+    def run_update() -> PostRead | None:
+        updated = update_post(db, post_id, update_data)
+        return PostRead.model_validate(updated) if updated else None
+
+    updated = await run_in_threadpool(run_update)
     if not updated:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Falha ao atualizar o post"
         )
+    if old_url and thumbnail_url != old_url:
+        background_tasks.add_task(release_file, old_url)
     return updated
 
 
 @router.delete("/{post_id}", response_model=PostRead)
-def delete_post_endpoint(post_id: str, db: Session = Depends(get_db)):
+def delete_post_endpoint(post_id: str, background_tasks: BackgroundTasks, db: Session = Depends(get_db)):
     post = get_post(db, post_id)
     if not post:
         raise HTTPException(404, "Post não encontrado")
 
+    thumbnail_url = post.thumbnail_url
+    deleted = delete_post(db, post_id)
     # deletar thumbnail
-    if post.thumbnail_url:
-        delete_file_by_url(post.thumbnail_url)
-
-    return delete_post(db, post_id)
+    if thumbnail_url:
+        background_tasks.add_task(release_file, thumbnail_url)
+    return deleted
 
 @router.get("/", response_model=list[PostRead])
 def list_all(
@@ -123,11 +132,12 @@ def read_by_slug(slug: str, db: Session = Depends(get_db)):
     """
     Busca um post pelo seu slug amigável.
     Exemplo: GET /posts/slug/como-usar-fastapi
+    Devolve o snapshot JSON em cache (já no formato PostRead).
     """
-    post = get_post_by_slug(db, slug)
-    if not post:
+    snapshot = get_post_snapshot_by_slug(db, slug)
+    if snapshot is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Post with slug '{slug}' not found"
         )
-    return post
\ No newline at end of file
+    return Response(content=snapshot, media_type="application/json")
\ No newline at end of file
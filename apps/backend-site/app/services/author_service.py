@@ -1,5 +1,7 @@
 from sqlalchemy.orm import Session
 from app.models.author import Author
+from app.utils.cache import invalidate
+from app.services.post_service import POSTS_CACHE
 from app.schemas.author import AuthorCreate
 
 def create_author(db: Session, data: AuthorCreate) -> Author:
@@ -25,6 +27,7 @@ def update_author(db: Session, author_id: str, data: AuthorCreate) -> Author | N
     author.avatar_url = data.avatar_url
     db.commit()
     db.refresh(author)
+    invalidate(POSTS_CACHE)  # snapshots de posts embutem o autor
     return author
 
 def delete_author(db: Session, author_id: str) -> Author | None:
@@ -32,6 +35,7 @@ def delete_author(db: Session, author_id: str) -> Author | None:
     if author:
         db.delete(author)
         db.commit()
+        invalidate(POSTS_CACHE)
     return author
 
 def list_authors(db: Session) -> list[Author]:
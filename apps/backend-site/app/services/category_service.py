@@ -1,5 +1,7 @@
 from sqlalchemy.orm import Session, selectinload
 from app.models.category import Category
+from app.utils.cache import invalidate
+from app.services.post_service import POSTS_CACHE
 from app.schemas.category import CategoryCreate
 
 def get_category_by_name(db: Session, name: str) -> Category | None:
@@ -26,6 +28,7 @@ def update_category(db: Session, category_id: str, data: CategoryCreate) -> Cate
     category.parent_id = data.parent_id
     db.commit()
     db.refresh(category)
+    invalidate(POSTS_CACHE)  # snapshots de posts embutem as categorias
     return category
 
 def delete_category(db: Session, category_id: str) -> Category | None:
@@ -33,6 +36,7 @@ def delete_category(db: Session, category_id: str) -> Category | None:
     if category:
         db.delete(category)
         db.commit()
+        invalidate(POSTS_CACHE)
     return category
 
 def list_categories(db: Session) -> list[Category]:
@@ -1,10 +1,15 @@
+from collections import defaultdict
+from sqlalchemy import select
 from sqlalchemy.orm import Session, selectinload
 from app.models.help_category import HelpCategory
 from app.schemas.help_category import HelpCategoryCreate, HelpCategoryTree
 from uuid import UUID
 from app.models.help_post import HelpPost, help_post_categories
+from app.utils.cache import cached, invalidate
 from typing import Optional
 
+HELP_CACHE = "help"  # namespace do cache (invalidado em escritas de categorias e posts)
+
 def list_help_categories(db: Session) -> list[HelpCategory]:
     return db.query(HelpCategory).options(selectinload(HelpCategory.children)).all()
 
@@ -16,6 +21,7 @@ def create_help_category(db: Session, data: HelpCategoryCreate) -> HelpCategory:
     db.add(cat)
     db.commit()
     db.refresh(cat)
+    invalidate(HELP_CACHE)
     return cat
 
 def update_help_category(db: Session, category_id: UUID, data: HelpCategoryCreate) -> HelpCategory | None:
@@ -26,6 +32,7 @@ def update_help_category(db: Session, category_id: UUID, data: HelpCategoryCreat
     cat.parent_id = data.parent_id
     db.commit()
     db.refresh(cat)
+    invalidate(HELP_CACHE)
     return cat
 
 def delete_help_category(db: Session, category_id: UUID) -> HelpCategory | None:
@@ -33,6 +40,7 @@ def delete_help_category(db: Session, category_id: UUID) -> HelpCategory | None:
     if cat:
         db.delete(cat)
         db.commit()
+        invalidate(HELP_CACHE)
     return cat
 
 def list_help_category_tree(db: Session) -> list[HelpCategory]:
@@ -47,34 +55,98 @@ def list_help_category_tree(db: Session) -> list[HelpCategory]:
           .all()
     )
 
+def _subtree_rows(db: Session, root_ids: list) -> list:
+    """
+    (id, name, parent_id) das categorias `root_ids` e de todos os descendentes,
+    numa única CTE recursiva. UNION (e não UNION ALL) para não entrar em loop
+    se houver ciclo parent_id.
+    """
+    tree = (
+        select(HelpCategory.id, HelpCategory.name, HelpCategory.parent_id)
+        .where(HelpCategory.id.in_(root_ids))
+        .cte("help_tree", recursive=True)
+    )
+    tree = tree.union(
+        select(HelpCategory.id, HelpCategory.name, HelpCategory.parent_id)
+        .join(tree, HelpCategory.parent_id == tree.c.id)
+    )
+    return db.execute(select(tree.c.id, tree.c.name, tree.c.parent_id)).all()
+
+
+def _load_category_tree(db: Session, category_id: str) -> Optional[HelpCategoryTree]:
+    rows = _subtree_rows(db, [category_id])
+    by_id = {r.id: r for r in rows}
+    root = next((r for r in rows if str(r.id) == str(category_id)), None)
+    if root is None:
+        return None
+
+    # todos os posts da subárvore de uma vez (+ blocos e categorias via selectin)
+    post_rows = db.execute(
+        select(help_post_categories.c.category_id, HelpPost)
+        .join(HelpPost, HelpPost.id == help_post_categories.c.post_id)
+        .where(help_post_categories.c.category_id.in_([r.id for r in rows]))
+        .options(selectinload(HelpPost.blocks), selectinload(HelpPost.categories))
+        .order_by(HelpPost.created_at.desc())
+    ).all()
+
+    # categorias dos posts fora da subárvore: suas subárvores também vão no JSON
+    missing = {c.id for _, p in post_rows for c in p.categories} - by_id.keys()
+    if missing:
+        for r in _subtree_rows(db, list(missing)):
+            by_id.setdefault(r.id, r)
+
+    children: dict = defaultdict(list)
+    for r in sorted(by_id.values(), key=lambda r: r.name):
+        if r.parent_id is not None:
+            children[r.parent_id].append(r.id)
+
+    def category_read(cid) -> dict:
+        # mesmo formato de HelpCategoryRead: filhos recursivos, posts vazios
+        r = by_id[cid]
+        return {
+            "id": r.id, "name": r.name, "parent_id": r.parent_id,
+            "children": [category_read(c) for c in children.get(cid, [])],
+            "posts": [],
+        }
+
+    post_cache: dict = {}
+
+    def post_read(post: HelpPost) -> dict:
+        if post.id not in post_cache:
+            post_cache[post.id] = {
+                "id": post.id, "title": post.title, "slug": post.slug,
+                "categories": [category_read(c.id) for c in post.categories],
+                "blocks": [
+                    {"id": b.id, "position": b.position, "type": b.type, "content": b.content}
+                    for b in post.blocks
+                ],
+                "created_at": post.created_at, "updated_at": post.updated_at,
+            }
+        return post_cache[post.id]
+
+    posts_by_category: dict = defaultdict(list)
+    for cat_id, post in post_rows:
+        posts_by_category[cat_id].append(post_read(post))
+
+    def build(cid) -> dict:
+        r = by_id[cid]
+        return {
+            "id": r.id, "name": r.name, "parent_id": r.parent_id,
+            "posts": posts_by_category.get(cid, []),
+            "children": [build(c) for c in children.get(cid, [])],
+        }
+
+    return HelpCategoryTree.model_validate(build(root.id))
+
+
 def get_category_tree_with_posts(
     db: Session,
     category_id: str
 ) -> Optional[HelpCategoryTree]:
-    # carrega recursivamente filhos imediatos
-    root = (
-        db.query(HelpCategory)
-          .options(selectinload(HelpCategory.children))
-          .filter(HelpCategory.id == category_id)
-          .first()
-    )
-    if not root:
-        return None
-
-    def build(cat: HelpCategory) -> HelpCategoryTree:
-        # carrega todos os posts desta categoria
-        posts = (
-            db.query(HelpPost)
-              .join(help_post_categories, HelpPost.id == help_post_categories.c.post_id)
-              .filter(help_post_categories.c.category_id == cat.id)
-              .order_by(HelpPost.created_at.desc())
-              .all()
-        )
-        node = HelpCategoryTree.from_orm(cat)
-        node.posts = posts  # Pydantic vai converter via HelpPostRead
-        # monta cada filho
-        for child in cat.children:
-            node.children.append(build(child))
-        return node
-
-    return build(root)
\ No newline at end of file
+    """
+    Categoria + subárvore completa com os posts de cada nó.
+    Número fixo de queries (CTE da subárvore, posts, blocos, categorias dos
+    posts) independente do tamanho da árvore; resultado em cache até a próxima
+    escrita em categorias/posts da central de ajuda.
+    """
+    return cached(HELP_CACHE, f"tree:{category_id}", lambda: _load_category_tree(db, category_id))
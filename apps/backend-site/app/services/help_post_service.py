@@ -7,6 +7,8 @@ from app.schemas.help_post import HelpPostCreate, HelpPostUpdate
 from app.models.help_category import HelpCategory
 from uuid import UUID
 from typing import List
+from app.utils.cache import invalidate
+from app.services.help_category_service import HELP_CACHE
 
 def generate_unique_slug_help(db: Session, base_slug: str) -> str:
     slug = re.sub(r"[^\w\-]+","-", base_slug.strip().lower())
@@ -32,6 +34,7 @@ def create_help_post(db: Session, data: HelpPostCreate) -> HelpPost:
         ))
     db.commit()
     db.refresh(post)
+    invalidate(HELP_CACHE)
     return post
 
 def get_help_post(db: Session, post_id: UUID) -> HelpPost | None:
@@ -59,6 +62,7 @@ def update_help_post(db: Session, post_id: UUID, data: HelpPostUpdate) -> HelpPo
             ))
     db.commit()
     db.refresh(post)
+    invalidate(HELP_CACHE)
     return post
 
 def delete_help_post(db: Session, post_id: UUID) -> HelpPost | None:
@@ -66,6 +70,7 @@ def delete_help_post(db: Session, post_id: UUID) -> HelpPost | None:
     if post:
         db.delete(post)
         db.commit()
+        invalidate(HELP_CACHE)
     return post
 
 def search_help_posts(
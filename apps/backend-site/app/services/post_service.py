@@ -1,10 +1,31 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import or_
+from sqlalchemy.orm import Session, joinedload, selectinload
 from app.models.post import Post, post_categories
 from app.models.block import Block
-from app.schemas.post import PostCreate, PostUpdate
+from app.models.category import Category
+from app.schemas.post import PostCreate, PostUpdate, PostRead
+from app.utils.cache import cached, invalidate
 from uuid import uuid4
 import re
 
+POSTS_CACHE = "posts"  # snapshots JSON por slug (invalidados em escritas de posts/autores/categorias)
+CATEGORY_DEPTH = 8     # níveis de categorias pré-carregados; além disso cai no lazy load
+
+
+def _post_query(db: Session):
+    """
+    Post com tudo que o PostRead serializa, em número fixo de queries:
+    autor no mesmo SELECT (N:1) e categorias/blocos via selectin (1 query cada,
+    para a página inteira) — nada de lazy load durante a serialização.
+    `Category.children` aponta para o pai (remote_side=id) e o CategoryRead
+    serializa a cadeia até a raiz: 1 query por nível, não por categoria.
+    """
+    return db.query(Post).options(
+        joinedload(Post.author),
+        selectinload(Post.categories).selectinload(Category.children, recursion_depth=CATEGORY_DEPTH),
+        selectinload(Post.blocks),
+    )
+
 def create_post(db: Session, data: PostCreate) -> Post:
     # 1) Cria a instância e adiciona ao session
     post = Post(
@@ -42,7 +63,19 @@ def create_post(db: Session, data: PostCreate) -> Post:
     return post
 
 def get_post_by_slug(db: Session, slug: str) -> Post | None:
-    return db.query(Post).filter(Post.slug == slug).first()
+    return _post_query(db).filter(Post.slug == slug).first()
+
+
+def get_post_snapshot_by_slug(db: Session, slug: str) -> bytes | None:
+    """
+    JSON já renderizado do PostRead, em cache por slug.
+    Slugs inexistentes não são guardados (um post novo aparece na hora).
+    """
+    def render() -> bytes | None:
+        post = get_post_by_slug(db, slug)
+        return PostRead.model_validate(post).model_dump_json().encode() if post else None
+
+    return cached(POSTS_CACHE, f"slug:{slug}", render, cache_none=False)
 
 def generate_unique_slug(db: Session, base_slug: str) -> str:
     """
@@ -51,18 +84,23 @@ def generate_unique_slug(db: Session, base_slug: str) -> str:
     """
     # normaliza (tira espaços, caracteres inválidos…)
     slug = re.sub(r"[^\w\-]+", "-", base_slug.strip().lower())
+
+    # uma única query traz o slug e todos os "slug-<n>" já usados
+    taken = {
+        s for (s,) in db.query(Post.slug).filter(
+            or_(Post.slug == slug, Post.slug.startswith(f"{slug}-", autoescape=True))
+        )
+    }
     candidate = slug
     idx = 1
-
-    # Enquanto existir um post com esse slug, incrementa
-    while get_post_by_slug(db, candidate):
+    while candidate in taken:
         candidate = f"{slug}-{idx}"
         idx += 1
 
     return candidate
 
 def get_post(db: Session, post_id):
-    return db.query(Post).filter(Post.id == post_id).first()
+    return _post_query(db).filter(Post.id == post_id).first()
 
 from sqlalchemy.orm import Session
 from app.models.post import Post, post_categories
@@ -121,6 +159,7 @@ def update_post(db: Session, post_id: str, data: PostUpdate) -> Post | None:
     # 4) Persiste tudo
     db.commit()
     db.refresh(post)
+    invalidate(POSTS_CACHE)  # o slug pode ter mudado: descarta todos os snapshots
     return post
 
 
@@ -129,6 +168,7 @@ def delete_post(db: Session, post_id):
     if post:
         db.delete(post)
         db.commit()
+        invalidate(POSTS_CACHE)
     return post
 
 def search_posts(
@@ -139,7 +179,7 @@ def search_posts(
     page: int = 1,
     page_size: int = 10,
 ):
-    query = db.query(Post)
+    query = _post_query(db)
 
     if author_id:
         query = query.filter(Post.author_id == author_id)
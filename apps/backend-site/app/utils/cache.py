@@ -0,0 +1,77 @@
+# app/utils/cache.py
+#
+# Cache em memória do processo para respostas públicas montadas a partir de
+# várias queries (árvore da central de ajuda, posts do blog).
+# - entradas agrupadas por namespace; escritas chamam invalidate(namespace)
+# - TTL curto como teto de desatualização entre workers (cada worker do
+#   uvicorn tem o seu cache e só vê as invalidações feitas nele mesmo)
+# - LRU limitado para não crescer sem controle
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable
+from app.core.config import settings
+
+_MISSING = object()
+
+
+class NamespacedCache:
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._data: OrderedDict[tuple[str, str], tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, namespace: str, key: str) -> Any:
+        with self._lock:
+            entry = self._data.get((namespace, key))
+            if entry is None:
+                return _MISSING
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[(namespace, key)]
+                return _MISSING
+            self._data.move_to_end((namespace, key))
+            return value
+
+    def set(self, namespace: str, key: str, value: Any, ttl: float) -> None:
+        with self._lock:
+            self._data[(namespace, key)] = (time.monotonic() + ttl, value)
+            self._data.move_to_end((namespace, key))
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def invalidate(self, namespace: str) -> None:
+        with self._lock:
+            for k in [k for k in self._data if k[0] == namespace]:
+                del self._data[k]
+
+
+cache = NamespacedCache(settings.CACHE_MAX_ENTRIES)
+
+
+def cached(
+    namespace: str,
+    key: str,
+    loader: Callable[[], Any],
+    ttl: float | None = None,
+    cache_none: bool = True,
+) -> Any:
+    """
+    Devolve o valor em cache ou executa `loader()` e guarda o resultado.
+    Com `cache_none`, `None` também é guardado (ex.: categoria inexistente)
+    até a próxima escrita.
+    """
+    if not settings.CACHE_ENABLED:
+        return loader()
+    value = cache.get(namespace, key)
+    if value is _MISSING:
+        value = loader()
+        if value is not None or cache_none:
+            cache.set(namespace, key, value, settings.CACHE_TTL_SECONDS if ttl is None else ttl)
+    return value
+
+
+def invalidate(*namespaces: str) -> None:
+    for ns in namespaces:
+        cache.invalidate(ns)
@@ -0,0 +1,147 @@
+# app/utils/images.py
+#
+# Variantes redimensionadas (WebP e, se disponível, AVIF) das imagens enviadas.
+# Geradas depois da resposta (BackgroundTasks) num pool de processos limitado;
+# os nomes derivam do hash do original: `<sha256>_<variante>.<fmt>`.
+
+import re
+import asyncio
+import atexit
+import logging
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from functools import cache
+from pathlib import Path
+from app.core.config import settings
+from app.utils.static_files import STATIC_DIR
+
+logger = logging.getLogger(__name__)
+
+try:
+    from PIL import Image, ImageOps
+    HAS_PIL = True
+except ImportError:  # Pillow é opcional: sem ele só o original é salvo
+    HAS_PIL = False
+
+try:
+    import pillow_avif  # noqa: F401  (registra o encoder AVIF no Pillow)
+except ImportError:
+    pass
+
+# largura máxima de cada variante (nunca amplia o original)
+VARIANT_WIDTHS = {
+    "thumb": 160,
+    "sm":    480,
+    "md":    960,
+    "lg":    1600,
+}
+
+# formatos raster que sabemos redimensionar (SVG e afins ficam só com o original)
+RASTER_EXTENSIONS = {".jpg", ".jpeg", ".png", ".webp", ".avif", ".gif", ".bmp", ".tif", ".tiff"}
+
+
+@cache
+def _avif_enabled() -> bool:
+    if not (HAS_PIL and settings.IMAGE_AVIF_ENABLED):
+        return False
+    # o encoder (nativo no Pillow >= 11.3 ou do pillow_avif) fica registrado
+    # em Image.SAVE; features.check("avif") só avisa e devolve False nos
+    # Pillow sem a feature, mesmo com o plugin
+    Image.init()
+    return "AVIF" in Image.SAVE
+
+VARIANT_FORMATS: tuple[str, ...] = ("webp", "avif") if _avif_enabled() else ("webp",)
+
+_pool: ProcessPoolExecutor | None = None
+_pool_lock = threading.Lock()
+
+def get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ProcessPoolExecutor(max_workers=settings.IMAGE_WORKERS)
+    return _pool
+
+def shutdown_pool() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=True, cancel_futures=True)
+            _pool = None
+
+atexit.register(shutdown_pool)
+
+
+def make_variants(src: str, digest: str, formats: tuple[str, ...]) -> list[str]:
+    """
+    Executado no pool de processos: gera `<digest>_<nome>.<fmt>` ao lado do
+    original para cada largura de VARIANT_WIDTHS. Retorna os arquivos criados.
+    """
+    src_path = Path(src)
+    created = []
+    with Image.open(src_path) as im:
+        im = ImageOps.exif_transpose(im)  # normaliza a orientação (fotos de celular)
+        if im.mode not in ("RGB", "RGBA"):
+            im = im.convert("RGBA" if "transparency" in im.info or im.mode in ("P", "LA") else "RGB")
+        for name, width in VARIANT_WIDTHS.items():
+            variant = im.copy()
+            if variant.width > width:
+                variant.thumbnail((width, round(variant.height * width / variant.width)), Image.LANCZOS)
+            for fmt in formats:
+                out = src_path.with_name(f"{digest}_{name}.{fmt}")
+                if out.exists():
+                    continue
+                tmp = out.with_suffix(f".{fmt}.tmp")
+                variant.save(tmp, format=fmt.upper(), quality=settings.IMAGE_QUALITY)
+                tmp.replace(out)
+                created.append(out.name)
+    return created
+
+
+def has_variants(path: Path) -> bool:
+    return HAS_PIL and path.suffix.lower() in RASTER_EXTENSIONS
+
+
+async def generate_variants(path: Path, digest: str) -> None:
+    """
+    Tarefa de fundo: gera as variantes no pool sem ocupar o event loop nem
+    a thread da requisição (a resposta já foi enviada).
+    """
+    if not has_variants(path):
+        return
+    loop = asyncio.get_running_loop()
+    try:
+        await loop.run_in_executor(get_pool(), make_variants, str(path), digest, VARIANT_FORMATS)
+    except Exception as e:
+        # imagem corrompida / formato não suportado: mantém só o original
+        logger.warning("Falha ao gerar variantes de %s: %s", path.name, e)
+
+
+_HASHED_URL = re.compile(r"^/static/(?P<folder>.+)/(?P<digest>[0-9a-f]{64})(?P<ext>\.[A-Za-z0-9]+)$")
+
+
+def variant_urls(url: str | None) -> dict[str, str] | None:
+    """
+    URLs das variantes de uma imagem salva por hash, ex.:
+    {"thumb": ".../<hash>_thumb.webp", "thumb_avif": ..., "sm": ..., "md": ..., "lg": ...}.
+    None para imagens antigas (nome aleatório), vetoriais, sem Pillow ou cujas
+    variantes ainda estão sendo geradas em segundo plano.
+    """
+    if not url or not HAS_PIL:
+        return None
+    m = _HASHED_URL.match(url)
+    if not m or m.group("ext").lower() not in RASTER_EXTENSIONS:
+        return None
+    folder, digest = m.group("folder"), m.group("digest")
+    # a última variante gravada por make_variants indica que o conjunto está completo
+    last = f"{digest}_{list(VARIANT_WIDTHS)[-1]}.{VARIANT_FORMATS[-1]}"
+    if not (STATIC_DIR / folder / last).exists():
+        return None
+    base = f"/static/{folder}/{digest}"
+    urls = {}
+    for name in VARIANT_WIDTHS:
+        urls[name] = f"{base}_{name}.webp"
+        if "avif" in VARIANT_FORMATS:
+            urls[f"{name}_avif"] = f"{base}_{name}.avif"
+    return urls
@@ -0,0 +1,202 @@
+# app/utils/uploads.py
+#
+# Uploads (avatar de autor, imagem de banner, thumbnail de post):
+# - UploadLimitMiddleware recusa o corpo acima do limite antes do parse do
+#   multipart (Content-Length ou contagem dos bytes recebidos)
+# - store_upload lê em blocos e grava no disco sem bloquear o event loop;
+#   o nome é o sha256 do conteúdo (mesmo arquivo → mesma URL, sem duplicar)
+# - variantes de imagem são geradas depois da resposta (app/utils/images.py)
+# - release_file remove um arquivo substituído só quando nenhum registro
+#   aponta mais para ele
+
+import os
+import time
+import hashlib
+import logging
+from pathlib import Path
+from uuid import uuid4
+import anyio
+from fastapi import BackgroundTasks, HTTPException, UploadFile, status
+from sqlalchemy import String, cast, or_, select
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.author import Author
+from app.models.banner import Banner
+from app.models.block import Block
+from app.models.help_block import HelpBlock
+from app.models.post import Post
+from app.utils.images import generate_variants
+from app.utils.static_files import STATIC_DIR, precompress
+
+logger = logging.getLogger(__name__)
+
+# folga para os demais campos do formulário e os delimitadores do multipart
+FORM_OVERHEAD_BYTES = 1024 * 1024
+
+_HEX = frozenset("0123456789abcdef")
+
+
+def _too_large() -> HTTPException:
+    return HTTPException(
+        status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"Arquivo maior que {settings.UPLOAD_MAX_BYTES // (1024 * 1024)} MB",
+    )
+
+
+# ───────────── gravação ─────────────
+
+async def store_upload(upload: UploadFile, folder: str, background: BackgroundTasks) -> str:
+    """
+    Grava um UploadFile em app/static/<folder> e retorna a URL /static/….
+    - lê em blocos de UPLOAD_CHUNK_SIZE (nunca o arquivo inteiro em memória)
+    - recusa arquivos acima de UPLOAD_MAX_BYTES (413)
+    - escrita assíncrona num `.part` e rename atômico para `<sha256><ext>`
+    - variantes (imagens) e .gz/.br (SVG) ficam para depois da resposta
+    """
+    dest_folder = STATIC_DIR / folder
+    await anyio.Path(dest_folder).mkdir(parents=True, exist_ok=True)
+    ext = os.path.splitext(upload.filename or "")[1].lower()
+
+    if upload.size is not None and upload.size > settings.UPLOAD_MAX_BYTES:
+        raise _too_large()
+
+    tmp_path = anyio.Path(dest_folder / f".{uuid4()}.part")
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        await upload.seek(0)
+        async with await anyio.open_file(tmp_path, "wb") as f:
+            while chunk := await upload.read(settings.UPLOAD_CHUNK_SIZE):
+                size += len(chunk)
+                if size > settings.UPLOAD_MAX_BYTES:
+                    raise _too_large()
+                digest.update(chunk)
+                await f.write(chunk)
+
+        hexdigest = digest.hexdigest()
+        file_path = anyio.Path(dest_folder / f"{hexdigest}{ext}")
+        if await file_path.exists():
+            # conteúdo idêntico já enviado antes: renova o mtime para que um
+            # release_file concorrente respeite a carência e não o apague
+            await tmp_path.unlink()
+            await file_path.touch()
+        else:
+            await tmp_path.replace(file_path)
+    finally:
+        if await tmp_path.exists():
+            await tmp_path.unlink()
+
+    path = Path(file_path)
+    background.add_task(generate_variants, path, hexdigest)
+    background.add_task(precompress, path)
+    return f"/static/{path.relative_to(STATIC_DIR).as_posix()}"
+
+
+# ───────────── coleta de arquivos substituídos ─────────────
+
+def is_content_addressed(path: Path) -> bool:
+    stem = path.stem
+    return len(stem) == 64 and all(c in _HEX for c in stem)
+
+
+def _static_path(url: str) -> Path | None:
+    if not url or not url.startswith("/static/"):
+        return None
+    root = STATIC_DIR.resolve()
+    path = (STATIC_DIR / url[len("/static/"):]).resolve()
+    # nada fora de app/static (ex.: "/static/../main.py")
+    if root not in path.parents:
+        return None
+    return path
+
+
+def is_referenced(db, url: str) -> bool:
+    """
+    Algum registro ainda aponta para a URL? Inclui blocos de imagem de posts
+    e artigos de ajuda, que guardam a URL dentro do JSON.
+    """
+    stmt = select(or_(
+        select(Author.id).where(Author.avatar_url == url).exists(),
+        select(Banner.id).where(Banner.image_url == url).exists(),
+        select(Post.id).where(Post.thumbnail_url == url).exists(),
+        select(Block.id).where(cast(Block.content, String).contains(url, autoescape=True)).exists(),
+        select(HelpBlock.id).where(cast(HelpBlock.content, String).contains(url, autoescape=True)).exists(),
+    ))
+    return bool(db.execute(stmt).scalar())
+
+
+def release_file(url: str | None) -> None:
+    """
+    Remove o arquivo de uma URL que deixou de ser usada (registro apagado ou
+    imagem trocada), com suas variantes e .gz/.br. Chamar depois do commit.
+    Como arquivos por hash podem ser compartilhados, só apaga quando nenhum
+    registro os referencia e quando não foram gravados/reenviados há menos de
+    UPLOAD_GC_GRACE_SECONDS (upload do mesmo conteúdo ainda sem commit).
+    """
+    path = _static_path(url or "")
+    if path is None or not path.exists():
+        return
+    if is_content_addressed(path):
+        if time.time() - path.stat().st_mtime < settings.UPLOAD_GC_GRACE_SECONDS:
+            return
+    with SessionLocal() as db:
+        if is_referenced(db, url):
+            return
+
+    candidates = [path, Path(f"{path}.gz"), Path(f"{path}.br")]
+    if is_content_addressed(path):
+        candidates += path.parent.glob(f"{path.stem}_*")
+    for candidate in candidates:
+        try:
+            candidate.unlink()
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning("Falha ao remover %s: %s", candidate, e)
+
+
+# ───────────── limite do corpo ─────────────
+
+class UploadLimitMiddleware:
+    """
+    Middleware ASGI: requisições multipart maiores que UPLOAD_MAX_BYTES (+ folga
+    do formulário) recebem 413 sem que o corpo seja lido/spoolado em disco.
+    Com Content-Length a recusa é imediata; sem ele (chunked) os bytes são
+    contados à medida que chegam e o parse do formulário é interrompido.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        headers = Headers(scope=scope)
+        if not headers.get("content-type", "").startswith("multipart/form-data"):
+            await self.app(scope, receive, send)
+            return
+
+        limit = settings.UPLOAD_MAX_BYTES + FORM_OVERHEAD_BYTES
+        content_length = headers.get("content-length")
+        if content_length and content_length.isdigit() and int(content_length) > limit:
+            response = JSONResponse({"detail": _too_large().detail}, status_code=413)
+            await response(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    # HTTPException atravessa o parse do FastAPI e vira 413
+                    raise _too_large()
+            return message
+
+        await self.app(scope, limited_receive, send)
@@ -60,6 +60,10 @@ from app.models.loyalty_card import RuleType, LoyaltyCardTemplate, LoyaltyCardRu
 from app.models.reward import CompanyReward, TemplateRewardLink, RewardRedemptionCode
 from app.models.coupon import DiscountType, Coupon
 from app.models.coupon_redemption import CouponRedemption
+from app.models.outbound_email import EmailStatus, OutboundEmail
+from app.models.background_job import JobStatus, BackgroundJob
+from app.models.payment_webhook_event import PaymentWebhookEvent
+from app.models.digital_behavior_event import DigitalBehaviorEvent
 
 
 
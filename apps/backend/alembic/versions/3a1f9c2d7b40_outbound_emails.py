@@ -0,0 +1,55 @@
+"""outbound_emails
+
+Revision ID: 3a1f9c2d7b40
+Revises: fae97b466809
+Create Date: 2025-08-20 10:12:31.402118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3a1f9c2d7b40'
+down_revision: Union[str, None] = 'fae97b466809'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+email_status = postgresql.ENUM(
+    "pending", "sent", "failed", name="emailstatus", create_type=False
+)
+
+
+def upgrade():
+    email_status.create(op.get_bind(), checkfirst=True)
+    op.create_table(
+        "outbound_emails",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("to_address", sa.String(255), nullable=False),
+        sa.Column("subject", sa.String(255), nullable=False),
+        sa.Column("html", sa.Text(), nullable=True),
+        sa.Column("template_name", sa.String(120), nullable=True),
+        sa.Column("template_context", postgresql.JSONB(), nullable=True),
+        sa.Column("status", email_status, nullable=False, server_default="pending"),
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("max_attempts", sa.Integer(), nullable=False, server_default="5"),
+        sa.Column("next_attempt_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("sent_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index(
+        "ix_outbound_emails_status_next_attempt",
+        "outbound_emails",
+        ["status", "next_attempt_at"],
+        unique=False,
+    )
+
+def downgrade():
+    op.drop_index("ix_outbound_emails_status_next_attempt", table_name="outbound_emails")
+    op.drop_table("outbound_emails")
+    email_status.drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,30 @@
+"""purchase_logs_company_created_at
+
+Revision ID: 3d8f2b6e1c40
+Revises: e4a8c2f61b09
+Create Date: 2025-08-28 09:41:07.215836
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3d8f2b6e1c40'
+down_revision: Union[str, None] = 'e4a8c2f61b09'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade():
+    op.create_index(
+        "ix_purchase_logs_company_created_at",
+        "purchase_logs",
+        ["company_id", "created_at"],
+        unique=False,
+        postgresql_include=["user_id", "amount"],
+    )
+
+def downgrade():
+    op.drop_index("ix_purchase_logs_company_created_at", table_name="purchase_logs")
@@ -0,0 +1,29 @@
+"""background_job_rerun
+
+Revision ID: 4e7b1c9d2a58
+Revises: 8d4f2b6a1e37
+Create Date: 2025-09-02 10:14:36.208153
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4e7b1c9d2a58'
+down_revision: Union[str, None] = '8d4f2b6a1e37'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'background_jobs',
+        sa.Column('rerun_requested', sa.Boolean(), nullable=False, server_default=sa.text('false')),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('background_jobs', 'rerun_requested')
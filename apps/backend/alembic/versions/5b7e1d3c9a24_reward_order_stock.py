@@ -0,0 +1,44 @@
+"""reward_order_stock
+
+Revision ID: 5b7e1d3c9a24
+Revises: c27a5e90d8b1
+Create Date: 2025-08-25 10:12:31.482907
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b7e1d3c9a24'
+down_revision: Union[str, None] = 'c27a5e90d8b1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade():
+    op.add_column("reward_products", sa.Column("stock_qty", sa.Integer(), nullable=True))
+    op.create_check_constraint(
+        "ck_reward_products_stock_qty",
+        "reward_products",
+        "stock_qty IS NULL OR stock_qty >= 0",
+    )
+    op.add_column("reward_orders", sa.Column("idempotency_key", sa.String(64), nullable=True))
+    op.create_unique_constraint(
+        "uq_reward_orders_user_idempotency_key",
+        "reward_orders",
+        ["user_id", "idempotency_key"],
+    )
+    op.add_column(
+        "reward_order_items",
+        sa.Column("reserved", sa.Boolean(), nullable=False, server_default=sa.false()),
+    )
+
+def downgrade():
+    op.drop_column("reward_order_items", "reserved")
+    op.drop_constraint("uq_reward_orders_user_idempotency_key", "reward_orders", type_="unique")
+    op.drop_column("reward_orders", "idempotency_key")
+    op.drop_constraint("ck_reward_products_stock_qty", "reward_products", type_="check")
+    op.drop_column("reward_products", "stock_qty")
@@ -0,0 +1,31 @@
+"""export_job_token_index
+
+Revision ID: 5c9a3e7f1d24
+Revises: b6e2d94a7c18
+Create Date: 2025-08-29 16:05:48.930217
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c9a3e7f1d24'
+down_revision: Union[str, None] = 'b6e2d94a7c18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade():
+    op.create_index(
+        "ix_background_jobs_export_token",
+        "background_jobs",
+        [sa.text("(payload ->> 'token')")],
+        unique=False,
+        postgresql_where=sa.text("job_type = 'export_report'"),
+    )
+
+def downgrade():
+    op.drop_index("ix_background_jobs_export_token", table_name="background_jobs")
@@ -0,0 +1,25 @@
+"""company_timezone
+
+Revision ID: 7a1c9e4d2f63
+Revises: 3d8f2b6e1c40
+Create Date: 2025-08-28 15:20:44.671209
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7a1c9e4d2f63'
+down_revision: Union[str, None] = '3d8f2b6e1c40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade():
+    op.add_column("companies", sa.Column("timezone", sa.String(64), nullable=True))
+
+def downgrade():
+    op.drop_column("companies", "timezone")
@@ -0,0 +1,63 @@
+"""background_jobs
+
+Revision ID: 8d4e2b6f1c93
+Revises: 3a1f9c2d7b40
+Create Date: 2025-08-21 09:41:07.118352
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d4e2b6f1c93'
+down_revision: Union[str, None] = '3a1f9c2d7b40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+job_status = postgresql.ENUM(
+    "pending", "running", "done", "failed", name="jobstatus", create_type=False
+)
+
+
+def upgrade():
+    job_status.create(op.get_bind(), checkfirst=True)
+    op.create_table(
+        "background_jobs",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("job_type", sa.String(80), nullable=False),
+        sa.Column("payload", postgresql.JSONB(), nullable=False, server_default=sa.text("'{}'::jsonb")),
+        sa.Column("status", job_status, nullable=False, server_default="pending"),
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("max_attempts", sa.Integer(), nullable=False, server_default="5"),
+        sa.Column("run_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("dedupe_key", sa.String(255), nullable=True),
+        sa.Column("locked_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("locked_by", sa.String(120), nullable=True),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index(
+        "ix_background_jobs_status_type_run_at",
+        "background_jobs",
+        ["status", "job_type", "run_at"],
+        unique=False,
+    )
+    op.create_index(
+        "uq_background_jobs_dedupe_active",
+        "background_jobs",
+        ["dedupe_key"],
+        unique=True,
+        postgresql_where=sa.text("status IN ('pending', 'running')"),
+    )
+
+def downgrade():
+    op.drop_index("uq_background_jobs_dedupe_active", table_name="background_jobs")
+    op.drop_index("ix_background_jobs_status_type_run_at", table_name="background_jobs")
+    op.drop_table("background_jobs")
+    job_status.drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,53 @@
+"""branch_geofences
+
+Revision ID: 8d4f2b6a1e37
+Revises: 5c9a3e7f1d24
+Create Date: 2025-08-30 09:41:12.377804
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from geoalchemy2 import Geography
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d4f2b6a1e37'
+down_revision: Union[str, None] = '5c9a3e7f1d24'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+ADDRESS_COLUMNS = [
+    ("street", 255),
+    ("number", 20),
+    ("neighborhood", 100),
+    ("city", 100),
+    ("state", 100),
+    ("postal_code", 20),
+]
+
+
+def upgrade():
+    for name, length in ADDRESS_COLUMNS:
+        op.add_column("branches", sa.Column(name, sa.String(length), nullable=True))
+    op.add_column(
+        "branches",
+        sa.Column("location", Geography(geometry_type="POINT", srid=4326, spatial_index=False), nullable=True),
+    )
+    op.add_column(
+        "branches",
+        sa.Column("geofence", Geography(geometry_type="POLYGON", srid=4326, spatial_index=False), nullable=True),
+    )
+    # mesmos nomes que o geoalchemy2 dá aos índices espaciais no create_all
+    op.create_index("idx_branches_location", "branches", ["location"], postgresql_using="gist")
+    op.create_index("idx_branches_geofence", "branches", ["geofence"], postgresql_using="gist")
+
+def downgrade():
+    op.drop_index("idx_branches_geofence", table_name="branches")
+    op.drop_index("idx_branches_location", table_name="branches")
+    op.drop_column("branches", "geofence")
+    op.drop_column("branches", "location")
+    for name, _ in reversed(ADDRESS_COLUMNS):
+        op.drop_column("branches", name)
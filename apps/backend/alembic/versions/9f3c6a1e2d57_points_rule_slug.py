@@ -0,0 +1,51 @@
+"""points_rule_slug
+
+Revision ID: 9f3c6a1e2d57
+Revises: 5b7e1d3c9a24
+Create Date: 2025-08-26 09:27:44.615302
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9f3c6a1e2d57'
+down_revision: Union[str, None] = '5b7e1d3c9a24'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade():
+    op.add_column("points_rules", sa.Column("slug", sa.Text(), nullable=True))
+
+    # copia config->>'slug' das regras digitais; slugs repetidos entre empresas
+    # (nada impedia antes) mantêm o mais antigo e os demais ganham o sufixo do id
+    op.execute("""
+        WITH ranked AS (
+            SELECT id,
+                   config->>'slug' AS slug,
+                   row_number() OVER (PARTITION BY config->>'slug' ORDER BY created_at, id) AS rn
+              FROM points_rules
+             WHERE rule_type = 'digital_behavior'
+               AND coalesce(config->>'slug', '') <> ''
+        )
+        UPDATE points_rules p
+           SET slug = CASE WHEN r.rn = 1 THEN r.slug ELSE r.slug || '-' || left(p.id::text, 8) END
+          FROM ranked r
+         WHERE p.id = r.id
+    """)
+    op.execute("""
+        UPDATE points_rules
+           SET config = jsonb_set(config, '{slug}', to_jsonb(slug))
+         WHERE slug IS NOT NULL
+           AND config->>'slug' IS DISTINCT FROM slug
+    """)
+
+    op.create_index("ix_points_rules_slug", "points_rules", ["slug"], unique=True)
+
+def downgrade():
+    op.drop_index("ix_points_rules_slug", table_name="points_rules")
+    op.drop_column("points_rules", "slug")
@@ -0,0 +1,38 @@
+"""admin_listing_keyset_indexes
+
+Revision ID: b6e2d94a7c18
+Revises: 7a1c9e4d2f63
+Create Date: 2025-08-29 10:12:31.504118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b6e2d94a7c18'
+down_revision: Union[str, None] = '7a1c9e4d2f63'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDEXES = [
+    ("ix_reward_orders_created_at_id", "reward_orders", ["created_at", "id"]),
+    ("ix_reward_orders_status_created_at_id", "reward_orders", ["status", "created_at", "id"]),
+    ("ix_reward_orders_user_created_at_id", "reward_orders", ["user_id", "created_at", "id"]),
+    ("ix_points_rules_created_at_id", "points_rules", ["created_at", "id"]),
+    ("ix_user_points_transactions_rule_created_at_id", "user_points_transactions", ["rule_id", "created_at", "id"]),
+]
+
+
+def upgrade():
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, unique=False)
+    # estimativas de pg_class.reltuples já válidas para as listagens
+    for table in {table for _, table, _ in INDEXES}:
+        op.execute(f"ANALYZE {table}")
+
+def downgrade():
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,38 @@
+"""payment_webhook_events
+
+Revision ID: c27a5e90d8b1
+Revises: 8d4e2b6f1c93
+Create Date: 2025-08-22 14:03:55.260941
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c27a5e90d8b1'
+down_revision: Union[str, None] = '8d4e2b6f1c93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade():
+    op.create_table(
+        "payment_webhook_events",
+        sa.Column("event_id", sa.String(120), primary_key=True),
+        sa.Column("event", sa.String(60), nullable=False),
+        sa.Column("asaas_id", sa.String(255), nullable=True),
+        sa.Column("received_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    )
+    op.create_index(
+        "ix_payment_webhook_events_asaas_id",
+        "payment_webhook_events",
+        ["asaas_id"],
+        unique=False,
+    )
+
+def downgrade():
+    op.drop_index("ix_payment_webhook_events_asaas_id", table_name="payment_webhook_events")
+    op.drop_table("payment_webhook_events")
@@ -0,0 +1,42 @@
+"""digital_behavior_events
+
+Revision ID: e4a8c2f61b09
+Revises: 9f3c6a1e2d57
+Create Date: 2025-08-27 16:05:12.903418
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4a8c2f61b09'
+down_revision: Union[str, None] = '9f3c6a1e2d57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade():
+    op.create_table(
+        "digital_behavior_events",
+        sa.Column("company_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("companies.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("event_id", sa.String(100), primary_key=True),
+        sa.Column("rule_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("points_rules.id", ondelete="SET NULL"), nullable=True),
+        sa.Column("user_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("status", sa.String(30), nullable=False),
+        sa.Column("points", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    )
+    op.create_index(
+        "ix_digital_behavior_events_created_at",
+        "digital_behavior_events",
+        ["created_at"],
+        unique=False,
+    )
+
+def downgrade():
+    op.drop_index("ix_digital_behavior_events_created_at", table_name="digital_behavior_events")
+    op.drop_table("digital_behavior_events")
@@ -1,6 +1,7 @@
 # backend/app/api/deps.py
 
-from fastapi import Depends, Request, HTTPException, status
+from zoneinfo import ZoneInfo
+from fastapi import Depends, Request, HTTPException, Query, status
 from fastapi.security import HTTPBearer
 from jose import JWTError, jwt
 from sqlalchemy.orm import Session
@@ -8,6 +9,8 @@ from ..core.config import settings
 from ..db.session import SessionLocal
 from ..models.user import User, Role
 from ..models.company import Company
+from ..core.time_range import resolve_timezone
+from ..core import redis_client
 from redis import Redis
 
 bearer_scheme = HTTPBearer(auto_error=False)
@@ -69,5 +72,15 @@ def get_current_company(request: Request, db: Session = Depends(get_db)) -> Comp
         raise HTTPException(status.HTTP_401_UNAUTHORIZED, "Empresa não encontrada")
     return company
 
+def get_company_timezone(
+    tz: str | None = Query(None, description="Fuso IANA (ex.: America/Sao_Paulo); padrão: o da empresa"),
+    company: Company = Depends(get_current_company),
+) -> ZoneInfo:
+    """
+    Fuso dos dashboards: ?tz= do pedido ou o cadastrado na empresa.
+    """
+    return resolve_timezone(tz, company)
+
 def get_redis() -> Redis:
-    return Redis.from_url(settings.REDIS_URL, decode_responses=True)
\ No newline at end of file
+    # cliente do pool do processo (app/core/redis_client.py)
+    return redis_client.get_redis()
\ No newline at end of file
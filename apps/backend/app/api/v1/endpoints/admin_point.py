@@ -1,8 +1,12 @@
 # backend/app/api/v1/endpoints/points.py  – adicione depois dos imports
-from fastapi import APIRouter, Depends, Query, Path
+from fastapi import APIRouter, Depends, Query, Path, Response
 from sqlalchemy.orm import Session
 from uuid import UUID
+from datetime import date
 from app.api.deps import get_db, require_admin
+from app.core.time_range import resolve_timezone
+from app.models.points_rule import RuleType
+from app.models.user_points_transaction import UserPointsTxType
 
 from app.schemas.points_rule_admin import PaginatedRules
 from app.services.points_admin_service import (
@@ -23,12 +27,34 @@ router = APIRouter(tags=["admin_points"])
     dependencies=[Depends(require_admin)]
 )
 def admin_list_rules(
+    response: Response,
+    company_id: UUID | None = Query(None),
+    rule_type: RuleType | None = Query(None),
+    active: bool | None = Query(None),
+    start_date: date | None = Query(None, description="Criadas a partir do dia (fuso de ?tz=)"),
+    end_date: date | None = Query(None, description="Criadas até o dia, inclusive"),
+    tz: str | None = Query(None, description="Fuso IANA das datas (padrão: METRICS_DEFAULT_TIMEZONE)"),
+    after: str | None = Query(None, description="X-Next-Cursor da página anterior"),
+    exact_total: bool = Query(False, description="Conta o total exato (lento em tabelas grandes)"),
     skip: int = Query(0, ge=0),
     limit: int = Query(10, gt=0, le=100),
     db: Session = Depends(get_db),
 ):
-    total, items = list_all_rules(db, skip, limit)
-    return {"total": total, "skip": skip, "limit": limit, "items": items}
+    page = list_all_rules(
+        db,
+        company_id=company_id,
+        rule_type=rule_type,
+        active=active,
+        start_date=start_date,
+        end_date=end_date,
+        tz=resolve_timezone(tz),
+        limit=limit,
+        after=after,
+        skip=skip,
+        exact_total=exact_total,
+    )
+    response.headers.update(page.headers())
+    return {"total": page.total, "skip": skip, "limit": limit, "items": page.rows}
 
 
 @router.get(
@@ -38,12 +64,33 @@ def admin_list_rules(
     dependencies=[Depends(require_admin)]
 )
 def admin_rule_transactions(
+    response: Response,
     rule_id: UUID = Path(..., description="ID da regra"),
+    company_id: UUID | None = Query(None),
+    type: UserPointsTxType | None = Query(None),
+    start_date: date | None = Query(None),
+    end_date: date | None = Query(None),
+    tz: str | None = Query(None, description="Fuso IANA das datas (padrão: METRICS_DEFAULT_TIMEZONE)"),
+    after: str | None = Query(None, description="X-Next-Cursor da página anterior"),
+    exact_total: bool = Query(False, description="Conta o total exato (lento em tabelas grandes)"),
     skip: int = Query(0, ge=0),
     limit: int = Query(10, gt=0, le=100),
     db: Session = Depends(get_db),
 ):
-    total, txs = list_rule_transactions(db, str(rule_id), skip, limit)
+    page = list_rule_transactions(
+        db,
+        str(rule_id),
+        company_id=company_id,
+        tx_type=type,
+        start_date=start_date,
+        end_date=end_date,
+        tz=resolve_timezone(tz),
+        limit=limit,
+        after=after,
+        skip=skip,
+        exact_total=exact_total,
+    )
+    response.headers.update(page.headers())
     # reaproveita serializer existente
     items = [
         {
@@ -56,6 +103,6 @@ def admin_rule_transactions(
             "company_name": t.company.name,
             "created_at":   t.created_at,
         }
-        for t in txs
+        for t in page.rows
     ]
-    return {"total": total, "skip": skip, "limit": limit, "items": items}
+    return {"total": page.total, "skip": skip, "limit": limit, "items": items}
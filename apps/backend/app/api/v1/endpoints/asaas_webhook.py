@@ -1,28 +1,26 @@
-from fastapi import APIRouter, Request, Depends, status
+import hmac
+from fastapi import APIRouter, Body, Depends, Header, HTTPException, status
 from sqlalchemy.orm import Session
 from app.api.deps import get_db
-from app.models.company_payment import CompanyPayment
-from app.models.company_point_purchase import CompanyPointPurchase
-from app.services.company_payment_service import refresh_payment_status
-from app.services.point_purchase_service import refresh_point_purchase_status
+from app.core.config import settings
+from app.services.payment_webhook_service import record_event
 
 router = APIRouter(tags=["webhooks"])
 
 @router.post("/asaas", status_code=status.HTTP_204_NO_CONTENT)
-async def asaas_webhook(
-    request: Request,
+def asaas_webhook(
+    payload: dict = Body(...),
+    access_token: str | None = Header(None, alias="asaas-access-token"),
     db: Session = Depends(get_db),
 ):
-    payload = await request.json()
-    event = payload.get("event", "").upper()
-
-    if event.startswith("PAYMENT_") and "payment" in payload:
-        asaas_id = payload["payment"]["id"]
-        # verifique primeiro se é uma cobrança de créditos
-        if db.query(CompanyPayment).filter_by(asaas_id=asaas_id).first():
-            refresh_payment_status(db, asaas_id)
-        # senão, pode ser compra de pontos
-        elif db.query(CompanyPointPurchase).filter_by(asaas_id=asaas_id).first():
-            refresh_point_purchase_status(db, asaas_id)
+    """
+    Recebe o evento, valida o token, deduplica pelo id do evento e responde
+    na hora. A reconsulta na Asaas e os créditos rodam no job worker.
+    """
+    if settings.ASAAS_WEBHOOK_TOKEN and not hmac.compare_digest(
+        access_token or "", settings.ASAAS_WEBHOOK_TOKEN
+    ):
+        raise HTTPException(status.HTTP_401_UNAUTHORIZED, "Token de webhook inválido")
 
+    record_event(db, payload)
     return
@@ -1,6 +1,6 @@
 # backend/app/api/v1/endpoints/auth.py
 
-from fastapi import APIRouter, Depends, Query, Response, BackgroundTasks, HTTPException, status
+from fastapi import APIRouter, Depends, Query, Response, HTTPException, status
 from jose import jwt, JWTError
 import re
 import app.api.deps as deps
@@ -11,11 +11,12 @@ from ....core.cpf_utils import normalize_cpf
 from app.core.security import hash_password, create_access_token  # ← importar create_access_token aqui
 from ....schemas.user import UserCreate, LeadCreate, UserRead
 from ....schemas.token import Token
-from ....services import user_service, auth_service, password_reset_service
+from ....services import user_service, auth_service, password_reset_service, job_service
 from ....services.password_reset_service import create_code
-from ....services.sms_service import send_phone_code, verify_phone_code
+from ....services.sms_service import verify_phone_code
 from ....core.config import settings
-from ....core.email_utils import send_email, send_templated_email
+from ....core.static_files import asset_url
+from ....core.email_utils import queue_email, queue_templated_email
 from app.models.user import User
 from app.models.company import Company
 from datetime import datetime
@@ -123,7 +124,6 @@ def register(
     *,
     payload: UserCreate,
     response: Response,
-    background: BackgroundTasks,
     db: Session = Depends(get_db),
 ):
     """
@@ -165,14 +165,14 @@ def register(
     
     explore_url = f"{settings.FRONTEND_ORIGINS[0]}/"
 
-    background.add_task(
-        send_templated_email,
+    queue_templated_email(
+        db,
         to=user.email,
         subject="Bem-vindo(a) ao Clubily!",
         template_name="welcome_user.html",
         user_name=user.name or user.name or "cliente",
         explore_url=explore_url,
-        logo_url=f"{settings.BACKEND_ORIGINS}/static/logo.png",
+        logo_url=f"{settings.BACKEND_ORIGINS}{asset_url('logo.png')}",
     )
 
     # 6) Envia e‐mail de verificação em background
@@ -240,7 +240,6 @@ def login(
 def forgot_password(
     *,
     email: str,
-    background: BackgroundTasks,
     db: Session = Depends(get_db)
 ):
     # 1) Verifica existência do usuário
@@ -261,9 +260,9 @@ def forgot_password(
     <h2 style="font-family:monospace;">{code}</h2>
     """
 
-    # 4) Agenda envio em background
-    background.add_task(
-        send_email,
+    # 4) Enfileira o envio (worker de e-mail)
+    queue_email(
+        db,
         to=user.email,
         subject="Código para redefinição de senha",
         html=html
@@ -320,13 +319,13 @@ def verify_email(
 def request_phone_code(
     *,
     phone: str,
-    background: BackgroundTasks,
     db: Session = Depends(get_db),
 ):
     """
     Gera e envia um código de verificação por SMS usando Twilio Verify.
+    O envio é feito pelo job worker.
     """
-    background.add_task(send_phone_code, phone)
+    job_service.enqueue(db, "send_phone_code", {"phone": phone})
     return {"msg": "Código enviado por SMS"}
 
 
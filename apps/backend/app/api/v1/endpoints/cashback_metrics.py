@@ -1,11 +1,13 @@
 # backend/app/api/v1/endpoints/cashback_metrics.py
 
 from fastapi import APIRouter, Depends, Query, HTTPException
-from datetime import date, datetime, timedelta
+from datetime import date, timedelta
 from typing import List, Optional
+from zoneinfo import ZoneInfo
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_db, get_current_company
+from app.api.deps import get_db, get_current_company, get_company_timezone
+from app.core.time_range import local_today
 from app.schemas.cashback_metrics import MonthlyCharts, ProgramMetrics, CompanyMetrics
 from app.services.metrics_service import (
     get_daily_spend_range,
@@ -29,9 +31,10 @@ def read_charts_range(
     end_date:   Optional[date] = Query(None, description="Data final   (YYYY-MM-DD)"),
     db: Session = Depends(get_db),
     current_company=Depends(get_current_company),
+    tz: ZoneInfo = Depends(get_company_timezone),
 ):
-    # define intervalo padrão = mês atual
-    today = datetime.utcnow().date()
+    # define intervalo padrão = mês atual (no fuso da empresa)
+    today = local_today(tz)
     first = today.replace(day=1)
     last  = (first + timedelta(days=32)).replace(day=1) - timedelta(days=1)
 
@@ -43,10 +46,10 @@ def read_charts_range(
     cid = str(current_company.id)
 
     return MonthlyCharts(
-        spend_by_day          = get_daily_spend_range(db, cid, sd, ed),
-        cashback_value_by_day = get_daily_cashback_value_range(db, cid, sd, ed),
-        cashback_count_by_day = get_daily_cashback_count_range(db, cid, sd, ed),
-        new_users_by_day      = get_daily_new_users_range(db, sd, ed),
+        spend_by_day          = get_daily_spend_range(db, cid, sd, ed, tz),
+        cashback_value_by_day = get_daily_cashback_value_range(db, cid, sd, ed, tz),
+        cashback_count_by_day = get_daily_cashback_count_range(db, cid, sd, ed, tz),
+        new_users_by_day      = get_daily_new_users_range(db, sd, ed, tz),
     )
 
 
@@ -72,8 +75,9 @@ def read_company_metrics(
     end_date:   Optional[date] = Query(None, description="Data final   (YYYY-MM-DD)"),
     db: Session = Depends(get_db),
     current_company=Depends(get_current_company),
+    tz: ZoneInfo = Depends(get_company_timezone),
 ):
-    today = datetime.utcnow().date()
+    today = local_today(tz)
     first = today.replace(day=1)
     last  = (first + timedelta(days=32)).replace(day=1) - timedelta(days=1)
 
@@ -82,4 +86,4 @@ def read_company_metrics(
     if sd > ed:
         raise HTTPException(400, "start_date não pode ser depois de end_date")
 
-    return get_company_metrics_range(db, str(current_company.id), sd, ed)
+    return get_company_metrics_range(db, str(current_company.id), sd, ed, tz)
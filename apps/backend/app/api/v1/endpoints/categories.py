@@ -1,10 +1,9 @@
 # backend/app/api/v1/endpoints/categories.py
 
-import os
-import uuid
 from decimal import Decimal, InvalidOperation, ROUND_HALF_UP 
 from typing import List, Optional   
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, status, Query
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from app.api.deps import get_db, require_admin, get_current_company, get_redis
 from app.services.geocode_service import GeocodeService
@@ -12,6 +11,9 @@ from app.models.category import Category
 from app.models.company import Company
 from app.schemas.category import CategoryRead, CategoryPage
 from app.services.category_service import list_categories, list_categories_paginated
+from app.services.file_service import store_file, delete_file_from_url
+from app.core import response_cache
+from app.core.response_cache import cached_response
 from sqlalchemy import or_, func
 from geoalchemy2 import functions as geo_func
 from redis import Redis
@@ -59,25 +61,18 @@ async def create_cat(
     if not image.content_type.startswith("image/"):
         raise HTTPException(status.HTTP_400_BAD_REQUEST, "Envie um arquivo de imagem válido")
 
-    save_dir = os.path.join(os.getcwd(), "app", "static", "categories")
-    os.makedirs(save_dir, exist_ok=True)
-    ext = os.path.splitext(image.filename)[1]
-    filename = f"{uuid.uuid4()}{ext}"
-    file_path = os.path.join(save_dir, filename)
-
-    content = await image.read()
-    with open(file_path, "wb") as f:
-        f.write(content)
-
-    image_url = f"/static/categories/{filename}"
+    # grava em blocos numa thread (não bloqueia o event loop)
+    image_url = await run_in_threadpool(store_file, image, "categories")
     cat = Category(name=name, image_url=image_url, commission_percent=cp)  # ✅ Decimal
     db.add(cat)
     db.commit()
     db.refresh(cat)
+    response_cache.bump("categories")
     return cat
 
 
 @router.get("/", response_model=list[CategoryRead])
+@cached_response("categories", model=list[CategoryRead])
 def read_cats(db: Session = Depends(get_db)):
     return list_categories(db)
 
@@ -87,6 +82,7 @@ def read_cats(db: Session = Depends(get_db)):
     status_code=status.HTTP_200_OK,
     summary="Lista pública de categorias (com comissão), paginada e com busca opcional",
 )
+@cached_response("categories", model=CategoryPage)
 def read_categories_public(
     page: int = Query(1, ge=1, description="Página (1-based)"),
     size: int = Query(20, ge=1, le=100, description="Itens por página (máx 100)"),
@@ -145,27 +141,17 @@ async def update_category(
         if not image.content_type.startswith("image/"):
             raise HTTPException(status.HTTP_400_BAD_REQUEST, detail="Envie um arquivo de imagem válido")
 
-        if cat.image_url:
-            old_file = os.path.basename(cat.image_url)
-            old_path = os.path.join(os.getcwd(), "app", "static", "categories", old_file)
-            if os.path.exists(old_path):
-                try:
-                    os.remove(old_path)
-                except OSError:
-                    pass
-
-        save_dir = os.path.join(os.getcwd(), "app", "static", "categories")
-        os.makedirs(save_dir, exist_ok=True)
-        ext = os.path.splitext(image.filename)[1]
-        new_filename = f"{uuid.uuid4()}{ext}"
-        new_path = os.path.join(save_dir, new_filename)
-        content = await image.read()
-        with open(new_path, "wb") as f:
-            f.write(content)
-        cat.image_url = f"/static/categories/{new_filename}"
+        new_url = await run_in_threadpool(store_file, image, "categories")
+        if cat.image_url and cat.image_url != new_url:
+            try:
+                delete_file_from_url(cat.image_url)
+            except OSError:
+                pass
+        cat.image_url = new_url
 
     db.commit()
     db.refresh(cat)
+    response_cache.bump("categories")
     return cat
 
 @router.get(
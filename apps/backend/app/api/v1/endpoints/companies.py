@@ -1,8 +1,8 @@
 # backend/app/api/v1/endpoints/companies.py
 
 from typing import List, Optional, Tuple
-import os, uuid
-from fastapi import APIRouter, Depends, Response, BackgroundTasks, HTTPException, status, UploadFile, File, Query
+from fastapi import APIRouter, Depends, Response, HTTPException, status, UploadFile, File, Query
+from fastapi.concurrency import run_in_threadpool
 from fastapi_pagination import Page, Params
 from fastapi_pagination.ext.sqlalchemy import paginate as sqlalchemy_paginate
 from sqlalchemy.orm import Session
@@ -13,7 +13,9 @@ from ....schemas.company import CompanyCreate, CompanyRead, CompanyLogin, Compan
 from ....schemas.token import Token
 from ....services.company_service import create, authenticate
 from ....core.config import settings
-from ....core.email_utils import send_email, send_templated_email
+from ....core.static_files import asset_url
+from ....core import response_cache
+from ....core.email_utils import queue_email, queue_templated_email
 from jose import jwt
 from app.core.security import create_access_token 
 from app.models.user import User
@@ -26,7 +28,9 @@ from ....schemas.referral import ReferralRedeem, ReferralRead
 from ....services.referral_service import redeem_referral_code
 from ....services import company_password_reset_service as comp_reset
 from geoalchemy2 import functions as geo_func
-from app.services.geocode_service import GeocodeService, geocode_and_save
+from app.services.geocode_service import GeocodeService
+from app.services import digital_rule_cache, job_service
+from app.services.file_service import store_file, delete_file_from_url
 from redis import Redis
 
 router = APIRouter(tags=["companies"])
@@ -48,13 +52,12 @@ def _addr_tuple(c) -> Tuple[str, str, str, str, str, str]:
 )
 def register_company(
     payload: CompanyCreate,
-    background: BackgroundTasks,
     response: Response,
     db: Session = Depends(get_db),
 ):
     """
     Registra uma nova empresa e, logo após:
-    - Agenda geocoding do endereço completo em background
+    - Agenda geocoding do endereço completo no job worker
     - Gera e devolve um JWT no cookie e no JSON
     - Envia e-mail de boas-vindas com verificação de e-mail
     """
@@ -80,17 +83,19 @@ def register_company(
     # 1) Cria a empresa (sem location ainda)
     company = create(db, payload)
 
-    # 2) Agenda geocoding PRECISO (endereço completo)
-    background.add_task(
-        geocode_and_save,
-        company_id=str(company.id),
-        redis_url=settings.REDIS_URL,
-        street=payload.street,
-        number=payload.number,
-        neighborhood=payload.neighborhood,
-        city=payload.city,
-        state=payload.state,
-        postal_code=payload.postal_code,
+    # 2) Agenda geocoding PRECISO (endereço completo) no job worker
+    job_service.enqueue(
+        db,
+        "geocode_company",
+        {
+            "company_id": str(company.id),
+            "street": payload.street,
+            "number": payload.number,
+            "neighborhood": payload.neighborhood,
+            "city": payload.city,
+            "state": payload.state,
+            "postal_code": payload.postal_code,
+        },
     )
 
     # 3) Gera o JWT de sessão e seta no cookie
@@ -106,14 +111,14 @@ def register_company(
 
     # 4) Envia e-mail de boas-vindas + verificação
     verify_url = f"{settings.FRONTEND_ORIGINS[0]}/verify-email?token={token}"
-    background.add_task(
-        send_templated_email,
+    queue_templated_email(
+        db,
         to=company.email,
         subject="Bem-vindo ao Clubily – Confirme seu e-mail",
         template_name="welcome_company.html",
         company_name=company.name,
         verify_url=verify_url,
-        logo_url=f"{settings.BACKEND_ORIGINS}/static/logo.png",
+        logo_url=f"{settings.BACKEND_ORIGINS}{asset_url('logo.png')}",
     )
 
     # 5) Retorna o token no JSON
@@ -183,7 +188,6 @@ def read_current_company(
 def forgot_password_company(
     *,
     email: str,
-    background: BackgroundTasks,
     db: Session = Depends(get_db),
 ):
     """
@@ -202,13 +206,13 @@ def forgot_password_company(
     # 3) Gera código válido por 30 minutos
     code = comp_reset.create_code(db, comp, minutes=30)
 
-    # 4) Monta HTML e agenda envio
+    # 4) Monta HTML e enfileira envio
     html = f"""
     <p>Use o código abaixo para redefinir a senha da sua empresa (válido por 30 minutos):</p>
     <h2 style="font-family:monospace;">{code}</h2>
     """
-    background.add_task(
-        send_email,
+    queue_email(
+        db,
         to=comp.email,
         subject="Código para redefinição de senha empresarial",
         html=html,
@@ -320,31 +324,18 @@ async def upload_company_logo(
     if not image.content_type.startswith("image/"):
         raise HTTPException(status.HTTP_400_BAD_REQUEST, "Envie um arquivo de imagem válido")
 
-    # 2) Define diretório e garante existência
-    save_dir = os.path.join(os.getcwd(), "app", "static", "companies")
-    os.makedirs(save_dir, exist_ok=True)
-
-    # 3) Se já existia uma logo, apaga o arquivo antigo
-    if current_company.logo_url:
-        old_filename = os.path.basename(current_company.logo_url)
-        old_path = os.path.join(save_dir, old_filename)
-        if os.path.exists(old_path):
-            try:
-                os.remove(old_path)
-            except OSError:
-                # se falhar, apenas ignore
-                pass
-
-    # 4) Gera nome único e salva a nova imagem
-    ext = os.path.splitext(image.filename)[1]
-    filename = f"{uuid.uuid4()}{ext}"
-    new_path = os.path.join(save_dir, filename)
-    content = await image.read()
-    with open(new_path, "wb") as f:
-        f.write(content)
-
-    # 5) Atualiza logo_url no banco usando a sessão `db`
-    public_url = f"/static/companies/{filename}"
+    # 2) Grava em blocos numa thread (nome = hash do conteúdo, com variantes)
+    public_url = await run_in_threadpool(store_file, image, "companies")
+
+    # 3) Se já existia outra logo, apaga o arquivo antigo
+    if current_company.logo_url and current_company.logo_url != public_url:
+        try:
+            delete_file_from_url(current_company.logo_url)
+        except OSError:
+            # se falhar, apenas ignore
+            pass
+
+    # 4) Atualiza logo_url no banco usando a sessão `db`
     company = db.get(Company, current_company.id)
     if not company:
         raise HTTPException(status.HTTP_404_NOT_FOUND, "Empresa não encontrada")
@@ -352,6 +343,8 @@ async def upload_company_logo(
 
     db.commit()
     db.refresh(company)
+    response_cache.bump(f"company:{company.id}")
+    digital_rule_cache.invalidate_company(db, company.id)
 
     return {"logo_url": public_url}
 
@@ -481,23 +474,12 @@ def search_companies_by_name(
     # 1) pagina
     page = sqlalchemy_paginate(q, params)
 
-    # 2) adiciona o served flag em cada item
-    resultado = []
+    # 2) o filtro acima só deixa passar empresas online ou dentro do raio,
+    # então toda empresa retornada atende o endereço. O flag vai como atributo
+    # transitório e o response_model valida cada empresa uma única vez.
     for comp in page.items:
-        served = comp.only_online or (
-            comp.location is not None
-            and geo_func.ST_DWithin(comp.location, point, distance_m)
-        )
-        # transforma em dict + injeta o campo
-        data = CompanyReadWithService.model_validate(comp).model_dump()
-        data["serves_address"] = served
-        resultado.append(CompanyReadWithService.model_validate(data))
-
-    # 3) devolve novo Page com items customizados
-    return Page[CompanyReadWithService](
-        items=resultado,
-        meta=page.meta
-    )
+        comp.serves_address = True
+    return page
 
 
 
@@ -565,7 +547,6 @@ def get_company_info(
 def update_company(
     company_id: str,
     payload: CompanyUpdate,
-    background: BackgroundTasks,
     db: Session = Depends(get_db),
     current_company: Company = Depends(get_current_company),
 ):
@@ -587,11 +568,12 @@ def update_company(
             company.email_verified_at = None
             token = jwt.encode({"sub": str(company.id)}, settings.SECRET_KEY, algorithm="HS256")
             verify_url = f"{settings.FRONTEND_ORIGINS[0]}/companies/verify-email?token={token}"
-            background.add_task(
-                send_email,
+            queue_email(
+                db,
                 to=new_email,
                 subject="Verifique seu novo e-mail",
                 html=f"<p>Você alterou seu e-mail. Clique <a href='{verify_url}'>aqui</a> para confirmar.</p>",
+                commit=False,
             )
 
     # categorias
@@ -611,6 +593,8 @@ def update_company(
 
     db.commit()
     db.refresh(company)
+    response_cache.bump(f"company:{company.id}")
+    digital_rule_cache.invalidate_company(db, company.id)
 
     # Se marcou only_online=True, opcionalmente zere location
     if company.only_online and company.location is not None:
@@ -622,16 +606,18 @@ def update_company(
     # Se endereço mudou, re-geocodifique com endereço COMPLETO
     new_addr = _addr_tuple(company)
     if new_addr != old_addr:
-        background.add_task(
-            geocode_and_save,
-            company_id=str(company.id),
-            redis_url=settings.REDIS_URL,
-            street=company.street,
-            number=company.number,
-            neighborhood=company.neighborhood,
-            city=company.city,
-            state=company.state,
-            postal_code=company.postal_code,
+        job_service.enqueue(
+            db,
+            "geocode_company",
+            {
+                "company_id": str(company.id),
+                "street": company.street,
+                "number": company.number,
+                "neighborhood": company.neighborhood,
+                "city": company.city,
+                "state": company.state,
+                "postal_code": company.postal_code,
+            },
         )
 
     return company
@@ -665,7 +651,6 @@ def logout_company(
     summary="Envia solicitação de exclusão de conta da empresa"
 )
 def request_company_deletion(
-    background: BackgroundTasks,
     db: Session = Depends(get_db),
     current_company: Company = Depends(get_current_company),
 ):
@@ -708,9 +693,9 @@ def request_company_deletion(
     <p>Por favor, prossiga com o processo de exclusão conforme as políticas internas.</p>
     """
 
-    # 2) Envia o e-mail em background para o suporte/admin
-    background.add_task(
-        send_email,
+    # 2) Enfileira o e-mail para o suporte/admin
+    queue_email(
+        db,
         to=settings.EMAIL_FROM,
         subject=subject,
         html=html,
@@ -1,12 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, status, Query
 from sqlalchemy.orm import Session
 from datetime import datetime
 from typing import Optional
 from app.api.deps import get_db, get_current_company
+from app.core.config import settings
 from app.schemas.company_payment import (
     CompanyPaymentCreate, CompanyPaymentRead,
     PaginatedPayments, PaymentStatus, PaginatedAdminPayments, PaymentStatus as PaymentStatusEnum
 )
+from app.services import payment_events
 from app.services.company_payment_service import (
     create_charge, list_payments, get_balance, get_charge, list_all_company_payments
 )
@@ -65,22 +67,33 @@ def read_history(
     response_model=CompanyPaymentRead,
     summary="Recupera o status de uma cobrança PIX pelo ID",
 )
-def read_charge(
+async def read_charge(
     payment_id: str,
+    response: Response,
+    wait: int = Query(0, ge=0, le=settings.PAYMENT_LONG_POLL_MAX_SECONDS, description="Long-poll: com If-None-Match, espera até N s por uma mudança"),
+    if_none_match: Optional[str] = Header(None),
     db: Session = Depends(get_db),
     current_company=Depends(get_current_company),
 ):
     """
     Retorna a cobrança criada pela empresa autenticada
     para que o front possa verificar se já saiu CONFIRMED, RECEIVED, etc.
+    Só lê o estado local (quem atualiza é o webhook da Asaas). Com o ETag
+    em If-None-Match: 304 se nada mudou; com ?wait=N, long-poll.
     """
-    charge = get_charge(db, str(current_company.id), payment_id)
+    company_id = str(current_company.id)
+
+    def load():
+        charge = get_charge(db, company_id, payment_id)
+        return CompanyPaymentRead.model_validate(charge) if charge else None
+
+    charge = await payment_events.long_poll(db, company_id, load, if_none_match, wait)
     if not charge:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Cobrança não encontrada"
         )
-    return charge
+    return payment_events.conditional(charge, response, if_none_match)
 
 
 @router.get(
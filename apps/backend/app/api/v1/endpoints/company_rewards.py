@@ -2,6 +2,7 @@
 from uuid import UUID
 from typing import List, Optional
 from fastapi import APIRouter, Depends, UploadFile, File, Form, Path, Body, status, HTTPException, Response
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 from app.api.deps import get_db, get_current_company, get_current_user
@@ -37,7 +38,7 @@ async def admin_create_reward(
     db: Session = Depends(get_db),
     company = Depends(get_current_company),
 ):
-    img_url = save_upload(image, "rewards") if image else None
+    img_url = await run_in_threadpool(save_upload, image, "rewards") if image else None
     payload = RewardCreate(
         name=name,
         description=description,
@@ -77,7 +78,7 @@ async def admin_update_reward(
     reward = db.get(CompanyReward, reward_id)
     if not reward or reward.company_id != company.id:
         raise HTTPException(status.HTTP_404_NOT_FOUND, "Recompensa não encontrada")
-    img_url = save_upload(image, "rewards") if image else None
+    img_url = await run_in_threadpool(save_upload, image, "rewards") if image else None
     payload = RewardUpdate(
         name=name,
         description=description,
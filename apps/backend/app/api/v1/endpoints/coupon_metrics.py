@@ -1,11 +1,12 @@
 from datetime import date
 from typing import Optional
 from uuid import UUID
+from zoneinfo import ZoneInfo
 
 from fastapi import APIRouter, Depends, Query, Path, HTTPException, status
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_db, get_current_company
+from app.api.deps import get_db, get_current_company, get_company_timezone
 from app.schemas.coupon_metrics import (
     TimeGranularity,
     CouponMetricsSummary,
@@ -41,9 +42,10 @@ def coupons_summary(
     date_to: date = Query(..., description="YYYY-MM-DD"),
     db: Session = Depends(get_db),
     current_company=Depends(get_current_company),
+    tz: ZoneInfo = Depends(get_company_timezone),
 ):
     _assert_valid_range(date_from, date_to)
-    return metrics_summary(db, str(current_company.id), date_from=date_from, date_to=date_to)
+    return metrics_summary(db, str(current_company.id), date_from=date_from, date_to=date_to, tz=tz)
 
 
 @router.get("/timeseries", response_model=CouponTimeseriesResponse, summary="Séries temporais de resgates/valores no período")
@@ -54,6 +56,7 @@ def coupons_timeseries(
     coupon_id: Optional[UUID] = Query(None, description="Se informado, filtra por cupom específico"),
     db: Session = Depends(get_db),
     current_company=Depends(get_current_company),
+    tz: ZoneInfo = Depends(get_company_timezone),
 ):
     _assert_valid_range(date_from, date_to)
     return metrics_timeseries(
@@ -63,6 +66,7 @@ def coupons_timeseries(
         date_from=date_from,
         date_to=date_to,
         coupon_id=str(coupon_id) if coupon_id else None,
+        tz=tz,
     )
 
 
@@ -73,11 +77,12 @@ def coupon_summary(
     date_to: date = Query(..., description="YYYY-MM-DD"),
     db: Session = Depends(get_db),
     current_company=Depends(get_current_company),
+    tz: ZoneInfo = Depends(get_company_timezone),
 ):
     _assert_valid_range(date_from, date_to)
     return metrics_summary_by_coupon(
         db, str(current_company.id), str(coupon_id),
-        date_from=date_from, date_to=date_to
+        date_from=date_from, date_to=date_to, tz=tz
     )
 
 
@@ -87,9 +92,10 @@ def coupons_tracking_bubbles(
     date_to: date = Query(..., description="YYYY-MM-DD"),
     db: Session = Depends(get_db),
     current_company=Depends(get_current_company),
+    tz: ZoneInfo = Depends(get_company_timezone),
 ):
     _assert_valid_range(date_from, date_to)
-    return tracking_bubbles(db, str(current_company.id), date_from=date_from, date_to=date_to)
+    return tracking_bubbles(db, str(current_company.id), date_from=date_from, date_to=date_to, tz=tz)
 
 
 @router.get("/tracking/map", response_model=list[CouponMapPoint], summary="Pontos de mapa (rastreamento) no período")
@@ -98,9 +104,10 @@ def coupons_tracking_map(
     date_to: date = Query(..., description="YYYY-MM-DD"),
     db: Session = Depends(get_db),
     current_company=Depends(get_current_company),
+    tz: ZoneInfo = Depends(get_company_timezone),
 ):
     _assert_valid_range(date_from, date_to)
-    return tracking_map_points(db, str(current_company.id), date_from=date_from, date_to=date_to)
+    return tracking_map_points(db, str(current_company.id), date_from=date_from, date_to=date_to, tz=tz)
 
 
 @router.get("/{coupon_id}/usage", response_model=PaginatedCouponUsage, summary="Lista de usos (redemptions) do cupom no período")
@@ -112,6 +119,7 @@ def coupon_usage(
     limit: int = Query(10, ge=1, le=100),
     db: Session = Depends(get_db),
     current_company=Depends(get_current_company),
+    tz: ZoneInfo = Depends(get_company_timezone),
 ):
     _assert_valid_range(date_from, date_to)
     total, rows = list_coupon_usage(
@@ -122,6 +130,7 @@ def coupon_usage(
         date_to=date_to,
         skip=skip,
         limit=limit,
+        tz=tz,
     )
     return PaginatedCouponUsage(
         total=total,
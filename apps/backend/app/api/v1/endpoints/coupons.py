@@ -7,6 +7,7 @@ from fastapi import APIRouter, Depends, HTTPException, status, Query, Path, stat
 from sqlalchemy.orm import Session
 from sqlalchemy import func
 from app.api.deps import get_db, get_current_company, get_current_user, require_admin
+from app.core.serialization import trusted_rows, page_headers
 from app.schemas.coupon import CouponCreate, CouponUpdate, CouponRead, PaginatedCoupons
 from app.services.coupon_service import (
     create_coupon, get_coupon, list_coupons_by_company, update_coupon, delete_coupon, serialize_coupon, list_active_visible
@@ -188,7 +189,6 @@ def platform_list_coupon_stats(
     created_to: Optional[datetime] = Query(None),
     db: Session = Depends(get_db),
     _: User = Depends(require_admin),
-    response: Response = None,
 ):
     # agregados
     used_count = func.count(CouponRedemption.id).label("used_count")
@@ -259,37 +259,9 @@ def platform_list_coupon_stats(
     total_rows = qy.count()
     rows = qy.offset((page - 1) * page_size).limit(page_size).all()
 
-    if response is not None:
-        response.headers["X-Total-Count"] = str(total_rows)
-        response.headers["X-Page"] = str(page)
-        response.headers["X-Page-Size"] = str(page_size)
-
-    result: List[CouponStatsAdmin] = []
-    for r in rows:
-        result.append(
-            CouponStatsAdmin(
-                coupon_id=r.coupon_id,
-                company_id=r.company_id,
-                company_name=r.company_name,
-                name=r.name,
-                code=r.code,
-                is_active=r.is_active,
-                is_visible=r.is_visible,
-                usage_limit_total=r.usage_limit_total,
-                usage_limit_per_user=r.usage_limit_per_user,
-                min_order_amount=float(r.min_order_amount) if r.min_order_amount is not None else None,
-                discount_type=(r.discount_type.value if r.discount_type is not None and hasattr(r.discount_type, "value") else (r.discount_type or None)),
-                discount_value=float(r.discount_value) if r.discount_value is not None else None,
-                created_at=r.created_at,
-                updated_at=r.updated_at,
-                used_count=int(r.used_count or 0),
-                unique_users=int(r.unique_users or 0),
-                total_discount_applied=float(r.total_discount_applied or 0),
-                total_amount=float(r.total_amount or 0),
-                last_redemption_at=r.last_redemption_at,
-            )
-        )
-    return result
+    # colunas com os nomes de CouponStatsAdmin: Decimal → float e Enum → valor
+    # ficam a cargo do serializador (sem montar um modelo por linha)
+    return trusted_rows(CouponStatsAdmin, rows, headers=page_headers(total_rows, page, page_size))
 
 
 # ──────────────────────────────────────────────────────────────────────────────
@@ -1,16 +1,16 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from pydantic import BaseModel, UUID4, ConfigDict
-from typing import Optional
+from pydantic import BaseModel, UUID4, ConfigDict, Field
+from typing import Optional, List, Literal
 from decimal import Decimal
 from sqlalchemy.orm import Session
-from app.models.points_rule import PointsRule
 from app.schemas.company import CompanyBasic
 
 from app.api.deps import get_db, get_current_company
 from app.services.digital_behavior_service import (
-    get_digital_rule_by_slug,
-    process_digital_behavior_event, is_slug_unique
+    process_digital_behavior_event, is_slug_unique, ingest_digital_behavior_events
 )
+from app.core.config import settings
+from app.services.digital_rule_cache import get_compiled_rule
 
 from app.services.lead_service import create_or_update_lead
 from app.schemas.user import LeadCreate
@@ -42,6 +42,28 @@ class DigitalBehaviorTriggerResponse(BaseModel):
 class SlugAvailabilityResponse(BaseModel):
     available: bool
 
+class DigitalBehaviorEventIn(BaseModel):
+    event_id: str = Field(..., min_length=1, max_length=100)
+    user_id: UUID4
+    slug: str
+    amount: Decimal = Decimal("0")
+    purchased_items: List[str] = []
+
+class DigitalBehaviorEventBatch(BaseModel):
+    events: List[DigitalBehaviorEventIn] = Field(..., min_length=1)
+
+class DigitalBehaviorEventOutcome(BaseModel):
+    event_id: str
+    status: Literal[
+        "awarded", "duplicate", "user_not_found", "rule_not_found", "forbidden",
+        "rule_inactive", "not_started", "expired", "limit_reached",
+        "insufficient_balance", "insufficient_points",
+    ]
+    points: int = 0
+
+class DigitalBehaviorEventBatchResponse(BaseModel):
+    results: List[DigitalBehaviorEventOutcome]
+
 @router.get(
     "/slug-available",
     response_model=SlugAvailabilityResponse,
@@ -63,22 +85,46 @@ def check_slug_available(
     )
     return {"available": available}
 
+@router.post(
+    "/events",
+    response_model=DigitalBehaviorEventBatchResponse,
+    status_code=status.HTTP_200_OK
+)
+def ingest_events(
+    payload: DigitalBehaviorEventBatch,
+    db: Session = Depends(get_db),
+    current_company=Depends(get_current_company)
+):
+    """
+    Ingestão em lote para sites parceiros (envio a cada poucos segundos em vez
+    de um /trigger por clique). Idempotente pelo event_id: reenviar um lote
+    devolve "duplicate" para o que já foi processado. Cada evento recebe o
+    próprio resultado; só regras da empresa autenticada são aceitas.
+    """
+    if len(payload.events) > settings.DIGITAL_EVENTS_MAX_BATCH:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Máximo de {settings.DIGITAL_EVENTS_MAX_BATCH} eventos por lote"
+        )
+    results = ingest_digital_behavior_events(db, str(current_company.id), payload.events)
+    return {"results": results}
+
+
 @router.get("/{slug}", response_model=DigitalBehaviorResponse)
 def get_digital_rule(slug: str, db: Session = Depends(get_db)):
-    rule: PointsRule | None = get_digital_rule_by_slug(db, slug)
+    rule = get_compiled_rule(db, slug)
     if not rule:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Regra não encontrada")
 
-    cfg = rule.config or {}
     return DigitalBehaviorResponse(
         slug=slug,
-        name=rule.name,
-        description=rule.description,
-        points=int(cfg.get("points") or 0),
-        valid_from=cfg.get("valid_from") or None,
-        valid_to=cfg.get("valid_to") or None,
-        max_attributions=int(cfg.get("max_attributions") or 0),
-        company=rule.company,
+        name=rule["name"],
+        description=rule["description"],
+        points=rule["points"],
+        valid_from=rule["valid_from"],
+        valid_to=rule["valid_to"],
+        max_attributions=rule["max_attributions"],
+        company=rule["company"],
     )
 
 
@@ -98,10 +144,10 @@ def trigger_rule(
     2) Processa o evento digital e atribui pontos
     """
     # Descobre a empresa pelo slug (sem exigir login)
-    rule = get_digital_rule_by_slug(db, slug)
+    rule = get_compiled_rule(db, slug)
     if not rule:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Regra não encontrada")
-    company_id = str(rule.company_id)
+    company_id = rule["company_id"]
 
     # 1) Pré-cadastro / atualização de lead
     if payload.phone or payload.cpf:
@@ -0,0 +1,164 @@
+# backend/app/api/v1/endpoints/exports.py
+#
+# Exportação CSV/XLSX dos relatórios (app/services/export_reports.py).
+# Os parâmetros de cada relatório vão na query string, validados pelo schema
+# do relatório. Resposta: o CSV em stream (200) ou, para exportações grandes
+# e XLSX, 202 com o token; GET /exports/jobs/{token} acompanha e
+# /download baixa — só a empresa dona da exportação ou um admin.
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
+from pydantic import ValidationError
+from sqlalchemy.orm import Session
+from zoneinfo import ZoneInfo
+
+from app.api.deps import get_db, get_current_company, get_current_user, get_company_timezone, require_admin
+from app.core.config import settings
+from app.core.time_range import resolve_timezone
+from app.models.background_job import JobStatus
+from app.schemas.exports import ExportFormat, ExportJobRead, ExportMode
+from app.services import export_service
+from app.services.export_reports import ExportReport
+
+router = APIRouter(tags=["exports"])
+
+RESERVED_PARAMS = {"format", "mode", "tz"}
+
+
+def _params(report: ExportReport, request: Request):
+    raw = {k: v for k, v in request.query_params.items() if k not in RESERVED_PARAMS}
+    try:
+        return report.params.model_validate(raw)
+    except ValidationError as e:
+        raise RequestValidationError(e.errors())
+
+
+def _export_owner(request: Request, db: Session = Depends(get_db)) -> str | None:
+    """
+    Quem acompanha/baixa exportações: a empresa logada (seu id) ou um admin
+    (None = qualquer exportação).
+    """
+    try:
+        return str(get_current_company(request, db).id)
+    except HTTPException:
+        pass
+    require_admin(get_current_user(request, db))
+    return None
+
+
+def _owned_job(db: Session, token: str, owner: str | None):
+    # 404 (e não 403) para não revelar se o token existe
+    job = export_service.find_job(db, token)
+    if not job or (owner is not None and job.payload.get("company_id") != owner):
+        return None
+    return job
+
+
+def _job_read(token: str, report: str, fmt: ExportFormat, job_status: str, **extra) -> ExportJobRead:
+    return ExportJobRead(
+        token=token,
+        report=report,
+        format=fmt,
+        status=job_status,
+        download_url=(
+            f"{settings.API_V1_STR}/exports/jobs/{token}/download" if job_status == JobStatus.done.value else None
+        ),
+        **extra,
+    )
+
+
+def _export(
+    db: Session,
+    report: ExportReport,
+    params,
+    fmt: ExportFormat,
+    mode: ExportMode,
+    *,
+    company_id: str | None,
+    tz: ZoneInfo,
+):
+    if fmt is ExportFormat.xlsx and not export_service.xlsx_available():
+        raise HTTPException(status.HTTP_400_BAD_REQUEST, "Exportação XLSX indisponível")
+    stmt = report.build(params, company_id=company_id, tz=tz)
+    if export_service.should_run_as_job(db, stmt, fmt, mode.value):
+        token = export_service.start_job(db, report, params, fmt, company_id=company_id, tz=tz)
+        body = _job_read(token, report.name, fmt, JobStatus.pending.value)
+        return JSONResponse(body.model_dump(mode="json"), status_code=status.HTTP_202_ACCEPTED)
+
+    return StreamingResponse(
+        export_service.stream_csv(report, params, company_id=company_id, tz=tz),
+        media_type=export_service.MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{export_service.filename(report.name, fmt)}"'},
+    )
+
+
+@router.get(
+    "/admin/{report}",
+    summary="Admin: exportar relatório (CSV em stream ou job)",
+    dependencies=[Depends(require_admin)],
+)
+def admin_export(
+    report: str,
+    request: Request,
+    format: ExportFormat = Query(ExportFormat.csv),
+    mode: ExportMode = Query(ExportMode.auto),
+    tz: str | None = Query(None, description="Fuso IANA das datas (padrão: METRICS_DEFAULT_TIMEZONE)"),
+    db: Session = Depends(get_db),
+):
+    spec = export_service.get_report(report, "admin")
+    return _export(db, spec, _params(spec, request), format, mode, company_id=None, tz=resolve_timezone(tz))
+
+
+@router.get(
+    "/jobs/{token}",
+    response_model=ExportJobRead,
+    summary="Situação de uma exportação em background",
+)
+def export_job(token: str, db: Session = Depends(get_db), owner: str | None = Depends(_export_owner)):
+    job = _owned_job(db, token, owner)
+    if not job:
+        raise HTTPException(status.HTTP_404_NOT_FOUND, "Exportação não encontrada")
+    job_status = export_service.job_status(job)
+    return _job_read(
+        token,
+        job.payload["report"],
+        ExportFormat(job.payload["format"]),
+        job_status,
+        error=job.last_error if job_status == JobStatus.failed.value else None,
+        created_at=job.created_at,
+        finished_at=job.finished_at,
+    )
+
+
+@router.get(
+    "/jobs/{token}/download",
+    summary="Baixar o arquivo de uma exportação concluída",
+)
+def download_export(token: str, db: Session = Depends(get_db), owner: str | None = Depends(_export_owner)):
+    job = _owned_job(db, token, owner)
+    if not job or export_service.job_status(job) != JobStatus.done.value:
+        raise HTTPException(status.HTTP_404_NOT_FOUND, "Arquivo não disponível")
+    fmt = ExportFormat(job.payload["format"])
+    return FileResponse(
+        export_service.export_path(token, fmt),
+        media_type=export_service.MEDIA_TYPES[fmt],
+        filename=export_service.filename(job.payload["report"], fmt),
+    )
+
+
+@router.get(
+    "/{report}",
+    summary="Empresa: exportar relatório (CSV em stream ou job)",
+)
+def company_export(
+    report: str,
+    request: Request,
+    format: ExportFormat = Query(ExportFormat.csv),
+    mode: ExportMode = Query(ExportMode.auto),
+    db: Session = Depends(get_db),
+    company=Depends(get_current_company),
+    tz: ZoneInfo = Depends(get_company_timezone),
+):
+    spec = export_service.get_report(report, "company")
+    return _export(db, spec, _params(spec, request), format, mode, company_id=str(company.id), tz=tz)
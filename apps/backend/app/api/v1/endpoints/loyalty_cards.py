@@ -2,14 +2,15 @@
 from uuid import UUID
 from datetime import datetime, timedelta, timezone
 from typing import List, Optional
-from sqlalchemy import or_, func, case 
+from sqlalchemy import or_, func, case, select, cast, Integer
 from fastapi import (
     APIRouter, Depends, UploadFile, File, Form,
     Query, Path, status, HTTPException, Body, Response
 )
+from fastapi.concurrency import run_in_threadpool
 from geoalchemy2 import functions as geo_func
 from redis import Redis
-from app.models.reward import TemplateRewardLink
+from app.models.reward import TemplateRewardLink, RewardRedemptionCode
 from sqlalchemy.orm import Session, selectinload
 from sqlalchemy import or_
 
@@ -17,6 +18,9 @@ from app.api.deps import (
     get_db, get_current_company, get_current_user, get_redis, require_admin
 )
 from app.services.file_service import save_upload, delete_file_from_url
+from app.core import response_cache
+from app.core.response_cache import cached_response
+from app.core.serialization import trusted_rows, page_headers
 from app.services.loyalty_service import (
     create_template, update_template, add_rule,
     issue_card, generate_code, stamp_with_code, stamp_direct    
@@ -33,6 +37,7 @@ from app.models.loyalty_card import (
     LoyaltyCardTemplate,
     LoyaltyCardInstance,
     LoyaltyCardRule,
+    LoyaltyCardStamp,
 )
 from app.models.company import Company
 from app.schemas.company import CompanyBasic
@@ -72,7 +77,7 @@ async def admin_create_template(
 ):
     # salva arquivo e retorna URL ou None
     stamp_icon_url: Optional[str] = (
-        save_upload(stamp_icon, "loyalty_icons")
+        await run_in_threadpool(save_upload, stamp_icon, "loyalty_icons")
         if stamp_icon
         else None
     )
@@ -140,7 +145,7 @@ async def admin_update_template(
 
     # salva novo ícone (se houver) e pega URL
     new_icon_url: Optional[str] = (
-        save_upload(stamp_icon, "loyalty_icons")
+        await run_in_threadpool(save_upload, stamp_icon, "loyalty_icons")
         if stamp_icon
         else None
     )
@@ -182,6 +187,7 @@ def admin_delete_template(
         delete_file_from_url(tpl.stamp_icon_url)
     db.delete(tpl)
     db.commit()
+    response_cache.bump(f"loyalty_templates:{company.id}")
     return Response(status_code=status.HTTP_204_NO_CONTENT)
 
 # ─── ADMIN (empresa) / regras ────────────────────────────────────────────
@@ -257,6 +263,7 @@ def admin_update_rule(
         setattr(rule, k, v)
     db.commit()
     db.refresh(rule)
+    response_cache.bump(f"loyalty_templates:{company.id}")
     return rule
 
 @router.delete(
@@ -304,6 +311,7 @@ def admin_delete_rule(
     # tudo ok: apaga a regra
     db.delete(rule)
     db.commit()
+    response_cache.bump(f"loyalty_templates:{company.id}")
     return Response(status_code=status.HTTP_204_NO_CONTENT)
 
 # ─── ADMIN (empresa) / carimbar com código ───────────────────────────────
@@ -486,6 +494,11 @@ def user_list_active_templates(
     response_model=List[TemplateRead],
     summary="Usuário: listar templates de cartão disponíveis de uma empresa"
 )
+# ttl curto: a lista depende de emission_start/emission_end em relação a agora
+@cached_response(
+    "loyalty_templates:{company_id}", "company:{company_id}",
+    model=List[TemplateRead], ttl=300,
+)
 def list_templates_by_company(
     company_id: UUID = Path(..., description="ID da empresa"),
     page: int        = Query(1, ge=1),
@@ -990,105 +1003,92 @@ def platform_list_completed_cards(
     completed_to: Optional[datetime] = Query(None, description="Concluídos até esta data"),
     db: Session = Depends(get_db),
     _: User = Depends(require_admin),   # <-- RESTRIÇÃO DE ADMIN DE PLATAFORMA
-    response: Response = None,
 ):
     """
     Lista cartões (LoyaltyCardInstance) que foram concluídos (completed_at != NULL),
     em toda a plataforma. Inclui informações do template, empresa, usuário, carimbos e
     métricas úteis para acompanhamento do programa.
     """
-    q = (
-        db.query(LoyaltyCardInstance)
-          .join(LoyaltyCardTemplate, LoyaltyCardTemplate.id == LoyaltyCardInstance.template_id)
-          .join(Company, Company.id == LoyaltyCardTemplate.company_id)
-          .filter(LoyaltyCardInstance.completed_at.isnot(None))
-          .options(
-              # carregamentos necessários p/ montar o payload completo
-              selectinload(LoyaltyCardInstance.template)
-                .selectinload(LoyaltyCardTemplate.rewards_map),
-              selectinload(LoyaltyCardInstance.template)
-                .selectinload(LoyaltyCardTemplate.company),
-              selectinload(LoyaltyCardInstance.redemptions),
-              selectinload(LoyaltyCardInstance.stamps),
-              selectinload(LoyaltyCardInstance.user),
-          )
-    )
-
-    # filtros opcionais
+    # filtros (sobre a instância e o template)
+    filters = [LoyaltyCardInstance.completed_at.isnot(None)]
     if company_id is not None:
-        q = q.filter(LoyaltyCardTemplate.company_id == company_id)
-
+        filters.append(LoyaltyCardTemplate.company_id == company_id)
     if template_id is not None:
-        q = q.filter(LoyaltyCardInstance.template_id == template_id)
-
+        filters.append(LoyaltyCardInstance.template_id == template_id)
     if user_id is not None:
-        q = q.filter(LoyaltyCardInstance.user_id == str(user_id))
-
+        filters.append(LoyaltyCardInstance.user_id == user_id)
     if completed_from is not None:
-        q = q.filter(LoyaltyCardInstance.completed_at >= completed_from)
-
+        filters.append(LoyaltyCardInstance.completed_at >= completed_from)
     if completed_to is not None:
-        q = q.filter(LoyaltyCardInstance.completed_at <= completed_to)
+        filters.append(LoyaltyCardInstance.completed_at <= completed_to)
 
-    total = q.count()
-    instances: List[LoyaltyCardInstance] = (
-        q.order_by(LoyaltyCardInstance.completed_at.desc())
-         .offset((page - 1) * page_size)
-         .limit(page_size)
-         .all()
+    total = db.scalar(
+        select(func.count(LoyaltyCardInstance.id))
+        .join(LoyaltyCardTemplate, LoyaltyCardTemplate.id == LoyaltyCardInstance.template_id)
+        .where(*filters)
     )
 
-    # paginação em headers
-    if response is not None:
-        response.headers["X-Total-Count"] = str(total)
-        response.headers["X-Page"] = str(page)
-        response.headers["X-Page-Size"] = str(page_size)
-
-    # monta resposta
-    result: List[CompletedCardAdmin] = []
-    for inst in instances:
-        tpl = inst.template
-        comp = tpl.company if tpl else None
-        usr = inst.user
-
-        # contagens de recompensas
-        total_rewards = len(tpl.rewards_map) if tpl else 0
-        redeemed = sum(1 for r in inst.redemptions if r.used)
-        pending = max(total_rewards - redeemed, 0)
-
-        # último carimbo (se houver)
-        last_stamp_at = max((s.given_at for s in inst.stamps), default=None)
-
-        # tempo p/ completar (segundos)
-        if inst.issued_at and inst.completed_at:
-            time_to_complete_seconds = int((inst.completed_at - inst.issued_at).total_seconds())
-        else:
-            time_to_complete_seconds = 0
-
-        result.append(
-            CompletedCardAdmin(
-                id=inst.id,
-                template_id=inst.template_id,
-                template_title=(tpl.title if tpl else ""),
-                stamp_total=(tpl.stamp_total if tpl else inst.stamps_given),
-                user_id=inst.user_id,
-                user_name=(usr.name if usr else None),
-                user_email=(usr.email if usr else None),
-                company_id=(comp.id if comp else None),
-                company_name=(comp.name if comp else ""),
-                issued_at=inst.issued_at,
-                completed_at=inst.completed_at,   # guaranteed not None by filter
-                expires_at=inst.expires_at,
-                stamps_given=inst.stamps_given,
-                total_rewards=total_rewards,
-                redeemed_count=redeemed,
-                pending_count=pending,
-                last_stamp_at=last_stamp_at,
-                time_to_complete_seconds=time_to_complete_seconds,
-            )
+    # 1) página de instâncias; 2) métricas só para as linhas da página
+    page_q = (
+        select(LoyaltyCardInstance)
+        .join(LoyaltyCardTemplate, LoyaltyCardTemplate.id == LoyaltyCardInstance.template_id)
+        .where(*filters)
+        .order_by(LoyaltyCardInstance.completed_at.desc())
+        .offset((page - 1) * page_size)
+        .limit(page_size)
+        .subquery("page")
+    )
+    total_rewards = (
+        select(func.count(TemplateRewardLink.id))
+        .where(TemplateRewardLink.template_id == page_q.c.template_id)
+        .scalar_subquery()
+    )
+    redeemed = (
+        select(func.count(RewardRedemptionCode.id))
+        .where(
+            RewardRedemptionCode.instance_id == page_q.c.id,
+            RewardRedemptionCode.used.is_(True),
         )
+        .scalar_subquery()
+    )
+    last_stamp_at = (
+        select(func.max(LoyaltyCardStamp.given_at))
+        .where(LoyaltyCardStamp.instance_id == page_q.c.id)
+        .scalar_subquery()
+    )
+    rows = db.execute(
+        select(
+            page_q.c.id,
+            page_q.c.template_id,
+            LoyaltyCardTemplate.title.label("template_title"),
+            LoyaltyCardTemplate.stamp_total,
+            page_q.c.user_id,
+            User.name.label("user_name"),
+            User.email.label("user_email"),
+            LoyaltyCardTemplate.company_id,
+            Company.name.label("company_name"),
+            page_q.c.issued_at,
+            page_q.c.completed_at,
+            page_q.c.expires_at,
+            func.coalesce(page_q.c.stamps_given, 0).label("stamps_given"),
+            total_rewards.label("total_rewards"),
+            redeemed.label("redeemed_count"),
+            func.greatest(total_rewards - redeemed, 0).label("pending_count"),
+            last_stamp_at.label("last_stamp_at"),
+            func.coalesce(
+                cast(func.floor(func.extract("epoch", page_q.c.completed_at - page_q.c.issued_at)), Integer),
+                0,
+            ).label("time_to_complete_seconds"),
+        )
+        .select_from(page_q)
+        .join(LoyaltyCardTemplate, LoyaltyCardTemplate.id == page_q.c.template_id)
+        .join(Company, Company.id == LoyaltyCardTemplate.company_id)
+        .outerjoin(User, User.id == page_q.c.user_id)
+        .order_by(page_q.c.completed_at.desc())
+    ).all()
 
-    return result
+    # linhas já no formato do schema: serializa direto (paginação em headers)
+    return trusted_rows(CompletedCardAdmin, rows, headers=page_headers(total, page, page_size))
 
 
 @router.get(
@@ -1105,7 +1105,6 @@ def platform_list_template_stats(
     created_to: Optional[datetime] = Query(None, description="Templates criados até"),
     db: Session = Depends(get_db),
     _: User = Depends(require_admin),   # <-- restrição de admin de plataforma
-    response: Response = None,
 ):
     """
     Agrega por template:
@@ -1182,35 +1181,5 @@ def platform_list_template_stats(
          .all()
     )
 
-    # paginação em headers
-    if response is not None:
-        response.headers["X-Total-Count"] = str(total)
-        response.headers["X-Page"] = str(page)
-        response.headers["X-Page-Size"] = str(page_size)
-
-    # montar resposta
-    result: List[TemplateStatsAdmin] = []
-    for r in rows:
-        result.append(
-            TemplateStatsAdmin(
-                template_id=r.template_id,
-                template_title=r.template_title,
-                company_id=r.company_id,
-                company_name=r.company_name,
-                active=r.active,
-                created_at=r.created_at,
-                updated_at=r.updated_at,
-                stamp_total=r.stamp_total,
-                per_user_limit=r.per_user_limit,
-                emission_start=r.emission_start,
-                emission_end=r.emission_end,
-                emission_limit=r.emission_limit,
-                issued_total=r.issued_total or 0,
-                active_instances=r.active_instances or 0,
-                completed_instances=r.completed_instances or 0,
-                unique_users=r.unique_users or 0,
-                last_issued_at=r.last_issued_at,
-            )
-        )
-
-    return result
\ No newline at end of file
+    # colunas já rotuladas como em TemplateStatsAdmin (agregados com coalesce)
+    return trusted_rows(TemplateStatsAdmin, rows, headers=page_headers(total, page, page_size))
\ No newline at end of file
@@ -3,7 +3,8 @@ from typing import Optional
 from fastapi import APIRouter, Depends, Path, Query
 from sqlalchemy.orm import Session
 from datetime import date
-from app.api.deps import get_db, get_current_company
+from zoneinfo import ZoneInfo
+from app.api.deps import get_db, get_current_company, get_company_timezone
 from app.schemas.loyalty_metrics import MetricSummary, MetricsCharts, ChartSeries, SeriesPoint
 from app.services.loyalty_metrics_service import summary_for_company, daily_counts
 
@@ -22,8 +23,9 @@ def metrics_summary(
     date_to: Optional[date] = Query(None, description="aaaa-mm-dd"),
     db: Session = Depends(get_db),
     company = Depends(get_current_company),
+    tz: ZoneInfo = Depends(get_company_timezone),
 ):
-    data = summary_for_company(db, str(company.id), tpl_id, date_from, date_to)
+    data = summary_for_company(db, str(company.id), tpl_id, date_from, date_to, tz)
     return MetricSummary(template_id=tpl_id, **data)
 
 
@@ -38,8 +40,9 @@ def metrics_charts(
     date_to: date = Query(..., description="Data final (aaaa-mm-dd)"),
     db: Session = Depends(get_db),
     company = Depends(get_current_company),
+    tz: ZoneInfo = Depends(get_company_timezone),
 ):
-    counts = daily_counts(db, str(company.id), tpl_id, date_from, date_to)
+    counts = daily_counts(db, str(company.id), tpl_id, date_from, date_to, tz)
 
     series = [
         ChartSeries(
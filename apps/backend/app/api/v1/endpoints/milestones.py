@@ -4,6 +4,7 @@ from uuid import UUID
 from typing import List, Optional
 
 from app.api.deps import get_db, require_admin, get_current_user
+from app.core.response_cache import cached_response
 from app.services.file_service import save_upload
 from app.services.milestone_service import (
     create_milestone, update_milestone, delete_milestone,
@@ -128,6 +129,10 @@ def my_next_milestone(
     response_model=List[MilestoneStatusRead],
     summary="Usuário: lista todos os marcos e indica quais já conquistou"
 )
+@cached_response(
+    "milestones", "user_milestones:{current_user.id}",
+    model=List[MilestoneStatusRead], private=True,
+)
 def all_milestones(
     db: Session = Depends(get_db),
     current_user = Depends(get_current_user)
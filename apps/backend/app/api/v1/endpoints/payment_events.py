@@ -0,0 +1,36 @@
+# backend/app/api/v1/endpoints/payment_events.py
+#
+# Canal SSE por empresa com as mudanças de status das cobranças de créditos
+# e compras de pontos (app/services/payment_events.py). O front abre um
+# EventSource (com cookie) e, a cada "ready", relê o estado pelos GET de
+# status; sem SSE, usa o long-poll desses GET (?wait= + If-None-Match).
+
+from fastapi import APIRouter, Depends
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from app.api.deps import get_db, get_current_company
+from app.services import payment_events
+
+router = APIRouter(tags=["payment_events"])
+
+
+@router.get(
+    "/",
+    summary="SSE: mudanças de status das cobranças da empresa",
+)
+async def stream_payment_events(
+    db: Session = Depends(get_db),
+    current_company=Depends(get_current_company),
+):
+    # o teardown do get_db só roda quando o stream termina: devolve a conexão
+    # ao pool já, senão cada aba aberta segura uma
+    company_id = str(current_company.id)
+    await run_in_threadpool(db.close)
+    return StreamingResponse(
+        payment_events.stream(company_id),
+        media_type="text/event-stream",
+        # sem buffer no nginx: cada evento sai na hora
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
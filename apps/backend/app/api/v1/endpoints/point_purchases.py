@@ -1,7 +1,9 @@
 # app/api/v1/endpoints/point_purchases.py
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
 from app.api.deps import get_db, get_current_company
+from app.core.config import settings
+from app.services import payment_events
 from app.services.point_purchase_service import (
     create_point_purchase, list_point_purchases, list_all_point_purchases, get_point_purchase
 )
@@ -51,16 +53,26 @@ def read_all_point_purchases(
     )
 
 @router.get("/{purchase_id}", response_model=PointPurchaseRead)
-def read_point_purchase(
+async def read_point_purchase(
     purchase_id: str,
+    response: Response,
+    wait: int = Query(0, ge=0, le=settings.PAYMENT_LONG_POLL_MAX_SECONDS, description="Long-poll: com If-None-Match, espera até N s por uma mudança"),
+    if_none_match: str | None = Header(None),
     db: Session = Depends(get_db),
     current_company=Depends(get_current_company)
 ):
     """
     Retorna os detalhes de uma compra de pontos pelo seu ID,
     garantindo que seja da empresa autenticada.
+    Só lê o estado local; ETag/If-None-Match e ?wait=N como em /credits/{id}.
     """
-    p = get_point_purchase(db, str(current_company.id), purchase_id)
+    company_id = str(current_company.id)
+
+    def load():
+        p = get_point_purchase(db, company_id, purchase_id)
+        return PointPurchaseRead.model_validate(p) if p else None
+
+    p = await payment_events.long_poll(db, company_id, load, if_none_match, wait)
     if not p:
         raise HTTPException(status_code=404, detail="Compra de pontos não encontrada")
-    return p
\ No newline at end of file
+    return payment_events.conditional(p, response, if_none_match)
\ No newline at end of file
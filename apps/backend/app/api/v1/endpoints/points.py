@@ -4,6 +4,8 @@ from sqlalchemy.orm import Session
 from typing import List
 from uuid import UUID
 from app.api.deps import get_db, get_current_company, get_current_user
+from app.core import response_cache
+from app.core.response_cache import cached_response
 from app.schemas.points_rule import (
     PointsRuleCreate, PointsRuleRead, PointsRuleUpdate, RuleStatusRead
 )
@@ -89,6 +91,7 @@ def update_points_rule(
         setattr(rule, field, value)
     db.commit()
     db.refresh(rule)
+    response_cache.bump(f"points_rules:{current_company.id}")
     return rule
 
 
@@ -113,6 +116,7 @@ def delete_points_rule(
 
     db.delete(rule)
     db.commit()
+    response_cache.bump(f"points_rules:{current_company.id}")
     return
 
 
@@ -121,6 +125,7 @@ def delete_points_rule(
     response_model=List[PointsRuleRead],
     summary="Usuário: Regras de pontos ativas/visíveis de uma empresa específica"
 )
+@cached_response("points_rules:{company_id}", model=List[PointsRuleRead])
 def list_company_visible_rules(
     company_id: UUID = Path(..., description="ID da empresa cujas regras serão listadas"),
     db: Session = Depends(get_db),
@@ -4,8 +4,9 @@ from sqlalchemy.orm import Session
 from uuid import UUID
 from datetime import date
 from typing import List
+from zoneinfo import ZoneInfo
 
-from app.api.deps import get_db, get_current_company, require_admin
+from app.api.deps import get_db, get_current_company, get_company_timezone, require_admin
 from app.services.points_metrics_service import (
     get_rule_metrics,
     get_single_rule_metric,
@@ -34,8 +35,9 @@ def admin_metrics_rules(
     end_date:   date | None = Query(None),
     db:         Session = Depends(get_db),
     company     = Depends(get_current_company),
+    tz:         ZoneInfo = Depends(get_company_timezone),
 ):
-    return get_rule_metrics(db, str(company.id), start_date, end_date)
+    return get_rule_metrics(db, str(company.id), start_date, end_date, tz)
 
 @router.get("/rules/{rule_id}", response_model=RuleMetricRead, summary="Métrica única de regra")
 def admin_metric_single_rule(
@@ -44,8 +46,9 @@ def admin_metric_single_rule(
     end_date:   date | None = Query(None),
     db:         Session = Depends(get_db),
     company     = Depends(get_current_company),
+    tz:         ZoneInfo = Depends(get_company_timezone),
 ):
-    return get_single_rule_metric(db, str(company.id), str(rule_id), start_date, end_date)
+    return get_single_rule_metric(db, str(company.id), str(rule_id), start_date, end_date, tz)
 
 @router.get(
     "/rules/{rule_id}/transactions",
@@ -80,8 +83,9 @@ def admin_metrics_points(
     end_date:   date | None = Query(None),
     db:         Session = Depends(get_db),
     company     = Depends(get_current_company),
+    tz:         ZoneInfo = Depends(get_company_timezone),
 ):
-    return get_points_overview(db, str(company.id), start_date, end_date)
+    return get_points_overview(db, str(company.id), start_date, end_date, tz)
 
 @router.get("/points/chart/awarded", response_model=List[PointsByDay], summary="Pontos concedidos diários")
 def chart_points_awarded(
@@ -89,8 +93,9 @@ def chart_points_awarded(
     end_date:   date | None = Query(None),
     db:         Session = Depends(get_db),
     company     = Depends(get_current_company),
+    tz:         ZoneInfo = Depends(get_company_timezone),
 ):
-    return get_points_awarded_chart(db, str(company.id), start_date, end_date)
+    return get_points_awarded_chart(db, str(company.id), start_date, end_date, tz)
 
 @router.get("/points/chart/redeemed", response_model=List[PointsRedeemedByDay], summary="Pontos resgatados diários")
 def chart_points_redeemed(
@@ -98,8 +103,9 @@ def chart_points_redeemed(
     end_date:   date | None = Query(None),
     db:         Session = Depends(get_db),
     company     = Depends(get_current_company),
+    tz:         ZoneInfo = Depends(get_company_timezone),
 ):
-    return get_points_redeemed_chart(db, str(company.id), start_date, end_date)
+    return get_points_redeemed_chart(db, str(company.id), start_date, end_date, tz)
 
 @router.get("/points/chart/tx-users", response_model=List[TxUserStatsByDay], summary="Transações x usuários diários")
 def chart_tx_vs_users(
@@ -107,8 +113,9 @@ def chart_tx_vs_users(
     end_date:   date | None = Query(None),
     db:         Session = Depends(get_db),
     company     = Depends(get_current_company),
+    tz:         ZoneInfo = Depends(get_company_timezone),
 ):
-    return get_tx_vs_users_chart(db, str(company.id), start_date, end_date)
+    return get_tx_vs_users_chart(db, str(company.id), start_date, end_date, tz)
 
 @router.get("/points/chart/avg-per-tx", response_model=List[AvgPointsPerTxByDay], summary="Média de pontos por transação diária")
 def chart_avg_points_per_tx(
@@ -116,5 +123,6 @@ def chart_avg_points_per_tx(
     end_date:   date | None = Query(None),
     db:         Session = Depends(get_db),
     company     = Depends(get_current_company),
+    tz:         ZoneInfo = Depends(get_company_timezone),
 ):
-    return get_avg_points_per_tx_chart(db, str(company.id), start_date, end_date)
+    return get_avg_points_per_tx_chart(db, str(company.id), start_date, end_date, tz)
@@ -1,10 +1,13 @@
 # backend/app/api/v1/endpoints/purchase_metrics.py
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Response
 from datetime import date
 from typing import List
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_db, get_current_company
+from zoneinfo import ZoneInfo
+
+from app.api.deps import get_db, get_current_company, get_company_timezone
+from app.core.config import settings
 from app.services.purchase_metrics_service import (
     get_purchase_chart,
     get_purchases_per_user,
@@ -28,10 +31,14 @@ router = APIRouter(tags=["purchase_metrics"])
 def admin_metrics_purchases(
     start_date: date | None = Query(None, description="YYYY-MM-DD"),
     end_date:   date | None = Query(None, description="YYYY-MM-DD"),
+    approximate: bool | None = Query(
+        None, description="Compradores distintos aproximados (HLL); vazio = automático pelo período"
+    ),
     db:         Session = Depends(get_db),
     company     = Depends(get_current_company),
+    tz:         ZoneInfo = Depends(get_company_timezone),
 ):
-    return get_purchase_metrics(db, str(company.id), start_date, end_date)
+    return get_purchase_metrics(db, str(company.id), start_date, end_date, approximate, tz)
 
 
 @router.get(
@@ -44,8 +51,9 @@ def chart_purchases_daily(
     end_date:   date | None = Query(None),
     db:         Session = Depends(get_db),
     company     = Depends(get_current_company),
+    tz:         ZoneInfo = Depends(get_company_timezone),
 ):
-    return get_purchase_chart(db, str(company.id), start_date, end_date)
+    return get_purchase_chart(db, str(company.id), start_date, end_date, tz)
 
 @router.get(
     "/purchases/chart/by-user/count",
@@ -53,12 +61,19 @@ def chart_purchases_daily(
     summary="Total de compras por usuário"
 )
 def chart_purchases_per_user(
+    response:   Response,
     start_date: date | None = Query(None),
     end_date:   date | None = Query(None),
+    limit:      int = Query(settings.METRICS_RANKING_DEFAULT_LIMIT, ge=1, le=settings.METRICS_RANKING_MAX_LIMIT),
+    after:      str | None = Query(None, description="X-Next-Cursor da página anterior"),
     db:         Session = Depends(get_db),
     company     = Depends(get_current_company),
+    tz:         ZoneInfo = Depends(get_company_timezone),
 ):
-    return get_purchases_per_user(db, str(company.id), start_date, end_date)
+    items, next_cursor = get_purchases_per_user(db, str(company.id), start_date, end_date, limit, after, tz)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return items
 
 @router.get(
     "/purchases/chart/by-user/revenue",
@@ -66,9 +81,16 @@ def chart_purchases_per_user(
     summary="Receita por usuário"
 )
 def chart_revenue_per_user(
+    response:   Response,
     start_date: date | None = Query(None),
     end_date:   date | None = Query(None),
+    limit:      int = Query(settings.METRICS_RANKING_DEFAULT_LIMIT, ge=1, le=settings.METRICS_RANKING_MAX_LIMIT),
+    after:      str | None = Query(None, description="X-Next-Cursor da página anterior"),
     db:         Session = Depends(get_db),
     company     = Depends(get_current_company),
+    tz:         ZoneInfo = Depends(get_company_timezone),
 ):
-    return get_revenue_per_user(db, str(company.id), start_date, end_date)
+    items, next_cursor = get_revenue_per_user(db, str(company.id), start_date, end_date, limit, after, tz)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return items
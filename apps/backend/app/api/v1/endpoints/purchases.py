@@ -18,6 +18,8 @@ class PurchasePayload(BaseModel):
     product_categories: List[str] = []
     purchased_items: List[str] = []
     branch_id: str | None = None
+    lat: float | None = None  # coordenada do usuário (regra de geolocalização)
+    lng: float | None = None
     event: str | None = None
 
 @router.post("/evaluate", status_code=status.HTTP_201_CREATED)
@@ -2,16 +2,19 @@
 
 from fastapi import (
     APIRouter, Depends, UploadFile, File, Form,
-    Query, HTTPException, status, Path
+    Query, HTTPException, status, Path, Response
 )
 from sqlalchemy.orm import Session
 from uuid import UUID
+from datetime import date
 from typing import List, Optional
 
 from app.api.deps import get_db, get_current_user, require_admin
+from app.core.response_cache import cached_response
+from app.core.time_range import resolve_timezone
 from app.models.reward_category import RewardCategory
 from app.models.reward_product import RewardProduct
-from app.models.reward_order import RewardOrder, OrderStatus
+from app.models.reward_order import OrderStatus
 from app.schemas.rewards import (
     RewardCategoryCreate, RewardCategoryRead, PaginatedRewardCategory,
     RewardProductCreate, RewardProductUpdate, RewardProductRead, PaginatedRewardProduct,PaginatedRewardProductWithCategory,
@@ -22,7 +25,7 @@ from app.services.reward_service import (
     create_category, list_categories,
     update_category, delete_category,
     create_product, list_products,
-    update_product, delete_product,
+    update_product, delete_product, set_product_stock,
     create_order, list_user_orders,
     admin_list_orders, admin_update_order_status
 )
@@ -103,6 +106,7 @@ def admin_delete_category(
     response_model=PaginatedRewardCategory,
     summary="Listar categorias disponíveis (paginado)"
 )
+@cached_response("reward_catalog", model=PaginatedRewardCategory)
 def read_categories(
     skip: int = Query(0, ge=0),
     limit: int = Query(10, ge=1, le=100),
@@ -123,6 +127,7 @@ def read_categories(
     response_model=PaginatedRewardProductWithCategory,
     summary="Listar produtos de uma categoria (paginado) com dados da categoria"
 )
+@cached_response("reward_catalog", model=PaginatedRewardProductWithCategory)
 def read_products_by_category(
     category_id: UUID = Path(..., description="ID da categoria"),
     skip: int = Query(0, ge=0),
@@ -171,6 +176,7 @@ def admin_create_product(
     name: str = Form(...),
     sku: str = Form(...),
     points_cost: int = Form(...),
+    stock_qty: Optional[int] = Form(None, ge=0, description="Vazio → ilimitado"),
     short_desc: Optional[str] = Form(None),
     long_desc: Optional[str]  = Form(None),
     category_ids: str = Form("", description="IDs separados por vírgula"),
@@ -186,6 +192,7 @@ def admin_create_product(
         name=name,
         sku=sku,
         points_cost=points_cost,
+        stock_qty=stock_qty,
         short_desc=short_desc,
         long_desc=long_desc,
         category_ids=[UUID(cid) for cid in category_ids.split(",") if cid]
@@ -249,6 +256,20 @@ def admin_update_product(
     return update_product(db, product_id, payload, img_url, pdf_url)
 
 
+@router.patch(
+    "/admin/products/{product_id}/stock",
+    response_model=RewardProductRead,
+    summary="Admin: Ajustar estoque do produto"
+)
+def admin_set_product_stock(
+    product_id: UUID,
+    stock_qty: Optional[int] = Form(None, ge=0, description="Vazio → ilimitado"),
+    db: Session = Depends(get_db),
+    _admin=Depends(require_admin),
+):
+    return set_product_stock(db, product_id, stock_qty)
+
+
 @router.delete(
     "/admin/products/{product_id}",
     status_code=status.HTTP_204_NO_CONTENT,
@@ -293,6 +314,7 @@ def search_products_by_name(
     response_model=PaginatedRewardProduct,
     summary="Listar produtos disponíveis (paginado)"
 )
+@cached_response("reward_catalog", model=PaginatedRewardProduct)
 def read_products(
     skip: int = Query(0, ge=0),
     limit: int = Query(10, ge=1, le=100),
@@ -314,6 +336,7 @@ def read_products(
     response_model=RewardProductRead,
     summary="Obter detalhes de um produto por ID"
 )
+@cached_response("reward_catalog", model=RewardProductRead)
 def read_product_by_id(
     product_id: UUID = Path(..., description="ID do produto"),
     db: Session = Depends(get_db),
@@ -346,20 +369,16 @@ def make_order(
     summary="Usuário: Listar meus pedidos (paginado)"
 )
 def my_orders(
+    response: Response,
+    after: Optional[str] = Query(None, description="X-Next-Cursor da página anterior"),
     skip: int = Query(0, ge=0),
     limit: int = Query(10, ge=1, le=100),
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
-    q = db.query(RewardOrder).filter_by(user_id=str(current_user.id))
-    total = q.count()
-    items = (
-        q.order_by(RewardOrder.created_at.desc())
-         .offset(skip)
-         .limit(limit)
-         .all()
-    )
-    return {"total": total, "skip": skip, "limit": limit, "items": items}
+    page = list_user_orders(db, str(current_user.id), limit=limit, after=after, skip=skip)
+    response.headers.update(page.headers())
+    return {"total": page.total, "skip": skip, "limit": limit, "items": page.rows}
 
 
 # ─── Admin: gerenciar pedidos ──────────────────────────────────────────────────
@@ -370,23 +389,35 @@ def my_orders(
     summary="Admin: Listar pedidos (paginado)"
 )
 def admin_orders(
+    response: Response,
     status: Optional[OrderStatus] = Query(None),
+    user_id: Optional[UUID] = Query(None),
+    product_id: Optional[UUID] = Query(None, description="Pedidos com este produto"),
+    start_date: Optional[date] = Query(None, description="Criados a partir do dia (fuso de ?tz=)"),
+    end_date: Optional[date] = Query(None, description="Criados até o dia, inclusive"),
+    tz: Optional[str] = Query(None, description="Fuso IANA das datas (padrão: METRICS_DEFAULT_TIMEZONE)"),
+    after: Optional[str] = Query(None, description="X-Next-Cursor da página anterior"),
+    exact_total: bool = Query(False, description="Conta o total exato (lento em tabelas grandes)"),
     skip: int = Query(0, ge=0),
     limit: int = Query(10, ge=1, le=100),
     db: Session = Depends(get_db),
     _admin=Depends(require_admin),
 ):
-    q = db.query(RewardOrder)
-    if status is not None:
-        q = q.filter_by(status=status)
-    total = q.count()
-    items = (
-        q.order_by(RewardOrder.created_at.desc())
-         .offset(skip)
-         .limit(limit)
-         .all()
+    page = admin_list_orders(
+        db,
+        status,
+        user_id=user_id,
+        product_id=product_id,
+        start_date=start_date,
+        end_date=end_date,
+        tz=resolve_timezone(tz),
+        limit=limit,
+        after=after,
+        skip=skip,
+        exact_total=exact_total,
     )
-    return {"total": total, "skip": skip, "limit": limit, "items": items}
+    response.headers.update(page.headers())
+    return {"total": page.total, "skip": skip, "limit": limit, "items": page.rows}
 
 
 @router.post(
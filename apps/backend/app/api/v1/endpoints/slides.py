@@ -9,6 +9,7 @@ from uuid import UUID
 from typing import List, Optional
 
 from app.api.deps import get_db, require_admin, get_current_user
+from app.core.response_cache import cached_response
 from app.services.file_service import save_upload
 from app.services.slide_image_service import (
     create_slide, list_slides, get_slide,
@@ -66,6 +67,7 @@ def admin_list_slides(
     response_model=List[SlideImageRead],
     summary="Listar todos os slides ativos (usuário autenticado)"
 )
+@cached_response("slides", model=List[SlideImageRead])
 def list_active_slides(
     db: Session = Depends(get_db),
     _user = Depends(get_current_user),
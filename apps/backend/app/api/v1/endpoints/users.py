@@ -1,6 +1,6 @@
 # backend/app/api/v1/endpoints/users.py
 
-from fastapi import APIRouter, Depends, Query, status, BackgroundTasks, HTTPException
+from fastapi import APIRouter, Depends, Query, status, HTTPException
 from sqlalchemy import select
 from typing import List
 from sqlalchemy.orm import Session, selectinload, load_only
@@ -10,7 +10,7 @@ from app.api.deps import get_current_user, get_db, require_admin
 from ....services.referral_service import generate_referral_code, get_referral_code, get_companies_by_referral_code, list_companies_by_referral_code_paginated
 from jose import jwt
 from app.core.config import settings
-from app.core.email_utils import send_email
+from app.core.email_utils import queue_email
 from app.core.security import hash_password
 from app.models.company import Company
 from ....schemas.company import CompanyRead
@@ -34,7 +34,6 @@ def read_me(current_user: User = Depends(get_current_user)):
 )
 def update_me(
     payload: UserUpdate,
-    background: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
@@ -74,11 +73,12 @@ def update_me(
             # dispara novo e-mail de confirmação
             token = jwt.encode({"sub": str(user.id)}, settings.SECRET_KEY, algorithm="HS256")
             verify_url = f"{settings.FRONTEND_ORIGINS[0]}/verify?token={token}"
-            background.add_task(
-                send_email,
+            queue_email(
+                db,
                 to=new_email,
                 subject="Confirme seu novo e-mail",
                 html=f"<p>Clique <a href='{verify_url}'>aqui</a> para confirmar seu novo e-mail.</p>",
+                commit=False,
             )
 
     # 4) Se veio senha, faz hash e atualiza
@@ -182,7 +182,6 @@ def read_my_companies(
     summary="Envia solicitação de exclusão de conta do usuário"
 )
 def request_user_deletion(
-    background: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
@@ -213,9 +212,9 @@ def request_user_deletion(
     <p>Por favor, prossiga com o processo de exclusão conforme as políticas internas.</p>
     """
 
-    # 2) Envia o e-mail em background para o suporte/admin
-    background.add_task(
-        send_email,
+    # 2) Enfileira o e-mail para o suporte/admin
+    queue_email(
+        db,
         to=settings.EMAIL_FROM,
         subject=subject,
         html=html,
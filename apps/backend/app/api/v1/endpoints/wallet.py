@@ -18,9 +18,6 @@ from app.services.wallet_service import (
     debit_wallet
 )
 from uuid import UUID
-from app.services.cashback_service import (
-    expire_overdue_cashbacks
-)
 from app.models.wallet_transaction import WalletTransaction
 from app.models.credits_wallet_transaction import CreditsWalletTransaction
 
@@ -198,10 +195,7 @@ def read_wallets_summary(
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
-    # 1) expira tudo que venceu antes de resumir
-    expire_overdue_cashbacks(db)
-
-    # 2) retorna total + count
+    # cashbacks vencidos são expirados pelo job periódico `expire_cashbacks`
     user_id = str(current_user.id)
     return get_user_wallet_summary(db, user_id)
 
@@ -258,8 +252,6 @@ def read_my_company_wallet(
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
-    expire_overdue_cashbacks(db)
-
     user_id = str(current_user.id)
     w = get_user_wallet(db, user_id, company_id)
     if not w:
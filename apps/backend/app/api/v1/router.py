@@ -10,7 +10,7 @@ from .endpoints import (
     branches, inventory_items, purchases, product_categories, admin_point,
     leaderboard, rewards, points_metrics, purchase_metrics, selection_items,
     milestones, loyalty_cards, company_rewards, loyalty_metrics, digital_behavior, 
-    coupons, checkout, coupon_metrics
+    coupons, checkout, coupon_metrics, exports, payment_events
 )
 
 router = APIRouter()
@@ -55,4 +55,5 @@ router.include_router(digital_behavior.router, prefix="/digital-behavior", tags=
 router.include_router(coupons.router, prefix="/coupons", tags=["coupons"])
 router.include_router(checkout.router, prefix="/checkout", tags=["checkout"])
 router.include_router(coupon_metrics.router, prefix="/coupons/metrics", tags=["coupons:metrics"])
-
+router.include_router(exports.router, prefix="/exports", tags=["exports"])
+router.include_router(payment_events.router, prefix="/payment-events", tags=["payment_events"])
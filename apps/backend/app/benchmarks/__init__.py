@@ -0,0 +1,11 @@
+# apps/backend/app/benchmarks/__init__.py
+#
+# Suíte de benchmark de carga da API (somente Postgres/PostGIS e Redis locais).
+#
+#   1) python -m app.benchmarks.seed --scale 1 --reset
+#        gera a massa sintética determinística e grava o fixtures.json
+#   2) uvicorn app.main:app --workers 4
+#   3) python -m app.benchmarks.load --duration 30 --concurrency 32
+#        roda os cenários e grava bench-results/<commit>.json
+#   4) python -m app.benchmarks.compare bench-results/<base>.json bench-results/<head>.json
+#        compara p50/p95/p99 e throughput entre dois commits
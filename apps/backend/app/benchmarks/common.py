@@ -0,0 +1,52 @@
+# apps/backend/app/benchmarks/common.py
+#
+# Utilitários compartilhados pelos scripts de benchmark.
+
+import json
+import subprocess
+from pathlib import Path
+from urllib.parse import urlsplit
+
+BENCH_DOMAIN = "bench.clubily.local"   # e-mails da massa sintética (usado no --reset)
+BENCH_PREFIX = "Bench"                 # prefixo de nomes (categorias globais)
+
+RESULTS_DIR = Path("bench-results")
+FIXTURES_PATH = RESULTS_DIR / "fixtures.json"
+
+LOCAL_HOSTS = {"localhost", "127.0.0.1", "::1", "0.0.0.0"}
+
+
+def ensure_local(url: str, allowed: set[str] | None = None) -> None:
+    """
+    Recusa rodar contra qualquer host que não seja local: o seed apaga e
+    recria dados e a carga gera milhares de escritas.
+    """
+    host = urlsplit(str(url)).hostname or ""
+    if host not in LOCAL_HOSTS | (allowed or set()):
+        raise SystemExit(
+            f"Host não local: {host!r}. Use --allow-host {host} se for um container local."
+        )
+
+
+def git_revision() -> dict:
+    def _git(*args: str) -> str:
+        try:
+            return subprocess.check_output(("git", *args), text=True, stderr=subprocess.DEVNULL).strip()
+        except (OSError, subprocess.CalledProcessError):
+            return ""
+
+    return {
+        "commit": _git("rev-parse", "HEAD"),
+        "short": _git("rev-parse", "--short", "HEAD"),
+        "subject": _git("log", "-1", "--format=%s"),
+        "dirty": bool(_git("status", "--porcelain", "--untracked-files=no")),
+    }
+
+
+def write_json(path: Path, data: dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data, indent=2, ensure_ascii=False, default=str), encoding="utf-8")
+
+
+def read_json(path: Path) -> dict:
+    return json.loads(Path(path).read_text(encoding="utf-8"))
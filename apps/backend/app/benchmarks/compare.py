@@ -0,0 +1,89 @@
+# apps/backend/app/benchmarks/compare.py
+#
+# Uso: python -m app.benchmarks.compare BASE.json HEAD.json [--threshold 10] [--endpoints] [--fail]
+#
+# Compara dois resultados de app.benchmarks.load (ex.: main × branch).
+# Marca como regressão p95/p99 que subiram, ou throughput que caiu, mais que
+# --threshold %. Com --fail sai com código 1 se houver regressão (CI).
+
+import argparse
+import sys
+from pathlib import Path
+from .common import read_json
+
+METRICS = (
+    # (chave, maior é melhor)
+    ("p50_ms", False),
+    ("p95_ms", False),
+    ("p99_ms", False),
+    ("throughput_rps", True),
+)
+GATED = {"p95_ms", "p99_ms", "throughput_rps"}
+
+
+def _delta(base: float, head: float) -> float | None:
+    if not base:
+        return None
+    return (head - base) / base * 100
+
+
+def _row(name: str, base: dict, head: dict, threshold: float) -> tuple[str, bool]:
+    cells, regressed = [f"{name:<58}"], False
+    for key, higher_is_better in METRICS:
+        b, h = base.get(key, 0.0), head.get(key, 0.0)
+        d = _delta(b, h)
+        flag = ""
+        if d is not None:
+            worse = -d if higher_is_better else d
+            if key in GATED and worse > threshold:
+                flag, regressed = "!", True
+        pct = f"{d:+.1f}%" if d is not None else "  n/a"
+        cells.append(f"{h:>9.2f} {pct:>8}{flag:1}")
+    errors = head.get("errors", 0) - base.get("errors", 0)
+    cells.append(f"{errors:+d}" if errors else "")
+    return " ".join(cells), regressed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compara dois resultados de benchmark")
+    parser.add_argument("base", type=Path)
+    parser.add_argument("head", type=Path)
+    parser.add_argument("--threshold", type=float, default=10.0, help="% de piora tolerada")
+    parser.add_argument("--endpoints", action="store_true", help="detalha por endpoint")
+    parser.add_argument("--fail", action="store_true", help="código de saída 1 se houver regressão")
+    args = parser.parse_args()
+
+    base, head = read_json(args.base), read_json(args.head)
+    print(f"base: {base['revision']['short']} {base['revision']['subject']}")
+    print(f"head: {head['revision']['short']} {head['revision']['subject']}")
+    if base["dataset"] != head["dataset"]:
+        print("aviso: massas diferentes (seed/scale/âncora/contagens) — comparação pouco confiável")
+    if base["load"] != head["load"]:
+        print("aviso: parâmetros de carga diferentes")
+
+    header = f"{'cenário':<58} " + " ".join(f"{k:>19}" for k, _ in METRICS) + "  erros"
+    print(header)
+    regressions = []
+    for name, h in head["scenarios"].items():
+        b = base["scenarios"].get(name)
+        if b is None:
+            continue
+        line, bad = _row(name, b, h, args.threshold)
+        print(line)
+        if bad:
+            regressions.append(name)
+        if args.endpoints:
+            for label, he in h.get("endpoints", {}).items():
+                be = b.get("endpoints", {}).get(label)
+                if be:
+                    line, bad = _row(f"  {label}", be, he, args.threshold)
+                    print(line)
+
+    if regressions:
+        print(f"regressões (> {args.threshold}%): {', '.join(regressions)}")
+        if args.fail:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+# apps/backend/app/benchmarks/export_rss.py
+#
+# Uso: python -m app.benchmarks.export_rss [--rows 1000000] [--max-rss-mb 64]
+#          [--format csv|xlsx] [--yield-per 2000] [--buffered]
+#          [--output bench-results/export-rss.json]
+#
+# Exporta `rows` linhas sintéticas (generate_series no Postgres, com colunas
+# parecidas com as de coupon_usage) pelo mesmo caminho de
+# app/services/export_service.py — cursor no servidor + escrita incremental —
+# e mede o crescimento do pico de RSS do processo. Sai com código 1 se
+# passar de --max-rss-mb (uso em CI). --buffered lê tudo com .all() antes de
+# escrever, para comparação. Só lê o banco; o arquivo vai para um tmp.
+# ru_maxrss em KB: Linux.
+
+import argparse
+import resource
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from sqlalchemy import Numeric, cast, func, select, text
+from app.core.config import settings
+from app.core.time_range import resolve_timezone
+from app.db.session import SessionLocal
+from app.services import export_service
+from .common import RESULTS_DIR, git_revision, write_json
+
+COLUMNS = (
+    ("id", "id"), ("usuário", "user_id"), ("nome", "user_name"), ("valor", "amount"),
+    ("desconto", "discount_applied"), ("local", "source_location_name"), ("data", "created_at"),
+)
+
+
+def synthetic(rows: int):
+    n = func.generate_series(1, rows).table_valued("n").render_derived()
+    return select(
+        func.gen_random_uuid().label("id"),
+        func.gen_random_uuid().label("user_id"),
+        func.concat("Usuário ", n.c.n).label("user_name"),
+        cast(n.c.n % 500 + 0.99, Numeric(14, 2)).label("amount"),
+        cast(n.c.n % 50 + 0.5, Numeric(14, 2)).label("discount_applied"),
+        func.concat("Loja ", n.c.n % 37).label("source_location_name"),
+        (func.now() - n.c.n * text("interval '1 second'")).label("created_at"),
+    ).select_from(n)
+
+
+def peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def export(db, stmt, fmt: str, path: Path, buffered: bool) -> int:
+    rows = db.execute(stmt).mappings().all() if buffered else export_service.iter_rows(db, stmt)
+    if fmt == "xlsx":
+        return export_service.write_xlsx(path, rows, COLUMNS, resolve_timezone())
+    return export_service.write_csv(path, rows, COLUMNS)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="RSS de uma exportação grande")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--max-rss-mb", type=float, default=64.0, help="crescimento máximo do pico de RSS")
+    parser.add_argument("--format", choices=("csv", "xlsx"), default="csv")
+    parser.add_argument("--yield-per", type=int, help="padrão: EXPORTS_YIELD_PER")
+    parser.add_argument("--buffered", action="store_true", help="sem cursor no servidor (comparação)")
+    parser.add_argument("--output", type=Path)
+    args = parser.parse_args()
+
+    if args.format == "xlsx" and not export_service.xlsx_available():
+        raise SystemExit("openpyxl não instalado")
+    if args.yield_per:
+        settings.EXPORTS_YIELD_PER = args.yield_per
+
+    with SessionLocal() as db, tempfile.TemporaryDirectory() as tmp:
+        # aquecimento: conexão, imports e buffers entram na linha de base
+        export(db, synthetic(1000), args.format, Path(tmp) / "warmup", args.buffered)
+        db.rollback()
+        baseline = peak_rss_mb()
+
+        started = time.perf_counter()
+        path = Path(tmp) / f"export.{args.format}"
+        count = export(db, synthetic(args.rows), args.format, path, args.buffered)
+        elapsed = time.perf_counter() - started
+        size_mb = path.stat().st_size / 1024 / 1024
+
+    growth = peak_rss_mb() - baseline
+    ok = growth <= args.max_rss_mb
+    print(f"{'ok  ' if ok else 'FAIL'} {count} linhas ({args.format}, "
+          f"{'buffered' if args.buffered else f'yield_per={settings.EXPORTS_YIELD_PER}'}): "
+          f"{elapsed:.1f}s, {count / elapsed:,.0f} linhas/s, {size_mb:.1f} MB; "
+          f"pico de RSS +{growth:.1f} MB (limite {args.max_rss_mb:.0f} MB, base {baseline:.1f} MB)")
+
+    write_json(args.output or RESULTS_DIR / "export-rss.json", {
+        "revision": git_revision(),
+        "at": datetime.now(timezone.utc).isoformat(),
+        "rows": count,
+        "format": args.format,
+        "buffered": args.buffered,
+        "yield_per": settings.EXPORTS_YIELD_PER,
+        "seconds": round(elapsed, 2),
+        "file_mb": round(size_mb, 1),
+        "baseline_rss_mb": round(baseline, 1),
+        "rss_growth_mb": round(growth, 1),
+        "max_rss_mb": args.max_rss_mb,
+    })
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
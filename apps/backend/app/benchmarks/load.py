@@ -0,0 +1,162 @@
+# apps/backend/app/benchmarks/load.py
+#
+# Uso: python -m app.benchmarks.load [--base-url http://127.0.0.1:8000]
+#          [--scenario checkout --scenario dashboards ...]
+#          [--duration 30] [--warmup 5] [--concurrency 32] [--seed 1]
+#          [--output bench-results/<commit>.json]
+#
+# Gerador de carga em malha fechada: `concurrency` clientes virtuais fazem
+# requisições em sequência, cada cenário isolado por `duration` segundos
+# (após `warmup` segundos descartados). Para cada cenário e endpoint:
+# p50/p95/p99, média, máximo, throughput, erros e — lendo o Server-Timing da
+# API — tempo médio de banco e statements por requisição.
+#
+# O JSON de saída traz o commit, a massa (seed/scale/âncora) e os parâmetros
+# da carga, para ser comparado com app.benchmarks.compare.
+
+import argparse
+import asyncio
+import platform
+import random
+import re
+import time
+from collections import Counter, defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+import httpx
+from .common import FIXTURES_PATH, RESULTS_DIR, ensure_local, git_revision, read_json, write_json
+from .scenarios import SCENARIOS, Context
+
+_DB_TIMING = re.compile(r'db;dur=([\d.]+);desc="(\d+) queries')
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    # nearest-rank: estável e sem interpolação entre execuções
+    if not sorted_values:
+        return 0.0
+    rank = max(1, round(pct / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+class _Samples:
+    def __init__(self):
+        self.latencies: list[float] = []
+        self.db_ms: list[float] = []
+        self.queries: list[int] = []
+        self.errors = 0
+        self.statuses: Counter = Counter()
+
+    def summary(self, elapsed: float) -> dict:
+        lat = sorted(self.latencies)
+        n = len(lat)
+        out = {
+            "requests": n,
+            "errors": self.errors,
+            "throughput_rps": round(n / elapsed, 2) if elapsed else 0.0,
+            "p50_ms": round(percentile(lat, 50), 2),
+            "p95_ms": round(percentile(lat, 95), 2),
+            "p99_ms": round(percentile(lat, 99), 2),
+            "mean_ms": round(sum(lat) / n, 2) if n else 0.0,
+            "max_ms": round(lat[-1], 2) if n else 0.0,
+            "statuses": dict(sorted((str(k), v) for k, v in self.statuses.items())),
+        }
+        if self.db_ms:
+            out["db_mean_ms"] = round(sum(self.db_ms) / len(self.db_ms), 2)
+            out["queries_mean"] = round(sum(self.queries) / len(self.queries), 2)
+        return out
+
+
+async def _run_scenario(name: str, client: httpx.AsyncClient, ctx: Context, args) -> dict:
+    factory = SCENARIOS[name]
+    total = _Samples()
+    per_label: dict[str, _Samples] = defaultdict(_Samples)
+    loop_start = time.perf_counter()
+    measure_from = loop_start + args.warmup
+    deadline = measure_from + args.duration
+
+    async def worker(worker_id: int) -> None:
+        # rng por cliente: a sequência de requisições é a mesma a cada execução
+        rng = random.Random(f"{args.seed}:{name}:{worker_id}")
+        while True:
+            req = factory(ctx, rng)
+            headers = {"Authorization": f"Bearer {req.token}"} if req.token else None
+            start = time.perf_counter()
+            if start >= deadline:
+                return
+            try:
+                resp = await client.request(req.method, req.path, params=req.params, json=req.json, headers=headers)
+                status = resp.status_code
+                timing = _DB_TIMING.search(resp.headers.get("server-timing", ""))
+            except httpx.HTTPError:
+                status, timing = 0, None
+            end = time.perf_counter()
+            if start < measure_from:
+                continue
+            for s in (total, per_label[req.label]):
+                s.statuses[status] += 1
+                if status not in req.expected:
+                    s.errors += 1
+                    continue
+                s.latencies.append((end - start) * 1000)
+                if timing:
+                    s.db_ms.append(float(timing.group(1)))
+                    s.queries.append(int(timing.group(2)))
+
+    await asyncio.gather(*(worker(i) for i in range(args.concurrency)))
+    elapsed = min(time.perf_counter(), deadline) - measure_from
+    result = total.summary(elapsed)
+    result["endpoints"] = {label: s.summary(elapsed) for label, s in sorted(per_label.items())}
+    return result
+
+
+async def run(args) -> dict:
+    fixtures = read_json(args.fixtures)
+    ctx = Context.build(fixtures)
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    results = {}
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=args.timeout) as client:
+        for name in args.scenario or list(SCENARIOS):
+            print(f"→ {name} ({args.concurrency} clientes, {args.warmup}s aquecimento + {args.duration}s)")
+            results[name] = await _run_scenario(name, client, ctx, args)
+            r = results[name]
+            print(
+                f"  {r['requests']} req  {r['throughput_rps']} req/s  "
+                f"p50 {r['p50_ms']}ms  p95 {r['p95_ms']}ms  p99 {r['p99_ms']}ms  erros {r['errors']}"
+            )
+    return {
+        "revision": git_revision(),
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "host": {"python": platform.python_version(), "machine": platform.machine(), "node": platform.node()},
+        "dataset": {k: fixtures[k] for k in ("seed", "scale", "anchor", "counts")},
+        "load": {
+            "base_url": args.base_url, "concurrency": args.concurrency, "duration_s": args.duration,
+            "warmup_s": args.warmup, "seed": args.seed,
+        },
+        "scenarios": results,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Carga sintética contra a API local")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS))
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--warmup", type=float, default=5.0)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--fixtures", type=Path, default=FIXTURES_PATH)
+    parser.add_argument("--output", type=Path, default=None)
+    parser.add_argument("--allow-host", action="append", default=[])
+    args = parser.parse_args()
+
+    ensure_local(args.base_url, set(args.allow_host))
+    report = asyncio.run(run(args))
+    rev = report["revision"]
+    output = args.output or RESULTS_DIR / f"{rev['short'] or 'local'}{'-dirty' if rev['dirty'] else ''}.json"
+    write_json(output, report)
+    print(f"resultado em {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+# apps/backend/app/benchmarks/scenarios.py
+#
+# Cenários de carga. Cada cenário é uma função que, dado o contexto (fixtures
+# + tokens) e um random.Random, devolve a próxima requisição a ser feita.
+# O `label` agrupa as latências por endpoint dentro do cenário.
+
+import random
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Any, Callable
+from app.core.config import settings
+from app.core.security import create_access_token
+
+API = settings.API_V1_STR
+
+
+@dataclass
+class Request:
+    label: str
+    method: str
+    path: str
+    expected: tuple[int, ...] = (200,)
+    params: dict[str, Any] | None = None
+    json: Any = None
+    token: str | None = None
+
+
+@dataclass
+class Context:
+    fixtures: dict
+    company_tokens: dict[str, str] = field(default_factory=dict)
+
+    @classmethod
+    def build(cls, fixtures: dict) -> "Context":
+        # JWT emitido direto (mesma chave da API): sem login/argon2 no caminho medido
+        tokens = {c["id"]: create_access_token(c["id"]) for c in fixtures["companies"]}
+        return cls(fixtures=fixtures, company_tokens=tokens)
+
+    def company(self, rng: random.Random) -> dict:
+        # as primeiras empresas das fixtures são as mais movimentadas
+        companies = self.fixtures["companies"]
+        return companies[min(int(rng.expovariate(1 / 20)), len(companies) - 1)]
+
+    def user(self, rng: random.Random) -> str:
+        return rng.choice(self.fixtures["users"])
+
+    def period(self, days: int) -> tuple[str, str]:
+        end = date.fromisoformat(self.fixtures["anchor"])
+        return (end - timedelta(days=days)).isoformat(), end.isoformat()
+
+
+def _amount(rng: random.Random) -> float:
+    return round(min(rng.lognormvariate(4.0, 0.7), 5_000), 2)
+
+
+def checkout(ctx: Context, rng: random.Random) -> Request:
+    company = ctx.company(rng)
+    body = {
+        "user_id": ctx.user(rng),
+        "amount": _amount(rng),
+        "item_ids": rng.sample(company["items"], k=rng.randint(0, 3)),
+    }
+    if company["events"] and rng.random() < 0.2:
+        body["event"] = company["events"][0]
+    if rng.random() < 0.2:
+        body["coupon_code"] = rng.choice(company["coupons"])
+    if company["programs"] and rng.random() < 0.3:
+        body["associate_cashback"] = True
+        body["program_id"] = rng.choice(company["programs"])
+    return Request("POST /checkout/", "POST", f"{API}/checkout/", (201, 400),
+                   json=body, token=ctx.company_tokens[company["id"]])
+
+
+def purchase_evaluate(ctx: Context, rng: random.Random) -> Request:
+    company = ctx.company(rng)
+    body = {
+        "user_id": ctx.user(rng),
+        "amount": _amount(rng),
+        "purchased_items": rng.sample(company["items"], k=rng.randint(0, 3)),
+    }
+    if company["events"] and rng.random() < 0.2:
+        body["event"] = company["events"][0]
+    return Request("POST /purchases/evaluate", "POST", f"{API}/purchases/evaluate", (201,),
+                   json=body, token=ctx.company_tokens[company["id"]])
+
+
+def company_search(ctx: Context, rng: random.Random) -> Request:
+    fx = ctx.fixtures
+    params = {
+        "postal_code": rng.choice(fx["postal_codes"]),
+        "radius_km": rng.choice((2, 5, 10, 20)),
+        "page": rng.choice((1, 1, 1, 2, 3)),
+        "size": 20,
+    }
+    roll = rng.random()
+    if roll < 0.4:
+        return Request("GET /companies/search", "GET", f"{API}/companies/search", params=params)
+    if roll < 0.7:
+        params["category_id"] = rng.choice(fx["categories"])
+        return Request("GET /companies/search-by-category", "GET",
+                       f"{API}/companies/search-by-category", params=params)
+    params["name"] = rng.choice(fx["name_terms"])
+    return Request("GET /companies/search-by-name", "GET", f"{API}/companies/search-by-name", params=params)
+
+
+def stamping(ctx: Context, rng: random.Random) -> Request:
+    company = ctx.company(rng)
+    tpl = rng.choice(company["templates"])
+    user = ctx.user(rng)
+    # auto_issue + force: emite quando não há cartão ativo e ignora as regras;
+    # 400 = cartão completo/limite atingido, faz parte do fluxo normal
+    return Request(
+        "POST /loyalty/admin/templates/{tpl_id}/users/{user_id}/stamp", "POST",
+        f"{API}/loyalty/admin/templates/{tpl}/users/{user}/stamp",
+        (200, 400), params={"auto_issue": "true", "force": "true"},
+        token=ctx.company_tokens[company["id"]],
+    )
+
+
+_DASHBOARDS = [
+    # (path, estilo dos parâmetros de período)
+    ("/purchase_metrics/purchases", "start"),
+    ("/purchase_metrics/purchases/chart/daily", "start"),
+    ("/purchase_metrics/purchases/chart/by-user/revenue", "start"),
+    ("/points_metrics/points", "start"),
+    ("/points_metrics/points/chart/awarded", "start"),
+    ("/points_metrics/rules", "start"),
+    ("/cashback-metrics/summary", "start"),
+    ("/cashback-metrics/charts", "start"),
+    ("/coupons/metrics/summary", "from"),
+    ("/coupons/metrics/timeseries", "from"),
+    ("/loyalty_metrics/admin/metrics/summary", "from"),
+    ("/loyalty_metrics/admin/metrics/charts", "from"),
+]
+
+
+def dashboards(ctx: Context, rng: random.Random) -> Request:
+    company = ctx.company(rng)
+    path, style = rng.choice(_DASHBOARDS)
+    start, end = ctx.period(rng.choice((7, 30, 90)))
+    params = {"start_date": start, "end_date": end} if style == "start" else {"date_from": start, "date_to": end}
+    return Request(f"GET {path}", "GET", f"{API}{path}", params=params,
+                   token=ctx.company_tokens[company["id"]])
+
+
+SCENARIOS: dict[str, Callable[[Context, random.Random], Request]] = {
+    "checkout": checkout,
+    "purchase_evaluate": purchase_evaluate,
+    "company_search": company_search,
+    "stamping": stamping,
+    "dashboards": dashboards,
+}
@@ -0,0 +1,482 @@
+# apps/backend/app/benchmarks/seed.py
+#
+# Uso: python -m app.benchmarks.seed [--scale 1] [--seed 42] [--anchor AAAA-MM-DD] [--reset]
+#
+# Gera uma massa sintética determinística em escala de produção:
+# empresas (com localização PostGIS), usuários, compras, transações de pontos,
+# cashbacks, cupons e resgates, cartões fidelidade com carimbos e prêmios.
+#
+# - mesmo --seed e --scale ⇒ mesmos ids, nomes, valores e distribuições;
+#   as datas são relativas a --anchor (padrão: hoje), então duas cargas com a
+#   mesma âncora são idênticas
+# - tudo é marcado com e-mails @bench.clubily.local; --reset apaga a massa
+#   anterior (cascade) antes de gerar
+# - grava bench-results/fixtures.json com os ids usados pelos cenários de carga
+#   e pré-carrega o cache de geocode dos CEPs usados nas buscas (sem rede)
+
+import argparse
+import math
+import random
+import time
+import uuid
+from datetime import date, datetime, time as dtime, timedelta, timezone
+from decimal import Decimal
+from sqlalchemy import bindparam, create_engine, delete, select
+from app.core import redis_client
+from app.core.config import settings
+from app.core.password_hashing import hash_password
+from app.models.association import company_categories
+from app.models.cashback import Cashback
+from app.models.cashback_program import CashbackProgram
+from app.models.category import Category
+from app.models.company import Company
+from app.models.coupon import Coupon, DiscountType
+from app.models.coupon_redemption import CouponRedemption
+from app.models.inventory_item import InventoryItem
+from app.models.loyalty_card import (
+    LoyaltyCardInstance, LoyaltyCardRule, LoyaltyCardStamp, LoyaltyCardTemplate, RuleType as CardRuleType,
+)
+from app.models.points_rule import PointsRule, RuleType
+from app.models.points_wallet import PointsWallet
+from app.models.product_category import ProductCategory, inventory_item_categories
+from app.models.purchase_log import PurchaseLog
+from app.models.reward import CompanyReward, RewardRedemptionCode, TemplateRewardLink
+from app.models.user import Role, User
+from app.models.user_points_stats import UserPointsStats
+from app.models.user_points_transaction import UserPointsTransaction, UserPointsTxType
+from app.models.user_points_wallet import UserPointsWallet
+from app.models.wallet import UserCashbackWallet, Wallet
+from .common import BENCH_DOMAIN, BENCH_PREFIX, FIXTURES_PATH, ensure_local, write_json
+
+BATCH = 5_000
+
+# volumes com --scale 1
+BASE = {
+    "companies": 500,
+    "users": 20_000,
+    "purchases": 200_000,
+    "card_instances": 30_000,
+}
+
+# centros urbanos usados para espalhar as empresas (CEP, lat, lon, cidade, UF)
+CITIES = [
+    ("01310100", -23.5614, -46.6559, "São Paulo", "SP"),
+    ("20040002", -22.9035, -43.1780, "Rio de Janeiro", "RJ"),
+    ("30130010", -19.9191, -43.9386, "Belo Horizonte", "MG"),
+    ("80020310", -25.4296, -49.2713, "Curitiba", "PR"),
+    ("90010150", -30.0277, -51.2287, "Porto Alegre", "RS"),
+]
+
+CATEGORY_NAMES = [
+    "Restaurantes", "Cafeterias", "Mercados", "Farmácias", "Academias", "Beleza",
+    "Pet shops", "Moda", "Livrarias", "Eletrônicos", "Padarias", "Serviços",
+]
+NAME_WORDS = [
+    "Sabor", "Ponto", "Casa", "Bom", "Nova", "Central", "Vila", "Prime", "Doce",
+    "Bella", "Real", "Express", "Mix", "Top", "Garden", "Urbano",
+]
+EVENTS = ["app_checkin", "review", "birthday"]
+
+
+class Generator:
+    """
+    Todos os valores aleatórios saem de um único random.Random(seed), na mesma
+    ordem a cada execução — por isso a massa é reproduzível.
+    """
+
+    def __init__(self, seed: int, scale: float, anchor: date):
+        self.rng = random.Random(seed)
+        self.scale = scale
+        self.anchor = datetime.combine(anchor, dtime(12, 0), tzinfo=timezone.utc)
+        self.counts = {k: max(1, int(v * scale)) for k, v in BASE.items()}
+
+    # ───────────── helpers ─────────────
+
+    def uuid(self) -> uuid.UUID:
+        return uuid.UUID(int=self.rng.getrandbits(128), version=4)
+
+    def past(self, days: int) -> datetime:
+        # horário com pico no almoço e no fim da tarde
+        day = self.rng.randrange(days)
+        hour = self.rng.choice((8, 10, 11, 12, 12, 13, 13, 15, 17, 18, 18, 19, 20))
+        return (self.anchor - timedelta(days=day)).replace(
+            hour=hour, minute=self.rng.randrange(60), second=self.rng.randrange(60)
+        )
+
+    def amount(self) -> Decimal:
+        # ticket médio ~R$ 60, cauda longa
+        return Decimal(str(round(min(self.rng.lognormvariate(4.0, 0.7), 5_000), 2)))
+
+    def point_near(self, lat: float, lon: float, km: float) -> tuple[float, float]:
+        d_lat = self.rng.gauss(0, km) / 111.0
+        d_lon = self.rng.gauss(0, km) / (111.0 * math.cos(math.radians(lat)))
+        return round(lat + d_lat, 6), round(lon + d_lon, 6)
+
+    def zipf_weights(self, n: int, s: float = 0.8) -> list[float]:
+        # poucas empresas concentram a maior parte do movimento
+        return [1 / (rank ** s) for rank in range(1, n + 1)]
+
+
+def _insert(conn, table, rows: list[dict]) -> None:
+    for i in range(0, len(rows), BATCH):
+        conn.execute(table.insert(), rows[i:i + BATCH])
+
+
+class _Buffer:
+    """Acumula linhas por tabela e descarrega em lotes (memória constante)."""
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.rows: dict = {}
+        self.totals: dict[str, int] = {}
+
+    def add(self, table, row: dict) -> None:
+        bucket = self.rows.setdefault(table, [])
+        bucket.append(row)
+        if len(bucket) >= BATCH:
+            self.flush(table)
+
+    def flush(self, table=None) -> None:
+        for t in ([table] if table is not None else list(self.rows)):
+            bucket = self.rows.get(t)
+            if bucket:
+                self.conn.execute(t.insert(), bucket)
+                self.totals[t.name] = self.totals.get(t.name, 0) + len(bucket)
+                bucket.clear()
+
+
+def reset(conn) -> None:
+    like = f"%@{BENCH_DOMAIN}"
+    conn.execute(delete(Company.__table__).where(Company.email.like(like)))
+    conn.execute(delete(User.__table__).where(User.email.like(like)))
+    conn.execute(delete(Category.__table__).where(Category.name.like(f"{BENCH_PREFIX} · %")))
+
+
+def generate(conn, gen: Generator) -> dict:
+    rng = gen.rng
+    buf = _Buffer(conn)
+    password = hash_password("bench-password")
+    now = gen.anchor
+
+    # ───────────── categorias globais ─────────────
+    categories = [{"id": gen.uuid(), "name": f"{BENCH_PREFIX} · {n}", "commission_percent": Decimal("5.00")}
+                  for n in CATEGORY_NAMES]
+    _insert(conn, Category.__table__, categories)
+
+    # ───────────── empresas ─────────────
+    companies = []
+    for i in range(gen.counts["companies"]):
+        cep, lat, lon, city, state = rng.choice(CITIES)
+        roll = rng.random()
+        only_online = roll < 0.1
+        is_active = roll < 0.9
+        p_lat, p_lon = gen.point_near(lat, lon, km=8)
+        name = f"{rng.choice(NAME_WORDS)} {rng.choice(NAME_WORDS)} {i:05d}"
+        companies.append({
+            "id": gen.uuid(), "name": name, "email": f"company{i}@{BENCH_DOMAIN}",
+            "hashed_password": password, "phone": f"+55900{i:08d}", "cnpj": f"99{i:012d}",
+            "street": "Rua Benchmark", "number": str(i), "neighborhood": "Centro",
+            "city": city, "state": state, "postal_code": cep,
+            "only_online": only_online, "online_url": f"https://{i}.{BENCH_DOMAIN}" if only_online else None,
+            "accepted_terms": True, "is_active": is_active,
+            "email_verified_at": now, "phone_verified_at": now,
+            "created_at": gen.past(720),
+            "location": None if only_online else f"SRID=4326;POINT({p_lon} {p_lat})",
+            "primary_category_id": rng.choice(categories)["id"],
+        })
+    _insert(conn, Company.__table__, companies)
+
+    links = []
+    for c in companies:
+        for cat in rng.sample(categories, k=rng.randint(1, 3)):
+            links.append({"company_id": c["id"], "category_id": cat["id"]})
+    _insert(conn, company_categories, links)
+
+    # carteiras com saldo de sobra: as regras de pontos debitam taxa e reserva
+    _insert(conn, Wallet.__table__, [
+        {"id": gen.uuid(), "company_id": c["id"], "balance": Decimal("100000000.00")} for c in companies
+    ])
+    _insert(conn, PointsWallet.__table__, [
+        {"id": gen.uuid(), "company_id": c["id"], "balance": Decimal("1000000000")} for c in companies
+    ])
+
+    # ───────────── catálogo, regras, programas, cupons e cartões por empresa ─────────────
+    per_company: dict = {}
+    for c in companies:
+        cid = c["id"]
+        info = per_company[cid] = {"items": [], "rules": [], "programs": [], "coupons": [], "templates": []}
+
+        cats = []
+        for j in range(4):
+            pc = {"id": gen.uuid(), "company_id": cid, "name": f"Categoria {j}", "slug": f"categoria-{j}"}
+            buf.add(ProductCategory.__table__, pc)
+            cats.append(pc["id"])
+        for j in range(20):
+            item = {"id": gen.uuid(), "company_id": cid, "sku": f"SKU-{j:04d}",
+                    "name": f"Produto {j}", "price": gen.amount()}
+            buf.add(InventoryItem.__table__, item)
+            buf.add(inventory_item_categories, {"inventory_item_id": item["id"], "category_id": rng.choice(cats)})
+            info["items"].append(item["id"])
+
+        rules = [
+            (RuleType.value_spent, {"step": 10, "points": rng.randint(1, 5)}),
+            (RuleType.event, {"event_name": rng.choice(EVENTS), "points": 20}),
+            (RuleType.frequency, {"window_days": 30, "threshold": 5, "bonus_points": 50}),
+        ]
+        for rule_type, cfg in rules:
+            rule = {"id": gen.uuid(), "company_id": cid, "name": f"Regra {rule_type.value}",
+                    "rule_type": rule_type, "config": cfg, "active": True, "visible": True}
+            buf.add(PointsRule.__table__, rule)
+            info["rules"].append((rule["id"], rule_type, cfg))
+
+        for j in range(rng.randint(1, 2)):
+            prog = {"id": gen.uuid(), "company_id": cid, "name": f"Cashback {j}",
+                    "description": "Programa sintético", "percent": Decimal(rng.choice(("2.00", "5.00", "10.00"))),
+                    "validity_days": 90, "is_active": True, "is_visible": True}
+            buf.add(CashbackProgram.__table__, prog)
+            info["programs"].append((prog["id"], prog["percent"]))
+
+        for j in range(3):
+            percent = rng.random() < 0.7
+            coupon = {"id": gen.uuid(), "company_id": cid, "name": f"Cupom {j}",
+                      "code": f"BENCH{j}{rng.randrange(10_000):04d}", "is_active": True, "is_visible": True,
+                      "discount_type": DiscountType.percent if percent else DiscountType.fixed,
+                      "discount_value": Decimal("10.00") if percent else Decimal("5.00"),
+                      "min_order_amount": None, "usage_limit_total": None, "usage_limit_per_user": None,
+                      "created_at": gen.past(365)}
+            buf.add(Coupon.__table__, coupon)
+            info["coupons"].append((coupon["id"], coupon["code"], percent))
+
+        for j in range(rng.randint(1, 2)):
+            stamp_total = rng.choice((5, 8, 10))
+            tpl = {"id": gen.uuid(), "company_id": cid, "title": f"Cartão {j}", "stamp_total": stamp_total,
+                   # limite alto para o cenário de carimbo poder reemitir cartões
+                   "per_user_limit": 1_000, "active": True, "created_at": gen.past(365)}
+            buf.add(LoyaltyCardTemplate.__table__, tpl)
+            buf.add(LoyaltyCardRule.__table__, {"id": gen.uuid(), "template_id": tpl["id"], "order": 0,
+                                                "rule_type": CardRuleType.visit, "config": {"visits": 1},
+                                                "active": True})
+            reward = {"id": gen.uuid(), "company_id": cid, "name": f"Prêmio {j}", "secret": False, "stock_qty": None}
+            buf.add(CompanyReward.__table__, reward)
+            link = {"id": gen.uuid(), "template_id": tpl["id"], "reward_id": reward["id"], "stamp_no": stamp_total}
+            buf.add(TemplateRewardLink.__table__, link)
+            info["templates"].append((tpl["id"], stamp_total, link["id"]))
+    buf.flush()
+
+    # ───────────── usuários ─────────────
+    users = []
+    for i in range(gen.counts["users"]):
+        users.append({
+            "id": gen.uuid(), "name": f"Usuário {i}", "email": f"user{i}@{BENCH_DOMAIN}",
+            "hashed_password": password, "cpf": f"9{i:010d}", "phone": f"+55800{i:08d}",
+            "is_active": True, "role": Role.user, "accepted_terms": True, "pre_registered": False,
+            "email_verified_at": now, "created_at": gen.past(720),
+        })
+    _insert(conn, User.__table__, users)
+    user_ids = [u["id"] for u in users]
+
+    wallets = {uid: gen.uuid() for uid in user_ids}
+    _insert(conn, UserPointsWallet.__table__, [
+        {"id": wid, "user_id": uid, "balance": 0} for uid, wid in wallets.items()
+    ])
+
+    # ───────────── compras + pontos + cashback + cupons ─────────────
+    active = [c for c in companies if c["is_active"]]
+    weights = gen.zipf_weights(len(active))
+    balances: dict = {}
+    cashback_wallets: dict = {}
+
+    for _ in range(gen.counts["purchases"]):
+        company = rng.choices(active, weights)[0]
+        cid = company["id"]
+        info = per_company[cid]
+        uid = rng.choice(user_ids)
+        created = gen.past(365)
+        amount = gen.amount()
+        items = rng.sample(info["items"], k=rng.randint(0, 3))
+        buf.add(PurchaseLog.__table__, {"id": gen.uuid(), "user_id": uid, "company_id": cid, "amount": amount,
+                                         "item_ids": [str(x) for x in items], "created_at": created})
+
+        if rng.random() < 0.6:
+            rule_id, _, cfg = info["rules"][0]
+            pts = int(amount // 10) * cfg["points"]
+            if pts:
+                buf.add(UserPointsTransaction.__table__, {
+                    "id": gen.uuid(), "wallet_id": wallets[uid], "user_id": uid, "company_id": cid,
+                    "rule_id": rule_id, "type": UserPointsTxType.award, "amount": pts,
+                    "description": "Regra value_spent", "created_at": created,
+                })
+                balances[uid] = balances.get(uid, 0) + pts
+
+        if rng.random() < 0.2:
+            program_id, percent = rng.choice(info["programs"])
+            value = (amount * percent / 100).quantize(Decimal("0.01"))
+            buf.add(Cashback.__table__, {
+                "id": gen.uuid(), "user_id": uid, "program_id": program_id, "amount_spent": amount,
+                "cashback_value": value, "assigned_at": created, "expires_at": created + timedelta(days=90),
+                "is_active": created + timedelta(days=90) > now, "created_at": created,
+            })
+            cashback_wallets[(uid, cid)] = cashback_wallets.get((uid, cid), Decimal("0")) + value
+
+        if rng.random() < 0.05:
+            coupon_id, _, percent = rng.choice(info["coupons"])
+            discount = (amount * Decimal("0.10")).quantize(Decimal("0.01")) if percent else min(Decimal("5.00"), amount)
+            lat, lon = (None, None)
+            if company["location"]:
+                _, c_lat, c_lon, _, _ = next(x for x in CITIES if x[3] == company["city"])
+                lat, lon = gen.point_near(c_lat, c_lon, km=3)
+            buf.add(CouponRedemption.__table__, {
+                "id": gen.uuid(), "coupon_id": coupon_id, "user_id": uid, "company_id": cid,
+                "amount": amount, "discount_applied": discount, "item_ids": [str(x) for x in items],
+                "source_location_name": "Loja" if lat is not None else None,
+                "redemption_location": f"SRID=4326;POINT({lon} {lat})" if lat is not None else None,
+                "created_at": created,
+            })
+
+    # resgates de pontos (~10% do saldo de parte dos usuários)
+    for uid, bal in list(balances.items()):
+        if bal >= 100 and rng.random() < 0.3:
+            spent = bal // 10
+            buf.add(UserPointsTransaction.__table__, {
+                "id": gen.uuid(), "wallet_id": wallets[uid], "user_id": uid, "company_id": None,
+                "rule_id": None, "type": UserPointsTxType.redeem, "amount": -spent,
+                "description": "Resgate sintético", "created_at": gen.past(90),
+            })
+            balances[uid] = bal - spent
+    buf.flush()
+
+    for (uid, cid), value in cashback_wallets.items():
+        buf.add(UserCashbackWallet.__table__, {"id": gen.uuid(), "user_id": uid, "company_id": cid, "balance": value})
+    for uid, bal in balances.items():
+        buf.add(UserPointsStats.__table__, {"id": gen.uuid(), "user_id": uid, "lifetime_points": bal,
+                                            "today_points": 0, "month_points": 0})
+    buf.flush()
+    wallet_table = UserPointsWallet.__table__
+    balance_rows = [{"wid": wallets[uid], "bal": bal} for uid, bal in balances.items()]
+    for i in range(0, len(balance_rows), BATCH):
+        conn.execute(
+            wallet_table.update()
+            .where(wallet_table.c.id == bindparam("wid"))
+            .values(balance=bindparam("bal")),
+            balance_rows[i:i + BATCH],
+        )
+
+    # ───────────── cartões fidelidade ─────────────
+    seen: set = set()
+    for _ in range(gen.counts["card_instances"]):
+        company = rng.choices(active, weights)[0]
+        tpl_id, stamp_total, link_id = rng.choice(per_company[company["id"]]["templates"])
+        uid = rng.choice(user_ids)
+        if (tpl_id, uid) in seen:  # uq_template_user
+            continue
+        seen.add((tpl_id, uid))
+        issued = gen.past(365)
+        stamps = rng.randint(0, stamp_total)
+        completed = stamps == stamp_total
+        inst_id = gen.uuid()
+        given = issued
+        for n in range(1, stamps + 1):
+            given = given + timedelta(days=rng.randint(1, 10), minutes=rng.randrange(600))
+            buf.add(LoyaltyCardStamp.__table__, {"id": gen.uuid(), "instance_id": inst_id, "stamp_no": n,
+                                                 "given_by_id": None, "given_at": given})
+        buf.add(LoyaltyCardInstance.__table__, {
+            "id": inst_id, "template_id": tpl_id, "user_id": uid, "issued_at": issued,
+            "expires_at": issued + timedelta(days=365), "stamps_given": stamps,
+            "completed_at": given if completed else None, "reward_claimed": completed and rng.random() < 0.5,
+        })
+        if completed:
+            buf.add(RewardRedemptionCode.__table__, {
+                "id": gen.uuid(), "link_id": link_id, "instance_id": inst_id,
+                "code": f"{rng.getrandbits(48):012X}", "expires_at": given + timedelta(days=30),
+                "used": rng.random() < 0.6,
+            })
+    buf.flush()
+
+    counts = {
+        "categories": len(categories), "companies": len(companies), "users": len(users),
+        **buf.totals,
+    }
+    return {"companies": companies, "per_company": per_company, "users": user_ids,
+            "categories": categories, "counts": counts}
+
+
+def build_fixtures(gen: Generator, data: dict, seed: int) -> dict:
+    """
+    Subconjunto estável dos ids gerados, consumido pelos cenários de carga.
+    """
+    rng = random.Random(seed + 1)
+    active = [c for c in data["companies"] if c["is_active"]]
+    # as primeiras empresas são as mais movimentadas (pesos zipf)
+    sample = active[:200]
+    return {
+        "seed": seed,
+        "scale": gen.scale,
+        "anchor": gen.anchor.date().isoformat(),
+        "counts": data["counts"],
+        "postal_codes": [c[0] for c in CITIES],
+        "categories": [str(c["id"]) for c in data["categories"]],
+        "name_terms": sorted(NAME_WORDS),
+        "users": [str(u) for u in rng.sample(data["users"], k=min(5_000, len(data["users"])))],
+        "companies": [
+            {
+                "id": str(c["id"]),
+                "items": [str(x) for x in data["per_company"][c["id"]]["items"]],
+                "events": [cfg["event_name"] for _, t, cfg in data["per_company"][c["id"]]["rules"]
+                           if t == RuleType.event],
+                "coupons": [code for _, code, _ in data["per_company"][c["id"]]["coupons"]],
+                "programs": [str(p) for p, _ in data["per_company"][c["id"]]["programs"]],
+                "templates": [str(t) for t, _, _ in data["per_company"][c["id"]]["templates"]],
+            }
+            for c in sample
+        ],
+    }
+
+
+def warm_geocode_cache() -> None:
+    # mesma chave do GeocodeService: as buscas por CEP não saem para a rede
+    if not redis_client.set_many(
+        {f"geocode:{cep}": f"{lat},{lon}" for cep, lat, lon, _, _ in CITIES},
+        ex=60 * 60 * 24 * 30,
+    ):
+        raise SystemExit("Redis indisponível: cache de geocode não aquecido")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Gera a massa sintética do benchmark")
+    parser.add_argument("--scale", type=float, default=1.0)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--anchor", type=date.fromisoformat, default=date.today(),
+                        help="data de referência das séries (AAAA-MM-DD)")
+    parser.add_argument("--reset", action="store_true", help="apaga a massa sintética anterior")
+    parser.add_argument("--allow-host", action="append", default=[])
+    args = parser.parse_args()
+
+    allowed = set(args.allow_host)
+    ensure_local(settings.DATABASE_URI, allowed)
+    ensure_local(settings.REDIS_URL, allowed)
+
+    engine = create_engine(str(settings.DATABASE_URI))
+    gen = Generator(args.seed, args.scale, args.anchor)
+    start = time.perf_counter()
+    with engine.begin() as conn:
+        exists = conn.execute(
+            select(User.id).where(User.email.like(f"%@{BENCH_DOMAIN}")).limit(1)
+        ).first()
+        if exists and not args.reset:
+            raise SystemExit("Já existe massa sintética no banco; rode com --reset.")
+        if args.reset:
+            reset(conn)
+        data = generate(conn, gen)
+
+    warm_geocode_cache()
+    fixtures = build_fixtures(gen, data, args.seed)
+    write_json(FIXTURES_PATH, fixtures)
+
+    print(f"massa gerada em {time.perf_counter() - start:.1f}s (seed={args.seed}, scale={args.scale})")
+    for table, n in sorted(data["counts"].items()):
+        print(f"  {table:<28} {n:>10}")
+    print(f"fixtures em {FIXTURES_PATH}")
+
+
+if __name__ == "__main__":
+    main()
@@ -32,6 +32,12 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60
     COOKIE_NAME: str = "access_token"
 
+    # Password hashing (argon2)
+    ARGON2_TIME_COST: int = 3
+    ARGON2_MEMORY_COST: int = 65536  # KiB por hash
+    ARGON2_PARALLELISM: int = 4
+    PASSWORD_HASH_WORKERS: int = 2  # 0 = hash inline, sem pool de processos
+
     # Crypto
     FERNET_KEY: str  # 32-byte base64 URL-safe key
 
@@ -41,6 +47,82 @@ class Settings(BaseSettings):
     SMTP_USER: EmailStr
     SMTP_PASSWORD: str
     EMAIL_FROM: EmailStr
+    SMTP_STARTTLS: bool = True  # False para o sink local (app/scripts/smtp_sink.py)
+    SMTP_TIMEOUT_SECONDS: float = 30.0
+
+    # Fila de e-mails (app/workers/email_worker.py)
+    EMAIL_SMTP_POOL_SIZE: int = 4
+    EMAIL_QUEUE_BATCH_SIZE: int = 50
+    EMAIL_QUEUE_POLL_SECONDS: float = 2.0
+    EMAIL_MAX_ATTEMPTS: int = 5
+    EMAIL_RETRY_BASE_SECONDS: int = 30
+    EMAIL_RETRY_MAX_SECONDS: int = 3600
+
+    # Jobs em background (app/workers/job_worker.py)
+    JOB_WORKER_THREADS: int = 8
+    JOB_POLL_SECONDS: float = 1.0
+    JOB_MAX_ATTEMPTS: int = 5
+    JOB_RETRY_BASE_SECONDS: int = 15
+    JOB_RETRY_MAX_SECONDS: int = 1800
+    JOB_STALE_SECONDS: int = 900  # job `running` há mais tempo que isso volta para a fila
+
+    # Uploads (app/services/file_service.py e image_service.py)
+    UPLOAD_MAX_BYTES: int = 10 * 1024 * 1024
+    UPLOAD_CHUNK_SIZE: int = 64 * 1024
+    IMAGE_WORKERS: int = 2
+    IMAGE_QUALITY: int = 80
+    IMAGE_AVIF_ENABLED: bool = True  # só vale se o Pillow tiver encoder AVIF
+
+    # Cache de respostas (app/core/response_cache.py)
+    RESPONSE_CACHE_ENABLED: bool = True
+    RESPONSE_CACHE_TTL_SECONDS: int = 3600
+    RESPONSE_CACHE_LRU_SIZE: int = 512
+
+    # Limiares de marcos em memória (app/services/milestone_service.py);
+    # validade usada só quando o Redis (versão "milestones") está fora
+    MILESTONE_CACHE_TTL_SECONDS: int = 60
+
+    # Regras digital_behavior por slug (app/services/digital_rule_cache.py)
+    DIGITAL_RULE_LOCAL_TTL_SECONDS: int = 5
+    DIGITAL_RULE_CACHE_TTL_SECONDS: int = 300
+    DIGITAL_RULE_LRU_SIZE: int = 2048
+    # POST /digital-behavior/events
+    DIGITAL_EVENTS_MAX_BATCH: int = 500
+
+    # Dashboards de métricas (app/services/metrics_query.py e app/core/time_range.py)
+    METRICS_DEFAULT_TIMEZONE: str = "America/Sao_Paulo"  # empresas sem fuso cadastrado
+    METRICS_APPROX_DISTINCT_MIN_DAYS: int = 0  # períodos >= N dias usam HLL (0 desliga)
+    METRICS_RANKING_DEFAULT_LIMIT: int = 100
+    METRICS_RANKING_MAX_LIMIT: int = 1000
+
+    # Listagens administrativas (app/services/listing.py): com filtros e sem
+    # ?exact_total=true, o total é contado só até este limite
+    ADMIN_LIST_COUNT_CAP: int = 10000
+
+    # Exportações CSV/XLSX (app/services/export_service.py)
+    EXPORTS_DIR: str = "exports"  # fora de app/static: download só pelo token
+    EXPORTS_STREAM_MAX_ROWS: int = 50_000  # acima disso (modo auto) vira job
+    EXPORTS_YIELD_PER: int = 2000
+    EXPORTS_TTL_HOURS: int = 24
+    EXPORTS_CSV_DELIMITER: str = ";"  # Excel em pt-BR
+
+    # Regra de geolocalização: raio em torno do ponto da filial quando nem a
+    # regra (config.radius_m) nem a filial (polígono) definem a área
+    GEOFENCE_DEFAULT_RADIUS_M: float = 150.0
+
+    # Status de cobranças em tempo real (app/services/payment_events.py)
+    PAYMENT_EVENTS_HEARTBEAT_SECONDS: int = 15  # comentário SSE para proxies não fecharem a conexão
+    PAYMENT_LONG_POLL_MAX_SECONDS: int = 30     # ?wait= máximo dos GET de status
+    PAYMENT_LONG_POLL_RECHECK_SECONDS: int = 10  # releitura do banco durante o long-poll (Redis fora)
+
+    # Serialização (app/core/serialization.py): valida as linhas "trusted" contra o schema
+    TRUSTED_ROWS_VALIDATE: bool = False
+
+    # Instrumentação (app/core/instrumentation.py)
+    INSTRUMENTATION_ENABLED: bool = True
+    SERVER_TIMING_ENABLED: bool = True
+    SLOW_QUERY_MS: float = 200.0
+    METRICS_TOKEN: str | None = None  # se definido, /metrics exige "Authorization: Bearer <token>"
 
     # CORS
     FRONTEND_ORIGINS: list[str]
@@ -58,10 +140,19 @@ class Settings(BaseSettings):
 
     ASAAS_API_KEY: str
     ASAAS_BASE_URL: str
+    ASAAS_WEBHOOK_TOKEN: str | None = None  # header asaas-access-token configurado no webhook
+    ASAAS_MAX_CONNECTIONS: int = 20
 
     NOMINATIM_URL: str
     NOMINATIM_USER_AGENT: str
     REDIS_URL: str
+    # Pool compartilhado (app/core/redis_client.py)
+    REDIS_MAX_CONNECTIONS: int = 50
+    REDIS_POOL_TIMEOUT_SECONDS: float = 1.0  # espera por conexão livre com o pool cheio
+    REDIS_SOCKET_TIMEOUT_SECONDS: float = 0.5
+    REDIS_CONNECT_TIMEOUT_SECONDS: float = 0.5
+    REDIS_HEALTH_CHECK_INTERVAL_SECONDS: int = 30
+    REDIS_RETRY_AFTER_SECONDS: float = 5.0  # sem Redis, tempo até tentar de novo
 
     GOOGLE_MAPS_API_KEY: str
 
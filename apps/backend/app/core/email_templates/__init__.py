@@ -1,5 +1,5 @@
 from pathlib import Path
-from jinja2 import Environment, FileSystemLoader, select_autoescape
+from jinja2 import Environment, FileSystemLoader, Template, select_autoescape
 
 # caminho: .../app/core/email_templates
 templates_dir = Path(__file__).parent
@@ -9,11 +9,26 @@ env = Environment(
     autoescape=select_autoescape(["html", "xml"]),
     trim_blocks=True,
     lstrip_blocks=True,
+    auto_reload=False,  # templates não mudam em runtime; evita stat() a cada render
 )
 
+# templates já compilados, indexados pelo nome do arquivo
+_compiled: dict[str, Template] = {}
+
+def precompile_templates() -> dict[str, Template]:
+    """
+    Compila todos os templates .html do diretório de uma vez.
+    O worker de e-mail chama isso no startup.
+    """
+    for path in templates_dir.glob("*.html"):
+        _compiled[path.name] = env.get_template(path.name)
+    return _compiled
+
 def render_template(name: str, **context) -> str:
     """
     Renderiza um template HTML Jinja2 com o contexto fornecido.
     """
-    template = env.get_template(name)
+    template = _compiled.get(name)
+    if template is None:
+        template = _compiled[name] = env.get_template(name)
     return template.render(**context)
@@ -1,23 +1,142 @@
 # backend/app/core/email_utils.py
 
 import smtplib, ssl
+import threading
+import queue
+from contextlib import contextmanager
 from email.message import EmailMessage
+from sqlalchemy.orm import Session
 from ..core.config import settings
 from .email_templates import render_template
 
-def send_email(to: str, subject: str, html: str):
+
+def build_message(to: str, subject: str, html: str) -> EmailMessage:
     msg = EmailMessage()
     msg["Subject"] = subject
     msg["From"] = settings.EMAIL_FROM
     msg["To"] = to
     msg.set_content(html, subtype="html")
+    return msg
+
+
+class SMTPConnectionPool:
+    """
+    Mantém até `size` sessões SMTP já com STARTTLS + login feitos,
+    reaproveitadas entre envios. Sessões que caíram são recriadas.
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+        self._idle: queue.LifoQueue[smtplib.SMTP] = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+
+    def _connect(self) -> smtplib.SMTP:
+        server = smtplib.SMTP(settings.SMTP_HOST, settings.SMTP_PORT, timeout=settings.SMTP_TIMEOUT_SECONDS)
+        if settings.SMTP_STARTTLS:
+            server.starttls(context=ssl.create_default_context())
+        if settings.SMTP_PASSWORD:
+            server.login(settings.SMTP_USER, settings.SMTP_PASSWORD)
+        return server
+
+    @staticmethod
+    def _is_alive(server: smtplib.SMTP) -> bool:
+        try:
+            return server.noop()[0] == 250
+        except smtplib.SMTPException:
+            return False
+        except OSError:
+            return False
+
+    @contextmanager
+    def connection(self):
+        self._slots.acquire()
+        server = None
+        try:
+            try:
+                server = self._idle.get_nowait()
+                if not self._is_alive(server):
+                    self._discard(server)
+                    server = None
+            except queue.Empty:
+                pass
+            if server is None:
+                server = self._connect()
+            yield server
+        except BaseException:
+            # sessão em estado desconhecido: não devolve ao pool
+            if server is not None:
+                self._discard(server)
+                server = None
+            raise
+        finally:
+            if server is not None:
+                self._idle.put(server)
+            self._slots.release()
+
+    @staticmethod
+    def _discard(server: smtplib.SMTP) -> None:
+        try:
+            server.quit()
+        except Exception:
+            server.close()
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._discard(self._idle.get_nowait())
+            except queue.Empty:
+                break
+
+
+_pool: SMTPConnectionPool | None = None
+_pool_lock = threading.Lock()
+
+def get_smtp_pool() -> SMTPConnectionPool:
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = SMTPConnectionPool(settings.EMAIL_SMTP_POOL_SIZE)
+    return _pool
 
-    context = ssl.create_default_context()
-    with smtplib.SMTP(settings.SMTP_HOST, settings.SMTP_PORT) as server:
-        server.starttls(context=context)
-        server.login(settings.SMTP_USER, settings.SMTP_PASSWORD)
+
+def send_email(to: str, subject: str, html: str):
+    """
+    Envia o e-mail imediatamente usando uma sessão SMTP do pool.
+    Usado pelo worker; a API deve usar `queue_email`.
+    """
+    msg = build_message(to, subject, html)
+    with get_smtp_pool().connection() as server:
         server.send_message(msg)
 
+# ---------- fila durável (usada pela API) ----------
+def queue_email(db: Session, to: str, subject: str, html: str, commit: bool = True):
+    """
+    Grava o e-mail na fila `outbound_emails`; o envio fica a cargo do worker.
+    """
+    from ..services import email_queue_service
+    return email_queue_service.enqueue(db, to=to, subject=subject, html=html, commit=commit)
+
+def queue_templated_email(
+    db: Session,
+    to: str,
+    template_name: str,
+    subject: str,
+    **context,
+):
+    """
+    Enfileira um e-mail de template; o HTML é renderizado no worker
+    com os templates pré-compilados. O contexto precisa ser serializável em JSON.
+    """
+    from ..services import email_queue_service
+    return email_queue_service.enqueue(
+        db,
+        to=to,
+        subject=subject,
+        template_name=template_name,
+        template_context=context,
+    )
+
 # ---------- helper para templates ----------
 def send_templated_email(
     to: str,
@@ -29,4 +148,4 @@ def send_templated_email(
     Renderiza o HTML via Jinja2 e dispara o e-mail.
     """
     html = render_template(template_name, **context)
-    send_email(to=to, subject=subject, html=html)
\ No newline at end of file
+    send_email(to=to, subject=subject, html=html)
@@ -0,0 +1,199 @@
+# backend/app/core/instrumentation.py
+#
+# Métricas por requisição:
+# - eventos do SQLAlchemy contam statements, tempo de banco e linhas retornadas
+# - middleware ASGI mede a latência por rota e devolve `Server-Timing`
+# - render_metrics() expõe tudo no formato texto do Prometheus (/metrics)
+# - queries acima de SLOW_QUERY_MS vão para o log com a rota e o SQL normalizado
+
+import re
+import time
+import logging
+import threading
+from bisect import bisect_left
+from contextvars import ContextVar
+from dataclasses import dataclass
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from .config import settings
+
+logger = logging.getLogger("app.slow_query")
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+ROW_BUCKETS = (1, 10, 50, 100, 500, 1000, 5000, 10000)
+
+
+@dataclass
+class RequestStats:
+    scope: dict | None = None  # scope ASGI; o roteador preenche "route" depois
+    db_seconds: float = 0.0
+    statements: int = 0
+    rows: int = 0
+
+    @property
+    def route(self) -> str:
+        # rota "template" (ex.: /companies/{company_id}) para não explodir a cardinalidade
+        route = (self.scope or {}).get("route")
+        return getattr(route, "path", None) or "unmatched"
+
+
+_current: ContextVar[RequestStats | None] = ContextVar("request_stats", default=None)
+
+
+def current_stats() -> RequestStats | None:
+    return _current.get()
+
+
+# ───────────── registro (formato Prometheus) ─────────────
+
+class _Histogram:
+    def __init__(self, name: str, help_text: str, buckets: tuple):
+        self.name = name
+        self.help = help_text
+        self.buckets = buckets
+        # labels → ([contagem por bucket], soma, total)
+        self._series: dict[tuple, list] = {}
+
+    def observe(self, labels: tuple, value: float) -> None:
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [[0] * len(self.buckets), 0.0, 0]
+        idx = bisect_left(self.buckets, value)
+        if idx < len(self.buckets):
+            series[0][idx] += 1
+        series[1] += value
+        series[2] += 1
+
+    def render(self, label_names: tuple[str, ...]) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for labels, (counts, total_sum, count) in sorted(self._series.items()):
+            base = ",".join(f'{k}="{_escape(v)}"' for k, v in zip(label_names, labels))
+            cumulative = 0
+            for bound, c in zip(self.buckets, counts):
+                cumulative += c
+                lines.append(f'{self.name}_bucket{{{base},le="{bound}"}} {cumulative}')
+            lines.append(f'{self.name}_bucket{{{base},le="+Inf"}} {count}')
+            lines.append(f"{self.name}_sum{{{base}}} {total_sum}")
+            lines.append(f"{self.name}_count{{{base}}} {count}")
+        return lines
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+_LABELS = ("method", "route", "status")
+_ROUTE_LABELS = ("method", "route")
+
+_lock = threading.Lock()
+_request_latency = _Histogram("http_request_duration_seconds", "Latência das requisições HTTP", LATENCY_BUCKETS)
+_db_time = _Histogram("http_request_db_seconds", "Tempo gasto no banco por requisição", LATENCY_BUCKETS)
+_db_statements = _Histogram("http_request_db_statements", "Statements SQL por requisição", STATEMENT_BUCKETS)
+_db_rows = _Histogram("http_request_db_rows", "Linhas retornadas pelo banco por requisição", ROW_BUCKETS)
+_slow_queries: dict[str, int] = {}
+
+
+def _record(method: str, route: str, status: int, elapsed: float, stats: RequestStats) -> None:
+    with _lock:
+        _request_latency.observe((method, route, str(status)), elapsed)
+        _db_time.observe((method, route), stats.db_seconds)
+        _db_statements.observe((method, route), stats.statements)
+        _db_rows.observe((method, route), stats.rows)
+
+
+def render_metrics() -> str:
+    with _lock:
+        lines = _request_latency.render(_LABELS)
+        lines += _db_time.render(_ROUTE_LABELS)
+        lines += _db_statements.render(_ROUTE_LABELS)
+        lines += _db_rows.render(_ROUTE_LABELS)
+        lines += ["# HELP db_slow_queries_total Queries acima de SLOW_QUERY_MS", "# TYPE db_slow_queries_total counter"]
+        lines += [f'db_slow_queries_total{{route="{_escape(r)}"}} {n}' for r, n in sorted(_slow_queries.items())]
+    return "\n".join(lines) + "\n"
+
+
+# ───────────── SQLAlchemy ─────────────
+
+_PARAM = re.compile(r"%\(\w+\)s|\$\d+|\?")
+_IN_LIST = re.compile(r"\bIN \((?:\?, )+\?\)", re.IGNORECASE)
+_SPACES = re.compile(r"\s+")
+
+
+def normalize_sql(statement: str) -> str:
+    """
+    SQL sem valores e com espaços colapsados, para agrupar queries iguais no log.
+    """
+    sql = _PARAM.sub("?", statement)
+    sql = _IN_LIST.sub("IN (...)", sql)
+    return _SPACES.sub(" ", sql).strip()[:2000]
+
+
+def instrument_engine(engine: Engine) -> None:
+    if not settings.INSTRUMENTATION_ENABLED:
+        return
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start"].pop()
+        stats = _current.get()
+        if stats is not None:
+            stats.db_seconds += elapsed
+            stats.statements += 1
+            # psycopg2 já trouxe o resultado: rowcount = linhas do SELECT
+            if cursor.description is not None and cursor.rowcount > 0:
+                stats.rows += cursor.rowcount
+
+        if elapsed * 1000 >= settings.SLOW_QUERY_MS:
+            route = stats.route if stats is not None else "-"
+            with _lock:
+                _slow_queries[route] = _slow_queries.get(route, 0) + 1
+            logger.warning(
+                "slow query %.1fms route=%s sql=%s",
+                elapsed * 1000, route, normalize_sql(statement),
+            )
+
+
+# ───────────── ASGI ─────────────
+
+class InstrumentationMiddleware:
+    """
+    Middleware ASGI puro (sem BaseHTTPMiddleware): mede a requisição, expõe o
+    contexto para os eventos do SQLAlchemy e adiciona o header Server-Timing.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.INSTRUMENTATION_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats(scope=scope)
+        token = _current.set(stats)
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if settings.SERVER_TIMING_ENABLED:
+                    total_ms = (time.perf_counter() - start) * 1000
+                    timing = (
+                        f'app;dur={total_ms:.1f}, '
+                        f'db;dur={stats.db_seconds * 1000:.1f};desc="{stats.statements} queries, {stats.rows} rows"'
+                    )
+                    message.setdefault("headers", []).append((b"server-timing", timing.encode()))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current.reset(token)
+            _record(scope["method"], stats.route, status_code, time.perf_counter() - start, stats)
@@ -0,0 +1,114 @@
+# backend/app/core/password_hashing.py
+
+import atexit
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from argon2 import PasswordHasher, exceptions
+from .config import settings
+
+# Hasher do processo atual (usado inline quando o pool está desligado e
+# também para checar necessidade de rehash, que não custa CPU).
+ph = PasswordHasher(
+    time_cost=settings.ARGON2_TIME_COST,
+    memory_cost=settings.ARGON2_MEMORY_COST,
+    parallelism=settings.ARGON2_PARALLELISM,
+)
+
+_pool: ProcessPoolExecutor | None = None
+_pool_lock = threading.Lock()
+
+# hasher de cada processo do pool (criado no initializer)
+_worker_ph: PasswordHasher | None = None
+
+
+def _init_worker(time_cost: int, memory_cost: int, parallelism: int) -> None:
+    global _worker_ph
+    _worker_ph = PasswordHasher(
+        time_cost=time_cost,
+        memory_cost=memory_cost,
+        parallelism=parallelism,
+    )
+
+
+def _hash_in_worker(password: str) -> str:
+    return _worker_ph.hash(password)
+
+
+def _verify_in_worker(hashed_password: str, plain_password: str) -> bool:
+    try:
+        return _worker_ph.verify(hashed_password, plain_password)
+    except (exceptions.VerifyMismatchError, exceptions.InvalidHashError):
+        return False
+
+
+def get_pool() -> ProcessPoolExecutor | None:
+    """
+    Retorna o pool de processos do argon2, criando-o na primeira chamada.
+    Com PASSWORD_HASH_WORKERS = 0 o hashing roda inline (sem pool).
+    """
+    global _pool
+    if settings.PASSWORD_HASH_WORKERS <= 0:
+        return None
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ProcessPoolExecutor(
+                    max_workers=settings.PASSWORD_HASH_WORKERS,
+                    initializer=_init_worker,
+                    initargs=(
+                        settings.ARGON2_TIME_COST,
+                        settings.ARGON2_MEMORY_COST,
+                        settings.ARGON2_PARALLELISM,
+                    ),
+                )
+    return _pool
+
+
+def shutdown_pool() -> None:
+    """
+    Encerra o pool (chamado no shutdown da aplicação).
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=True, cancel_futures=True)
+            _pool = None
+
+
+atexit.register(shutdown_pool)
+
+
+def hash_password(password: str) -> str:
+    """
+    Gera o hash argon2 da senha em um dos processos do pool.
+    A thread chamadora só espera o resultado; memória e CPU do argon2
+    ficam limitadas a PASSWORD_HASH_WORKERS processos.
+    """
+    pool = get_pool()
+    if pool is None:
+        return ph.hash(password)
+    return pool.submit(_hash_in_worker, password).result()
+
+
+def verify_password(hashed_password: str, plain_password: str) -> bool:
+    """
+    Verifica a senha contra o hash armazenado, também via pool.
+    """
+    pool = get_pool()
+    if pool is None:
+        try:
+            return ph.verify(hashed_password, plain_password)
+        except (exceptions.VerifyMismatchError, exceptions.InvalidHashError):
+            return False
+    return pool.submit(_verify_in_worker, hashed_password, plain_password).result()
+
+
+def needs_rehash(hashed_password: str) -> bool:
+    """
+    True se o hash foi gerado com parâmetros diferentes dos atuais
+    (ARGON2_* em Settings). Só faz parse do hash, não roda argon2.
+    """
+    try:
+        return ph.check_needs_rehash(hashed_password)
+    except exceptions.InvalidHashError:
+        return False
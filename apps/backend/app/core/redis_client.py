@@ -0,0 +1,201 @@
+# backend/app/core/redis_client.py
+#
+# Acesso ao Redis compartilhado pelo processo:
+# - um pool por processo (sync e redis.asyncio), com limite de conexões,
+#   timeouts curtos e PING nas conexões ociosas (health_check_interval)
+# - decode=True devolve str (geocode, scripts); decode=False, bytes
+#   (corpos do cache de respostas, JSON do orjson)
+# - disjuntor: depois de uma falha de conexão/timeout, as chamadas falham na
+#   hora por REDIS_RETRY_AFTER_SECONDS, sem esperar o timeout de novo; quem
+#   usa o Redis como cache trata RedisError como miss
+# - get_many/set_many: lotes de GET/SET num só round-trip (pipeline)
+
+import logging
+import threading
+import time
+from typing import Any, Iterable, Mapping
+from redis import BlockingConnectionPool, Redis, RedisError
+from redis import asyncio as aioredis
+from redis.exceptions import ConnectionError as RedisConnectionError, TimeoutError as RedisTimeoutError
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_clients: dict[bool, Redis] = {}
+_async_clients: dict[bool, aioredis.Redis] = {}
+_down_until = 0.0
+
+
+# ───────────── disjuntor ─────────────
+
+def available() -> bool:
+    return time.monotonic() >= _down_until
+
+
+def mark_down(error: Exception) -> None:
+    global _down_until
+    if available():
+        logger.warning("Redis indisponível (%s); nova tentativa em %ss", error, settings.REDIS_RETRY_AFTER_SECONDS)
+    _down_until = time.monotonic() + settings.REDIS_RETRY_AFTER_SECONDS
+
+
+def _failed(error: RedisError) -> None:
+    # pipelines não passam por execute_command: registra a queda aqui
+    if isinstance(error, (RedisConnectionError, RedisTimeoutError)):
+        mark_down(error)
+
+
+def _check_available() -> None:
+    if not available():
+        raise RedisConnectionError("Redis indisponível (aguardando nova tentativa)")
+
+
+class _GuardedRedis(Redis):
+    def execute_command(self, *args, **options):
+        _check_available()
+        try:
+            return super().execute_command(*args, **options)
+        except (RedisConnectionError, RedisTimeoutError) as e:
+            mark_down(e)
+            raise
+
+    def pipeline(self, transaction=True, shard_hint=None):
+        _check_available()
+        return super().pipeline(transaction, shard_hint)
+
+
+class _GuardedAsyncRedis(aioredis.Redis):
+    async def execute_command(self, *args, **options):
+        _check_available()
+        try:
+            return await super().execute_command(*args, **options)
+        except (RedisConnectionError, RedisTimeoutError) as e:
+            mark_down(e)
+            raise
+
+    def pipeline(self, transaction=True, shard_hint=None):
+        _check_available()
+        return super().pipeline(transaction, shard_hint)
+
+
+# ───────────── clientes ─────────────
+
+def _pool_options(decode: bool) -> dict[str, Any]:
+    return {
+        "max_connections": settings.REDIS_MAX_CONNECTIONS,
+        # pool cheio espera uma conexão livre em vez de abrir outra
+        "timeout": settings.REDIS_POOL_TIMEOUT_SECONDS,
+        "socket_timeout": settings.REDIS_SOCKET_TIMEOUT_SECONDS,
+        "socket_connect_timeout": settings.REDIS_CONNECT_TIMEOUT_SECONDS,
+        "socket_keepalive": True,
+        "health_check_interval": settings.REDIS_HEALTH_CHECK_INTERVAL_SECONDS,
+        "decode_responses": decode,
+    }
+
+
+def get_redis(decode: bool = True) -> Redis:
+    """
+    Cliente síncrono sobre o pool do processo (não fechar).
+    """
+    client = _clients.get(decode)
+    if client is None:
+        with _lock:
+            client = _clients.get(decode)
+            if client is None:
+                pool = BlockingConnectionPool.from_url(settings.REDIS_URL, **_pool_options(decode))
+                client = _clients[decode] = _GuardedRedis(connection_pool=pool)
+    return client
+
+
+def get_async_redis(decode: bool = True) -> aioredis.Redis:
+    """
+    Cliente redis.asyncio sobre o pool do processo (um event loop por
+    processo, como no uvicorn).
+    """
+    client = _async_clients.get(decode)
+    if client is None:
+        pool = aioredis.BlockingConnectionPool.from_url(settings.REDIS_URL, **_pool_options(decode))
+        client = _async_clients[decode] = _GuardedAsyncRedis(connection_pool=pool)
+    return client
+
+
+def ping() -> bool:
+    try:
+        return bool(get_redis().ping())
+    except RedisError:
+        return False
+
+
+def close() -> None:
+    with _lock:
+        for client in _clients.values():
+            client.connection_pool.disconnect()
+        _clients.clear()
+
+
+async def aclose() -> None:
+    for client in _async_clients.values():
+        await client.aclose()
+        await client.connection_pool.disconnect()
+    _async_clients.clear()
+
+
+# ───────────── lotes ─────────────
+
+def get_many(keys: Iterable[str], *, decode: bool = True) -> list[Any]:
+    """
+    MGET; sem Redis, tudo None (miss).
+    """
+    keys = list(keys)
+    if not keys:
+        return []
+    try:
+        return get_redis(decode).mget(keys)
+    except RedisError as e:
+        logger.debug("get_many sem Redis: %s", e)
+        return [None] * len(keys)
+
+
+def set_many(items: Mapping[str, Any], *, ex: int | None = None, decode: bool = True) -> bool:
+    """
+    SET de vários pares num round-trip; False se o Redis falhou.
+    """
+    if not items:
+        return True
+    try:
+        pipe = get_redis(decode).pipeline(transaction=False)
+        for key, value in items.items():
+            pipe.set(key, value, ex=ex)
+        pipe.execute()
+        return True
+    except RedisError as e:
+        _failed(e)
+        logger.debug("set_many sem Redis: %s", e)
+        return False
+
+
+async def aget_many(keys: Iterable[str], *, decode: bool = True) -> list[Any]:
+    keys = list(keys)
+    if not keys:
+        return []
+    try:
+        return await get_async_redis(decode).mget(keys)
+    except RedisError as e:
+        logger.debug("aget_many sem Redis: %s", e)
+        return [None] * len(keys)
+
+
+async def aset_many(items: Mapping[str, Any], *, ex: int | None = None, decode: bool = True) -> bool:
+    if not items:
+        return True
+    try:
+        async with get_async_redis(decode).pipeline(transaction=False) as pipe:
+            for key, value in items.items():
+                pipe.set(key, value, ex=ex)
+            await pipe.execute()
+        return True
+    except RedisError as e:
+        _failed(e)
+        logger.debug("aset_many sem Redis: %s", e)
+        return False
@@ -0,0 +1,176 @@
+# backend/app/core/response_cache.py
+#
+# Cache de respostas para endpoints de leitura que mudam pouco.
+#
+# Cada endpoint declara de quais "entidades" depende (ex.: "slides",
+# "points_rules:{company_id}"). Cada entidade tem um contador de versão no
+# Redis; os serviços chamam bump() depois de criar/editar/excluir. O ETag é
+# derivado da URL + versões, então:
+# - If-None-Match igual → 304 sem tocar no banco nem serializar nada
+# - corpo já gerado → vem do LRU do processo ou do Redis, sem ORM/Pydantic
+# Sem Redis o endpoint roda normalmente (sem cache).
+
+import time
+import hashlib
+import inspect
+import logging
+import threading
+from collections import OrderedDict
+from functools import wraps
+from typing import Any, Callable
+from fastapi import Request, Response
+from pydantic import TypeAdapter
+from redis import Redis, RedisError
+from . import redis_client
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+VERSION_PREFIX = "respcache:v:"
+BODY_PREFIX = "respcache:b:"
+
+
+class _LRU:
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data: OrderedDict[str, bytes] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> bytes | None:
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: bytes) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+
+_local = _LRU(settings.RESPONSE_CACHE_LRU_SIZE)
+
+def _get_redis() -> Redis:
+    # sem decode_responses: os corpos são bytes
+    return redis_client.get_redis(decode=False)
+
+
+def bump(*entities: str) -> None:
+    """
+    Invalida as respostas que dependem dessas entidades (chamar após o commit).
+    """
+    if not entities:
+        return
+    try:
+        pipe = _get_redis().pipeline(transaction=False)
+        for entity in entities:
+            pipe.incr(VERSION_PREFIX + entity)
+        pipe.execute()
+    except RedisError as e:
+        logger.warning("Falha ao invalidar cache %s: %s", entities, e)
+
+
+def version(entity: str) -> int | None:
+    """
+    Versão atual de uma entidade, para caches em memória de outros módulos
+    (ex.: limiares de marcos). None se o Redis estiver indisponível.
+    """
+    try:
+        return int(_get_redis().get(VERSION_PREFIX + entity) or 0)
+    except RedisError as e:
+        logger.warning("Falha ao ler versão de %s: %s", entity, e)
+        return None
+
+
+def _cache_headers(etag: str, private: bool) -> dict[str, str]:
+    return {
+        "ETag": f'"{etag}"',
+        "Cache-Control": "private, no-cache" if private else "public, no-cache",
+    }
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    return any(tag.strip().removeprefix("W/").strip('"') == etag for tag in header.split(","))
+
+
+def cached_response(
+    *entities: str,
+    model: Any,
+    ttl: int | None = None,
+    private: bool = False,
+) -> Callable:
+    """
+    Decorator para endpoints síncronos de leitura.
+
+    - `entities`: chaves de versão; aceitam placeholders com os parâmetros do
+      endpoint, ex.: "points_rules:{company_id}" ou "user_milestones:{current_user.id}"
+    - `model`: tipo da resposta (o mesmo do response_model) usado para serializar
+    - `ttl`: validade máxima em segundos (limita respostas que dependem do relógio)
+    - `private`: resposta por usuário (Cache-Control private)
+    """
+    adapter = TypeAdapter(model)
+    ttl = ttl or settings.RESPONSE_CACHE_TTL_SECONDS
+
+    def decorator(func: Callable) -> Callable:
+        signature = inspect.signature(func)
+        params = list(signature.parameters.values())
+        params.append(inspect.Parameter("_cache_request", inspect.Parameter.KEYWORD_ONLY, annotation=Request))
+
+        @wraps(func)
+        def wrapper(*args, _cache_request: Request, **kwargs):
+            if not settings.RESPONSE_CACHE_ENABLED:
+                return func(*args, **kwargs)
+
+            resolved = [entity.format(**kwargs) for entity in entities]
+            try:
+                versions = _get_redis().mget([VERSION_PREFIX + e for e in resolved])
+            except RedisError as e:
+                logger.warning("Cache de respostas indisponível: %s", e)
+                return func(*args, **kwargs)
+
+            # o bucket de tempo garante que nada fica em cache além do ttl
+            query = "&".join(sorted(str(_cache_request.query_params).split("&")))
+            raw_key = "|".join([
+                _cache_request.url.path,
+                query,
+                *(f"{e}={int(v or 0)}" for e, v in zip(resolved, versions)),
+                str(int(time.time() // ttl)),
+            ])
+            etag = hashlib.sha1(raw_key.encode()).hexdigest()
+            headers = _cache_headers(etag, private)
+
+            if _etag_matches(_cache_request, etag):
+                return Response(status_code=304, headers=headers)
+
+            body = _local.get(etag)
+            if body is None:
+                try:
+                    body = _get_redis().get(BODY_PREFIX + etag)
+                except RedisError:
+                    body = None
+                if body is not None:
+                    _local.set(etag, body)
+
+            if body is None:
+                result = func(*args, **kwargs)
+                if isinstance(result, Response):
+                    return result
+                body = adapter.dump_json(adapter.validate_python(result, from_attributes=True), by_alias=True)
+                _local.set(etag, body)
+                try:
+                    _get_redis().set(BODY_PREFIX + etag, body, ex=ttl)
+                except RedisError:
+                    pass
+
+            return Response(content=body, media_type="application/json", headers=headers)
+
+        wrapper.__signature__ = signature.replace(parameters=params)
+        return wrapper
+
+    return decorator
@@ -2,23 +2,25 @@
 
 from datetime import datetime, timedelta
 from jose import jwt
-from argon2 import PasswordHasher, exceptions
 from cryptography.fernet import Fernet
 from .config import settings
+from .password_hashing import hash_password, verify_password, needs_rehash
 
-ph = PasswordHasher()
 fernet = Fernet(settings.FERNET_KEY.encode())
 
 ALGORITHM = "HS256"
 
-def hash_password(password: str) -> str:
-    return ph.hash(password)
-
-def verify_password(hashed_password: str, plain_password: str) -> bool:
-    try:
-        return ph.verify(hashed_password, plain_password)
-    except (exceptions.VerifyMismatchError, exceptions.InvalidHashError):
-        return False
+def verify_and_update(hashed_password: str, plain_password: str) -> tuple[bool, str | None]:
+    """
+    Verifica a senha e, se os parâmetros do argon2 mudaram desde que o hash
+    foi gerado, devolve também um novo hash para ser persistido.
+    Retorna (ok, novo_hash_ou_None).
+    """
+    if not verify_password(hashed_password, plain_password):
+        return False, None
+    if needs_rehash(hashed_password):
+        return True, hash_password(plain_password)
+    return True, None
 
 def create_access_token(subject: str) -> str:
     expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
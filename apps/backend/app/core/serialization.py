@@ -0,0 +1,92 @@
+# backend/app/core/serialization.py
+#
+# Serialização JSON com orjson.
+# - ORJSONResponse é a resposta padrão da aplicação (ver main.py)
+# - trusted_rows(): listagens que já vêm do SQL com as colunas no formato do
+#   schema viram JSON direto dos mappings, sem instanciar modelos Pydantic e
+#   sem a segunda validação do response_model
+
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any, Iterable, Mapping
+import orjson
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, TypeAdapter
+from pydantic_core import PydanticUndefined
+from .config import settings
+
+# "Z" em vez de "+00:00", igual ao Pydantic
+_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, Decimal):
+        return float(obj)
+    raise TypeError(f"Tipo não serializável: {type(obj).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    """
+    orjson.dumps com os tipos extras do projeto (Decimal → float).
+    UUID, datetime, date e Enum são nativos do orjson.
+    """
+    return orjson.dumps(content, default=_default, option=_OPTIONS)
+
+
+class TrustedJSONResponse(ORJSONResponse):
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+@lru_cache(maxsize=None)
+def _fields(model: type[BaseModel]) -> tuple[tuple[str, bool, Any], ...]:
+    # (nome, obrigatório, default) de cada campo do schema
+    return tuple(
+        (name, field.is_required(), None if field.default is PydanticUndefined else field.default)
+        for name, field in model.model_fields.items()
+    )
+
+
+@lru_cache(maxsize=None)
+def _list_adapter(model: type[BaseModel]) -> TypeAdapter:
+    return TypeAdapter(list[model])
+
+
+def _mapping(row: Any) -> Mapping[str, Any]:
+    return row._mapping if hasattr(row, "_mapping") else row
+
+
+def trusted_rows(
+    model: type[BaseModel],
+    rows: Iterable[Any],
+    *,
+    headers: dict[str, str] | None = None,
+    status_code: int = 200,
+) -> TrustedJSONResponse:
+    """
+    Monta a resposta JSON de uma lista de linhas SQL (Row / RowMapping / dict)
+    cujas colunas têm os mesmos nomes e tipos dos campos de `model`.
+    Colunas extras são ignoradas; campos opcionais ausentes usam o default.
+
+    Com TRUSTED_ROWS_VALIDATE (dev/testes) as linhas são validadas contra o
+    schema, para pegar divergência entre a query e o modelo.
+    """
+    fields = _fields(model)
+    items = []
+    for row in rows:
+        m = _mapping(row)
+        items.append({
+            name: m[name] if (required or name in m) else default
+            for name, required, default in fields
+        })
+    if settings.TRUSTED_ROWS_VALIDATE:
+        _list_adapter(model).validate_python(items)
+    return TrustedJSONResponse(items, status_code=status_code, headers=headers)
+
+
+def page_headers(total: int, page: int, page_size: int) -> dict[str, str]:
+    return {
+        "X-Total-Count": str(total),
+        "X-Page": str(page),
+        "X-Page-Size": str(page_size),
+    }
@@ -0,0 +1,204 @@
+# backend/app/core/static_files.py
+#
+# Camada de arquivos estáticos:
+# - nomes por hash (uploads e cópias do manifest) → Cache-Control immutable
+# - demais arquivos → revalidação obrigatória via ETag / If-None-Match
+# - serve `<arquivo>.br` / `<arquivo>.gz` pré-gerados quando o cliente aceita
+# - manifest.json: "logo.png" → "logo.<hash>.png" (ver asset_url)
+#
+# Uso no deploy: python -m app.scripts.build_static_assets
+#
+# Cópia deliberada de apps/backend-site/app/utils/static_files.py (os apps são
+# implantados separadamente, sem pacote em comum): fora deste cabeçalho e do
+# bloco "configuração do app" os dois arquivos devem ficar idênticos.
+
+import os
+import re
+import gzip
+import json
+import shutil
+import hashlib
+from mimetypes import guess_type
+from pathlib import Path
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import StaticFiles, NotModifiedResponse
+from starlette.types import Scope
+
+try:
+    import brotli
+    HAS_BROTLI = True
+except ImportError:  # sem brotli só o .gz é gerado
+    HAS_BROTLI = False
+
+# ───────────── configuração do app ─────────────
+STATIC_DIR = Path(os.getcwd()) / "app" / "static"
+# pastas de upload: nomes já são únicos, não entram no manifest
+UPLOAD_FOLDERS = {"rewards", "categories", "companies"}
+# ────────────────────────────────────────────────
+
+MANIFEST_NAME = "manifest.json"
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "public, no-cache"
+
+# tipos textuais que compensam comprimir (imagens raster já são comprimidas)
+COMPRESSIBLE_SUFFIXES = {".svg", ".json", ".css", ".js", ".txt", ".xml", ".html", ".map"}
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+# <sha256>.ext, <sha256>_<variante>.ext (uploads), <uuid4>.ext (uploads antigos,
+# nunca sobrescritos) ou nome.<hash16>.ext (manifest)
+_FINGERPRINTED = re.compile(
+    r"^(?:[0-9a-f]{64}(?:_[a-z0-9]+)?"
+    r"|[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}"
+    r"|.+\.[0-9a-f]{16})\.[A-Za-z0-9]+$"
+)
+_CONTENT_HASH = re.compile(r"^([0-9a-f]{64}(?:_[a-z0-9]+)?)\.")
+
+
+def is_fingerprinted(name: str) -> bool:
+    return bool(_FINGERPRINTED.match(name))
+
+
+class CachedStaticFiles(StaticFiles):
+    """
+    StaticFiles com cache HTTP agressivo para arquivos versionados pelo nome
+    e negociação de Content-Encoding com arquivos pré-comprimidos.
+    """
+
+    def file_response(
+        self,
+        full_path,
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        request_headers = Headers(scope=scope)
+        path = Path(full_path)
+        media_type = guess_type(path.name)[0] or "text/plain"
+        compressible = path.suffix.lower() in COMPRESSIBLE_SUFFIXES
+
+        encoding = None
+        if compressible:
+            accept = request_headers.get("accept-encoding", "")
+            for enc, ext in ENCODINGS:
+                if enc not in accept:
+                    continue
+                try:
+                    compressed_stat = os.stat(f"{path}{ext}")
+                except OSError:
+                    continue
+                # só usa a versão comprimida se não estiver desatualizada
+                if compressed_stat.st_mtime >= stat_result.st_mtime:
+                    full_path, stat_result, encoding = f"{path}{ext}", compressed_stat, enc
+                    break
+
+        response = FileResponse(
+            full_path,
+            status_code=status_code,
+            stat_result=stat_result,
+            media_type=media_type,
+        )
+
+        # ETag forte: o próprio hash quando o nome é por conteúdo
+        m = _CONTENT_HASH.match(path.name)
+        etag = f'"{m.group(1)}"' if m else response.headers["etag"]
+        if encoding:
+            etag = f'{etag[:-1]}-{encoding}"'
+            response.headers["content-encoding"] = encoding
+        response.headers["etag"] = etag
+        response.headers["cache-control"] = IMMUTABLE if is_fingerprinted(path.name) else REVALIDATE
+        if compressible:
+            response.headers["vary"] = "Accept-Encoding"
+
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
+
+
+# ───────────── pré-compressão ─────────────
+
+def precompress(path: Path) -> None:
+    """
+    Gera `<arquivo>.gz` (e `.br` se houver brotli) ao lado de um arquivo textual.
+    """
+    if path.suffix.lower() not in COMPRESSIBLE_SUFFIXES:
+        return
+    try:
+        if os.stat(f"{path}.gz").st_mtime >= path.stat().st_mtime:
+            return  # já gerado
+    except OSError:
+        pass
+    data = path.read_bytes()
+    targets = [(f"{path}.gz", lambda d: gzip.compress(d, compresslevel=9, mtime=0))]
+    if HAS_BROTLI:
+        targets.append((f"{path}.br", lambda d: brotli.compress(d, quality=11)))
+    for target, compress in targets:
+        tmp = f"{target}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(compress(data))
+        os.replace(tmp, target)
+
+
+# ───────────── manifest ─────────────
+
+_manifest: dict[str, str] = {}
+_manifest_mtime: float | None = None
+
+
+def _load_manifest() -> dict[str, str]:
+    global _manifest, _manifest_mtime
+    path = STATIC_DIR / MANIFEST_NAME
+    try:
+        mtime = path.stat().st_mtime
+    except OSError:
+        return _manifest
+    if mtime != _manifest_mtime:
+        _manifest = json.loads(path.read_text(encoding="utf-8"))
+        _manifest_mtime = mtime
+    return _manifest
+
+
+def asset_url(name: str) -> str:
+    """
+    URL /static/… versionada de um asset fixo (ex.: "logo.png").
+    Sem manifest (ou asset fora dele) devolve a URL simples.
+    """
+    name = name.lstrip("/")
+    return f"/static/{_load_manifest().get(name, name)}"
+
+
+def build_manifest(static_dir: Path = STATIC_DIR) -> dict[str, str]:
+    """
+    Para cada asset com nome fixo cria uma cópia `nome.<hash>.ext`, pré-comprime
+    os textuais e grava o manifest.json. Uploads (UPLOAD_FOLDERS) só recebem a
+    pré-compressão.
+    """
+    manifest: dict[str, str] = {}
+    for path in sorted(static_dir.rglob("*")):
+        if not path.is_file() or path.suffix in (".gz", ".br", ".tmp", ".part"):
+            continue
+        if path.name == MANIFEST_NAME or path.name.startswith("."):
+            continue
+        rel = path.relative_to(static_dir)
+        if is_fingerprinted(path.name) or rel.parts[0] in UPLOAD_FOLDERS:
+            precompress(path)
+            continue
+
+        digest = hashlib.sha256(path.read_bytes()).hexdigest()[:16]
+        fingerprinted = path.with_name(f"{path.stem}.{digest}{path.suffix}")
+        if not fingerprinted.exists():
+            shutil.copy2(path, fingerprinted)
+        precompress(fingerprinted)
+        precompress(path)
+        manifest[rel.as_posix()] = fingerprinted.relative_to(static_dir).as_posix()
+
+    tmp = static_dir / f"{MANIFEST_NAME}.tmp"
+    tmp.write_text(json.dumps(manifest, indent=2, sort_keys=True), encoding="utf-8")
+    tmp.replace(static_dir / MANIFEST_NAME)
+    return manifest
+
+
+if __name__ == "__main__":
+    for name, fingerprinted in build_manifest().items():
+        print(f"{name} → {fingerprinted}")
@@ -0,0 +1,146 @@
+# backend/app/core/time_range.py
+#
+# Períodos e baldes de tempo dos dashboards no fuso da empresa (IANA, ex.:
+# "America/Sao_Paulo") em vez do fuso do servidor — sem isso, vendas depois
+# das 21h caíam no dia seguinte.
+# - local_range: [00:00 do 1º dia, 00:00 do dia seguinte ao último) no fuso,
+#   convertido para instantes; o filtro compara a coluna crua, então o
+#   índice em created_at continua valendo
+# - bucket: date_trunc(unit, coluna AT TIME ZONE tz) → data/hora local
+# - zero_filled: generate_series dos baldes locais + LEFT JOIN dos agregados
+# Dias que não começam à meia-noite (horário de verão) começam no primeiro
+# instante existente; o dia da troca tem 23h ou 25h.
+
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+from fastapi import HTTPException, status
+from sqlalchemy import Date, and_, cast, func, literal, select, text
+from app.core.config import settings
+
+UNITS = ("day", "week", "month")
+
+
+def validate_timezone(name: str) -> str:
+    """
+    Nome IANA válido ou ValueError (uso em validators Pydantic).
+    """
+    try:
+        ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise ValueError(f"Fuso horário inválido: {name}")
+    return name
+
+
+def resolve_timezone(requested: str | None = None, company=None) -> ZoneInfo:
+    """
+    Fuso do pedido (?tz=) > fuso cadastrado da empresa > METRICS_DEFAULT_TIMEZONE.
+    """
+    name = requested or getattr(company, "timezone", None) or settings.METRICS_DEFAULT_TIMEZONE
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise HTTPException(status.HTTP_400_BAD_REQUEST, f"Fuso horário inválido: {name}")
+
+
+def _local_midnight(day: date, tz: ZoneInfo) -> datetime:
+    # fold=0: meia-noite inexistente (início do horário de verão) vira o
+    # primeiro instante do dia; ambígua, a primeira ocorrência
+    return datetime.combine(day, time.min, tzinfo=tz)
+
+
+@dataclass(frozen=True)
+class TimeRange:
+    start_date: date
+    end_date: date
+    tz: ZoneInfo
+
+    @property
+    def tz_name(self) -> str:
+        return self.tz.key
+
+    @property
+    def start(self) -> datetime:
+        return _local_midnight(self.start_date, self.tz)
+
+    @property
+    def end(self) -> datetime:
+        """Exclusivo: meia-noite local do dia seguinte ao último."""
+        return _local_midnight(self.end_date + timedelta(days=1), self.tz)
+
+    def days(self) -> list[date]:
+        return [self.start_date + timedelta(days=i) for i in range((self.end_date - self.start_date).days + 1)]
+
+    def filter(self, column):
+        """Semiaberto sobre a coluna timestamptz crua (index-friendly)."""
+        return and_(column >= self.start, column < self.end)
+
+    def local(self, column):
+        """Data/hora local (timestamp sem fuso) da coluna timestamptz."""
+        return func.timezone(self.tz_name, column)
+
+    def bucket(self, column, unit: str = "day"):
+        """Início local do balde (timestamp sem fuso)."""
+        return func.date_trunc(_unit(unit), self.local(column))
+
+    def local_date(self, column):
+        return cast(self.local(column), Date)
+
+    def series(self, unit: str = "day"):
+        """
+        generate_series com todos os baldes locais do período
+        (coluna `bucket`, timestamp sem fuso).
+        """
+        unit = _unit(unit)
+        first = func.date_trunc(unit, literal(datetime.combine(self.start_date, time.min)))
+        last = func.date_trunc(unit, literal(datetime.combine(self.end_date, time.min)))
+        return (
+            func.generate_series(first, last, text(f"interval '1 {unit}'"))
+            .table_valued("bucket")
+            .render_derived()
+        )
+
+    def zero_filled(self, aggregated, unit: str = "day", bucket_column: str = "bucket", **defaults):
+        """
+        SELECT dos baldes do período com os agregados de `aggregated`
+        (subquery com a coluna `bucket_column` = self.bucket(...)); baldes
+        sem linha recebem os valores de `defaults` (ex.: value=0).
+        """
+        series = self.series(unit)
+        columns = [series.c.bucket]
+        for col in aggregated.c:
+            if col.key == bucket_column:
+                continue
+            if col.key in defaults:
+                columns.append(func.coalesce(col, defaults[col.key]).label(col.key))
+            else:
+                columns.append(col)
+        return (
+            select(*columns)
+            .select_from(series.outerjoin(aggregated, aggregated.c[bucket_column] == series.c.bucket))
+            .order_by(series.c.bucket)
+        )
+
+
+def _unit(unit: str) -> str:
+    if unit not in UNITS:
+        raise ValueError(f"Unidade inválida: {unit}")
+    return unit
+
+
+def local_range(start_date: date, end_date: date, tz: ZoneInfo) -> TimeRange:
+    if start_date > end_date:
+        start_date, end_date = end_date, start_date
+    return TimeRange(start_date, end_date, tz)
+
+
+def local_today(tz: ZoneInfo) -> date:
+    return datetime.now(tz).date()
+
+
+def month_to_date(tz: ZoneInfo, start_date: date | None = None, end_date: date | None = None) -> TimeRange:
+    """
+    Padrão dos dashboards: do dia 1º do mês corrente até hoje, no fuso.
+    """
+    today = local_today(tz)
+    return local_range(start_date or today.replace(day=1), end_date or today, tz)
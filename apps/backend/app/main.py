@@ -1,11 +1,19 @@
 # backend/app/main.py
-from fastapi import FastAPI
+import hmac
+from fastapi import FastAPI, Request, HTTPException
+from fastapi.responses import ORJSONResponse, PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from .core.config import settings
 from .api import api_router
-from fastapi.staticfiles import StaticFiles
+from .core.static_files import CachedStaticFiles
+from .core.instrumentation import InstrumentationMiddleware, render_metrics
+from .core.password_hashing import shutdown_pool
+from .core import redis_client
+from .services.image_service import shutdown_pool as shutdown_image_pool
+from .services.asaas_client import close_http_client
+from .services import payment_events
 
-app = FastAPI(title=settings.PROJECT_NAME)
+app = FastAPI(title=settings.PROJECT_NAME, default_response_class=ORJSONResponse)
 
 app.add_middleware(
     CORSMiddleware,
@@ -13,12 +21,38 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing", "ETag", "X-Next-Cursor", "X-Total-Count", "X-Total-Estimated"],
 )
+# por último = mais externo: mede também o CORS e o roteamento
+app.add_middleware(InstrumentationMiddleware)
 
 app.mount(
     "/static",
-    StaticFiles(directory="app/static"),
+    CachedStaticFiles(directory="app/static"),
     name="static",
 )
 
 app.include_router(api_router)
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics(request: Request):
+    if settings.METRICS_TOKEN:
+        auth = request.headers.get("Authorization", "")
+        if not hmac.compare_digest(auth, f"Bearer {settings.METRICS_TOKEN}"):
+            raise HTTPException(status_code=401, detail="Token inválido")
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
+
+@app.on_event("shutdown")
+def _shutdown_pools():
+    shutdown_pool()
+    shutdown_image_pool()
+    close_http_client()
+
+
+@app.on_event("shutdown")
+async def _close_redis():
+    await payment_events.close()
+    redis_client.close()
+    await redis_client.aclose()
@@ -40,3 +40,7 @@ from .milestone import Milestone
 from .user_milestone import UserMilestone
 from .loyalty_card import RuleType, LoyaltyCardTemplate, LoyaltyCardRule, LoyaltyCardInstance, LoyaltyCardStamp, LoyaltyCardStampCode 
 from .reward import CompanyReward, TemplateRewardLink, RewardRedemptionCode
+from .outbound_email import EmailStatus, OutboundEmail
+from .background_job import JobStatus, BackgroundJob
+from .payment_webhook_event import PaymentWebhookEvent
+from .digital_behavior_event import DigitalBehaviorEvent
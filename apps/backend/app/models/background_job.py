@@ -0,0 +1,56 @@
+# app/models/background_job.py
+import enum
+from uuid import uuid4
+from sqlalchemy import Boolean, Column, String, Integer, Text, DateTime, Enum, Index, text
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy.sql import func
+from app.db.base import Base
+
+class JobStatus(str, enum.Enum):
+    pending = "pending"
+    running = "running"
+    done    = "done"
+    failed  = "failed"
+
+class BackgroundJob(Base):
+    """
+    Fila de jobs executados pelo worker (app/workers/job_worker.py).
+    """
+    __tablename__ = "background_jobs"
+
+    id           = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
+    job_type     = Column(String(80), nullable=False)
+    payload      = Column(JSONB, nullable=False, server_default=text("'{}'::jsonb"))
+    status       = Column(Enum(JobStatus), nullable=False, default=JobStatus.pending)
+
+    attempts     = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=5)
+    run_at       = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    # evita duplicar jobs enquanto um igual está pendente/rodando
+    dedupe_key   = Column(String(255), nullable=True)
+    # pedido deduplicado enquanto o job rodava: ao concluir, volta para a fila
+    rerun_requested = Column(Boolean, nullable=False, default=False, server_default=text("false"))
+
+    locked_at    = Column(DateTime(timezone=True), nullable=True)
+    locked_by    = Column(String(120), nullable=True)
+    last_error   = Column(Text, nullable=True)
+
+    created_at   = Column(DateTime(timezone=True), server_default=func.now())
+    finished_at  = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        Index("ix_background_jobs_status_type_run_at", "status", "job_type", "run_at"),
+        Index(
+            "uq_background_jobs_dedupe_active",
+            "dedupe_key",
+            unique=True,
+            postgresql_where=text("status IN ('pending', 'running')"),
+        ),
+        # download das exportações pelo token (app/services/export_service.py)
+        Index(
+            "ix_background_jobs_export_token",
+            text("(payload ->> 'token')"),
+            postgresql_where=text("job_type = 'export_report'"),
+        ),
+    )
@@ -1,9 +1,10 @@
 ### backend/app/models/branch.py ###
 from uuid import uuid4
-from sqlalchemy import Column, String, DateTime, ForeignKey
+from sqlalchemy import Column, String, DateTime, ForeignKey, cast
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, column_property
+from geoalchemy2 import Geography, Geometry
 from app.db.base import Base
 
 class Branch(Base):
@@ -14,5 +15,22 @@ class Branch(Base):
     name = Column(String(120), nullable=False)
     slug = Column(String(100), nullable=False, index=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    
-    company = relationship("Company", back_populates="branches")
\ No newline at end of file
+
+    # endereço (opcional) para geocodificar a filial no job "geocode_branch"
+    street = Column(String(255), nullable=True)
+    number = Column(String(20), nullable=True)
+    neighborhood = Column(String(100), nullable=True)
+    city = Column(String(100), nullable=True)
+    state = Column(String(100), nullable=True)
+    postal_code = Column(String(20), nullable=True)
+
+    # geofence da regra de geolocalização: polígono, se houver; senão o
+    # ponto + raio da regra (índices GiST criados pelo geoalchemy2)
+    location = Column(Geography(geometry_type="POINT", srid=4326), nullable=True)
+    geofence = Column(Geography(geometry_type="POLYGON", srid=4326), nullable=True)
+
+    lat = column_property(func.ST_Y(cast(location, Geometry)))
+    lng = column_property(func.ST_X(cast(location, Geometry)))
+    geofence_geojson = column_property(func.ST_AsGeoJSON(geofence))
+
+    company = relationship("Company", back_populates="branches")
@@ -36,6 +36,8 @@ class Company(Base):
     # Novo: URL do site e flag “venda apenas online”
     online_url = Column(String(255), nullable=True)     # URL do site (opcional)
     only_online = Column(Boolean, default=False, nullable=False)
+    # fuso IANA dos dashboards (None → METRICS_DEFAULT_TIMEZONE)
+    timezone = Column(String(64), nullable=True)
 
     accepted_terms = Column(Boolean, default=False, nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -0,0 +1,20 @@
+# app/models/digital_behavior_event.py
+from sqlalchemy import Column, String, Integer, DateTime, ForeignKey
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+from app.db.base import Base
+
+class DigitalBehaviorEvent(Base):
+    """
+    Eventos digital_behavior recebidos em lote (dedupe pelo id do evento
+    enviado pelo parceiro, por empresa) e o resultado de cada um.
+    """
+    __tablename__ = "digital_behavior_events"
+
+    company_id = Column(UUID(as_uuid=True), ForeignKey("companies.id", ondelete="CASCADE"), primary_key=True)
+    event_id   = Column(String(100), primary_key=True)
+    rule_id    = Column(UUID(as_uuid=True), ForeignKey("points_rules.id", ondelete="SET NULL"), nullable=True)
+    user_id    = Column(UUID(as_uuid=True), nullable=False)
+    status     = Column(String(30), nullable=False)
+    points     = Column(Integer, nullable=False, server_default="0")
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, index=True)
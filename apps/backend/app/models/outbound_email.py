@@ -0,0 +1,41 @@
+# app/models/outbound_email.py
+import enum
+from uuid import uuid4
+from sqlalchemy import Column, String, Integer, Text, DateTime, Enum, Index
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy.sql import func
+from app.db.base import Base
+
+class EmailStatus(str, enum.Enum):
+    pending = "pending"
+    sent    = "sent"
+    failed  = "failed"
+
+class OutboundEmail(Base):
+    """
+    Fila durável de e-mails. A API só insere a linha; o envio é feito
+    pelo worker (app/workers/email_worker.py).
+    """
+    __tablename__ = "outbound_emails"
+
+    id               = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
+    to_address       = Column(String(255), nullable=False)
+    subject          = Column(String(255), nullable=False)
+
+    # ou HTML pronto, ou template + contexto (renderizado no worker)
+    html             = Column(Text, nullable=True)
+    template_name    = Column(String(120), nullable=True)
+    template_context = Column(JSONB, nullable=True)
+
+    status           = Column(Enum(EmailStatus), nullable=False, default=EmailStatus.pending)
+    attempts         = Column(Integer, nullable=False, default=0)
+    max_attempts     = Column(Integer, nullable=False, default=5)
+    next_attempt_at  = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    last_error       = Column(Text, nullable=True)
+
+    created_at       = Column(DateTime(timezone=True), server_default=func.now())
+    sent_at          = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        Index("ix_outbound_emails_status_next_attempt", "status", "next_attempt_at"),
+    )
@@ -0,0 +1,15 @@
+# app/models/payment_webhook_event.py
+from sqlalchemy import Column, String, DateTime
+from sqlalchemy.sql import func
+from app.db.base import Base
+
+class PaymentWebhookEvent(Base):
+    """
+    Eventos de webhook da Asaas já recebidos (dedupe por id do evento).
+    """
+    __tablename__ = "payment_webhook_events"
+
+    event_id    = Column(String(120), primary_key=True)
+    event       = Column(String(60), nullable=False)
+    asaas_id    = Column(String(255), nullable=True, index=True)
+    received_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -1,7 +1,7 @@
 # backend/app/models/points_rule.py
 from uuid import uuid4
 from enum import Enum as PyEnum
-from sqlalchemy import Column, ForeignKey, Text, Boolean, DateTime, Enum as SAEnum
+from sqlalchemy import Column, ForeignKey, Text, Boolean, DateTime, Enum as SAEnum, Index
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
@@ -28,9 +28,16 @@ class PointsRule(Base):
     description = Column(Text, nullable=True)
     rule_type   = Column(SAEnum(RuleType, name="rule_type"), nullable=False)
     config      = Column(JSONB, nullable=False)
+    # slug das regras digital_behavior (cópia de config["slug"]), único no sistema todo
+    slug        = Column(Text, nullable=True, unique=True, index=True)
     active      = Column(Boolean, default=True, nullable=False)
     visible     = Column(Boolean, default=True, nullable=False)
     created_at  = Column(DateTime(timezone=True), server_default=func.now())
     updated_at  = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
+    __table_args__ = (
+        # listagem admin keyset (created_at desc, id desc)
+        Index("ix_points_rules_created_at_id", "created_at", "id"),
+    )
+
     company     = relationship("Company", back_populates="points_rules")
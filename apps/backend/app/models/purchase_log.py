@@ -1,6 +1,6 @@
 # backend/app/models/purchase_log.py
 from uuid import uuid4
-from sqlalchemy import Column, Numeric, DateTime, ForeignKey
+from sqlalchemy import Column, Numeric, DateTime, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.sql import func
 from app.db.base import Base
@@ -15,4 +15,11 @@ class PurchaseLog(Base):
     item_ids   = Column(JSONB, nullable=True)  
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
- 
+    __table_args__ = (
+        # dashboards: período da empresa com leitura só do índice
+        Index(
+            "ix_purchase_logs_company_created_at",
+            "company_id", "created_at",
+            postgresql_include=["user_id", "amount"],
+        ),
+    )
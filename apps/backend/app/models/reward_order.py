@@ -1,7 +1,7 @@
 # app/models/reward_order.py
 from uuid import uuid4
 from enum import Enum
-from sqlalchemy import Column, String, Integer, DateTime, Enum as PgEnum, ForeignKey
+from sqlalchemy import Column, String, Integer, Boolean, DateTime, Enum as PgEnum, ForeignKey, UniqueConstraint, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
@@ -30,8 +30,19 @@ class RewardOrder(Base):
     postal_code   = Column(String(10),  nullable=False)
     complement    = Column(String(120), nullable=True)
 
+    # chave enviada pelo cliente: repetir o POST devolve o mesmo pedido
+    idempotency_key = Column(String(64), nullable=True)
+
     created_at    = Column(DateTime(timezone=True), server_default=func.now())
 
+    __table_args__ = (
+        UniqueConstraint("user_id", "idempotency_key", name="uq_reward_orders_user_idempotency_key"),
+        # listagens keyset (created_at desc, id desc), geral e por status/usuário
+        Index("ix_reward_orders_created_at_id", "created_at", "id"),
+        Index("ix_reward_orders_status_created_at_id", "status", "created_at", "id"),
+        Index("ix_reward_orders_user_created_at_id", "user_id", "created_at", "id"),
+    )
+
     items = relationship("RewardOrderItem", back_populates="order", cascade="all, delete-orphan")
     user  = relationship("User", back_populates="reward_orders")
 
@@ -42,6 +53,8 @@ class RewardOrderItem(Base):
     order_id   = Column(UUID(as_uuid=True), ForeignKey("reward_orders.id", ondelete="CASCADE"), nullable=False)
     product_id = Column(UUID(as_uuid=True), ForeignKey("reward_products.id", ondelete="CASCADE"), nullable=False)
     quantity   = Column(Integer, nullable=False, default=1)
+    # True se a quantidade saiu de reward_products.stock_qty (devolvida na recusa)
+    reserved   = Column(Boolean, nullable=False, default=False, server_default="false")
 
     order      = relationship("RewardOrder", back_populates="items")
     product    = relationship("RewardProduct")
@@ -1,6 +1,6 @@
 # app/models/reward_product.py
 from uuid import uuid4
-from sqlalchemy import Column, String, Integer, Text, Boolean, DateTime, ForeignKey, Table
+from sqlalchemy import Column, String, Integer, Text, Boolean, DateTime, ForeignKey, Table, CheckConstraint
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
@@ -22,11 +22,16 @@ class RewardProduct(Base):
     short_desc  = Column(String(255), nullable=True)
     long_desc   = Column(Text, nullable=True)
     points_cost = Column(Integer, nullable=False)
+    stock_qty   = Column(Integer, nullable=True)     # None → ilimitado
     image_url   = Column(String(255), nullable=True)
     pdf_url     = Column(String(255), nullable=True)
     active      = Column(Boolean, nullable=False, server_default="true", index=True)
     created_at  = Column(DateTime(timezone=True), server_default=func.now())
 
+    __table_args__ = (
+        CheckConstraint("stock_qty IS NULL OR stock_qty >= 0", name="ck_reward_products_stock_qty"),
+    )
+
     categories  = relationship(
         "RewardCategory",
         secondary=reward_product_categories,
@@ -1,7 +1,7 @@
 # backend/app/models/user_points_transaction.py
 from uuid import uuid4
 from enum import Enum
-from sqlalchemy import Column, ForeignKey, Integer, DateTime, Text, Enum as PgEnum
+from sqlalchemy import Column, ForeignKey, Integer, DateTime, Text, Enum as PgEnum, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
@@ -25,6 +25,11 @@ class UserPointsTransaction(Base):
     description = Column(Text, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
+    __table_args__ = (
+        # transações de uma regra no admin, keyset (created_at desc, id desc)
+        Index("ix_user_points_transactions_rule_created_at_id", "rule_id", "created_at", "id"),
+    )
+
     wallet = relationship("UserPointsWallet", back_populates="transactions")
     rule = relationship("PointsRule")
     company = relationship("Company", viewonly=True)
\ No newline at end of file
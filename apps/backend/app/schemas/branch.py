@@ -1,17 +1,63 @@
 ### backend/app/schemas/branch.py ###
+import json
 from uuid import UUID
 from datetime import datetime
-from pydantic import BaseModel, ConfigDict
+from typing import List, Optional
+from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
+
+class GeoPoint(BaseModel):
+    lat: float = Field(..., ge=-90, le=90)
+    lng: float = Field(..., ge=-180, le=180)
 
 class BranchBase(BaseModel):
     name: str
     slug: str
+    street: Optional[str] = None
+    number: Optional[str] = None
+    neighborhood: Optional[str] = None
+    city: Optional[str] = None
+    state: Optional[str] = None
+    postal_code: Optional[str] = None
 
 class BranchCreate(BranchBase):
-    pass
+    # ponto manual; sem ele e com endereço/CEP, a filial é geocodificada em background
+    lat: Optional[float] = Field(None, ge=-90, le=90)
+    lng: Optional[float] = Field(None, ge=-180, le=180)
+    # vértices do polígono (fechado automaticamente); sem polígono vale ponto + raio
+    geofence: Optional[List[GeoPoint]] = None
+
+    @model_validator(mode="after")
+    def check_point(self):
+        if (self.lat is None) != (self.lng is None):
+            raise ValueError("Informe lat e lng juntos")
+        return self
+
+    @field_validator("geofence")
+    @classmethod
+    def check_geofence(cls, v):
+        if v is None:
+            return None
+        if len({(p.lat, p.lng) for p in v}) < 3:
+            raise ValueError("O polígono precisa de pelo menos 3 vértices distintos")
+        return v
+
+    def has_address(self) -> bool:
+        return any([self.street, self.number, self.neighborhood, self.city, self.state, self.postal_code])
 
 class BranchRead(BranchBase):
     id: UUID
     company_id: UUID
     created_at: datetime
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+    lat: Optional[float] = None
+    lng: Optional[float] = None
+    geofence: Optional[List[GeoPoint]] = Field(None, validation_alias="geofence_geojson")
+    model_config = ConfigDict(from_attributes=True)
+
+    @field_validator("geofence", mode="before")
+    @classmethod
+    def parse_geofence(cls, v):
+        # vem do banco como GeoJSON (ST_AsGeoJSON); só o anel externo
+        if not isinstance(v, str):
+            return v
+        ring = json.loads(v)["coordinates"][0][:-1]
+        return [{"lat": lat, "lng": lng} for lng, lat in ring]
@@ -1,5 +1,6 @@
 from typing import Optional, List
-from pydantic import BaseModel, ConfigDict, field_validator
+from pydantic import BaseModel, ConfigDict, field_validator, computed_field
+from app.services.image_service import variant_urls
 from uuid import UUID
 
 class CategoryBase(BaseModel):
@@ -21,6 +22,11 @@ class CategoryCreate(CategoryBase):
 
 class CategoryRead(CategoryBase):
     id: UUID
+    @computed_field
+    @property
+    def image_variants(self) -> Optional[dict[str, str]]:
+        return variant_urls(self.image_url)
+
     model_config = ConfigDict(from_attributes=True)
 
 
@@ -14,6 +14,8 @@ from pydantic import (
 )
 
 from app.schemas.category import CategoryRead
+from app.services.image_service import variant_urls
+from app.core.time_range import validate_timezone
 
 
 class CompanyBase(BaseModel):
@@ -31,6 +33,7 @@ class CompanyBase(BaseModel):
     description: Optional[str] = None
     online_url: Optional[HttpUrl] = None
     only_online: bool = False
+    timezone: Optional[str] = None
     primary_category_id: UUID | None = None
     primary_category: CategoryRead | None = None
 
@@ -44,6 +47,11 @@ class CompanyBase(BaseModel):
                 return None
         return v
 
+    @field_validator("timezone")
+    @classmethod
+    def check_timezone(cls, v):
+        return validate_timezone(v) if v else None
+
     @field_validator("cnpj", mode="before")
     @classmethod
     def normalize_cnpj(cls, v: str) -> str:
@@ -77,6 +85,11 @@ class CompanyRead(CompanyBase):
     def phone_verified(self) -> bool:
         return self.phone_verified_at is not None
 
+    @computed_field
+    @property
+    def logo_variants(self) -> Optional[dict[str, str]]:
+        return variant_urls(self.logo_url)
+
     model_config = ConfigDict(from_attributes=True)
 
 
@@ -101,6 +114,12 @@ class CompanyUpdate(BaseModel):
     category_ids: Optional[List[UUID]] = None
     online_url: Optional[HttpUrl] = None
     only_online: Optional[bool] = None
+    timezone: Optional[str] = None
+
+    @field_validator("timezone")
+    @classmethod
+    def check_timezone_update(cls, v):
+        return validate_timezone(v) if v else None
 
     @field_validator("online_url", mode="before")
     @classmethod
@@ -137,4 +156,9 @@ class CompanyBasic(BaseModel):
     cnpj: Optional[str] = None
     logo_url: Optional[str] = None
 
+    @computed_field
+    @property
+    def logo_variants(self) -> Optional[dict[str, str]]:
+        return variant_urls(self.logo_url)
+
     model_config = ConfigDict(from_attributes=True)
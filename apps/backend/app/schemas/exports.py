@@ -0,0 +1,68 @@
+# backend/app/schemas/exports.py
+from datetime import date, datetime
+from enum import Enum
+from typing import Optional
+from uuid import UUID
+
+from pydantic import BaseModel, ConfigDict
+
+from app.models.commission import CommissionWithdrawalStatus
+from app.models.user_points_transaction import UserPointsTxType
+
+
+class ExportFormat(str, Enum):
+    csv = "csv"
+    xlsx = "xlsx"
+
+
+class ExportMode(str, Enum):
+    auto = "auto"      # stream até EXPORTS_STREAM_MAX_ROWS linhas, job acima disso
+    stream = "stream"
+    job = "job"
+
+
+class ExportJobRead(BaseModel):
+    token: str
+    report: str
+    format: ExportFormat
+    status: str  # pending | running | done | failed | expired
+    download_url: Optional[str] = None
+    error: Optional[str] = None
+    created_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+
+# ---------- parâmetros de cada relatório (query string) ----------
+
+class _ExportParams(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+
+class CouponUsageExportParams(_ExportParams):
+    coupon_id: UUID
+    date_from: date
+    date_to: date
+
+
+class RevenuePerUserExportParams(_ExportParams):
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+
+
+class LoyaltyInstancesExportParams(_ExportParams):
+    template_id: Optional[UUID] = None
+    status: Optional[str] = None  # active | completed
+
+
+class RuleTransactionsExportParams(_ExportParams):
+    rule_id: UUID
+    company_id: Optional[UUID] = None
+    type: Optional[UserPointsTxType] = None
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+
+
+class CommissionWithdrawalsExportParams(_ExportParams):
+    status: Optional[CommissionWithdrawalStatus] = None
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
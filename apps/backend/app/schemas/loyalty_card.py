@@ -6,6 +6,7 @@ from typing import List, Optional
 from pydantic import BaseModel, ConfigDict, Field, computed_field
 from app.schemas.reward import LinkRead
 from app.schemas.company import CompanyBasic
+from app.services.image_service import variant_urls
 from app.schemas.reward import RewardRedemptionRead
 
 # ─── shared ----------------------------------------------------
@@ -49,6 +50,11 @@ class TemplateRead(TemplateBase):
     rules: List[RuleRead] = []
     rewards_map:  List[LinkRead]    = [] 
     company:    CompanyBasic  
+    @computed_field
+    @property
+    def stamp_icon_variants(self) -> Optional[dict[str, str]]:
+        return variant_urls(self.stamp_icon_url)
+
     model_config = ConfigDict(from_attributes=True)
 
 # ─── instance --------------------------------------------------
@@ -1,6 +1,8 @@
 from uuid import UUID
 from datetime import datetime
-from pydantic import BaseModel, ConfigDict
+from typing import Optional
+from pydantic import BaseModel, ConfigDict, computed_field
+from app.services.image_service import variant_urls
 
 # --- Admin / público -----------------------------------------
 class MilestoneBase(BaseModel):
@@ -21,6 +23,11 @@ class MilestoneRead(MilestoneBase):
     image_url: str
     created_at: datetime
     updated_at: datetime
+    @computed_field
+    @property
+    def image_variants(self) -> Optional[dict[str, str]]:
+        return variant_urls(self.image_url)
+
     model_config = ConfigDict(from_attributes=True)
 
 class PaginatedMilestone(BaseModel):
@@ -17,6 +17,7 @@ class PurchaseMetricRead(BaseModel):
     total_sales: float
     avg_ticket: float
     unique_buyers: int
+    unique_buyers_approximate: bool = False  # HyperLogLog em períodos longos
     avg_purchases_per_user: float
     sales_by_day: List[SaleByDay]
     model_config = ConfigDict(from_attributes=True)
@@ -2,7 +2,8 @@
 from uuid import UUID
 from datetime import datetime
 from typing import Optional
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, computed_field
+from app.services.image_service import variant_urls
 
 # ─── reward ----------------------------------------------------
 class RewardBase(BaseModel):
@@ -20,6 +21,11 @@ class RewardRead(RewardBase):
     company_id: UUID
     created_at: datetime
     updated_at: datetime
+    @computed_field
+    @property
+    def image_variants(self) -> Optional[dict[str, str]]:
+        return variant_urls(self.image_url)
+
     model_config = ConfigDict(from_attributes=True)
 
 
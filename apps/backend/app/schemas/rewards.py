@@ -2,7 +2,8 @@
 from uuid import UUID
 from typing import List, Optional
 from datetime import datetime
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field, computed_field
+from app.services.image_service import variant_urls
 
 # ---------- Categorias ----------
 class RewardCategoryBase(BaseModel):
@@ -26,17 +27,25 @@ class RewardProductBase(BaseModel):
     category_ids: List[UUID] = []
     active: bool = True
 
-class RewardProductCreate(RewardProductBase): ...
+class RewardProductCreate(RewardProductBase):
+    stock_qty: Optional[int] = Field(None, ge=0)   # None → ilimitado
 
+# estoque só muda por PATCH /admin/products/{id}/stock (set_product_stock)
 class RewardProductUpdate(RewardProductBase): ...
 
 class RewardProductRead(RewardProductBase):
     id: UUID
+    stock_qty: Optional[int] = None
     image_url: Optional[str]
     pdf_url:   Optional[str]
     created_at: datetime
     categories: List[RewardCategoryRead]
     active: bool
+    @computed_field
+    @property
+    def image_variants(self) -> Optional[dict[str, str]]:
+        return variant_urls(self.image_url)
+
     model_config = ConfigDict(from_attributes=True)
 
 # ---------- Pedidos ----------
@@ -52,10 +61,12 @@ class Address(BaseModel):
 
 class OrderItemPayload(BaseModel):
     product_id: UUID
-    quantity: int = 1
+    quantity: int = Field(1, ge=1)
 
 class RewardOrderCreate(Address):
-    items: List[OrderItemPayload]
+    items: List[OrderItemPayload] = Field(..., min_length=1)
+    # repetir o POST com a mesma chave devolve o pedido já criado
+    idempotency_key: Optional[str] = Field(None, max_length=64)
 
 class RewardOrderItemRead(BaseModel):
     product: RewardProductRead
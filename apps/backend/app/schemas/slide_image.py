@@ -1,7 +1,8 @@
 from uuid import UUID
 from datetime import datetime
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, computed_field
 from typing import Optional, List
+from app.services.image_service import variant_urls
 
 class SlideImageBase(BaseModel):
     title: str
@@ -20,6 +21,11 @@ class SlideImageRead(SlideImageBase):
     created_at: datetime
     updated_at: Optional[datetime]
 
+    @computed_field
+    @property
+    def image_variants(self) -> Optional[dict[str, str]]:
+        return variant_urls(self.image_url)
+
     model_config = ConfigDict(from_attributes=True)
 
 class PaginatedSlideImage(BaseModel):
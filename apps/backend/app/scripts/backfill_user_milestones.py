@@ -0,0 +1,57 @@
+# apps/backend/app/scripts/backfill_user_milestones.py
+#
+# Uso: python -m app.scripts.backfill_user_milestones [--rebuild-stats]
+#
+# Rode uma vez no deploy: os marcos passaram a ser concedidos no crédito de
+# pontos (points_rule_service.credit_user_points) e as leituras não gravam
+# mais nada. Este script concede os marcos já atingidos por quem pontuou
+# antes disso.
+#
+# --rebuild-stats recalcula user_points_stats.lifetime_points a partir das
+# transações `award` antes de conceder (o lifetime não era mantido pela API).
+
+import argparse
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from app.db.session import SessionLocal
+from app.models.user_points_stats import UserPointsStats
+from app.models.user_points_transaction import UserPointsTransaction, UserPointsTxType
+from app.services.milestone_service import backfill_user_milestones
+
+
+def rebuild_lifetime_points(db) -> int:
+    totals = (
+        select(
+            UserPointsTransaction.user_id,
+            func.sum(UserPointsTransaction.amount).label("points"),
+        )
+        .where(UserPointsTransaction.type == UserPointsTxType.award)
+        .group_by(UserPointsTransaction.user_id)
+        .subquery()
+    )
+    stmt = pg_insert(UserPointsStats).from_select(
+        ["id", "user_id", "lifetime_points"],
+        select(func.gen_random_uuid(), totals.c.user_id, totals.c.points),
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[UserPointsStats.user_id],
+        set_={"lifetime_points": stmt.excluded.lifetime_points, "updated_at": UserPointsStats.updated_at},
+    )
+    result = db.execute(stmt)
+    db.commit()
+    return result.rowcount
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Concede marcos já atingidos")
+    parser.add_argument("--rebuild-stats", action="store_true", help="recalcula lifetime_points antes")
+    args = parser.parse_args()
+
+    with SessionLocal() as db:
+        if args.rebuild_stats:
+            print(f"lifetime_points recalculado para {rebuild_lifetime_points(db)} usuários")
+        print(f"{backfill_user_milestones(db)} marcos ativos processados")
+
+
+if __name__ == "__main__":
+    main()
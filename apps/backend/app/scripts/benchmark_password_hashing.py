@@ -0,0 +1,69 @@
+# apps/backend/app/scripts/benchmark_password_hashing.py
+#
+# Uso: python -m app.scripts.benchmark_password_hashing [n_hashes]
+# Mede hashes/s do pool de argon2 com os parâmetros atuais de Settings
+# e a memória de pico consumida por um hash.
+
+import sys
+import time
+import resource
+from concurrent.futures import ProcessPoolExecutor
+from argon2 import PasswordHasher
+from app.core.config import settings
+from app.core import password_hashing
+
+
+def _peak_rss_kib() -> int:
+    # no Linux ru_maxrss vem em KiB
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def _memory_per_hash_kib() -> int:
+    before = _peak_rss_kib()
+    PasswordHasher(
+        time_cost=settings.ARGON2_TIME_COST,
+        memory_cost=settings.ARGON2_MEMORY_COST,
+        parallelism=settings.ARGON2_PARALLELISM,
+    ).hash("benchmark-password")
+    return _peak_rss_kib() - before
+
+
+def run(n_hashes: int = 50):
+    print(
+        f"argon2 time_cost={settings.ARGON2_TIME_COST} "
+        f"memory_cost={settings.ARGON2_MEMORY_COST}KiB "
+        f"parallelism={settings.ARGON2_PARALLELISM} "
+        f"workers={settings.PASSWORD_HASH_WORKERS}"
+    )
+
+    # memória medida num processo limpo, para não herdar o pico do pai
+    with ProcessPoolExecutor(max_workers=1) as probe:
+        mem_kib = probe.submit(_memory_per_hash_kib).result()
+    print(f"memória por hash: ~{mem_kib / 1024:.1f} MiB")
+
+    # aquece o pool (spawn dos processos fora da medição)
+    password_hashing.hash_password("warmup")
+
+    start = time.perf_counter()
+    hashes = [password_hashing.hash_password(f"pwd-{i}") for i in range(n_hashes)]
+    seq_elapsed = time.perf_counter() - start
+    print(f"sequencial: {n_hashes / seq_elapsed:.1f} hashes/s")
+
+    pool = password_hashing.get_pool()
+    if pool is not None:
+        start = time.perf_counter()
+        list(pool.map(password_hashing._hash_in_worker, [f"pwd-{i}" for i in range(n_hashes)]))
+        par_elapsed = time.perf_counter() - start
+        print(f"paralelo ({settings.PASSWORD_HASH_WORKERS} workers): {n_hashes / par_elapsed:.1f} hashes/s")
+
+    start = time.perf_counter()
+    for i, h in enumerate(hashes):
+        password_hashing.verify_password(h, f"pwd-{i}")
+    verify_elapsed = time.perf_counter() - start
+    print(f"verify: {n_hashes / verify_elapsed:.1f} verificações/s")
+
+    password_hashing.shutdown_pool()
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 50)
@@ -0,0 +1,109 @@
+# apps/backend/app/scripts/benchmark_serialization.py
+#
+# Uso: python -m app.scripts.benchmark_serialization [--rows 200] [--iterations 200]
+#
+# Compara, para as listagens admin mais pesadas, o custo de transformar uma
+# página de linhas SQL em bytes JSON:
+#   pydantic+json     – modelo por linha, revalidação do response_model e
+#                       json.dumps (caminho antigo do FastAPI)
+#   pydantic+orjson   – idem, mas com ORJSONResponse
+#   trusted_rows      – mappings direto para orjson (app.core.serialization)
+
+import argparse
+import json
+import time
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from enum import Enum
+from uuid import uuid4
+import orjson
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+from app.core.serialization import trusted_rows
+from app.schemas.loyalty_card import CompletedCardAdmin, TemplateStatsAdmin
+from app.schemas.coupon_admin import CouponStatsAdmin
+
+
+class _DiscountType(str, Enum):
+    percent = "percent"
+    fixed = "fixed"
+
+
+def _completed_card(i: int) -> dict:
+    issued = datetime.now(timezone.utc) - timedelta(days=30, minutes=i)
+    return {
+        "id": uuid4(), "template_id": uuid4(), "template_title": f"Cartão {i}",
+        "stamp_total": 10, "user_id": uuid4(), "user_name": f"Usuário {i}",
+        "user_email": f"user{i}@exemplo.com", "company_id": uuid4(),
+        "company_name": f"Empresa {i % 17}", "issued_at": issued,
+        "completed_at": issued + timedelta(days=7), "expires_at": None,
+        "stamps_given": 10, "total_rewards": 2, "redeemed_count": 1, "pending_count": 1,
+        "last_stamp_at": issued + timedelta(days=7), "time_to_complete_seconds": 604800,
+    }
+
+
+def _template_stats(i: int) -> dict:
+    created = datetime.now(timezone.utc) - timedelta(days=90, hours=i)
+    return {
+        "template_id": uuid4(), "template_title": f"Cartão {i}", "company_id": uuid4(),
+        "company_name": f"Empresa {i % 17}", "active": True, "created_at": created,
+        "updated_at": created, "stamp_total": 10, "per_user_limit": 1,
+        "emission_start": None, "emission_end": None, "emission_limit": None,
+        "issued_total": 1000 + i, "active_instances": 700, "completed_instances": 300 + i,
+        "unique_users": 650, "last_issued_at": created + timedelta(days=80),
+    }
+
+
+def _coupon_stats(i: int) -> dict:
+    created = datetime.now(timezone.utc) - timedelta(days=60, hours=i)
+    return {
+        "coupon_id": uuid4(), "company_id": uuid4(), "company_name": f"Empresa {i % 17}",
+        "name": f"Cupom {i}", "code": f"CUPOM{i:04d}", "is_active": True, "is_visible": True,
+        "usage_limit_total": 1000, "usage_limit_per_user": 1,
+        "min_order_amount": Decimal("50.00"), "discount_type": _DiscountType.percent,
+        "discount_value": Decimal("10.00"), "created_at": created, "updated_at": created,
+        "used_count": 120 + i, "unique_users": 110, "total_discount_applied": Decimal("1234.56"),
+        "total_amount": Decimal("23456.78"), "last_redemption_at": created + timedelta(days=50),
+    }
+
+
+def _legacy(model, rows, dumps) -> bytes:
+    # o endpoint monta um modelo por linha...
+    items = [model(**{k: (float(v) if isinstance(v, Decimal) else (v.value if isinstance(v, Enum) else v))
+                      for k, v in r.items()}) for r in rows]
+    # ...e o FastAPI revalida pelo response_model antes de codificar
+    validated = TypeAdapter(list[model]).validate_python([i.model_dump() for i in items])
+    return dumps(jsonable_encoder(validated))
+
+
+def _bench(label: str, fn, iterations: int, rows: int) -> None:
+    fn()  # aquecimento
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    elapsed = time.perf_counter() - start
+    per_page = elapsed / iterations * 1000
+    print(f"  {label:<16} {per_page:8.2f} ms/página  {rows * iterations / elapsed:10.0f} linhas/s")
+
+
+def run(rows: int, iterations: int) -> None:
+    json_dumps = lambda c: json.dumps(c, ensure_ascii=False, separators=(",", ":")).encode()
+    cases = [
+        ("platform_list_completed_cards", CompletedCardAdmin, _completed_card),
+        ("platform_list_template_stats", TemplateStatsAdmin, _template_stats),
+        ("platform_list_coupon_stats", CouponStatsAdmin, _coupon_stats),
+    ]
+    for name, model, factory in cases:
+        data = [factory(i) for i in range(rows)]
+        print(f"{name} ({rows} linhas)")
+        _bench("pydantic+json", lambda: _legacy(model, data, json_dumps), iterations, rows)
+        _bench("pydantic+orjson", lambda: _legacy(model, data, orjson.dumps), iterations, rows)
+        _bench("trusted_rows", lambda: trusted_rows(model, data).body, iterations, rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark de serialização das listagens admin")
+    parser.add_argument("--rows", type=int, default=200)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+    run(args.rows, args.iterations)
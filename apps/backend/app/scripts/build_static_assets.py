@@ -0,0 +1,20 @@
+# apps/backend/app/scripts/build_static_assets.py
+#
+# Uso: python -m app.scripts.build_static_assets
+#
+# Rode no deploy (depois de atualizar app/static): gera as cópias versionadas
+# dos assets fixos, os .gz/.br dos arquivos textuais e o manifest.json
+# consultado por app.core.static_files.asset_url.
+
+from app.core.static_files import build_manifest, STATIC_DIR, HAS_BROTLI
+
+
+def run():
+    manifest = build_manifest(STATIC_DIR)
+    for name, fingerprinted in manifest.items():
+        print(f"{name} → {fingerprinted}")
+    print(f"{len(manifest)} assets no manifest" + ("" if HAS_BROTLI else " (brotli indisponível: só .gz)"))
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,98 @@
+# apps/backend/app/scripts/check_admin_listings.py
+#
+# Uso: python -m app.scripts.check_admin_listings [--page-size 50] [--max-rows 20000]
+#          [--status pending]
+#
+# Percorre as listagens administrativas (pedidos e regras) página a página
+# pelo cursor e confere que saem as mesmas linhas, na mesma ordem, que a
+# consulta antiga com ORDER BY created_at DESC, id DESC; mostra também o
+# total estimado/limitado contra o exato e o nº de consultas por página
+# (selectinload: 4 por página de pedidos, sem N+1). Só lê o banco.
+
+import argparse
+import sys
+import time
+from sqlalchemy import event, func, select
+from app.db.session import SessionLocal
+from app.models.points_rule import PointsRule
+from app.models.reward_order import OrderStatus, RewardOrder
+from app.services.points_admin_service import list_all_rules
+from app.services.reward_service import admin_list_orders
+
+
+def _walk(fetch, page_size: int, max_rows: int) -> tuple[list, list[int], float]:
+    ids, pages, cursor = [], [], None
+    started = time.perf_counter()
+    while len(ids) < max_rows:
+        page, queries = fetch(page_size, cursor)
+        pages.append(queries)
+        ids += [row.id if hasattr(row, "id") else row["id"] for row in page.rows]
+        cursor = page.next_cursor
+        if not cursor:
+            break
+    return ids[:max_rows], pages, time.perf_counter() - started
+
+
+def _counting(db, call):
+    queries = []
+    listener = lambda *args: queries.append(1)
+    event.listen(db.get_bind(), "before_cursor_execute", listener)
+    try:
+        result = call()
+        # acessa itens/produtos: com selectinload não dispara consultas novas
+        for row in result.rows:
+            for item in getattr(row, "items", []):
+                item.product.categories
+    finally:
+        event.remove(db.get_bind(), "before_cursor_execute", listener)
+    return result, len(queries)
+
+
+def check(name, db, fetch, expected, exact_total, page_size, max_rows) -> bool:
+    ids, pages, elapsed = _walk(fetch, page_size, max_rows)
+    first = fetch(page_size, None)[0]
+    same = ids == expected[:max_rows]
+    print(f"{'ok  ' if same else 'FAIL'} {name}: {len(ids)} linhas em {len(pages)} páginas, "
+          f"{elapsed * 1000 / max(len(pages), 1):.1f} ms/página, "
+          f"consultas/página {max(pages)}; total {first.total}"
+          f"{' (estimado)' if first.total_estimated else ''} vs exato {exact_total}")
+    return same
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Paridade das listagens admin com keyset")
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--max-rows", type=int, default=20000)
+    parser.add_argument("--status", type=OrderStatus, help="filtro de status dos pedidos")
+    args = parser.parse_args()
+
+    with SessionLocal() as db:
+        order_filters = [RewardOrder.status == args.status] if args.status else []
+        expected_orders = list(db.execute(
+            select(RewardOrder.id).where(*order_filters)
+            .order_by(RewardOrder.created_at.desc(), RewardOrder.id.desc())
+            .limit(args.max_rows)
+        ).scalars())
+        total_orders = db.execute(select(func.count()).select_from(RewardOrder).where(*order_filters)).scalar()
+        expected_rules = list(db.execute(
+            select(PointsRule.id)
+            .order_by(PointsRule.created_at.desc(), PointsRule.id.desc())
+            .limit(args.max_rows)
+        ).scalars())
+        total_rules = db.execute(select(func.count()).select_from(PointsRule)).scalar()
+
+        ok = check(
+            "pedidos", db,
+            lambda n, after: _counting(db, lambda: admin_list_orders(db, args.status, limit=n, after=after)),
+            expected_orders, total_orders, args.page_size, args.max_rows,
+        )
+        ok &= check(
+            "regras", db,
+            lambda n, after: _counting(db, lambda: list_all_rules(db, limit=n, after=after)),
+            expected_rules, total_rules, args.page_size, args.max_rows,
+        )
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
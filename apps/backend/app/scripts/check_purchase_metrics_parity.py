@@ -0,0 +1,140 @@
+# apps/backend/app/scripts/check_purchase_metrics_parity.py
+#
+# Uso: python -m app.scripts.check_purchase_metrics_parity [--company ID]
+#          [--start 2025-01-01] [--end 2025-08-31] [--tz America/Sao_Paulo]
+#          [--companies 20] [--page-size 7]
+#
+# Confere que purchase_metrics_service (GROUPING SETS + keyset) devolve o
+# mesmo que as consultas antigas (intervalo fechado até 23:59:59.999999,
+# uma varredura por métrica, ranking sem limite) para as empresas com mais
+# compras. Só lê o banco.
+# O distinto aproximado (HLL) não entra: aqui é sempre exato.
+
+import argparse
+import sys
+from datetime import date, datetime
+from sqlalchemy import func, select
+from app.db.session import SessionLocal
+from app.models.purchase_log import PurchaseLog
+from app.core.time_range import TimeRange, month_to_date, resolve_timezone
+from app.services.purchase_metrics_service import (
+    get_purchase_chart,
+    get_purchase_metrics,
+    get_purchases_per_user,
+    get_revenue_per_user,
+)
+
+
+def _legacy(db, company_id, period: TimeRange) -> dict:
+    """
+    As consultas como eram antes: intervalo fechado [00:00, 23:59:59.999999]
+    montado com datetime.combine e comparado com <=; só o fuso é o mesmo do
+    serviço novo, para os dias baterem.
+    """
+    tz = period.tz
+    sdt = datetime.combine(period.start_date, datetime.min.time(), tzinfo=tz)
+    edt = datetime.combine(period.end_date, datetime.max.time(), tzinfo=tz)
+    base = (
+        PurchaseLog.company_id == company_id,
+        PurchaseLog.created_at >= sdt,
+        PurchaseLog.created_at <= edt,
+    )
+    day_trunc = func.date_trunc("day", func.timezone(tz.key, PurchaseLog.created_at))
+
+    def by_user(metric) -> dict:
+        return {
+            str(uid): value for uid, value in
+            db.query(PurchaseLog.user_id, metric).filter(*base).group_by(PurchaseLog.user_id).all()
+        }
+
+    return {
+        "total_purchases": db.query(func.count(PurchaseLog.id)).filter(*base).scalar() or 0,
+        "total_sales": float(
+            db.query(func.coalesce(func.sum(PurchaseLog.amount), 0)).filter(*base).scalar()
+        ),
+        "unique_buyers": db.query(PurchaseLog.user_id).filter(*base).distinct().count(),
+        "series": [
+            (r.day.date(), r.n, float(r.revenue)) for r in
+            db.query(
+                day_trunc.label("day"),
+                func.count(PurchaseLog.id).label("n"),
+                func.coalesce(func.sum(PurchaseLog.amount), 0).label("revenue"),
+            )
+            .filter(*base)
+            .group_by(day_trunc)
+            .order_by(day_trunc)
+            .all()
+        ],
+        "count_by_user": by_user(func.count(PurchaseLog.id)),
+        "revenue_by_user": {k: float(v) for k, v in by_user(func.sum(PurchaseLog.amount)).items()},
+    }
+
+
+def _all_pages(fetch, page_size: int) -> list:
+    items, cursor = fetch(page_size, None)
+    while cursor:
+        page, cursor = fetch(page_size, cursor)
+        items += page
+    return items
+
+
+def check_company(db, company_id, period: TimeRange, page_size: int) -> bool:
+    sd, ed, tz = period.start_date, period.end_date, period.tz
+    old = _legacy(db, company_id, period)
+    new = get_purchase_metrics(db, company_id, sd, ed, approximate=False, tz=tz)
+    chart = get_purchase_chart(db, company_id, sd, ed, tz=tz)
+    counts = _all_pages(
+        lambda n, after: get_purchases_per_user(db, company_id, sd, ed, n, after, tz), page_size
+    )
+    revenue = _all_pages(
+        lambda n, after: get_revenue_per_user(db, company_id, sd, ed, n, after, tz), page_size
+    )
+
+    series = [(s.day, s.num_purchases, s.revenue) for s in new.sales_by_day]
+    checks = {
+        "total_purchases": new.total_purchases == old["total_purchases"],
+        "total_sales": abs(new.total_sales - old["total_sales"]) < 0.005,
+        "unique_buyers": new.unique_buyers == old["unique_buyers"],
+        "sales_by_day": series == old["series"],
+        "chart": [(s.day, s.num_purchases, s.revenue) for s in chart] == old["series"],
+        "count_by_user": {r.user_id: r.purchase_count for r in counts} == old["count_by_user"]
+                         and len(counts) == len(old["count_by_user"])
+                         and all(a.purchase_count >= b.purchase_count for a, b in zip(counts, counts[1:])),
+        "revenue_by_user": {r.user_id: r.total_spent for r in revenue} == old["revenue_by_user"]
+                           and len(revenue) == len(old["revenue_by_user"])
+                           and all(a.total_spent >= b.total_spent for a, b in zip(revenue, revenue[1:])),
+    }
+    failed = [name for name, ok in checks.items() if not ok]
+    print(f"{'ok  ' if not failed else 'FAIL'} {company_id} "
+          f"({old['total_purchases']} compras, {len(old['count_by_user'])} compradores)"
+          + (f": {', '.join(failed)}" if failed else ""))
+    return not failed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Paridade das métricas de compras")
+    parser.add_argument("--company", action="append", default=[])
+    parser.add_argument("--start", type=date.fromisoformat)
+    parser.add_argument("--end", type=date.fromisoformat)
+    parser.add_argument("--tz", help="fuso IANA (padrão: METRICS_DEFAULT_TIMEZONE)")
+    parser.add_argument("--companies", type=int, default=20, help="sem --company: as N com mais compras")
+    parser.add_argument("--page-size", type=int, default=7, help="página pequena exercita o cursor")
+    args = parser.parse_args()
+
+    period = month_to_date(resolve_timezone(args.tz), args.start, args.end)
+    with SessionLocal() as db:
+        companies = args.company or [
+            str(cid) for cid in db.execute(
+                select(PurchaseLog.company_id)
+                .where(period.filter(PurchaseLog.created_at))
+                .group_by(PurchaseLog.company_id)
+                .order_by(func.count().desc())
+                .limit(args.companies)
+            ).scalars()
+        ]
+        ok = all([check_company(db, cid, period, args.page_size) for cid in companies])
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
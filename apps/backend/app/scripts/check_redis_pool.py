@@ -0,0 +1,256 @@
+# apps/backend/app/scripts/check_redis_pool.py
+#
+# Uso: python -m app.scripts.check_redis_pool [--threads 64] [--requests 2000] [--fake]
+#
+# Confere app/core/redis_client.py contra o Redis local (REDIS_URL) ou, com
+# --fake, contra o fakeredis (pip install fakeredis; não é dependência da API):
+# - o mesmo cliente/pool é reaproveitado e, com muitas threads, o nº de
+#   conexões abertas não passa de REDIS_MAX_CONNECTIONS
+# - com o pool esgotado, a chamada espera REDIS_POOL_TIMEOUT_SECONDS e falha
+#   sem abrir conexão extra
+# - get_many/set_many (e as versões async) fazem o lote num round-trip
+# - disjuntor: Redis fora → get_many vira miss e o disjuntor abre; aberto, as
+#   chamadas falham na hora sem ir ao servidor; passado
+#   REDIS_RETRY_AFTER_SECONDS a próxima chamada tenta de novo (meio-aberto):
+#   reabre se falhar e fecha se o Redis voltou
+# Sai com código 1 se alguma verificação falhar. Usa chaves
+# "check:redis_pool:*" com TTL curto.
+
+import argparse
+import asyncio
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from unittest.mock import patch
+from redis import BlockingConnectionPool, RedisError
+from redis import asyncio as aioredis
+from app.core import redis_client
+from app.core.config import settings
+
+PREFIX = "check:redis_pool:"
+CLOSED_URL = "redis://127.0.0.1:1/0"  # porta fechada
+
+
+def _check(ok: bool, msg: str) -> bool:
+    print(f"{'ok  ' if ok else 'FAIL'} {msg}")
+    return ok
+
+
+def _timed(fn):
+    started = time.perf_counter()
+    try:
+        fn()
+        error = None
+    except RedisError as e:
+        error = e
+    return error, time.perf_counter() - started
+
+
+def _wait_retry_window() -> None:
+    time.sleep(settings.REDIS_RETRY_AFTER_SECONDS + 0.05)
+
+
+# ───────────── fakeredis ─────────────
+
+@contextmanager
+def fake_redis():
+    """
+    Troca a conexão dos pools (sync e async) pela do fakeredis; o resto do
+    redis_client (pool, limites, disjuntor) roda como em produção.
+    """
+    try:
+        import fakeredis
+        import fakeredis.aioredis
+    except ImportError:
+        sys.exit("--fake precisa do fakeredis: pip install fakeredis")
+
+    server = fakeredis.FakeServer()
+    sync_from_url = BlockingConnectionPool.from_url.__func__
+    async_from_url = aioredis.BlockingConnectionPool.from_url.__func__
+
+    def sync_pool(cls, url, **kwargs):
+        return sync_from_url(cls, url, connection_class=fakeredis.FakeConnection, server=server, **kwargs)
+
+    def async_pool(cls, url, **kwargs):
+        # a conexão async do fakeredis não responde ao PING do health check
+        kwargs["health_check_interval"] = 0
+        return async_from_url(cls, url, connection_class=fakeredis.aioredis.FakeConnection, server=server, **kwargs)
+
+    with (
+        patch.object(BlockingConnectionPool, "from_url", classmethod(sync_pool)),
+        patch.object(aioredis.BlockingConnectionPool, "from_url", classmethod(async_pool)),
+    ):
+        yield server
+
+
+# ───────────── verificações ─────────────
+
+def check_pool(threads: int, requests: int) -> bool:
+    if not _check(redis_client.ping(), f"PING em {settings.REDIS_URL}"):
+        return False
+    ok = _check(redis_client.get_redis() is redis_client.get_redis(), "cliente compartilhado (decode=True)")
+    ok &= _check(
+        redis_client.get_redis(decode=False) is not redis_client.get_redis(),
+        "pool separado para bytes (decode=False)",
+    )
+
+    client = redis_client.get_redis()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(lambda i: client.set(f"{PREFIX}{i % 100}", i, ex=60), range(requests)))
+    opened = len(client.connection_pool._connections)
+    ok &= _check(
+        0 < opened <= settings.REDIS_MAX_CONNECTIONS,
+        f"{requests} SETs em {threads} threads: {opened} conexões no pool "
+        f"(máx. {settings.REDIS_MAX_CONNECTIONS})",
+    )
+    return ok
+
+
+def check_pool_limit(size: int = 4) -> bool:
+    max_connections, pool_timeout = settings.REDIS_MAX_CONNECTIONS, settings.REDIS_POOL_TIMEOUT_SECONDS
+    redis_client.close()
+    settings.REDIS_MAX_CONNECTIONS = size
+    settings.REDIS_POOL_TIMEOUT_SECONDS = 0.2
+    try:
+        client = redis_client.get_redis()
+        pool = client.connection_pool
+        held = [pool.get_connection() for _ in range(size)]
+
+        error, waited = _timed(lambda: client.get(f"{PREFIX}limit"))
+        ok = _check(
+            error is not None
+            and waited >= settings.REDIS_POOL_TIMEOUT_SECONDS * 0.9
+            and len(pool._connections) == size,
+            f"pool cheio ({size} conexões em uso): falha em {waited * 1000:.0f} ms "
+            f"sem abrir outra ({len(pool._connections)} no pool)",
+        )
+        # pool esgotado chega como ConnectionError: conta como queda
+        ok &= _check(not redis_client.available(), "pool esgotado abre o disjuntor")
+
+        for connection in held:
+            pool.release(connection)
+        _wait_retry_window()
+        ok &= _check(
+            client.set(f"{PREFIX}limit", 1, ex=60) and redis_client.available(),
+            "conexões devolvidas: volta a responder",
+        )
+    finally:
+        settings.REDIS_MAX_CONNECTIONS, settings.REDIS_POOL_TIMEOUT_SECONDS = max_connections, pool_timeout
+        redis_client.close()
+    return ok
+
+
+def check_batches() -> bool:
+    items = {f"{PREFIX}batch:{i}": str(i) for i in range(500)}
+    started = time.perf_counter()
+    stored = redis_client.set_many(items, ex=60)
+    values = redis_client.get_many(list(items) + [f"{PREFIX}missing"])
+    elapsed = (time.perf_counter() - started) * 1000
+    ok = _check(
+        stored and values[:-1] == list(items.values()) and values[-1] is None,
+        f"set_many/get_many de {len(items)} chaves em {elapsed:.1f} ms",
+    )
+    ok &= _check(redis_client.get_many([]) == [] and redis_client.set_many({}), "lotes vazios não vão ao Redis")
+
+    raw = redis_client.get_many([f"{PREFIX}batch:1"], decode=False)
+    ok &= _check(raw == [b"1"], "get_many(decode=False) devolve bytes")
+
+    async def run_async():
+        await redis_client.aset_many(items, ex=60)
+        got = await redis_client.aget_many(list(items))
+        await redis_client.aclose()
+        return got
+
+    ok &= _check(asyncio.run(run_async()) == list(items.values()), "aset_many/aget_many (redis.asyncio)")
+    return ok
+
+
+@contextmanager
+def outage(server=None):
+    """
+    Redis fora: fakeredis desconectado ou, no Redis real, porta fechada.
+    """
+    url = settings.REDIS_URL
+    redis_client.close()
+    if server is not None:
+        server.connected = False
+    else:
+        settings.REDIS_URL = CLOSED_URL
+    try:
+        yield
+    finally:
+        redis_client.close()
+        if server is not None:
+            server.connected = True
+        else:
+            settings.REDIS_URL = url
+
+
+def check_breaker(server=None) -> bool:
+    key = f"{PREFIX}breaker"
+    with outage(server):
+        started = time.perf_counter()
+        values = redis_client.get_many(["a", "b"])
+        first = time.perf_counter() - started
+        ok = _check(values == [None, None], f"Redis fora: get_many vira miss ({first * 1000:.0f} ms)")
+        ok &= _check(not redis_client.available(), "disjuntor aberto depois da falha")
+
+        error, fast = _timed(lambda: redis_client.get_redis().get(key))
+        ok &= _check(
+            error is not None and "aguardando" in str(error) and fast < 0.05,
+            f"aberto: falha na hora sem ir ao servidor ({fast * 1000:.1f} ms)",
+        )
+        ok &= _check(not redis_client.set_many({key: 1}), "aberto: set_many devolve False")
+        ok &= _check(not redis_client.ping(), "aberto: ping devolve False")
+
+        _wait_retry_window()
+        ok &= _check(redis_client.available(), "passado REDIS_RETRY_AFTER_SECONDS: meio-aberto")
+        error, _ = _timed(lambda: redis_client.get_redis().get(key))
+        ok &= _check(
+            error is not None and "aguardando" not in str(error) and not redis_client.available(),
+            "meio-aberto com Redis ainda fora: tenta o servidor e reabre",
+        )
+
+    # Redis de volta, mas o disjuntor ainda está aberto
+    ok &= _check(redis_client.get_many([key]) == [None] and not redis_client.available(),
+                 "Redis de volta com disjuntor aberto: ainda miss")
+    _wait_retry_window()
+    ok &= _check(redis_client.set_many({key: "1"}, ex=60), "meio-aberto com Redis de volta: set_many passa")
+    ok &= _check(
+        redis_client.get_many([key]) == ["1"] and redis_client.available(),
+        "disjuntor fechado: leituras voltam a usar o Redis",
+    )
+    return ok
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Pool compartilhado do Redis")
+    parser.add_argument("--threads", type=int, default=64)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--fake", action="store_true", help="usa o fakeredis em vez do REDIS_URL")
+    args = parser.parse_args()
+
+    # janela curta para o script não esperar o valor de produção
+    settings.REDIS_RETRY_AFTER_SECONDS = 0.3
+
+    def run(server=None) -> bool:
+        if not check_pool(args.threads, args.requests):
+            return False
+        ok = check_batches()
+        ok &= check_pool_limit()
+        ok &= check_breaker(server)
+        redis_client.close()
+        return ok
+
+    if args.fake:
+        with fake_redis() as server:
+            ok = run(server)
+    else:
+        ok = run()
+    print("tudo ok" if ok else "houve falhas")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+# apps/backend/app/scripts/check_time_range.py
+#
+# Uso: python -m app.scripts.check_time_range [--db]
+#
+# Confere os períodos de app/core/time_range.py nas trocas de horário de
+# verão (dias de 23h e 25h, meia-noite inexistente) e o caso que motivou o
+# fuso por empresa: venda às 21h30 em São Paulo fica no mesmo dia.
+# --db também confere, no Postgres, que o balde (date_trunc … AT TIME ZONE)
+# de instantes em volta de cada fronteira bate com a data local do Python
+# e com o filtro do período. Só lê o banco.
+
+import argparse
+import sys
+from datetime import date, datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+from sqlalchemy import DateTime, column, select, values
+from app.core.time_range import local_range
+
+UTC = timezone.utc
+
+# (fuso, dia local, início esperado em UTC, duração do dia)
+CASES = [
+    ("America/Sao_Paulo", date(2025, 8, 28), datetime(2025, 8, 28, 3, tzinfo=UTC), timedelta(hours=24)),
+    # início do horário de verão à meia-noite: 00:00 não existe, dia começa 01:00
+    ("America/Sao_Paulo", date(2018, 11, 4), datetime(2018, 11, 4, 3, tzinfo=UTC), timedelta(hours=23)),
+    # fim do horário de verão: 23:00–23:59 do dia 16 acontece duas vezes
+    ("America/Sao_Paulo", date(2019, 2, 16), datetime(2019, 2, 16, 2, tzinfo=UTC), timedelta(hours=25)),
+    ("America/New_York", date(2025, 3, 9), datetime(2025, 3, 9, 5, tzinfo=UTC), timedelta(hours=23)),
+    ("America/New_York", date(2025, 11, 2), datetime(2025, 11, 2, 4, tzinfo=UTC), timedelta(hours=25)),
+    ("Europe/Lisbon", date(2025, 3, 30), datetime(2025, 3, 30, 0, tzinfo=UTC), timedelta(hours=23)),
+    ("UTC", date(2025, 1, 1), datetime(2025, 1, 1, 0, tzinfo=UTC), timedelta(hours=24)),
+]
+
+# (instante UTC, fuso, dia local esperado)
+INSTANTS = [
+    # 21h30 em São Paulo: no fuso do servidor (UTC) cairia no dia 29
+    (datetime(2025, 8, 29, 0, 30, tzinfo=UTC), "America/Sao_Paulo", date(2025, 8, 28)),
+    (datetime(2025, 8, 29, 2, 59, 59, tzinfo=UTC), "America/Sao_Paulo", date(2025, 8, 28)),
+    (datetime(2025, 8, 29, 3, tzinfo=UTC), "America/Sao_Paulo", date(2025, 8, 29)),
+    # segunda passagem pelas 23h do dia 16/02/2019
+    (datetime(2019, 2, 17, 2, 30, tzinfo=UTC), "America/Sao_Paulo", date(2019, 2, 16)),
+    (datetime(2019, 2, 17, 3, tzinfo=UTC), "America/Sao_Paulo", date(2019, 2, 17)),
+]
+
+
+def _check(ok: bool, msg: str) -> bool:
+    print(f"{'ok  ' if ok else 'FAIL'} {msg}")
+    return ok
+
+
+def check_ranges() -> bool:
+    ok = True
+    for tz_name, day, start, length in CASES:
+        period = local_range(day, day, ZoneInfo(tz_name))
+        got_start = period.start.astimezone(UTC)
+        got_length = period.end.astimezone(UTC) - got_start
+        ok &= _check(
+            got_start == start and got_length == length,
+            f"{tz_name} {day}: início {got_start:%Y-%m-%d %H:%M}Z, {got_length}",
+        )
+
+    for instant, tz_name, expected in INSTANTS:
+        period = local_range(expected, expected, ZoneInfo(tz_name))
+        inside = period.start <= instant < period.end
+        ok &= _check(
+            instant.astimezone(ZoneInfo(tz_name)).date() == expected and inside,
+            f"{instant:%Y-%m-%d %H:%M}Z em {tz_name} → {expected}",
+        )
+    return ok
+
+
+def check_db() -> bool:
+    from app.db.session import SessionLocal
+
+    ok = True
+    with SessionLocal() as db:
+        for tz_name, day, start, length in CASES:
+            period = local_range(day, day, ZoneInfo(tz_name))
+            probes = [start - timedelta(seconds=1), start, start + length - timedelta(seconds=1), start + length]
+            ts = values(column("ts", DateTime(timezone=True)), name="probes").data([(p,) for p in probes])
+            rows = db.execute(
+                select(ts.c.ts, period.bucket(ts.c.ts).label("bucket"), period.filter(ts.c.ts).label("inside"))
+            ).all()
+            for instant, bucket, inside in rows:
+                local_day = instant.astimezone(ZoneInfo(tz_name)).date()
+                ok &= _check(
+                    bucket.date() == local_day and inside == (local_day == day),
+                    f"db {tz_name} {instant.astimezone(UTC):%Y-%m-%d %H:%M:%S}Z → {bucket:%Y-%m-%d}",
+                )
+
+            series = [r.bucket.date() for r in db.execute(select(local_range(day, day + timedelta(days=2), period.tz).series()))]
+            ok &= _check(
+                series == [day + timedelta(days=i) for i in range(3)],
+                f"db {tz_name} generate_series {series[0]}…{series[-1]} ({len(series)} dias)",
+            )
+    return ok
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Períodos por fuso nas trocas de horário")
+    parser.add_argument("--db", action="store_true", help="confere também o bucketing no Postgres")
+    args = parser.parse_args()
+
+    ok = check_ranges()
+    if args.db:
+        ok &= check_db()
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
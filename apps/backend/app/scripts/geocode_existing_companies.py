@@ -1,35 +1,152 @@
 # apps/backend/app/scripts/geocode_existing_companies.py
+#
+# Uso: python -m app.scripts.geocode_existing_companies [--chunk-size N] [--workers N] [--reset]
+#
+# Backfill de `companies.location` para empresas sem localização:
+# - lê as empresas em lotes (keyset por id), só com as colunas de endereço
+# - geocodifica uma vez por endereço (mesma chave do cache do GeocodeService)
+# - chama os provedores em paralelo, cada um no seu rate limit
+# - faz commit por lote e grava o cursor no Redis, então pode ser retomado
 
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+from uuid import UUID
+from sqlalchemy import select, update, func, bindparam
+from app.core import redis_client
 from app.db.session import SessionLocal
-from app.services.geocode_service import GeocodeService
-from redis import Redis
-from app.core.config import settings
-from sqlalchemy import select, func
 from app.models.company import Company
+from app.services.geocode_service import GeocodeService, _addr_cache_key
 
-def run():
+CURSOR_KEY = "geocode_backfill:cursor"
+STATS_KEY = "geocode_backfill:stats"
+
+
+def _fetch_chunk(db, after_id: UUID | None, size: int):
+    stmt = (
+        select(
+            Company.id,
+            Company.street,
+            Company.number,
+            Company.neighborhood,
+            Company.city,
+            Company.state,
+            Company.postal_code,
+        )
+        .where(Company.location.is_(None), Company.only_online.is_(False))
+        .order_by(Company.id)
+        .limit(size)
+    )
+    if after_id is not None:
+        stmt = stmt.where(Company.id > after_id)
+    return db.execute(stmt).all()
+
+
+def _geocode(geocoder: GeocodeService, row) -> tuple[float, float] | None:
+    try:
+        return geocoder.geocode_structured_address(
+            street=row.street,
+            number=row.number,
+            neighborhood=row.neighborhood,
+            city=row.city,
+            state=row.state,
+            postal_code=row.postal_code,
+        )
+    except Exception:
+        pass
+    # endereço sem CEP válido etc.: tenta só pelo CEP
+    try:
+        return geocoder.geocode_postal_code(row.postal_code)
+    except Exception as e:
+        print(f"Falha ao geocodificar {row.id}: {e}")
+        return None
+
+
+def _key(row) -> str:
+    try:
+        return _addr_cache_key(row.street, row.number, row.neighborhood, row.city, row.state, row.postal_code)
+    except ValueError:
+        return f"company:{row.id}"
+
+
+def run(chunk_size: int = 200, workers: int = 8, reset: bool = False):
     db = SessionLocal()
-    redis = Redis.from_url(settings.REDIS_URL, decode_responses=True)
+    redis = redis_client.get_redis()
     geocoder = GeocodeService(redis)
 
-    # 1) todas as empresas sem location
-    empresas = (
-        db.query(Company)
-        .filter(Company.location == None)
-        .all()
+    if reset:
+        redis.delete(CURSOR_KEY, STATS_KEY)
+    cursor = redis.get(CURSOR_KEY)
+    after_id = UUID(cursor) if cursor else None
+    if after_id:
+        print(f"Retomando a partir de {after_id}")
+
+    companies = Company.__table__
+    set_location = (
+        update(companies)
+        .where(companies.c.id == bindparam("company_id"))
+        .values(location=func.ST_SetSRID(func.ST_MakePoint(bindparam("lon"), bindparam("lat")), 4326))
     )
 
-    # 2) geocode e salva
-    for emp in empresas:
-        try:
-            lat, lon = geocoder.geocode_postal_code(emp.postal_code)
-            emp.location = func.ST_SetSRID(func.ST_MakePoint(lon, lat), 4326)
-            print(f"Geocoded {emp.id} → ({lat}, {lon})")
-        except Exception as e:
-            print(f"Falha ao geocodificar {emp.id}: {e}")
+    start = time.perf_counter()
+    total = geocoded = failed = lookups = 0
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            while True:
+                rows = _fetch_chunk(db, after_id, chunk_size)
+                if not rows:
+                    break
+
+                # 1) agrupa por endereço: um geocode por chave
+                by_key: dict[str, list] = {}
+                for row in rows:
+                    by_key.setdefault(_key(row), []).append(row)
+                keys = list(by_key)
+                results = executor.map(lambda k: _geocode(geocoder, by_key[k][0]), keys)
+
+                # 2) grava o lote numa única transação
+                params = []
+                for key, coords in zip(keys, results):
+                    group = by_key[key]
+                    if coords is None:
+                        failed += len(group)
+                        continue
+                    lat, lon = coords
+                    params.extend({"company_id": r.id, "lat": lat, "lon": lon} for r in group)
+                if params:
+                    # executemany no Core (sem o bulk update do ORM)
+                    db.connection().execute(set_location, params)
+                db.commit()
+
+                # 3) progresso (só depois do commit)
+                after_id = rows[-1].id
+                total += len(rows)
+                geocoded += len(params)
+                lookups += len(keys)
+                redis.set(CURSOR_KEY, str(after_id))
+                redis.hset(STATS_KEY, mapping={"processed": total, "geocoded": geocoded, "failed": failed})
+
+                elapsed = time.perf_counter() - start
+                print(
+                    f"{total} empresas ({geocoded} ok, {failed} falhas, {lookups} endereços únicos) "
+                    f"– {total / elapsed:.1f} empresas/s"
+                )
+    finally:
+        db.close()
+
+    elapsed = time.perf_counter() - start
+    print(
+        f"Concluído: {total} empresas em {elapsed:.1f}s "
+        f"({geocoded} geocodificadas, {failed} falhas, {lookups} consultas)"
+    )
+    # terminou a varredura: a próxima execução recomeça do início (pega as que falharam)
+    redis.delete(CURSOR_KEY)
 
-    db.commit()
-    db.close()
 
 if __name__ == "__main__":
-    run()
+    parser = argparse.ArgumentParser(description="Backfill de localização das empresas")
+    parser.add_argument("--chunk-size", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--reset", action="store_true", help="ignora o progresso salvo")
+    args = parser.parse_args()
+    run(chunk_size=args.chunk_size, workers=args.workers, reset=args.reset)
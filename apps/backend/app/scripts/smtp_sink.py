@@ -0,0 +1,84 @@
+# apps/backend/app/scripts/smtp_sink.py
+#
+# Servidor SMTP local que só recebe e guarda as mensagens, para testes
+# e desenvolvimento do worker de e-mail. Sem TLS e sem autenticação.
+#
+# Uso: python -m app.scripts.smtp_sink [porta] [diretório]
+# e no .env: SMTP_HOST=localhost SMTP_PORT=1025 SMTP_STARTTLS=false SMTP_PASSWORD=
+
+import sys
+import asyncio
+from pathlib import Path
+from uuid import uuid4
+
+
+class SMTPSink:
+    def __init__(self, out_dir: Path | None = None):
+        self.out_dir = out_dir
+        self.messages: list[dict] = []  # útil para inspeção em testes
+        if out_dir:
+            out_dir.mkdir(parents=True, exist_ok=True)
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        async def reply(line: str):
+            writer.write((line + "\r\n").encode())
+            await writer.drain()
+
+        await reply("220 clubily-smtp-sink")
+        mail_from, rcpt_to = None, []
+        while True:
+            raw = await reader.readline()
+            if not raw:
+                break
+            cmd = raw.decode(errors="replace").strip()
+            verb = cmd.split(" ", 1)[0].upper()
+
+            if verb in ("EHLO", "HELO"):
+                await reply("250 clubily-smtp-sink")
+            elif verb == "MAIL":
+                mail_from, rcpt_to = cmd.split(":", 1)[1].strip(), []
+                await reply("250 OK")
+            elif verb == "RCPT":
+                rcpt_to.append(cmd.split(":", 1)[1].strip())
+                await reply("250 OK")
+            elif verb == "DATA":
+                await reply("354 End data with <CR><LF>.<CR><LF>")
+                lines = []
+                while True:
+                    line = await reader.readline()
+                    if not line or line in (b".\r\n", b".\n"):
+                        break
+                    lines.append(line[1:] if line.startswith(b"..") else line)
+                self._store(mail_from, rcpt_to, b"".join(lines))
+                await reply("250 OK")
+            elif verb in ("RSET", "NOOP"):
+                await reply("250 OK")
+            elif verb == "QUIT":
+                await reply("221 Bye")
+                break
+            else:
+                await reply("502 Command not implemented")
+        writer.close()
+
+    def _store(self, mail_from, rcpt_to, data: bytes):
+        self.messages.append({"from": mail_from, "to": rcpt_to, "data": data})
+        if self.out_dir:
+            (self.out_dir / f"{uuid4()}.eml").write_bytes(data)
+        print(f"[smtp-sink] {mail_from} → {', '.join(rcpt_to)} ({len(data)} bytes)")
+
+
+async def serve(port: int = 1025, out_dir: Path | None = None):
+    sink = SMTPSink(out_dir)
+    server = await asyncio.start_server(sink.handle, "127.0.0.1", port)
+    print(f"[smtp-sink] ouvindo em 127.0.0.1:{port}")
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == "__main__":
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 1025
+    out_dir = Path(sys.argv[2]) if len(sys.argv) > 2 else None
+    try:
+        asyncio.run(serve(port, out_dir))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,152 @@
+# apps/backend/app/scripts/stress_reward_orders.py
+#
+# Uso: python -m app.scripts.stress_reward_orders [--threads 32] [--orders 200]
+#          [--balance 1000] [--cost 30] [--stock 20] [--allow-host db]
+#
+# Martela a mesma carteira com pedidos simultâneos (cada thread com sua
+# sessão) e confere os invariantes do reward_service.create_order:
+# - saldo nunca negativo e débito total == pedidos criados × custo
+# - estoque nunca negativo e baixa == quantidades reservadas
+# - chave de idempotência repetida → um único pedido
+# - recusa devolve o estoque reservado
+# Cria um usuário/produto próprios (e-mail em BENCH_DOMAIN) e os remove no fim.
+# Só roda contra banco local.
+
+import argparse
+import sys
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from uuid import uuid4
+from fastapi import HTTPException
+from sqlalchemy import delete, func, select
+from app.benchmarks.common import BENCH_DOMAIN, ensure_local
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models import RewardOrder, RewardProduct, User, UserPointsTransaction, UserPointsWallet
+from app.schemas.rewards import OrderItemPayload, RewardOrderCreate
+from app.services.reward_service import admin_update_order_status, create_order
+
+_ADDRESS = dict(
+    recipient="Stress", street="Rua Teste", number="1", neighborhood="Centro",
+    city="São Paulo", state="SP", postal_code="01000000",
+)
+
+
+def _setup(balance: int, cost: int, stock: int) -> tuple[str, str]:
+    with SessionLocal() as db:
+        user = User(
+            name="Stress", email=f"stress-{uuid4().hex[:12]}@{BENCH_DOMAIN}",
+            hashed_password="!", accepted_terms=True, pre_registered=False,
+        )
+        db.add(user); db.flush()
+        db.add(UserPointsWallet(user_id=user.id, balance=balance))
+        product = RewardProduct(
+            name="Stress", sku=f"STRESS-{uuid4().hex[:12]}", points_cost=cost, stock_qty=stock,
+        )
+        db.add(product)
+        db.commit()
+        return str(user.id), str(product.id)
+
+
+def _teardown(user_id: str, product_id: str) -> None:
+    with SessionLocal() as db:
+        db.execute(delete(UserPointsTransaction).where(UserPointsTransaction.user_id == user_id))
+        db.execute(delete(User).where(User.id == user_id))  # carteira e pedidos em cascata
+        db.execute(delete(RewardProduct).where(RewardProduct.id == product_id))
+        db.commit()
+
+
+def _order(user_id: str, product_id: str, key: str | None) -> str:
+    payload = RewardOrderCreate(
+        **_ADDRESS, items=[OrderItemPayload(product_id=product_id, quantity=1)], idempotency_key=key,
+    )
+    with SessionLocal() as db:
+        try:
+            return str(create_order(db, user_id, payload).id)
+        except HTTPException as e:
+            return f"http_{e.status_code}"
+
+
+def run(args) -> bool:
+    user_id, product_id = _setup(args.balance, args.cost, args.stock)
+    ok = True
+
+    def check(cond: bool, msg: str) -> None:
+        nonlocal ok
+        print(f"{'ok  ' if cond else 'FAIL'} {msg}")
+        ok &= cond
+
+    try:
+        barrier = threading.Barrier(args.threads)
+
+        def worker(i: int) -> list[str]:
+            barrier.wait()  # todas as threads disparam juntas
+            return [_order(user_id, product_id, None) for _ in range(i, args.orders, args.threads)]
+
+        with ThreadPoolExecutor(args.threads) as pool:
+            results = [r for rs in pool.map(worker, range(args.threads)) for r in rs]
+        outcomes = Counter(r if r.startswith("http_") else "created" for r in results)
+        print(f"{args.orders} pedidos em {args.threads} threads: {dict(outcomes)}")
+
+        created = outcomes["created"]
+        expected = min(args.balance // args.cost, args.stock)
+        with SessionLocal() as db:
+            balance = db.execute(select(UserPointsWallet.balance).where(UserPointsWallet.user_id == user_id)).scalar()
+            stock = db.execute(select(RewardProduct.stock_qty).where(RewardProduct.id == product_id)).scalar()
+            debited = -db.execute(
+                select(func.coalesce(func.sum(UserPointsTransaction.amount), 0))
+                .where(UserPointsTransaction.user_id == user_id)
+            ).scalar()
+        check(created == expected, f"pedidos criados {created} == {expected}")
+        check(balance >= 0 and args.balance - balance == created * args.cost,
+              f"saldo {balance} (débito {args.balance - balance} == {created}×{args.cost})")
+        check(debited == created * args.cost, f"transações somam {debited}")
+        check(stock >= 0 and args.stock - stock == created, f"estoque {stock} (baixa {args.stock - stock})")
+
+        # idempotência: a mesma chave em paralelo gera um pedido só
+        with SessionLocal() as db:
+            db.query(UserPointsWallet).filter_by(user_id=user_id).update({"balance": args.cost * args.threads})
+            db.query(RewardProduct).filter_by(id=product_id).update({"stock_qty": args.threads})
+            db.commit()
+        key = uuid4().hex
+        barrier = threading.Barrier(args.threads)
+
+        def same_key(_):
+            barrier.wait()
+            return _order(user_id, product_id, key)
+
+        with ThreadPoolExecutor(args.threads) as pool:
+            ids = set(pool.map(same_key, range(args.threads)))
+        check(len(ids) == 1 and not next(iter(ids)).startswith("http_"), f"mesma chave → {ids}")
+
+        # recusa devolve o estoque
+        order_id = next(iter(ids))
+        with SessionLocal() as db:
+            before = db.execute(select(RewardProduct.stock_qty).where(RewardProduct.id == product_id)).scalar()
+            admin_update_order_status(db, order_id, approve=False, msg="stress")
+            after = db.execute(select(RewardProduct.stock_qty).where(RewardProduct.id == product_id)).scalar()
+            orders = db.execute(select(func.count()).where(RewardOrder.user_id == user_id)).scalar()
+        check(after == before + 1, f"recusa devolveu estoque ({before} → {after})")
+        check(orders == created + 1, f"{orders} pedidos no banco")
+    finally:
+        _teardown(user_id, product_id)
+    return ok
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Pedidos simultâneos na mesma carteira")
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--orders", type=int, default=200)
+    parser.add_argument("--balance", type=int, default=1000)
+    parser.add_argument("--cost", type=int, default=30)
+    parser.add_argument("--stock", type=int, default=20)
+    parser.add_argument("--allow-host", action="append", default=[])
+    args = parser.parse_args()
+
+    ensure_local(settings.DATABASE_URI, set(args.allow_host))
+    sys.exit(0 if run(args) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,6 @@
 # app/services/asaas_client.py
-import requests
+import httpx
+import threading
 from datetime import datetime
 from decimal import Decimal
 from app.core.config import settings
@@ -9,12 +10,47 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+_http: httpx.Client | None = None
+_http_lock = threading.Lock()
+
+def get_http_client() -> httpx.Client:
+    """
+    Cliente HTTP compartilhado (keep-alive + pool de conexões) para a Asaas.
+    Evita um handshake TLS novo a cada chamada.
+    """
+    global _http
+    if _http is None:
+        with _http_lock:
+            if _http is None:
+                _http = httpx.Client(
+                    base_url=settings.ASAAS_BASE_URL,
+                    headers={
+                        "access_token": settings.ASAAS_API_KEY,
+                        "Content-Type": "application/json",
+                        "accept":       "application/json",
+                    },
+                    timeout=httpx.Timeout(10.0, connect=5.0),
+                    limits=httpx.Limits(
+                        max_connections=settings.ASAAS_MAX_CONNECTIONS,
+                        max_keepalive_connections=settings.ASAAS_MAX_CONNECTIONS,
+                        keepalive_expiry=60.0,
+                    ),
+                )
+    return _http
+
+def close_http_client() -> None:
+    global _http
+    with _http_lock:
+        if _http is not None:
+            _http.close()
+            _http = None
+
+
 class AsaasClient:
-    HEADERS = {
-      "access_token": settings.ASAAS_API_KEY,
-      "Content-Type": "application/json",
-      "accept":       "application/json"
-    }
+
+    @property
+    def http(self) -> httpx.Client:
+        return get_http_client()
 
     def ensure_customer(self, db, company: Company):
         if company.customer_id:
@@ -24,10 +60,7 @@ class AsaasClient:
             "email":   company.email,
             "cpfCnpj": re.sub(r"\D", "", getattr(company, "cnpj", "") or "")
         }
-        resp = requests.post(
-            f"{settings.ASAAS_BASE_URL}/customers",
-            headers=self.HEADERS, json=payload, timeout=10
-        )
+        resp = self.http.post("/customers", json=payload)
         try:
             resp.raise_for_status()
         except Exception:
@@ -52,18 +85,12 @@ class AsaasClient:
           "description": descr,
           "pix": {"pixType":"DYNAMIC"},
         }
-        resp = requests.post(
-            f"{settings.ASAAS_BASE_URL}/payments",
-            headers=self.HEADERS, json=payload, timeout=10
-        )
+        resp = self.http.post("/payments", json=payload)
         resp.raise_for_status()
         data = resp.json()
 
-        # agora busca o QR-code
-        qr = requests.get(
-            f"{settings.ASAAS_BASE_URL}/payments/{data['id']}/pixQrCode",
-            headers=self.HEADERS, timeout=10
-        ).json()
+        # agora busca o QR-code (depende do id; reaproveita a mesma conexão)
+        qr = self.http.get(f"/payments/{data['id']}/pixQrCode").json()
 
         return {
             "asaas_id": data["id"],
@@ -73,12 +100,11 @@ class AsaasClient:
         }
 
     def get_payment(self, asaas_id: str) -> dict:
-        resp = requests.get(
-            f"{settings.ASAAS_BASE_URL}/payments/{asaas_id}",
-            headers=self.HEADERS,
-            timeout=10
-        )
+        resp = self.http.get(f"/payments/{asaas_id}")
+        resp.raise_for_status()
+        return resp.json()
+
+    def create_customer(self, data: dict) -> dict:
+        resp = self.http.post("/customers", json=data)
         resp.raise_for_status()
         return resp.json()
-    
-    
\ No newline at end of file
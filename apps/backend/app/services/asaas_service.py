@@ -1,13 +1,9 @@
 # backend/app/services/asaas_service.py
-import requests
 from sqlalchemy.orm import Session
-from app.core.config import settings
 from app.models.company import Company
+from app.services.asaas_client import AsaasClient
 
-HEADERS = {
-    "access_token": settings.ASAAS_API_KEY,
-    "Content-Type": "application/json"
-}
+gateway = AsaasClient()
 
 def create_asaas_customer(db: Session, company_id: str, data: dict) -> Company:
     """
@@ -20,14 +16,7 @@ def create_asaas_customer(db: Session, company_id: str, data: dict) -> Company:
         raise ValueError("Esta empresa já possui um customer_id cadastrado")
 
     # 1) POST /customers no Asaas
-    resp = requests.post(
-        f"{settings.ASAAS_BASE_URL}/customers",
-        headers=HEADERS,
-        json=data,
-        timeout=10
-    )
-    resp.raise_for_status()
-    payload = resp.json()
+    payload = gateway.create_customer(data)
 
     # 2) grava no banco
     company.customer_id = payload["id"]
@@ -2,7 +2,7 @@
 
 from sqlalchemy.orm import Session
 from app.models.user import User
-from app.core.security import verify_password, hash_password
+from app.core.security import verify_and_update
 from sqlalchemy import or_
 import re
 
@@ -55,9 +55,13 @@ def authenticate(db: Session, identifier: str, password: str) -> tuple[str, User
     if not user:
         return None, None
 
-    # 2) verifica senha
-    if not verify_password(user.hashed_password, password):
+    # 2) verifica senha (e regrava o hash se os parâmetros do argon2 mudaram)
+    ok, new_hash = verify_and_update(user.hashed_password, password)
+    if not ok:
         return None, None
+    if new_hash:
+        user.hashed_password = new_hash
+        db.commit()
 
     # 3) tudo ok: cria JWT
     from app.core.security import create_access_token
@@ -0,0 +1,104 @@
+# backend/app/services/branch_service.py
+#
+# Filiais e suas geofences. Uma filial pode ter:
+# - polígono (geofence): o usuário precisa estar dentro dele
+# - só o ponto (location): o usuário precisa estar a até `radius_m` metros
+# O ponto vem manual (lat/lng) ou do job "geocode_branch", pelo endereço.
+
+from typing import Iterable
+from uuid import UUID
+from geoalchemy2 import Geography
+from sqlalchemy import and_, cast, func, or_, select, true
+from sqlalchemy.orm import Session
+from app.models.branch import Branch
+from app.schemas.branch import BranchCreate, GeoPoint
+from app.services import job_service
+
+ADDRESS_FIELDS = ("street", "number", "neighborhood", "city", "state", "postal_code")
+
+
+def _point(lat: float, lng: float):
+    return func.ST_SetSRID(func.ST_MakePoint(lng, lat), 4326)
+
+
+def _polygon(points: list[GeoPoint]):
+    ring = [(p.lng, p.lat) for p in points]
+    if ring[0] != ring[-1]:
+        ring.append(ring[0])
+    wkt = "POLYGON((" + ", ".join(f"{lng} {lat}" for lng, lat in ring) + "))"
+    return func.ST_GeomFromText(wkt, 4326)
+
+
+def save_branch(db: Session, branch: Branch, payload: BranchCreate) -> Branch:
+    """
+    Aplica o payload (criação ou edição) e agenda a geocodificação quando a
+    filial fica sem ponto manual e o endereço mudou (ou ainda não tem ponto).
+    """
+    address_changed = any(getattr(branch, f) != getattr(payload, f) for f in ADDRESS_FIELDS)
+    for k, v in payload.model_dump(exclude={"lat", "lng", "geofence"}).items():
+        setattr(branch, k, v)
+
+    geocode = False
+    if payload.lat is not None:
+        branch.location = _point(payload.lat, payload.lng)
+    elif address_changed or branch.location is None:
+        branch.location = None
+        geocode = payload.has_address()
+    branch.geofence = _polygon(payload.geofence) if payload.geofence else None
+
+    db.add(branch)
+    db.flush()
+    if geocode:
+        job_service.enqueue(
+            db,
+            "geocode_branch",
+            {"branch_id": str(branch.id)},
+            dedupe_key=f"geocode_branch:{branch.id}",
+            commit=False,
+        )
+    db.commit()
+    db.refresh(branch)
+    return branch
+
+
+def find_branch_at(
+    db: Session,
+    company_id: str | UUID,
+    lat: float,
+    lng: float,
+    radius_m: float,
+    branch_ids: Iterable[str] | None = None,
+) -> UUID | None:
+    """
+    Filial da empresa cuja geofence contém o ponto (a mais próxima, se mais
+    de uma). Uma consulta só: ST_Covers no polígono ou ST_DWithin no ponto,
+    ambos resolvidos pelos índices GiST.
+    """
+    user_point = cast(_point(lat, lng), Geography)
+    stmt = (
+        select(Branch.id)
+        .where(
+            Branch.company_id == company_id,
+            or_(
+                and_(Branch.geofence.isnot(None), func.ST_Covers(Branch.geofence, user_point)),
+                and_(Branch.geofence.is_(None), func.ST_DWithin(Branch.location, user_point, radius_m)),
+            ),
+            Branch.id.in_([str(b) for b in branch_ids]) if branch_ids else true(),
+        )
+        .order_by(func.ST_Distance(Branch.location, user_point).nulls_last())
+        .limit(1)
+    )
+    return db.execute(stmt).scalar_one_or_none()
+
+
+def has_geometry(db: Session, company_id: str | UUID, branch_ids: Iterable[str] | None = None) -> bool:
+    """
+    Se alguma das filiais (todas da empresa, sem `branch_ids`) já tem ponto
+    ou polígono; filiais anteriores às geofences ainda não têm.
+    """
+    stmt = select(Branch.id).where(
+        Branch.company_id == company_id,
+        or_(Branch.location.isnot(None), Branch.geofence.isnot(None)),
+        Branch.id.in_([str(b) for b in branch_ids]) if branch_ids else true(),
+    )
+    return db.execute(stmt.limit(1)).first() is not None
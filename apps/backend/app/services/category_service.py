@@ -1,5 +1,6 @@
 from sqlalchemy.orm import Session
 from app.models.category import Category
+from app.core import response_cache
 from app.schemas.category import CategoryCreate
 from typing import Tuple, List, Optional
 
@@ -12,6 +13,7 @@ def create_category(db: Session, obj_in: CategoryCreate) -> Category:
     db.add(cat)
     db.commit()
     db.refresh(cat)
+    response_cache.bump("categories")
     return cat
 
 def list_categories(db: Session) -> list[Category]:
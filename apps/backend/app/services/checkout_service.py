@@ -86,6 +86,8 @@ def run_checkout(
             "product_categories": product_category_ids,
             "purchased_items": item_ids or [],
             "branch_id": branch_id,
+            "lat": source_lat,   # regra de geolocalização (geofence das filiais)
+            "lng": source_lng,
             "event": event,
         }
         points_awarded, _ = evaluate_all_rules(db, user_id, company_id, data)
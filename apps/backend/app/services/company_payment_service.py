@@ -5,6 +5,7 @@ from sqlalchemy import func
 from sqlalchemy.orm import Session, joinedload
 from app.models.company_payment import CompanyPayment, PaymentStatus
 from app.models.company import Company
+from app.services import payment_events
 from app.services.asaas_client import AsaasClient
 from app.services.commission_service import credit_for_payment
 from app.services.wallet_service import credit_wallet
@@ -78,8 +79,14 @@ def refresh_payment_status(db: Session, asaas_id: str) -> CompanyPayment | None:
     if mapped is None:
         return None
 
-    # 3) atualiza o registro local
-    payment = db.query(CompanyPayment).filter_by(asaas_id=asaas_id).first()
+    # 3) atualiza o registro local (FOR UPDATE: evita crédito em dobro
+    #    se dois processos reconciliarem a mesma cobrança)
+    payment = (
+        db.query(CompanyPayment)
+          .filter_by(asaas_id=asaas_id)
+          .with_for_update()
+          .first()
+    )
     if not payment:
         return None
 
@@ -94,6 +101,10 @@ def refresh_payment_status(db: Session, asaas_id: str) -> CompanyPayment | None:
         credit_wallet(db, str(payment.company_id), Decimal(payment.amount))
         credit_for_payment(db, payment)
 
+    # 5) avisa o portal (SSE/long-poll) depois dos créditos
+    if previous != mapped:
+        payment_events.publish(payment_events.COMPANY_PAYMENT, payment)
+
     return payment
 
 def list_payments(
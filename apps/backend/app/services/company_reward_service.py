@@ -10,6 +10,7 @@ from app.models.reward import (
 from app.models.loyalty_card import LoyaltyCardInstance, LoyaltyCardTemplate
 from app.services.loyalty_service import _rand_code      # reaproveita helper
 from app.schemas.reward import RewardCreate, RewardUpdate
+from app.core import response_cache
 
 # ───────── CRUD básico de reward ──────────────────────────────
 def create_reward(db: Session, company_id: str, payload: RewardCreate, image_url: str | None):
@@ -28,6 +29,7 @@ def update_reward(db: Session, reward: CompanyReward, payload: RewardUpdate, ima
     if image_url is not None:
         reward.image_url = image_url
     db.commit(); db.refresh(reward)
+    response_cache.bump(f"loyalty_templates:{reward.company_id}")
     return reward
 
 def delete_reward(db: Session, reward: CompanyReward):
@@ -38,6 +40,7 @@ def delete_reward(db: Session, reward: CompanyReward):
         if has_instances and len(tpl.rewards_map) <= 1:
             raise ValueError(f"Não é possível excluir – o template '{tpl.title}' já foi emitido e ficaria sem recompensas.")
     db.delete(reward); db.commit()
+    response_cache.bump(f"loyalty_templates:{reward.company_id}")
 
 
 # ───────── ligação reward ↔ template ──────────────────────────
@@ -46,6 +49,7 @@ def add_link(db: Session, tpl: LoyaltyCardTemplate, reward: CompanyReward, stamp
         raise ValueError("stamp_no maior que stamp_total do template")
     link = TemplateRewardLink(template_id=tpl.id, reward_id=reward.id, stamp_no=stamp_no)
     db.add(link); db.commit(); db.refresh(link)
+    response_cache.bump(f"loyalty_templates:{tpl.company_id}")
     return link
 
 def remove_link(db: Session, link: TemplateRewardLink):
@@ -54,6 +58,7 @@ def remove_link(db: Session, link: TemplateRewardLink):
     if has_instances and len(tpl.rewards_map) <= 1:
         raise ValueError("Não é possível remover a última recompensa de um template que já foi emitido")
     db.delete(link); db.commit()
+    response_cache.bump(f"loyalty_templates:{tpl.company_id}")
 
 
 # ───────── geração / uso de código de resgate ─────────────────
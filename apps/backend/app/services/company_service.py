@@ -2,7 +2,7 @@
 
 from typing import Optional
 from sqlalchemy.orm import Session
-from ..core.security import hash_password, verify_password
+from ..core.security import hash_password, verify_and_update
 from ..models.company import Company
 from ..schemas.company import CompanyCreate
 
@@ -40,6 +40,7 @@ def create(db: Session, obj_in: CompanyCreate) -> Company:
         # Converter o HttpUrl em string antes de salvar:
         online_url=str(obj_in.online_url) if obj_in.online_url else None,
         only_online=obj_in.only_online,
+        timezone=obj_in.timezone,
 
         accepted_terms=obj_in.accepted_terms,
         description=obj_in.description,
@@ -57,6 +58,12 @@ def authenticate(db: Session, identifier: str, password: str) -> Optional[Compan
     Retorna a instância de Company se válido, ou None.
     """
     company = get_by_identifier(db, identifier)
-    if not company or not verify_password(company.hashed_password, password):
+    if not company:
         return None
+    ok, new_hash = verify_and_update(company.hashed_password, password)
+    if not ok:
+        return None
+    if new_hash:
+        company.hashed_password = new_hash
+        db.commit()
     return company
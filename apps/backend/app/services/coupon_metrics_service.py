@@ -1,12 +1,14 @@
 from __future__ import annotations
 
-from datetime import datetime, date
+from datetime import date
 from typing import List, Optional, Tuple
+from zoneinfo import ZoneInfo
 
 from sqlalchemy import func, cast
 from sqlalchemy.orm import Session
 from geoalchemy2 import Geometry
 
+from app.core.time_range import TimeRange, local_range, resolve_timezone
 from app.models.coupon import Coupon
 from app.models.coupon_redemption import CouponRedemption
 from app.schemas.coupon_metrics import (
@@ -27,19 +29,16 @@ except Exception:
     HAS_USER = False
 
 
-def _dt_start_end(date_from: date, date_to: date) -> Tuple[datetime, datetime]:
+def _period(date_from: date, date_to: date, tz: Optional[ZoneInfo]) -> TimeRange:
     """
-    Converte (date_from, date_to) para datetimes inclusivos do dia:
-    - from: 00:00:00
-    - to:   23:59:59.999999
+    Dias inteiros no fuso da empresa: [00:00 de date_from, 00:00 do dia
+    seguinte a date_to).
     """
-    dt_from = datetime.combine(date_from, datetime.min.time())
-    dt_to = datetime.combine(date_to, datetime.max.time())
-    return dt_from, dt_to
+    return local_range(date_from, date_to, tz or resolve_timezone())
 
 
-def _apply_period(q, field, dt_from: datetime, dt_to: datetime):
-    return q.filter(field >= dt_from, field <= dt_to)
+def _apply_period(q, field, period: TimeRange):
+    return q.filter(period.filter(field))
 
 
 def metrics_summary(
@@ -48,8 +47,9 @@ def metrics_summary(
     *,
     date_from: date,
     date_to: date,
+    tz: Optional[ZoneInfo] = None,
 ) -> CouponMetricsSummary:
-    dt_from, dt_to = _dt_start_end(date_from, date_to)
+    period = _period(date_from, date_to, tz)
 
     q = (
         db.query(
@@ -59,7 +59,7 @@ def metrics_summary(
         )
         .filter(CouponRedemption.company_id == company_id)
     )
-    q = _apply_period(q, CouponRedemption.created_at, dt_from, dt_to)
+    q = _apply_period(q, CouponRedemption.created_at, period)
 
     total_redemptions, total_discount, unique_users = q.one()
     total_redemptions = int(total_redemptions or 0)
@@ -82,8 +82,9 @@ def metrics_summary_by_coupon(
     *,
     date_from: date,
     date_to: date,
+    tz: Optional[ZoneInfo] = None,
 ) -> CouponMetricsSummary:
-    dt_from, dt_to = _dt_start_end(date_from, date_to)
+    period = _period(date_from, date_to, tz)
 
     q = (
         db.query(
@@ -96,7 +97,7 @@ def metrics_summary_by_coupon(
             CouponRedemption.coupon_id == coupon_id,
         )
     )
-    q = _apply_period(q, CouponRedemption.created_at, dt_from, dt_to)
+    q = _apply_period(q, CouponRedemption.created_at, period)
 
     total_redemptions, total_discount, unique_users = q.one()
     total_redemptions = int(total_redemptions or 0)
@@ -120,9 +121,10 @@ def metrics_timeseries(
     date_from: date,
     date_to: date,
     coupon_id: Optional[str] = None,
+    tz: Optional[ZoneInfo] = None,
 ) -> CouponTimeseriesResponse:
-    dt_from, dt_to = _dt_start_end(date_from, date_to)
-    trunc = func.date_trunc(granularity.value, CouponRedemption.created_at).label("period")
+    period = _period(date_from, date_to, tz)
+    trunc = period.bucket(CouponRedemption.created_at, granularity.value).label("period")
 
     q = (
         db.query(
@@ -137,13 +139,14 @@ def metrics_timeseries(
     if coupon_id:
         q = q.filter(CouponRedemption.coupon_id == coupon_id)
 
-    q = _apply_period(q, CouponRedemption.created_at, dt_from, dt_to)
+    q = _apply_period(q, CouponRedemption.created_at, period)
     q = q.group_by(trunc).order_by(trunc.asc())
 
     rows = q.all()
     points = [
         CouponTimeseriesPoint(
-            period_start=r.period,
+            # início do balde no fuso da empresa
+            period_start=r.period.replace(tzinfo=period.tz),
             redemptions=int(r.cnt or 0),
             total_discount=float(r.sum_discount or 0.0),
             unique_users=int(r.uniq_users or 0),
@@ -160,12 +163,13 @@ def tracking_bubbles(
     *,
     date_from: date,
     date_to: date,
+    tz: Optional[ZoneInfo] = None,
 ) -> List[CouponBubblePoint]:
     """
     Bubbles = cupons com APENAS source_location_name (texto) e sem source_location (ponto).
     Retorna usos e total de desconto no período.
     """
-    dt_from, dt_to = _dt_start_end(date_from, date_to)
+    period = _period(date_from, date_to, tz)
 
     C = (
         db.query(
@@ -190,7 +194,7 @@ def tracking_bubbles(
         )
         .filter(CouponRedemption.company_id == company_id)
     )
-    R = _apply_period(R, CouponRedemption.created_at, dt_from, dt_to)
+    R = _apply_period(R, CouponRedemption.created_at, period)
     R = R.group_by(CouponRedemption.coupon_id).subquery()
 
     q = (
@@ -229,12 +233,13 @@ def tracking_map_points(
     *,
     date_from: date,
     date_to: date,
+    tz: Optional[ZoneInfo] = None,
 ) -> List[CouponMapPoint]:
     """
     Mapa = todos os cupons com source_location (ponto).
     Retorna lat/lng do cupom, label (se houver), usos e total de desconto no período.
     """
-    dt_from, dt_to = _dt_start_end(date_from, date_to)
+    period = _period(date_from, date_to, tz)
 
     C = (
         db.query(
@@ -260,7 +265,7 @@ def tracking_map_points(
         )
         .filter(CouponRedemption.company_id == company_id)
     )
-    R = _apply_period(R, CouponRedemption.created_at, dt_from, dt_to)
+    R = _apply_period(R, CouponRedemption.created_at, period)
     R = R.group_by(CouponRedemption.coupon_id).subquery()
 
     q = (
@@ -306,8 +311,9 @@ def list_coupon_usage(
     date_to: date,
     skip: int,
     limit: int,
+    tz: Optional[ZoneInfo] = None,
 ) -> Tuple[int, List[dict]]:
-    dt_from, dt_to = _dt_start_end(date_from, date_to)
+    period = _period(date_from, date_to, tz)
 
     # contagem total no período
     total_q = (
@@ -315,8 +321,7 @@ def list_coupon_usage(
         .filter(
             CouponRedemption.company_id == company_id,
             CouponRedemption.coupon_id == coupon_id,
-            CouponRedemption.created_at >= dt_from,
-            CouponRedemption.created_at <= dt_to,
+            period.filter(CouponRedemption.created_at),
         )
     )
     total = int(total_q.scalar() or 0)
@@ -339,8 +344,7 @@ def list_coupon_usage(
         .filter(
             CouponRedemption.company_id == company_id,
             CouponRedemption.coupon_id == coupon_id,
-            CouponRedemption.created_at >= dt_from,
-            CouponRedemption.created_at <= dt_to,
+            period.filter(CouponRedemption.created_at),
         )
         .order_by(CouponRedemption.created_at.desc())
         .offset(skip)
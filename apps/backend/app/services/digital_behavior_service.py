@@ -1,7 +1,6 @@
 # backend/app/services/digital_behavior_service.py
 
 from sqlalchemy.orm import Session
-from datetime import datetime, timezone
 from decimal import Decimal
 from typing import List
 from sqlalchemy.orm import joinedload
@@ -15,22 +14,31 @@ from app.services.wallet_service import get_wallet_balance, debit_wallet
 from app.services.fee_setting_service import get_effective_fee
 from app.models.fee_setting import SettingTypeEnum
 from app.services.purchase_log_service import log_purchase
+from app.services import digital_rule_cache
+from collections import Counter
+from datetime import datetime, timezone
+from sqlalchemy import func, insert, select, update
+from app.core import response_cache
+from app.models.user import User
+from app.models.wallet import Wallet
+from app.models.points_wallet import PointsWallet
+from app.models.purchase_log import PurchaseLog
+from app.models.user_points_wallet import UserPointsWallet
+from app.models.credits_wallet_transaction import CreditsWalletTransaction, CreditTxType
+from app.models.points_wallet_transaction import PointsWalletTransaction, TransactionType
+from app.models.digital_behavior_event import DigitalBehaviorEvent
+from app.services.points_rule_service import record_points_awarded
 
 def is_slug_unique(
     db: Session,
     slug: str,
     company_id: str
 ) -> bool:
-    existing = (
-        db.query(PointsRule)
-          .filter(
-              PointsRule.company_id == company_id,
-              PointsRule.rule_type == RuleType.digital_behavior,
-              PointsRule.config["slug"].astext == slug
-          )
-          .first()
-    )
-    return existing is None
+    """
+    Slugs são únicos no sistema todo (índice único em points_rules.slug),
+    não só na empresa.
+    """
+    return db.query(PointsRule.id).filter(PointsRule.slug == slug).first() is None
 
 def get_digital_rule_by_slug(db: Session, slug: str) -> PointsRule | None:
     return (
@@ -38,11 +46,16 @@ def get_digital_rule_by_slug(db: Session, slug: str) -> PointsRule | None:
             .options(joinedload(PointsRule.company))
             .filter(
                 PointsRule.rule_type == RuleType.digital_behavior,
-                PointsRule.config["slug"].astext == slug
+                PointsRule.slug == slug
             )
             .first()
     )
 
+def _deactivate(db: Session, rule: dict) -> None:
+    db.query(PointsRule).filter(PointsRule.id == rule["id"]).update({"active": False})
+    db.commit()
+    digital_rule_cache.invalidate(rule["slug"])
+
 def process_digital_behavior_event(
     db: Session,
     user_id: str,
@@ -50,84 +63,312 @@ def process_digital_behavior_event(
     amount: Decimal,
     purchased_items: List[str]
 ) -> int:
-    rule = get_digital_rule_by_slug(db, slug)
-    if not rule or not rule.active:
+    rule = digital_rule_cache.get_compiled_rule(db, slug)
+    if not rule or not rule["active"]:
         raise ValueError("Regra digital não encontrada ou inativa")
 
-    cfg = (rule.config or {})
-    now = datetime.now(timezone.utc)
-
-    def parse_iso(dt: str | None):
-        if not dt:
-            return None
-        return datetime.fromisoformat(dt.replace("Z", "+00:00"))
-
     # valida período
-    start = parse_iso(cfg.get("valid_from"))
-    if start and now < (start if start.tzinfo else start.replace(tzinfo=timezone.utc)):
-        raise ValueError("Regra ainda não iniciou")
+    error = digital_rule_cache.validity_error(rule)
+    if error:
+        raise ValueError(error)
 
-    end = parse_iso(cfg.get("valid_to"))
-    if end and now > (end if end.tzinfo else end.replace(tzinfo=timezone.utc)):
-        raise ValueError("Regra expirada")
+    company_id = rule["company_id"]
 
-    # limite por usuário (robusto a None)
-    max_attr = int((cfg.get("max_attributions") or 0))
+    # limite por usuário
+    max_attr = rule["max_attributions"]
     if max_attr > 0:
         used = (
             db.query(UserPointsTransaction)
-              .filter_by(user_id=user_id, rule_id=str(rule.id), type=UserPointsTxType.award)
+              .filter_by(user_id=user_id, rule_id=rule["id"], type=UserPointsTxType.award)
               .count()
         )
         if used >= max_attr:
             raise ValueError("Limite de usos atingido para este usuário")
 
     # log do evento
-    log_purchase(db, user_id, str(rule.company_id), amount, purchased_items)
+    log_purchase(db, user_id, company_id, amount, purchased_items)
 
     # cobra taxa
-    fee = get_effective_fee(db, str(rule.company_id), SettingTypeEnum.points)
-    bal = get_wallet_balance(db, str(rule.company_id))
+    fee = get_effective_fee(db, company_id, SettingTypeEnum.points)
+    bal = get_wallet_balance(db, company_id)
     if bal < fee:
-        rule.active = False
-        db.commit()
+        _deactivate(db, rule)
         raise ValueError("Saldo da empresa insuficiente para taxa de pontos")
 
-    debit_wallet(db, str(rule.company_id), fee, description=f"Taxa pontos (digital: {cfg.get('name')})")
-
-    # reserva e crédito dos pontos (robusto a None)
-    pts_to_award = int((cfg.get("points") or 0))
+    debit_wallet(db, company_id, fee, description=f"Taxa pontos (digital: {rule['config_name']})")
 
-    # rótulo amigável da regra (ordem de prioridade de onde tirar o nome)
-    rule_title = (cfg.get("public_name")
-                  or cfg.get("name")
-                  or rule.name
-                  or slug)
+    # reserva e crédito dos pontos
+    pts_to_award = rule["points"]
 
     # descrição para o usuário na listagem de transações
     # Ex.: "Loja XPTO — pontos via link “Promo de Agosto”"
-    company_name = getattr(rule.company, "name", None) or "Empresa"
-    user_tx_desc = f"{company_name} — pontos via link “{rule_title}”"
+    company_name = rule["company"]["name"] or "Empresa"
+    user_tx_desc = f"{company_name} — pontos via link “{rule['title']}”"
 
     try:
         debit_points(
             db,
-            str(rule.company_id),
+            company_id,
             pts_to_award,
-            description=f"Reserva pontos digital: {cfg.get('name')}"
+            description=f"Reserva pontos digital: {rule['config_name']}"
         )
     except Exception:
-        rule.active = False
-        db.commit()
+        db.rollback()
+        _deactivate(db, rule)
         raise ValueError("Falha ao reservar pontos; regra desativada")
 
     credit_user_points(
         db,
         user_id,
-        str(rule.company_id),
-        str(rule.id),
+        company_id,
+        rule["id"],
         pts_to_award,
         description=user_tx_desc
     )
 
     return pts_to_award
+
+
+# ───────────── ingestão em lote ─────────────
+
+def _user_tx_description(rule: dict) -> str:
+    company_name = rule["company"]["name"] or "Empresa"
+    return f"{company_name} — pontos via link “{rule['title']}”"
+
+
+def ingest_digital_behavior_events(db: Session, company_id: str, events: list) -> list[dict]:
+    """
+    Processa um lote de eventos (event_id, user_id, slug, amount,
+    purchased_items) de uma empresa numa única transação, com as mesmas
+    regras de process_digital_behavior_event:
+    - dedupe pelo event_id, no lote e contra digital_behavior_events
+    - regras resolvidas uma vez por slug; limite por usuário com um COUNT
+      agrupado e contado em memória dentro do lote
+    - taxa e reserva de pontos agregadas: um lançamento por regra em cada
+      carteira da empresa, um crédito por usuário
+    Retorna {"event_id", "status", "points"} por evento, na ordem recebida.
+    status: awarded, duplicate, user_not_found, rule_not_found, forbidden,
+    rule_inactive, not_started, expired, limit_reached,
+    insufficient_balance, insufficient_points.
+    """
+    company_id = str(company_id)
+    # lotes da mesma empresa em série (dedupe e saldos consistentes)
+    db.execute(select(func.pg_advisory_xact_lock(func.hashtext(f"digital_events:{company_id}"))))
+
+    outcomes: dict[str, dict] = {}
+    fresh = []
+    for ev in events:
+        if ev.event_id not in outcomes:
+            outcomes[ev.event_id] = {"event_id": ev.event_id, "status": None, "points": 0}
+            fresh.append(ev)
+
+    stored = dict(db.execute(
+        select(DigitalBehaviorEvent.event_id, DigitalBehaviorEvent.points)
+        .where(
+            DigitalBehaviorEvent.company_id == company_id,
+            DigitalBehaviorEvent.event_id.in_(list(outcomes)),
+        )
+    ).all())
+    for event_id, points in stored.items():
+        outcomes[event_id].update(status="duplicate", points=points)
+    fresh = [ev for ev in fresh if ev.event_id not in stored]
+
+    user_ids = {str(ev.user_id) for ev in fresh}
+    known_users = {
+        str(uid) for uid in db.execute(select(User.id).where(User.id.in_(user_ids))).scalars()
+    } if user_ids else set()
+    rules = {slug: digital_rule_cache.get_compiled_rule(db, slug) for slug in {ev.slug for ev in fresh}}
+
+    # ── validação da regra ──
+    now = datetime.now(timezone.utc)
+    candidates = []
+    for ev in fresh:
+        rule = rules[ev.slug]
+        if str(ev.user_id) not in known_users:
+            status = "user_not_found"
+        elif rule is None:
+            status = "rule_not_found"
+        elif rule["company_id"] != company_id:
+            status = "forbidden"
+        elif not rule["active"]:
+            status = "rule_inactive"
+        else:
+            status = digital_rule_cache.validity_status(rule, now)
+        if status:
+            outcomes[ev.event_id]["status"] = status
+        else:
+            candidates.append((ev, rule))
+    if not candidates:
+        db.commit()
+        return _results(events, outcomes)
+
+    # limite por usuário: uma contagem para o lote inteiro
+    limited = {rule["id"] for _, rule in candidates if rule["max_attributions"] > 0}
+    used: Counter = Counter()
+    if limited:
+        rows = db.execute(
+            select(UserPointsTransaction.user_id, UserPointsTransaction.rule_id, func.count())
+            .where(
+                UserPointsTransaction.type == UserPointsTxType.award,
+                UserPointsTransaction.rule_id.in_(limited),
+                UserPointsTransaction.user_id.in_({str(ev.user_id) for ev, _ in candidates}),
+            )
+            .group_by(UserPointsTransaction.user_id, UserPointsTransaction.rule_id)
+        )
+        used.update({(str(uid), str(rid)): n for uid, rid, n in rows})
+
+    # ── taxa e pontos, alocados em memória sobre as carteiras travadas ──
+    fee = get_effective_fee(db, company_id, SettingTypeEnum.points)
+    wallet = db.query(Wallet).filter_by(company_id=company_id).with_for_update().first()
+    points_wallet = db.query(PointsWallet).filter_by(company_id=company_id).with_for_update().first()
+    balance = wallet.balance if wallet else Decimal("0")
+    points_balance = int(points_wallet.balance) if points_wallet else 0
+
+    logged = []
+    awarded = []
+    deactivated: dict[str, str] = {}  # id → slug
+    for ev, rule in candidates:
+        out = outcomes[ev.event_id]
+        key = (str(ev.user_id), rule["id"])
+        if rule["id"] in deactivated:
+            out["status"] = "rule_inactive"
+            continue
+        if rule["max_attributions"] > 0 and used[key] >= rule["max_attributions"]:
+            out["status"] = "limit_reached"
+            continue
+        logged.append(ev)
+        points = rule["points"]
+        if balance < fee or points_balance < points:
+            # mesma reação do evento avulso: sem saldo a regra é desativada
+            out["status"] = "insufficient_balance" if balance < fee else "insufficient_points"
+            deactivated[rule["id"]] = rule["slug"]
+            continue
+        balance -= fee
+        points_balance -= points
+        used[key] += 1
+        out.update(status="awarded", points=points)
+        awarded.append((ev, rule))
+
+    if logged:
+        db.execute(insert(PurchaseLog), [
+            {
+                "user_id": ev.user_id,
+                "company_id": company_id,
+                "amount": ev.amount,
+                "item_ids": ev.purchased_items or None,
+            }
+            for ev in logged
+        ])
+
+    if awarded:
+        if wallet is None:
+            wallet = Wallet(company_id=company_id, balance=Decimal("0"))
+            db.add(wallet)
+        if points_wallet is None:
+            points_wallet = PointsWallet(company_id=company_id, balance=0)
+            db.add(points_wallet)
+        db.flush()
+
+        # um débito por regra em cada carteira da empresa
+        per_rule = Counter(rule["id"] for _, rule in awarded)
+        by_id = {rule["id"]: rule for _, rule in awarded}
+        for rule_id, n in per_rule.items():
+            rule = by_id[rule_id]
+            fee_total = fee * n
+            points_total = rule["points"] * n
+            wallet.balance -= fee_total
+            points_wallet.balance -= points_total
+            db.add(CreditsWalletTransaction(
+                wallet_id=wallet.id,
+                company_id=company_id,
+                type=CreditTxType.DEBIT,
+                amount=fee_total,
+                description=f"Taxa pontos (digital: {rule['config_name']}) x{n}",
+            ))
+            db.add(PointsWalletTransaction(
+                wallet_id=points_wallet.id,
+                company_id=company_id,
+                type=TransactionType.DEBIT,
+                amount=points_total,
+                description=f"Reserva pontos digital: {rule['config_name']} x{n}",
+            ))
+
+        # carteiras dos usuários: um crédito por usuário
+        per_user: Counter = Counter()
+        for ev, rule in awarded:
+            per_user[str(ev.user_id)] += rule["points"]
+        # locks sempre na ordem de user_id (carteiras e user_points_stats):
+        # lotes concorrentes com os mesmos usuários não entram em deadlock
+        users = sorted(per_user)
+        user_wallets: dict[str, UserPointsWallet] = {}
+        for w in (
+            db.query(UserPointsWallet)
+              .filter(UserPointsWallet.user_id.in_(users))
+              .order_by(UserPointsWallet.user_id, UserPointsWallet.created_at)
+              .with_for_update()
+        ):
+            user_wallets.setdefault(str(w.user_id), w)
+        for uid in per_user.keys() - user_wallets.keys():
+            user_wallets[uid] = UserPointsWallet(user_id=uid, balance=0)
+            db.add(user_wallets[uid])
+        db.flush()
+        for uid, points in per_user.items():
+            user_wallets[uid].balance += points
+
+        db.execute(insert(UserPointsTransaction), [
+            {
+                "wallet_id": user_wallets[str(ev.user_id)].id,
+                "user_id": ev.user_id,
+                "company_id": company_id,
+                "rule_id": rule["id"],
+                "type": UserPointsTxType.award,
+                "amount": rule["points"],
+                "description": _user_tx_description(rule),
+            }
+            for ev, rule in awarded
+        ])
+        milestone_users = [uid for uid in users if record_points_awarded(db, uid, per_user[uid])]
+    else:
+        milestone_users = []
+
+    if deactivated:
+        db.execute(
+            update(PointsRule)
+            .where(PointsRule.id.in_(list(deactivated)))
+            .values(active=False)
+        )
+
+    # eventos que geraram efeito ficam registrados para o dedupe
+    if logged:
+        db.execute(insert(DigitalBehaviorEvent), [
+            {
+                "company_id": company_id,
+                "event_id": ev.event_id,
+                "rule_id": rules[ev.slug]["id"],
+                "user_id": ev.user_id,
+                "status": outcomes[ev.event_id]["status"],
+                "points": outcomes[ev.event_id]["points"],
+            }
+            for ev in logged
+        ])
+    db.commit()
+
+    digital_rule_cache.invalidate(*deactivated.values())
+    for uid in milestone_users:
+        response_cache.bump(f"user_milestones:{uid}")
+    return _results(events, outcomes)
+
+
+def _results(events: list, outcomes: dict[str, dict]) -> list[dict]:
+    """
+    Resultados na ordem do lote; repetições do mesmo event_id são duplicate.
+    """
+    seen = set()
+    results = []
+    for ev in events:
+        out = dict(outcomes[ev.event_id])
+        if ev.event_id in seen:
+            out["status"] = "duplicate"
+        seen.add(ev.event_id)
+        results.append(out)
+    return results
@@ -0,0 +1,205 @@
+# backend/app/services/digital_rule_cache.py
+#
+# Cache slug → regra digital_behavior "compilada" (dict com janela de
+# validade, limite de atribuições, pontos e dados da empresa), consultado a
+# cada clique em link rastreado.
+# - LRU do processo com TTL curto (absorve os picos de campanha sem I/O)
+# - Redis compartilhado entre workers, com TTL maior
+# - create/update/delete de regra chamam invalidate(slug) após o commit, e a
+#   edição da empresa (nome, logo…) chama invalidate_company; outros workers
+#   enxergam a mudança em até DIGITAL_RULE_LOCAL_TTL_SECONDS
+# Sem Redis, cai direto no banco (índice único em points_rules.slug).
+
+import time
+import logging
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any
+import orjson
+from redis import Redis, RedisError
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app.core import redis_client
+from app.core.config import settings
+from app.models.company import Company
+from app.models.points_rule import PointsRule, RuleType
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "digital_rule:"
+_MISSING = object()
+
+
+class _LocalCache:
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data: OrderedDict[str, tuple[float, dict | None]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, slug: str) -> Any:
+        with self._lock:
+            entry = self._data.get(slug)
+            if entry is None:
+                return _MISSING
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[slug]
+                return _MISSING
+            self._data.move_to_end(slug)
+            return value
+
+    def set(self, slug: str, value: dict | None) -> None:
+        with self._lock:
+            self._data[slug] = (time.monotonic() + settings.DIGITAL_RULE_LOCAL_TTL_SECONDS, value)
+            self._data.move_to_end(slug)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def discard(self, slug: str) -> None:
+        with self._lock:
+            self._data.pop(slug, None)
+
+
+_local = _LocalCache(settings.DIGITAL_RULE_LRU_SIZE)
+
+def _get_redis() -> Redis:
+    return redis_client.get_redis(decode=False)
+
+
+# ───────────── compilação ─────────────
+
+def _parse_iso(value: str | None) -> datetime | None:
+    if not value:
+        return None
+    dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+
+
+def compile_rule(rule: PointsRule, company: Company) -> dict:
+    """
+    Só o que o clique precisa, em tipos JSON (vai para o Redis como está).
+    """
+    cfg = rule.config or {}
+    slug = rule.slug
+    return {
+        "id": str(rule.id),
+        "company_id": str(rule.company_id),
+        "slug": slug,
+        "active": bool(rule.active),
+        "name": rule.name,
+        "description": rule.description,
+        "config_name": cfg.get("name"),
+        # rótulo amigável da regra (ordem de prioridade de onde tirar o nome)
+        "title": cfg.get("public_name") or cfg.get("name") or rule.name or slug,
+        "points": int(cfg.get("points") or 0),
+        "valid_from": cfg.get("valid_from") or None,
+        "valid_to": cfg.get("valid_to") or None,
+        "max_attributions": int(cfg.get("max_attributions") or 0),
+        "company": {
+            "id": str(company.id),
+            "name": company.name,
+            "email": company.email,
+            "phone": company.phone,
+            "cnpj": company.cnpj,
+            "logo_url": company.logo_url,
+        },
+    }
+
+
+_VALIDITY_ERRORS = {
+    "not_started": "Regra ainda não iniciou",
+    "expired": "Regra expirada",
+}
+
+
+def validity_status(compiled: dict, now: datetime | None = None) -> str | None:
+    """
+    "not_started"/"expired" se a regra estiver fora da janela de validade.
+    """
+    now = now or datetime.now(timezone.utc)
+    start = _parse_iso(compiled["valid_from"])
+    if start and now < start:
+        return "not_started"
+    end = _parse_iso(compiled["valid_to"])
+    if end and now > end:
+        return "expired"
+    return None
+
+
+def validity_error(compiled: dict, now: datetime | None = None) -> str | None:
+    """
+    Mensagem de erro se a regra estiver fora da janela de validade.
+    """
+    return _VALIDITY_ERRORS.get(validity_status(compiled, now))
+
+
+def _load(db: Session, slug: str) -> dict | None:
+    row = db.execute(
+        select(PointsRule, Company)
+        .join(Company, Company.id == PointsRule.company_id)
+        .where(PointsRule.slug == slug, PointsRule.rule_type == RuleType.digital_behavior)
+    ).first()
+    return compile_rule(*row) if row else None
+
+
+# ───────────── leitura / invalidação ─────────────
+
+def get_compiled_rule(db: Session, slug: str) -> dict | None:
+    """
+    Regra compilada do slug (ativa ou não) ou None se não existir.
+    Slugs inexistentes também ficam no cache local, para links quebrados
+    não virarem uma query por clique.
+    """
+    value = _local.get(slug)
+    if value is not _MISSING:
+        return value
+
+    key = KEY_PREFIX + slug
+    try:
+        raw = _get_redis().get(key)
+    except RedisError as e:
+        logger.warning("Cache de regras digitais indisponível: %s", e)
+        raw = None
+    if raw is not None:
+        value = orjson.loads(raw)
+        _local.set(slug, value)
+        return value
+
+    value = _load(db, slug)
+    _local.set(slug, value)
+    if value is not None:
+        try:
+            _get_redis().set(key, orjson.dumps(value), ex=settings.DIGITAL_RULE_CACHE_TTL_SECONDS)
+        except RedisError:
+            pass
+    return value
+
+
+def invalidate(*slugs: str | None) -> None:
+    """
+    Remove slugs do cache (chamar após o commit de create/update/delete).
+    """
+    slugs = [s for s in slugs if s]
+    if not slugs:
+        return
+    for slug in slugs:
+        _local.discard(slug)
+    try:
+        _get_redis().delete(*(KEY_PREFIX + s for s in slugs))
+    except RedisError as e:
+        logger.warning("Falha ao invalidar regras digitais %s: %s", slugs, e)
+
+
+def invalidate_company(db: Session, company_id) -> None:
+    """
+    Remove as regras da empresa (a regra compilada embute nome, logo etc.);
+    chamar após o commit da edição da empresa.
+    """
+    slugs = db.scalars(
+        select(PointsRule.slug).where(
+            PointsRule.company_id == company_id,
+            PointsRule.rule_type == RuleType.digital_behavior,
+        )
+    ).all()
+    invalidate(*slugs)
@@ -0,0 +1,83 @@
+# app/services/email_queue_service.py
+from datetime import datetime, timedelta, timezone
+from typing import Any
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.models.outbound_email import EmailStatus, OutboundEmail
+
+
+def enqueue(
+    db: Session,
+    *,
+    to: str,
+    subject: str,
+    html: str | None = None,
+    template_name: str | None = None,
+    template_context: dict[str, Any] | None = None,
+    commit: bool = True,
+) -> OutboundEmail:
+    """
+    Insere o e-mail na fila. Com commit=False a linha entra na transação
+    de quem chamou (só é enviada se essa transação for confirmada).
+    """
+    if html is None and template_name is None:
+        raise ValueError("Informe html ou template_name")
+    email = OutboundEmail(
+        to_address=to,
+        subject=subject,
+        html=html,
+        template_name=template_name,
+        template_context=template_context,
+        max_attempts=settings.EMAIL_MAX_ATTEMPTS,
+    )
+    db.add(email)
+    if commit:
+        db.commit()
+    return email
+
+
+def claim_batch(db: Session, limit: int) -> list[OutboundEmail]:
+    """
+    Trava até `limit` e-mails pendentes e vencidos (FOR UPDATE SKIP LOCKED),
+    permitindo vários workers em paralelo. A transação fica aberta até o
+    worker gravar o resultado; se ele morrer no meio, o rollback devolve
+    as linhas para a fila.
+    """
+    now = datetime.now(timezone.utc)
+    rows = db.scalars(
+        select(OutboundEmail)
+        .where(
+            OutboundEmail.status == EmailStatus.pending,
+            OutboundEmail.next_attempt_at <= now,
+        )
+        .order_by(OutboundEmail.next_attempt_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    ).all()
+    for row in rows:
+        row.attempts += 1
+    return rows
+
+
+def mark_sent(email: OutboundEmail) -> None:
+    email.status = EmailStatus.sent
+    email.sent_at = datetime.now(timezone.utc)
+    email.last_error = None
+
+
+def mark_failed(email: OutboundEmail, error: str) -> None:
+    """
+    Agenda nova tentativa com backoff exponencial ou, esgotadas as
+    tentativas, marca como `failed`.
+    """
+    email.last_error = error[:2000]
+    if email.attempts >= email.max_attempts:
+        email.status = EmailStatus.failed
+        return
+    delay = min(
+        settings.EMAIL_RETRY_BASE_SECONDS * (2 ** (email.attempts - 1)),
+        settings.EMAIL_RETRY_MAX_SECONDS,
+    )
+    email.status = EmailStatus.pending
+    email.next_attempt_at = datetime.now(timezone.utc) + timedelta(seconds=delay)
@@ -0,0 +1,226 @@
+# backend/app/services/export_reports.py
+#
+# Registro dos relatórios exportáveis (CSV/XLSX) por app/services/export_service.py.
+# Cada relatório monta um SELECT de colunas simples (sem entidades ORM, que
+# ficariam no identity map) ordenado de forma estável; `columns` define o
+# cabeçalho e a ordem das colunas no arquivo.
+# scope "company": filtrado pela empresa autenticada; "admin": global.
+
+from dataclasses import dataclass
+from typing import Callable
+from uuid import UUID
+from zoneinfo import ZoneInfo
+
+from geoalchemy2 import Geometry
+from pydantic import BaseModel
+from sqlalchemy import Select, cast, func, select
+
+from app.core.time_range import local_range, month_to_date
+from app.models.commission import CommissionWallet, CommissionWithdrawal
+from app.models.company import Company
+from app.models.coupon_redemption import CouponRedemption
+from app.models.loyalty_card import LoyaltyCardInstance, LoyaltyCardTemplate
+from app.models.purchase_log import PurchaseLog
+from app.models.transfer_method import TransferMethod
+from app.models.user import User
+from app.models.user_points_transaction import UserPointsTransaction
+from app.schemas.exports import (
+    CommissionWithdrawalsExportParams,
+    CouponUsageExportParams,
+    LoyaltyInstancesExportParams,
+    RevenuePerUserExportParams,
+    RuleTransactionsExportParams,
+)
+from app.services.listing import date_filters
+
+
+@dataclass(frozen=True)
+class ExportReport:
+    name: str
+    scope: str                                  # "company" | "admin"
+    params: type[BaseModel]
+    columns: tuple[tuple[str, str], ...]        # (cabeçalho, coluna do SELECT)
+    build: Callable[..., Select]                # build(params, *, company_id, tz)
+
+
+REPORTS: dict[str, ExportReport] = {}
+
+
+def report(name: str, *, scope: str, params: type[BaseModel], columns: tuple[tuple[str, str], ...]):
+    def decorator(fn):
+        REPORTS[name] = ExportReport(name=name, scope=scope, params=params, columns=columns, build=fn)
+        return fn
+    return decorator
+
+
+# ---------- empresa ----------
+
+@report(
+    "coupon_usage",
+    scope="company",
+    params=CouponUsageExportParams,
+    columns=(
+        ("id", "id"), ("cupom", "coupon_id"), ("usuário", "user_id"), ("nome", "user_name"),
+        ("valor", "amount"), ("desconto", "discount_applied"), ("local", "source_location_name"),
+        ("lat", "lat"), ("lng", "lng"), ("data", "created_at"),
+    ),
+)
+def coupon_usage(params: CouponUsageExportParams, *, company_id: UUID, tz: ZoneInfo) -> Select:
+    period = local_range(params.date_from, params.date_to, tz)
+    point = cast(CouponRedemption.redemption_location, Geometry)
+    return (
+        select(
+            CouponRedemption.id,
+            CouponRedemption.coupon_id,
+            CouponRedemption.user_id,
+            User.name.label("user_name"),
+            CouponRedemption.amount,
+            CouponRedemption.discount_applied,
+            CouponRedemption.source_location_name,
+            func.ST_Y(point).label("lat"),
+            func.ST_X(point).label("lng"),
+            CouponRedemption.created_at,
+        )
+        .outerjoin(User, User.id == CouponRedemption.user_id)
+        .where(
+            CouponRedemption.company_id == company_id,
+            CouponRedemption.coupon_id == params.coupon_id,
+            period.filter(CouponRedemption.created_at),
+        )
+        .order_by(CouponRedemption.created_at.desc(), CouponRedemption.id.desc())
+    )
+
+
+@report(
+    "revenue_per_user",
+    scope="company",
+    params=RevenuePerUserExportParams,
+    columns=(
+        ("usuário", "user_id"), ("nome", "user_name"), ("e-mail", "user_email"),
+        ("compras", "purchase_count"), ("receita", "total_spent"),
+    ),
+)
+def revenue_per_user(params: RevenuePerUserExportParams, *, company_id: UUID, tz: ZoneInfo) -> Select:
+    period = month_to_date(tz, params.start_date, params.end_date)
+    total_spent = func.sum(PurchaseLog.amount)
+    return (
+        select(
+            PurchaseLog.user_id,
+            User.name.label("user_name"),
+            User.email.label("user_email"),
+            func.count(PurchaseLog.id).label("purchase_count"),
+            total_spent.label("total_spent"),
+        )
+        .join(User, User.id == PurchaseLog.user_id)
+        .where(PurchaseLog.company_id == company_id, period.filter(PurchaseLog.created_at))
+        .group_by(PurchaseLog.user_id, User.name, User.email)
+        .order_by(total_spent.desc(), PurchaseLog.user_id)
+    )
+
+
+@report(
+    "loyalty_instances",
+    scope="company",
+    params=LoyaltyInstancesExportParams,
+    columns=(
+        ("cartão", "id"), ("modelo", "template_title"), ("usuário", "user_id"), ("nome", "user_name"),
+        ("e-mail", "user_email"), ("carimbos", "stamps_given"), ("total", "stamp_total"),
+        ("emitido em", "issued_at"), ("expira em", "expires_at"), ("concluído em", "completed_at"),
+    ),
+)
+def loyalty_instances(params: LoyaltyInstancesExportParams, *, company_id: UUID, tz: ZoneInfo) -> Select:
+    stmt = (
+        select(
+            LoyaltyCardInstance.id,
+            LoyaltyCardTemplate.title.label("template_title"),
+            LoyaltyCardInstance.user_id,
+            User.name.label("user_name"),
+            User.email.label("user_email"),
+            LoyaltyCardInstance.stamps_given,
+            LoyaltyCardTemplate.stamp_total,
+            LoyaltyCardInstance.issued_at,
+            LoyaltyCardInstance.expires_at,
+            LoyaltyCardInstance.completed_at,
+        )
+        .join(LoyaltyCardTemplate, LoyaltyCardTemplate.id == LoyaltyCardInstance.template_id)
+        .outerjoin(User, User.id == LoyaltyCardInstance.user_id)
+        .where(LoyaltyCardTemplate.company_id == company_id)
+        .order_by(LoyaltyCardInstance.issued_at.desc(), LoyaltyCardInstance.id.desc())
+    )
+    if params.template_id:
+        stmt = stmt.where(LoyaltyCardInstance.template_id == params.template_id)
+    if params.status == "completed":
+        stmt = stmt.where(LoyaltyCardInstance.completed_at.isnot(None))
+    elif params.status == "active":
+        stmt = stmt.where(LoyaltyCardInstance.completed_at.is_(None))
+    return stmt
+
+
+# ---------- admin ----------
+
+@report(
+    "rule_transactions",
+    scope="admin",
+    params=RuleTransactionsExportParams,
+    columns=(
+        ("id", "id"), ("tipo", "type"), ("pontos", "amount"), ("descrição", "description"),
+        ("usuário", "user_id"), ("empresa", "company_id"), ("nome da empresa", "company_name"),
+        ("data", "created_at"),
+    ),
+)
+def rule_transactions(params: RuleTransactionsExportParams, *, company_id: UUID | None, tz: ZoneInfo) -> Select:
+    filters = date_filters(UserPointsTransaction.created_at, params.start_date, params.end_date, tz)
+    if params.company_id:
+        filters.append(UserPointsTransaction.company_id == params.company_id)
+    if params.type:
+        filters.append(UserPointsTransaction.type == params.type)
+    return (
+        select(
+            UserPointsTransaction.id,
+            UserPointsTransaction.type,
+            UserPointsTransaction.amount,
+            UserPointsTransaction.description,
+            UserPointsTransaction.user_id,
+            UserPointsTransaction.company_id,
+            Company.name.label("company_name"),
+            UserPointsTransaction.created_at,
+        )
+        .outerjoin(Company, Company.id == UserPointsTransaction.company_id)
+        .where(UserPointsTransaction.rule_id == params.rule_id, *filters)
+        .order_by(UserPointsTransaction.created_at.desc(), UserPointsTransaction.id.desc())
+    )
+
+
+@report(
+    "commission_withdrawals",
+    scope="admin",
+    params=CommissionWithdrawalsExportParams,
+    columns=(
+        ("id", "id"), ("usuário", "user_id"), ("nome", "user_name"), ("e-mail", "user_email"),
+        ("valor", "amount"), ("status", "status"), ("método", "method_name"),
+        ("tipo de chave", "key_type"), ("chave", "key_value"), ("data", "created_at"),
+    ),
+)
+def commission_withdrawals(params: CommissionWithdrawalsExportParams, *, company_id: UUID | None, tz: ZoneInfo) -> Select:
+    filters = date_filters(CommissionWithdrawal.created_at, params.start_date, params.end_date, tz)
+    if params.status:
+        filters.append(CommissionWithdrawal.status == params.status)
+    return (
+        select(
+            CommissionWithdrawal.id,
+            CommissionWallet.user_id,
+            User.name.label("user_name"),
+            User.email.label("user_email"),
+            CommissionWithdrawal.amount,
+            CommissionWithdrawal.status,
+            TransferMethod.name.label("method_name"),
+            TransferMethod.key_type,
+            TransferMethod.key_value,
+            CommissionWithdrawal.created_at,
+        )
+        .join(CommissionWallet, CommissionWallet.id == CommissionWithdrawal.wallet_id)
+        .join(User, User.id == CommissionWallet.user_id)
+        .outerjoin(TransferMethod, TransferMethod.id == CommissionWithdrawal.transfer_method_id)
+        .where(*filters)
+        .order_by(CommissionWithdrawal.created_at.desc(), CommissionWithdrawal.id.desc())
+    )
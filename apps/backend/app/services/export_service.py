@@ -0,0 +1,297 @@
+# backend/app/services/export_service.py
+#
+# Exportação CSV/XLSX dos relatórios de app/services/export_reports.py com
+# memória constante:
+# - as linhas vêm de um cursor nomeado no servidor (yield_per → psycopg2
+#   server-side cursor), em lotes de EXPORTS_YIELD_PER; nada é acumulado
+# - CSV pequeno sai direto por StreamingResponse (stream_csv), com sessão
+#   própria: a do get_db fecha antes do corpo ser enviado
+# - acima de EXPORTS_STREAM_MAX_ROWS, e sempre em XLSX (o zip do .xlsx só
+#   fecha no fim), vira job "export_report": o worker grava em EXPORTS_DIR e
+#   o cliente acompanha/baixa pelo token; o job renova o lock enquanto grava
+#   (job_service.heartbeat) e cada tentativa usa o seu .part
+# Arquivos ficam EXPORTS_TTL_HOURS horas e são apagados pelo job purge_exports.
+
+import csv
+import io
+import logging
+import secrets
+import time
+import uuid
+from datetime import datetime, timezone
+from decimal import Decimal
+from enum import Enum
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+from uuid import UUID
+from zoneinfo import ZoneInfo
+from fastapi import HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.time_range import resolve_timezone
+from app.db.session import SessionLocal
+from app.models.background_job import BackgroundJob, JobStatus
+from app.schemas.exports import ExportFormat
+from app.services import job_service
+from app.services.export_reports import REPORTS, ExportReport
+from app.services.listing import capped_count
+
+try:
+    from openpyxl import Workbook
+except ImportError:  # openpyxl é opcional: sem ele só CSV
+    Workbook = None
+
+logger = logging.getLogger(__name__)
+
+JOB_TYPE = "export_report"
+CSV_CHUNK_BYTES = 64 * 1024
+MEDIA_TYPES = {
+    ExportFormat.csv: "text/csv; charset=utf-8",
+    ExportFormat.xlsx: "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+
+def get_report(name: str, scope: str) -> ExportReport:
+    report = REPORTS.get(name)
+    if not report or report.scope != scope:
+        raise HTTPException(status.HTTP_404_NOT_FOUND, "Relatório não encontrado")
+    return report
+
+
+def xlsx_available() -> bool:
+    return Workbook is not None
+
+
+def filename(report_name: str, fmt: ExportFormat) -> str:
+    return f"{report_name}-{datetime.now(timezone.utc):%Y%m%d-%H%M%S}.{fmt.value}"
+
+
+# ───────────── linhas ─────────────
+
+def iter_rows(db: Session, stmt) -> Iterator[Any]:
+    """
+    Linhas (mappings) de `stmt` lidas em lotes por cursor no servidor.
+    """
+    result = db.execute(stmt.execution_options(yield_per=settings.EXPORTS_YIELD_PER))
+    for partition in result.mappings().partitions():
+        yield from partition
+
+
+# texto começando com estes caracteres vira fórmula no Excel/LibreOffice
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def _text(value: str) -> str:
+    # "'" na frente: a planilha mostra o texto em vez de executar a fórmula
+    return "'" + value if value.startswith(FORMULA_PREFIXES) else value
+
+
+def _cell(value):
+    if value is None:
+        return ""
+    if isinstance(value, str):
+        return _text(value)
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, (UUID, Decimal)):
+        return str(value)
+    return value
+
+
+def _xlsx_cell(value, tz: ZoneInfo):
+    if isinstance(value, datetime) and value.tzinfo is not None:
+        # o Excel não guarda fuso: grava a hora local da empresa
+        return value.astimezone(tz).replace(tzinfo=None)
+    if isinstance(value, (str, Enum, UUID)):
+        return _cell(value)
+    return value
+
+
+def csv_chunks(rows: Iterable[Any], columns) -> Iterator[bytes]:
+    """
+    CSV em pedaços de ~CSV_CHUNK_BYTES; BOM para o Excel reconhecer UTF-8.
+    """
+    buf = io.StringIO()
+    writer = csv.writer(buf, delimiter=settings.EXPORTS_CSV_DELIMITER)
+    buf.write("\ufeff")
+    writer.writerow([header for header, _ in columns])
+    for row in rows:
+        writer.writerow([_cell(row[key]) for _, key in columns])
+        if buf.tell() >= CSV_CHUNK_BYTES:
+            yield buf.getvalue().encode("utf-8")
+            buf.seek(0)
+            buf.truncate()
+    yield buf.getvalue().encode("utf-8")
+
+
+def write_csv(path: Path, rows: Iterable[Any], columns) -> int:
+    count = 0
+
+    def counted():
+        nonlocal count
+        for row in rows:
+            count += 1
+            yield row
+
+    with open(path, "wb") as f:
+        for chunk in csv_chunks(counted(), columns):
+            f.write(chunk)
+    return count
+
+
+def write_xlsx(path: Path, rows: Iterable[Any], columns, tz: ZoneInfo) -> int:
+    # write_only: cada linha vai para um XML temporário, não fica em memória
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet()
+    ws.append([header for header, _ in columns])
+    count = 0
+    for row in rows:
+        ws.append([_xlsx_cell(row[key], tz) for _, key in columns])
+        count += 1
+    wb.save(path)
+    return count
+
+
+# ───────────── stream direto ─────────────
+
+def should_run_as_job(db: Session, stmt, fmt: ExportFormat, mode: str) -> bool:
+    if fmt is ExportFormat.xlsx or mode == "job":
+        return True
+    if mode == "stream":
+        return False
+    return capped_count(db, stmt, settings.EXPORTS_STREAM_MAX_ROWS) > settings.EXPORTS_STREAM_MAX_ROWS
+
+
+def stream_csv(report: ExportReport, params, *, company_id: str | None, tz: ZoneInfo) -> Iterator[bytes]:
+    db = SessionLocal()
+    try:
+        stmt = report.build(params, company_id=company_id, tz=tz)
+        yield from csv_chunks(iter_rows(db, stmt), report.columns)
+    finally:
+        db.close()
+
+
+# ───────────── job + arquivo local ─────────────
+
+def _exports_dir() -> Path:
+    path = Path(settings.EXPORTS_DIR)
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def export_path(token: str, fmt: ExportFormat | str) -> Path:
+    return _exports_dir() / f"{token}.{ExportFormat(fmt).value}"
+
+
+def start_job(
+    db: Session,
+    report: ExportReport,
+    params,
+    fmt: ExportFormat,
+    *,
+    company_id: str | None,
+    tz: ZoneInfo,
+) -> str:
+    """
+    Agenda a exportação e devolve o token de acompanhamento/download.
+    """
+    if fmt is ExportFormat.xlsx and not xlsx_available():
+        raise HTTPException(status.HTTP_400_BAD_REQUEST, "Exportação XLSX indisponível")
+    token = secrets.token_urlsafe(24)
+    job_service.enqueue(
+        db,
+        JOB_TYPE,
+        {
+            "token": token,
+            "report": report.name,
+            "format": fmt.value,
+            "params": params.model_dump(mode="json"),
+            "company_id": company_id,
+            "tz": tz.key,
+        },
+        max_attempts=3,
+    )
+    return token
+
+
+def _with_heartbeat(rows: Iterable[Any], job_id) -> Iterator[Any]:
+    """
+    Repassa as linhas renovando o lock do job a cada terço de
+    JOB_STALE_SECONDS, em sessão própria: a do job está no meio do cursor
+    no servidor, que um commit fecharia.
+    """
+    interval = settings.JOB_STALE_SECONDS / 3
+    last = time.monotonic()
+    for row in rows:
+        if time.monotonic() - last >= interval:
+            hb_db = SessionLocal()
+            try:
+                job_service.heartbeat(hb_db, job_id)
+            finally:
+                hb_db.close()
+            last = time.monotonic()
+        yield row
+
+
+def run_job(db: Session, payload: dict[str, Any]) -> int:
+    """
+    Handler do job: grava o arquivo em EXPORTS_DIR (.part próprio da
+    tentativa até terminar, para o download nunca servir arquivo pela metade
+    nem duas execuções escreverem no mesmo arquivo). Retorna o nº de linhas.
+    """
+    report = REPORTS[payload["report"]]
+    fmt = ExportFormat(payload["format"])
+    tz = resolve_timezone(payload.get("tz"))
+    params = report.params.model_validate(payload["params"])
+    stmt = report.build(params, company_id=payload.get("company_id"), tz=tz)
+    job = find_job(db, payload["token"])
+
+    final = export_path(payload["token"], fmt)
+    partial = final.with_name(f"{final.name}.{uuid.uuid4().hex[:12]}.part")
+    started = time.monotonic()
+    try:
+        rows = iter_rows(db, stmt)
+        if job is not None:
+            rows = _with_heartbeat(rows, job.id)
+        if fmt is ExportFormat.xlsx:
+            if not xlsx_available():
+                raise RuntimeError("openpyxl não instalado")
+            count = write_xlsx(partial, rows, report.columns, tz)
+        else:
+            count = write_csv(partial, rows, report.columns)
+        partial.replace(final)
+    finally:
+        partial.unlink(missing_ok=True)
+    logger.info("exportação %s (%s): %s linhas em %.1fs", report.name, fmt.value, count, time.monotonic() - started)
+    return count
+
+
+def find_job(db: Session, token: str) -> BackgroundJob | None:
+    return db.execute(
+        select(BackgroundJob)
+        .where(BackgroundJob.job_type == JOB_TYPE, BackgroundJob.payload["token"].astext == token)
+        .order_by(BackgroundJob.created_at.desc())
+        .limit(1)
+    ).scalar_one_or_none()
+
+
+def job_status(job: BackgroundJob) -> str:
+    if job.status is JobStatus.done and not export_path(job.payload["token"], job.payload["format"]).exists():
+        return "expired"
+    return job.status.value
+
+
+def purge_expired(max_age_hours: int | None = None) -> int:
+    """
+    Apaga arquivos (inclusive .part abandonados) mais velhos que o TTL.
+    """
+    cutoff = time.time() - (max_age_hours or settings.EXPORTS_TTL_HOURS) * 3600
+    removed = 0
+    for path in _exports_dir().iterdir():
+        if path.is_file() and path.stat().st_mtime < cutoff:
+            path.unlink(missing_ok=True)
+            removed += 1
+    return removed
@@ -1,44 +1,88 @@
 # backend/app/services/file_service.py
 
 import os
+import hashlib
 from pathlib import Path
 from uuid import uuid4
-from fastapi import UploadFile
+from fastapi import UploadFile, HTTPException, status
+from app.core.config import settings
+from app.core.static_files import precompress
+from app.services.image_service import generate_variants
 
-# 1) Define o diretório base em app/static/rewards
-BASE_STATIC = Path(os.getcwd()) / "app" / "static" / "rewards"
+# 1) Raiz dos arquivos servidos em /static (app/static)
+STATIC_ROOT = Path(os.getcwd()) / "app" / "static"
+BASE_STATIC = STATIC_ROOT / "rewards"
 BASE_STATIC.mkdir(parents=True, exist_ok=True)
 
+
+def store_file(upload: UploadFile, folder: str) -> str:
+    """
+    Grava um UploadFile em app/static/<folder> e retorna a URL /static/….
+    - lê em blocos de UPLOAD_CHUNK_SIZE (nunca o arquivo inteiro em memória)
+    - recusa arquivos acima de UPLOAD_MAX_BYTES (413)
+    - o nome é o sha256 do conteúdo: mesmo arquivo → mesma URL (sem duplicar
+      em disco) e a URL nunca muda de conteúdo (servida com Cache-Control immutable)
+    - imagens raster ganham variantes redimensionadas (ver image_service)
+    """
+    dest_folder = STATIC_ROOT / folder
+    dest_folder.mkdir(parents=True, exist_ok=True)
+    ext = os.path.splitext(upload.filename or "")[1].lower()
+
+    tmp_path = dest_folder / f".{uuid4()}.part"
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        upload.file.seek(0)
+        with open(tmp_path, "wb") as f:
+            while chunk := upload.file.read(settings.UPLOAD_CHUNK_SIZE):
+                size += len(chunk)
+                if size > settings.UPLOAD_MAX_BYTES:
+                    raise HTTPException(
+                        status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                        detail=f"Arquivo maior que {settings.UPLOAD_MAX_BYTES // (1024 * 1024)} MB",
+                    )
+                digest.update(chunk)
+                f.write(chunk)
+
+        hexdigest = digest.hexdigest()
+        file_path = dest_folder / f"{hexdigest}{ext}"
+        if file_path.exists():
+            # conteúdo idêntico já enviado antes
+            tmp_path.unlink()
+        else:
+            tmp_path.replace(file_path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+    generate_variants(file_path, hexdigest)
+    precompress(file_path)  # SVGs: .gz/.br servidos pelo CachedStaticFiles
+    return f"/static/{file_path.relative_to(STATIC_ROOT).as_posix()}"
+
+
 def save_upload(upload: UploadFile, subfolder: str = "") -> str:
     """
     Salva um UploadFile dentro de app/static/rewards[/<subfolder>]
     e retorna a URL relativa para servir via /static/…
     """
-    # 2) Cria subpasta, se fornecida
-    dest_folder = BASE_STATIC
+    folder = Path("rewards")
     if subfolder:
-        dest_folder = BASE_STATIC / subfolder
-        dest_folder.mkdir(parents=True, exist_ok=True)
-
-    # 3) Gera nome único e grava no disco
-    ext = os.path.splitext(upload.filename)[1]
-    filename = f"{uuid4()}{ext}"
-    file_path = dest_folder / filename
-
-    upload.file.seek(0)
-    with open(file_path, "wb") as f:
-        f.write(upload.file.read())
+        folder /= subfolder
+    return store_file(upload, folder.as_posix())
 
-    # 4) Retorna caminho relativo para o static handler do FastAPI
-    rel = Path("rewards")
-    if subfolder:
-        rel /= subfolder
-    rel /= filename
-    return f"/static/{rel.as_posix()}"
 
 def delete_file_from_url(url: str):
     # url = "/static/rewards/loyalty_icons/abc.png"
     rel_path = url.lstrip("/")                # "static/rewards/loyalty_icons/abc.png"
     file_path = Path(os.getcwd()) / rel_path  # "/full/path/to/app/static/rewards/…"
-    if file_path.exists():
-        file_path.unlink()
\ No newline at end of file
+    if is_content_addressed(file_path):
+        # arquivo por hash pode ser compartilhado por outros registros
+        return
+    for candidate in (file_path, Path(f"{file_path}.gz"), Path(f"{file_path}.br")):
+        if candidate.exists():
+            candidate.unlink()
+
+
+def is_content_addressed(path: Path) -> bool:
+    stem = path.stem
+    return len(stem) == 64 and all(c in "0123456789abcdef" for c in stem)
@@ -2,14 +2,17 @@
 
 import time
 import re
+import threading
 import requests
 import logging
 from typing import Optional
 
-from redis import Redis
+from redis import Redis, RedisError
 from sqlalchemy import func
+from app.core import redis_client
 from app.core.config import settings
 from app.db.session import SessionLocal
+from app.models.branch import Branch
 from app.models.company import Company
 
 logging.basicConfig(
@@ -53,20 +56,51 @@ class GeocodeService:
       2) Nominatim textual (fallback)
       3) AwesomeAPI por CEP (fallback)
       4) Google Maps (fallback final)
-    Com cache no Redis e rate limit 1 req/s.
+    Com cache no Redis e rate limit por provedor (Nominatim: 1 req/s).
     """
 
-    _last_call = 0.0
-    _min_interval = 1.0  # segundos
+    # intervalo mínimo entre chamadas, por provedor (segundos)
+    _min_intervals = {
+        "nominatim": 1.0,   # política de uso do Nominatim público
+        "awesomeapi": 0.2,
+        "google": 0.05,
+    }
+    _next_slot: dict[str, float] = {}
+    _locks = {name: threading.Lock() for name in _min_intervals}
 
-    def __init__(self, redis: Redis):
-        self.redis = redis
+    CACHE_TTL = 60 * 60 * 24 * 30
 
-    def _rate_limit(self):
-        elapsed = time.time() - GeocodeService._last_call
-        if elapsed < GeocodeService._min_interval:
-            wait = GeocodeService._min_interval - elapsed
-            logger.debug("Rate limiting: sleeping %.2f seconds", wait)
+    def __init__(self, redis: Redis | None = None):
+        self.redis = redis or redis_client.get_redis()
+
+    # cache é opcional: sem Redis, geocodifica de novo em vez de falhar
+    def _cache_get(self, key: str) -> str | None:
+        try:
+            return self.redis.get(key)
+        except RedisError as e:
+            logger.warning("Cache de geocode indisponível: %s", e)
+            return None
+
+    def _cache_set(self, key: str, lat, lon) -> None:
+        try:
+            self.redis.set(key, f"{lat},{lon}", ex=self.CACHE_TTL)
+        except RedisError as e:
+            logger.warning("Falha ao gravar cache de geocode: %s", e)
+
+    def _rate_limit(self, provider: str):
+        """
+        Reserva o próximo horário livre do provedor e dorme até ele.
+        Thread-safe: provedores diferentes podem ser chamados em paralelo,
+        mas cada um respeita o próprio limite.
+        """
+        interval = GeocodeService._min_intervals[provider]
+        with GeocodeService._locks[provider]:
+            now = time.monotonic()
+            slot = max(now, GeocodeService._next_slot.get(provider, 0.0))
+            GeocodeService._next_slot[provider] = slot + interval
+        wait = slot - now
+        if wait > 0:
+            logger.debug("Rate limiting %s: sleeping %.2f seconds", provider, wait)
             time.sleep(wait)
 
     # ========= MÉTODOS PÚBLICOS =========
@@ -80,24 +114,23 @@ class GeocodeService:
 
         # cache por CEP
         key = f"geocode:{cep}"
-        cached = self.redis.get(key)
+        cached = self._cache_get(key)
         if cached:
             lat_str, lon_str = cached.split(",")
             logger.info("Cache HIT para %s → %s,%s", cep, lat_str, lon_str)
             return float(lat_str), float(lon_str)
 
         # AwesomeAPI (precisa retornar lat/lng, às vezes é genérico por bairro/cidade)
-        self._rate_limit()
+        self._rate_limit("awesomeapi")
         awesome_url = f"https://cep.awesomeapi.com.br/json/{cep}"
         try:
             resp0 = requests.get(awesome_url, timeout=10)
-            GeocodeService._last_call = time.time()
             if resp0.status_code == 200:
                 data0 = resp0.json()
                 lat = data0.get("lat")
                 lon = data0.get("lng")
                 if lat is not None and lon is not None:
-                    self.redis.set(key, f"{lat},{lon}", ex=60 * 60 * 24 * 30)
+                    self._cache_set(key, lat, lon)
                     logger.info("AwesomeAPI mapeou %s → %s,%s", cep, lat, lon)
                     return float(lat), float(lon)
         except Exception as e:
@@ -105,15 +138,14 @@ class GeocodeService:
 
         # Nominatim (textual com CEP)
         headers = {"User-Agent": settings.NOMINATIM_USER_AGENT}
-        self._rate_limit()
+        self._rate_limit("nominatim")
         params_fb = {"q": f"{cep}, Brasil", "format": "json", "limit": 1}
         try:
             resp2 = requests.get(settings.NOMINATIM_URL, params=params_fb, headers=headers, timeout=10)
-            GeocodeService._last_call = time.time()
             data = resp2.json()
             if data:
                 lat, lon = float(data[0]["lat"]), float(data[0]["lon"])
-                self.redis.set(key, f"{lat},{lon}", ex=60 * 60 * 24 * 30)
+                self._cache_set(key, lat, lon)
                 logger.info("Nominatim fallback por CEP %s → %s,%s", cep, lat, lon)
                 return lat, lon
         except Exception as e:
@@ -122,16 +154,15 @@ class GeocodeService:
         # Google
         api_key = settings.GOOGLE_MAPS_API_KEY
         if api_key:
-            self._rate_limit()
+            self._rate_limit("google")
             google_url = "https://maps.googleapis.com/maps/api/geocode/json"
             try:
                 resp3 = requests.get(google_url, params={"address": f"{cep}, Brasil", "key": api_key}, timeout=10)
-                GeocodeService._last_call = time.time()
                 result = resp3.json()
                 if result.get("status") == "OK" and result.get("results"):
                     loc = result["results"][0]["geometry"]["location"]
                     lat, lon = float(loc["lat"]), float(loc["lng"])
-                    self.redis.set(key, f"{lat},{lon}", ex=60 * 60 * 24 * 30)
+                    self._cache_set(key, lat, lon)
                     logger.info("Google mapeou CEP %s → %s,%s", cep, lat, lon)
                     return lat, lon
             except Exception as e:
@@ -156,7 +187,7 @@ class GeocodeService:
         key = _addr_cache_key(street, number, neighborhood, city, state, cep)
 
         # cache
-        cached = self.redis.get(key)
+        cached = self._cache_get(key)
         if cached:
             lat_str, lon_str = cached.split(",")
             logger.info("Cache HIT addr → %s,%s", lat_str, lon_str)
@@ -177,9 +208,8 @@ class GeocodeService:
         }
         logger.info("Nominatim estruturado: %s", params_nom)
         try:
-            self._rate_limit()
+            self._rate_limit("nominatim")
             resp = requests.get(settings.NOMINATIM_URL, params=params_nom, headers=headers, timeout=12)
-            GeocodeService._last_call = time.time()
             data = resp.json()
         except Exception as e:
             logger.error("Erro Nominatim estruturado: %s", e)
@@ -201,14 +231,13 @@ class GeocodeService:
             )
             logger.info("Nominatim textual: %s", q)
             try:
-                self._rate_limit()
+                self._rate_limit("nominatim")
                 resp2 = requests.get(
                     settings.NOMINATIM_URL,
                     params={"q": q, "format": "json", "limit": 1},
                     headers=headers,
                     timeout=12,
                 )
-                GeocodeService._last_call = time.time()
                 data = resp2.json()
             except Exception as e:
                 logger.error("Erro Nominatim textual: %s", e)
@@ -218,7 +247,7 @@ class GeocodeService:
         if not data and cep:
             try:
                 lat, lon = self.geocode_postal_code(cep)
-                self.redis.set(key, f"{lat},{lon}", ex=60 * 60 * 24 * 30)
+                self._cache_set(key, lat, lon)
                 logger.info("Usando AwesomeAPI/CEP como fallback do endereço")
                 return lat, lon
             except Exception as e:
@@ -243,14 +272,13 @@ class GeocodeService:
             google_url = "https://maps.googleapis.com/maps/api/geocode/json"
             logger.info("Google por endereço: %s", addr_line)
             try:
-                self._rate_limit()
+                self._rate_limit("google")
                 resp3 = requests.get(google_url, params={"address": addr_line, "key": api_key}, timeout=12)
-                GeocodeService._last_call = time.time()
                 result = resp3.json()
                 if result.get("status") == "OK" and result.get("results"):
                     loc = result["results"][0]["geometry"]["location"]
                     lat, lon = float(loc["lat"]), float(loc["lng"])
-                    self.redis.set(key, f"{lat},{lon}", ex=60 * 60 * 24 * 30)
+                    self._cache_set(key, lat, lon)
                     return lat, lon
             except Exception as e:
                 logger.error("Erro Google (endereço): %s", e)
@@ -260,45 +288,71 @@ class GeocodeService:
 
         # Achou em Nominatim
         lat, lon = float(data[0]["lat"]), float(data[0]["lon"])
-        self.redis.set(key, f"{lat},{lon}", ex=60 * 60 * 24 * 30)
+        self._cache_set(key, lat, lon)
         return lat, lon
 
 
+def geocode_address(
+    geocoder: GeocodeService,
+    *,
+    postal_code: Optional[str] = None,
+    street: Optional[str] = None,
+    number: Optional[str] = None,
+    neighborhood: Optional[str] = None,
+    city: Optional[str] = None,
+    state: Optional[str] = None,
+) -> tuple[float, float]:
+    """
+    (lat, lon) preferindo o endereço completo.
+    """
+    if any([street, number, neighborhood, city, state, postal_code]):
+        return geocoder.geocode_structured_address(
+            street=street,
+            number=number,
+            neighborhood=neighborhood,
+            city=city,
+            state=state,
+            postal_code=postal_code,
+        )
+    elif postal_code:
+        return geocoder.geocode_postal_code(postal_code)
+    raise ValueError("Endereço/CEP não fornecido para geocodificação")
+
+
 def geocode_and_save(
     company_id: str,
     *,
-    redis_url: str,
+    redis_url: str | None = None,
     postal_code: Optional[str] = None,
     street: Optional[str] = None,
     number: Optional[str] = None,
     neighborhood: Optional[str] = None,
     city: Optional[str] = None,
     state: Optional[str] = None,
+    raise_on_error: bool = False,
 ):
     """
     Background task:
     - Conecta DB/Redis
     - Geocodifica (preferindo endereço completo)
     - Atualiza company.location
+    Com raise_on_error=True a falha é propagada (o job runner reagenda).
     """
     db = SessionLocal()
-    redis = Redis.from_url(redis_url, decode_responses=True)
+    # redis_url só para outro Redis que não o da aplicação
+    redis = Redis.from_url(redis_url, decode_responses=True) if redis_url and redis_url != settings.REDIS_URL else None
     geocoder = GeocodeService(redis)
 
     try:
-        if any([street, number, neighborhood, city, state, postal_code]):
-            lat, lon = geocoder.geocode_structured_address(
-                street=street,
-                number=number,
-                neighborhood=neighborhood,
-                city=city,
-                state=state,
-                postal_code=postal_code,
-            )
-        elif postal_code:
-            lat, lon = geocoder.geocode_postal_code(postal_code)
-        else:
-            raise ValueError("Endereço/CEP não fornecido para geocodificação")
+        lat, lon = geocode_address(
+            geocoder,
+            street=street,
+            number=number,
+            neighborhood=neighborhood,
+            city=city,
+            state=state,
+            postal_code=postal_code,
+        )
 
         company = db.get(Company, company_id)
         if company:
@@ -306,12 +360,43 @@ def geocode_and_save(
             db.commit()
     except Exception as e:
         logger.error("geocode_and_save falhou para company=%s: %s", company_id, e)
+        if raise_on_error:
+            raise
+    finally:
+        db.close()
+
+
+def geocode_branch_and_save(branch_id: str, *, raise_on_error: bool = False):
+    """
+    Background task: geocodifica o endereço da filial e grava branch.location.
+    Não sobrescreve um ponto definido manualmente depois do agendamento.
+    """
+    db = SessionLocal()
+    try:
+        branch = db.get(Branch, branch_id)
+        if not branch or branch.location is not None:
+            return
+        lat, lon = geocode_address(
+            GeocodeService(),
+            street=branch.street,
+            number=branch.number,
+            neighborhood=branch.neighborhood,
+            city=branch.city,
+            state=branch.state,
+            postal_code=branch.postal_code,
+        )
+        branch.location = func.ST_SetSRID(func.ST_MakePoint(lon, lat), 4326)
+        db.commit()
+    except Exception as e:
+        logger.error("geocode_branch_and_save falhou para branch=%s: %s", branch_id, e)
+        if raise_on_error:
+            raise
     finally:
         db.close()
 
 
 # Wrapper de compatibilidade (se em algum lugar antigo ainda chamar por CEP posicional)
-def geocode_and_save_cep(company_id: str, postal_code: str, redis_url: str):
+def geocode_and_save_cep(company_id: str, postal_code: str, redis_url: str | None = None):
     return geocode_and_save(
         company_id,
         redis_url=redis_url,
@@ -0,0 +1,132 @@
+# backend/app/services/image_service.py
+#
+# Variantes redimensionadas (WebP e, se disponível, AVIF) das imagens enviadas.
+# O trabalho de CPU roda num pool de processos limitado; os nomes são
+# derivados do hash do original, então as URLs das variantes podem ser
+# calculadas a partir da URL do original sem consultar o disco.
+
+import re
+import atexit
+import logging
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from functools import cache
+from pathlib import Path
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+try:
+    from PIL import Image, ImageOps
+    HAS_PIL = True
+except ImportError:  # Pillow é opcional: sem ele só o original é salvo
+    HAS_PIL = False
+
+try:
+    import pillow_avif  # noqa: F401  (registra o encoder AVIF no Pillow)
+except ImportError:
+    pass
+
+# largura máxima de cada variante (nunca amplia o original)
+VARIANT_WIDTHS = {
+    "thumb": 160,
+    "sm":    480,
+    "md":    960,
+}
+
+# formatos raster que sabemos redimensionar (SVG e afins ficam só com o original)
+RASTER_EXTENSIONS = {".jpg", ".jpeg", ".png", ".webp", ".avif", ".gif", ".bmp", ".tif", ".tiff"}
+
+_HASHED_URL = re.compile(r"^(?P<folder>/static/.+)/(?P<digest>[0-9a-f]{64})(?P<ext>\.[A-Za-z0-9]+)$")
+
+
+@cache
+def _avif_enabled() -> bool:
+    if not (HAS_PIL and settings.IMAGE_AVIF_ENABLED):
+        return False
+    # o encoder (nativo no Pillow >= 11.3 ou do pillow_avif) fica registrado
+    # em Image.SAVE; features.check("avif") só avisa e devolve False nos
+    # Pillow sem a feature, mesmo com o plugin
+    Image.init()
+    return "AVIF" in Image.SAVE
+
+VARIANT_FORMATS: tuple[str, ...] = ("webp", "avif") if _avif_enabled() else ("webp",)
+
+_pool: ProcessPoolExecutor | None = None
+_pool_lock = threading.Lock()
+
+def get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ProcessPoolExecutor(max_workers=settings.IMAGE_WORKERS)
+    return _pool
+
+def shutdown_pool() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=True, cancel_futures=True)
+            _pool = None
+
+atexit.register(shutdown_pool)
+
+def make_variants(src: str, digest: str, formats: tuple[str, ...]) -> list[str]:
+    """
+    Executado no pool de processos: gera `<digest>_<nome>.<fmt>` ao lado do
+    original para cada largura de VARIANT_WIDTHS. Retorna os arquivos criados.
+    """
+    src_path = Path(src)
+    created = []
+    with Image.open(src_path) as im:
+        im = ImageOps.exif_transpose(im)
+        if im.mode not in ("RGB", "RGBA"):
+            im = im.convert("RGBA" if "transparency" in im.info or im.mode in ("P", "LA") else "RGB")
+        for name, width in VARIANT_WIDTHS.items():
+            variant = im.copy()
+            if variant.width > width:
+                variant.thumbnail((width, round(variant.height * width / variant.width)), Image.LANCZOS)
+            for fmt in formats:
+                out = src_path.with_name(f"{digest}_{name}.{fmt}")
+                if out.exists():
+                    continue
+                tmp = out.with_suffix(f".{fmt}.tmp")
+                variant.save(tmp, format=fmt.upper(), quality=settings.IMAGE_QUALITY)
+                tmp.replace(out)
+                created.append(out.name)
+    return created
+
+
+def generate_variants(path: Path, digest: str) -> None:
+    """
+    Gera as variantes no pool e espera o resultado (a thread da requisição
+    só aguarda; o CPU fica nos processos do pool).
+    """
+    if not HAS_PIL or path.suffix.lower() not in RASTER_EXTENSIONS:
+        return
+    try:
+        get_pool().submit(make_variants, str(path), digest, VARIANT_FORMATS).result()
+    except Exception as e:
+        # imagem corrompida / formato não suportado: mantém só o original
+        logger.warning("Falha ao gerar variantes de %s: %s", path.name, e)
+
+
+def variant_urls(url: str | None) -> dict[str, str] | None:
+    """
+    URLs das variantes de uma imagem salva por hash, ex.:
+    {"thumb": ".../<hash>_thumb.webp", "thumb_avif": ..., "sm": ..., "md": ...}.
+    None para imagens antigas (nome aleatório), vetoriais ou sem Pillow.
+    """
+    if not url or not HAS_PIL:
+        return None
+    m = _HASHED_URL.match(url)
+    if not m or m.group("ext").lower() not in RASTER_EXTENSIONS:
+        return None
+    base = f"{m.group('folder')}/{m.group('digest')}"
+    urls = {}
+    for name in VARIANT_WIDTHS:
+        urls[name] = f"{base}_{name}.webp"
+        if "avif" in VARIANT_FORMATS:
+            urls[f"{name}_avif"] = f"{base}_{name}.avif"
+    return urls
@@ -0,0 +1,206 @@
+# app/services/job_service.py
+from datetime import datetime, timedelta, timezone
+from typing import Any
+from sqlalchemy import select, update, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.models.background_job import BackgroundJob, JobStatus
+
+ACTIVE_STATUSES = (JobStatus.pending, JobStatus.running)
+
+
+def enqueue(
+    db: Session,
+    job_type: str,
+    payload: dict[str, Any] | None = None,
+    *,
+    run_at: datetime | None = None,
+    max_attempts: int | None = None,
+    dedupe_key: str | None = None,
+    rerun_if_running: bool = False,
+    commit: bool = True,
+) -> bool:
+    """
+    Agenda um job. Com `dedupe_key`, não cria outro se já existir um job
+    pendente/rodando com a mesma chave. Retorna True se o job foi criado.
+    Com `rerun_if_running`, o job igual que já está rodando (e pode ter lido
+    o estado antigo) é marcado para rodar de novo ao concluir.
+    Com commit=False o job só vale se a transação de quem chamou for confirmada.
+    """
+    values = {
+        "job_type": job_type,
+        "payload": payload or {},
+        "status": JobStatus.pending,
+        "attempts": 0,
+        "max_attempts": max_attempts or settings.JOB_MAX_ATTEMPTS,
+        "run_at": run_at or datetime.now(timezone.utc),
+        "dedupe_key": dedupe_key,
+    }
+    stmt = pg_insert(BackgroundJob).values(**values)
+    if dedupe_key is not None:
+        stmt = stmt.on_conflict_do_nothing(
+            index_elements=[BackgroundJob.dedupe_key],
+            index_where=BackgroundJob.status.in_(ACTIVE_STATUSES),
+        )
+    created = db.execute(stmt).rowcount > 0
+    if not created and dedupe_key is not None and rerun_if_running:
+        created = _request_rerun(db, stmt, dedupe_key)
+    if commit:
+        db.commit()
+    return created
+
+
+def _request_rerun(db: Session, stmt, dedupe_key: str) -> bool:
+    """
+    O job com a mesma chave já existe. Pendente: ainda vai rodar e ver o
+    estado atual, nada a fazer. Rodando: marca `rerun_requested` (complete()
+    o devolve para a fila). Se terminou nesse meio-tempo, o insert passa.
+    """
+    flagged = db.execute(
+        update(BackgroundJob)
+        .where(
+            BackgroundJob.dedupe_key == dedupe_key,
+            BackgroundJob.status == JobStatus.running,
+        )
+        .values(rerun_requested=True)
+    ).rowcount
+    if flagged:
+        return False
+    return db.execute(stmt).rowcount > 0
+
+
+def claim(
+    db: Session,
+    *,
+    job_type: str,
+    limit: int,
+    concurrency: int,
+    worker_id: str,
+) -> list[tuple[Any, str, dict[str, Any]]]:
+    """
+    Reserva jobs vencidos de um tipo, respeitando o limite de concorrência
+    global (somando todos os workers). O advisory lock por tipo serializa a
+    contagem de jobs em execução entre workers.
+    Retorna tuplas (id, job_type, payload) já desacopladas da sessão.
+    """
+    db.execute(select(func.pg_advisory_xact_lock(func.hashtext(f"jobs:{job_type}"))))
+    running = db.scalar(
+        select(func.count(BackgroundJob.id)).where(
+            BackgroundJob.job_type == job_type,
+            BackgroundJob.status == JobStatus.running,
+        )
+    )
+    available = min(limit, concurrency - running)
+    if available <= 0:
+        db.commit()
+        return []
+
+    now = datetime.now(timezone.utc)
+    jobs = db.scalars(
+        select(BackgroundJob)
+        .where(
+            BackgroundJob.job_type == job_type,
+            BackgroundJob.status == JobStatus.pending,
+            BackgroundJob.run_at <= now,
+        )
+        .order_by(BackgroundJob.run_at)
+        .limit(available)
+        .with_for_update(skip_locked=True)
+    ).all()
+    for job in jobs:
+        job.status = JobStatus.running
+        job.attempts += 1
+        job.locked_at = now
+        job.locked_by = worker_id
+    claimed = [(job.id, job.job_type, dict(job.payload or {})) for job in jobs]
+    db.commit()
+    return claimed
+
+
+def complete(db: Session, job_id) -> None:
+    """
+    Conclui o job, ou o devolve para a fila se um pedido igual chegou
+    enquanto rodava. O lock da linha serializa com _request_rerun: ou a
+    marca é vista aqui, ou o enqueue já encontra o job concluído.
+    """
+    job = db.get(BackgroundJob, job_id, with_for_update=True)
+    if job is None:
+        db.commit()
+        return
+    job.last_error = None
+    job.locked_at = None
+    job.locked_by = None
+    if job.rerun_requested:
+        _rerun(job)
+    else:
+        job.status = JobStatus.done
+        job.finished_at = datetime.now(timezone.utc)
+    db.commit()
+
+
+def _rerun(job: BackgroundJob) -> None:
+    job.rerun_requested = False
+    job.status = JobStatus.pending
+    job.attempts = 0
+    job.run_at = datetime.now(timezone.utc)
+
+
+def fail(db: Session, job_id, error: str) -> bool:
+    """
+    Registra a falha e reagenda com backoff exponencial.
+    Retorna True se o job esgotou as tentativas (status `failed`).
+    """
+    job = db.get(BackgroundJob, job_id, with_for_update=True)
+    if job is None:
+        return True
+    job.last_error = error[:2000]
+    job.locked_at = None
+    job.locked_by = None
+    exhausted = job.attempts >= job.max_attempts
+    if exhausted and job.rerun_requested:
+        # chegou pedido novo durante a última tentativa: recomeça a contagem
+        _rerun(job)
+        exhausted = False
+    elif exhausted:
+        job.status = JobStatus.failed
+        job.finished_at = datetime.now(timezone.utc)
+    else:
+        delay = min(
+            settings.JOB_RETRY_BASE_SECONDS * (2 ** (job.attempts - 1)),
+            settings.JOB_RETRY_MAX_SECONDS,
+        )
+        job.status = JobStatus.pending
+        job.run_at = datetime.now(timezone.utc) + timedelta(seconds=delay)
+    db.commit()
+    return exhausted
+
+
+def heartbeat(db: Session, job_id) -> None:
+    """
+    Renova o lock de um job longo para requeue_stale não devolvê-lo à fila
+    enquanto ainda roda. Usar numa sessão própria (commita).
+    """
+    db.execute(
+        update(BackgroundJob)
+        .where(BackgroundJob.id == job_id, BackgroundJob.status == JobStatus.running)
+        .values(locked_at=func.now())
+    )
+    db.commit()
+
+
+def requeue_stale(db: Session, older_than_seconds: int) -> int:
+    """
+    Devolve para a fila jobs `running` cujo worker morreu (lock antigo).
+    """
+    limit = datetime.now(timezone.utc) - timedelta(seconds=older_than_seconds)
+    result = db.execute(
+        update(BackgroundJob)
+        .where(
+            BackgroundJob.status == JobStatus.running,
+            BackgroundJob.locked_at < limit,
+        )
+        .values(status=JobStatus.pending, locked_at=None, locked_by=None)
+    )
+    db.commit()
+    return result.rowcount
@@ -1,5 +1,5 @@
 from datetime import datetime, timedelta
-from sqlalchemy import func, desc, and_
+from sqlalchemy import func, desc, and_, or_, case, update
 from app.models import User, UserPointsStats, UserPointsTransaction, UserPointsTxType
 
 def leaderboard_overall(db, skip, limit):
@@ -73,3 +73,33 @@ def leaderboard_month(db, year, month, skip, limit):
     total = q.count()
     rows  = q.offset(skip).limit(limit).all()
     return total, rows
+
+
+def rollover_points_stats(db) -> int:
+    """
+    Zera today_points/month_points de quem não pontuou no dia/mês corrente.
+    Roda como job periódico (app/workers/tasks.py). O updated_at é mantido,
+    senão o onupdate faria as linhas parecerem atualizadas hoje.
+    """
+    now = datetime.utcnow()
+    day_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    month_start = day_start.replace(day=1)
+
+    stale_month = UserPointsStats.updated_at < month_start
+    result = db.execute(
+        update(UserPointsStats)
+        .where(
+            UserPointsStats.updated_at < day_start,
+            or_(
+                UserPointsStats.today_points != 0,
+                and_(UserPointsStats.month_points != 0, stale_month),
+            ),
+        )
+        .values(
+            today_points=0,
+            month_points=case((stale_month, 0), else_=UserPointsStats.month_points),
+            updated_at=UserPointsStats.updated_at,
+        )
+    )
+    db.commit()
+    return result.rowcount
@@ -0,0 +1,157 @@
+# backend/app/services/listing.py
+#
+# Listagens administrativas grandes (pedidos, regras, transações):
+# - keyset_page: página ordenada por (created_at desc, id desc) a partir do
+#   cursor da página anterior — sem OFFSET, o custo não cresce com a página.
+#   `skip` continua aceito sem cursor (compatibilidade com o console)
+# - count_rows: total exato só quando pedido; sem filtros usa a estimativa
+#   do planner (pg_class.reltuples), com filtros conta até
+#   ADMIN_LIST_COUNT_CAP linhas
+
+import base64
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Any
+from uuid import UUID
+from zoneinfo import ZoneInfo
+from fastapi import HTTPException, status
+from sqlalchemy import and_, func, literal_column, or_, select, text, tuple_
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.time_range import local_range, resolve_timezone
+
+
+@dataclass
+class Page:
+    rows: list[Any]
+    total: int
+    total_estimated: bool
+    next_cursor: str | None
+
+    def headers(self) -> dict[str, str]:
+        headers = {"X-Total-Count": str(self.total)}
+        if self.total_estimated:
+            headers["X-Total-Estimated"] = "true"
+        if self.next_cursor:
+            headers["X-Next-Cursor"] = self.next_cursor
+        return headers
+
+
+def encode_cursor(created_at: datetime | None, key) -> str:
+    stamp = created_at.isoformat() if created_at is not None else ""
+    return base64.urlsafe_b64encode(f"{stamp}|{key}".encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime | None, UUID]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, key = raw.rsplit("|", 1)
+        return (datetime.fromisoformat(created_at) if created_at else None), UUID(key)
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Cursor inválido")
+
+
+def date_filters(column, start_date: date | None, end_date: date | None, tz: ZoneInfo | None = None) -> list:
+    """
+    Filtro por dias locais (semiaberto, como TimeRange.filter); qualquer uma
+    das pontas pode faltar.
+    """
+    tz = tz or resolve_timezone()
+    filters = []
+    if start_date:
+        filters.append(column >= local_range(start_date, start_date, tz).start)
+    if end_date:
+        filters.append(column < local_range(end_date, end_date, tz).end)
+    return filters
+
+
+def estimated_rows(db: Session, table: str) -> int | None:
+    """
+    Estimativa do planner (atualizada por ANALYZE/autovacuum); None se a
+    tabela nunca foi analisada.
+    """
+    value = db.execute(
+        text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:t)"),
+        {"t": table},
+    ).scalar()
+    return value if value is not None and value >= 0 else None
+
+
+def count_rows(db: Session, stmt, *, table: str, filtered: bool, exact: bool = False) -> tuple[int, bool]:
+    """
+    Total das linhas de `stmt` (SELECT já filtrado, sem ordem/paginação);
+    retorna (total, é_estimativa).
+    """
+    if exact:
+        return db.execute(select(func.count()).select_from(_probe(stmt).subquery())).scalar_one(), False
+
+    if not filtered:
+        estimate = estimated_rows(db, table)
+        if estimate is not None:
+            return estimate, True
+
+    cap = settings.ADMIN_LIST_COUNT_CAP
+    counted = capped_count(db, stmt, cap)
+    if counted > cap:
+        return cap, True
+    return counted, False
+
+
+def capped_count(db: Session, stmt, cap: int) -> int:
+    """
+    Conta as linhas de `stmt` parando em cap + 1 (mais que `cap` = "muitas").
+    """
+    probe = _probe(stmt).limit(cap + 1)
+    return db.execute(select(func.count()).select_from(probe.subquery())).scalar_one()
+
+
+def _probe(stmt):
+    # mesmo FROM/WHERE, sem colunas nem ordem: o count não lê as linhas inteiras
+    return stmt.with_only_columns(literal_column("1"), maintain_column_froms=True).order_by(None)
+
+
+def keyset_page(
+    db: Session,
+    stmt,
+    *,
+    created_at,
+    key,
+    table: str,
+    filtered: bool,
+    limit: int,
+    after: str | None = None,
+    skip: int = 0,
+    exact: bool = False,
+    options: tuple = (),
+) -> Page:
+    """
+    Página de `stmt` ordenada por (`created_at` desc, `key` desc):
+    - after: cursor (X-Next-Cursor) da página anterior; tem prioridade sobre skip
+    - options: loader options (selectinload…) aplicadas só à página
+    Cada Row traz as colunas de `stmt`; o cursor sai de `created_at`/`key`.
+    Linhas sem `created_at` vêm primeiro (DESC do Postgres = NULLS FIRST, a
+    mesma ordem dos índices) e também entram no cursor.
+    """
+    total, estimated = count_rows(db, stmt, table=table, filtered=filtered, exact=exact)
+
+    page = stmt.add_columns(created_at.label("_cursor_created_at"), key.label("_cursor_key"))
+    if after:
+        last_created_at, last_key = decode_cursor(after)
+        if last_created_at is None:
+            # ainda nas linhas sem data: as demais vêm todas depois delas
+            page = page.where(or_(and_(created_at.is_(None), key < last_key), created_at.isnot(None)))
+        else:
+            # NULL na tupla não passa no "<": as linhas sem data já foram listadas
+            page = page.where(tuple_(created_at, key) < tuple_(last_created_at, last_key))
+    elif skip:
+        page = page.offset(skip)
+    rows = db.execute(
+        page.options(*options).order_by(created_at.desc(), key.desc()).limit(limit + 1)
+    ).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(last._cursor_created_at, last._cursor_key)
+    return Page(rows=rows, total=total, total_estimated=estimated, next_cursor=next_cursor)
@@ -1,10 +1,13 @@
 # app/services/loyalty_metrics_service.py
-from datetime import date, datetime, time, timedelta
+from datetime import date
 from uuid import UUID
+from zoneinfo import ZoneInfo
 
-from sqlalchemy import func, cast, Date
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 
+from app.core.time_range import local_range, resolve_timezone
+
 from app.models.loyalty_card import (
     LoyaltyCardTemplate,
     LoyaltyCardInstance,
@@ -14,12 +17,13 @@ from app.models.reward import RewardRedemptionCode, TemplateRewardLink
 
 
 # ───────────────────────── helpers ─────────────────────────────
-def _to_datetime_range(date_from: date | None, date_to: date | None):
-    """Converte date → datetime (00 h a 23:59)."""
+def _to_datetime_range(date_from: date | None, date_to: date | None, tz: ZoneInfo | None):
+    """Converte date → instantes no fuso (00 h do 1º dia até 00 h do dia seguinte ao último, exclusivo)."""
     if date_from and date_to and date_from > date_to:
         date_from, date_to = date_to, date_from
-    start = datetime.combine(date_from, time.min) if date_from else None
-    end   = datetime.combine(date_to,   time.max) if date_to   else None
+    tz = tz or resolve_timezone()
+    start = local_range(date_from, date_from, tz).start if date_from else None
+    end   = local_range(date_to,   date_to,   tz).end   if date_to   else None
     return start, end
 
 
@@ -30,8 +34,9 @@ def summary_for_company(
     tpl_id: UUID | None = None,
     date_from: date | None = None,
     date_to: date | None = None,
+    tz: ZoneInfo | None = None,
 ) -> dict:
-    start_dt, end_dt = _to_datetime_range(date_from, date_to)
+    start_dt, end_dt = _to_datetime_range(date_from, date_to, tz)
 
     # cartões emitidos ----------------------------------------------------
     base_q = (
@@ -47,7 +52,7 @@ def summary_for_company(
     if start_dt:
         base_q = base_q.filter(LoyaltyCardInstance.issued_at >= start_dt)
     if end_dt:
-        base_q = base_q.filter(LoyaltyCardInstance.issued_at <= end_dt)
+        base_q = base_q.filter(LoyaltyCardInstance.issued_at < end_dt)
 
     total_cards  = base_q.count()
     unique_users = base_q.distinct(LoyaltyCardInstance.user_id).count()
@@ -71,7 +76,7 @@ def summary_for_company(
     if start_dt:
         stamps_q = stamps_q.filter(LoyaltyCardStamp.given_at >= start_dt)
     if end_dt:
-        stamps_q = stamps_q.filter(LoyaltyCardStamp.given_at <= end_dt)
+        stamps_q = stamps_q.filter(LoyaltyCardStamp.given_at < end_dt)
 
     total_stamps = stamps_q.scalar() or 0
 
@@ -96,7 +101,7 @@ def summary_for_company(
     if start_dt:
         redeem_q = redeem_q.filter(RewardRedemptionCode.expires_at >= start_dt)
     if end_dt:
-        redeem_q = redeem_q.filter(RewardRedemptionCode.expires_at <= end_dt)
+        redeem_q = redeem_q.filter(RewardRedemptionCode.expires_at < end_dt)
 
     rewards_redeemed = redeem_q.count()
 
@@ -115,38 +120,34 @@ def daily_counts(
     tpl_id: UUID | None,
     date_from: date,
     date_to: date,
+    tz: ZoneInfo | None = None,
 ) -> dict[str, dict[date, int]]:
-    """Retorna contagens por dia entre date_from e date_to (inclusive)."""
-    if date_from > date_to:
-        date_from, date_to = date_to, date_from
-
-    start_dt = datetime.combine(date_from, time.min)
-    end_dt   = datetime.combine(date_to,   time.max)
-    span     = (date_to - date_from).days + 1
-    full_rng = [date_from + timedelta(d) for d in range(span)]
+    """Retorna contagens por dia local entre date_from e date_to (inclusive), dias vazios com 0."""
+    period = local_range(date_from, date_to, tz or resolve_timezone())
 
     # cartões por dia -----------------------------------------------------
-    day_col = cast(LoyaltyCardInstance.issued_at, Date)
+    day_col = period.bucket(LoyaltyCardInstance.issued_at)
 
     cards_q = (
-        db.query(day_col.label("d"), func.count().label("n"))
+        select(day_col.label("bucket"), func.count().label("n"))
+        .select_from(LoyaltyCardInstance)
         .join(
             LoyaltyCardTemplate,
             LoyaltyCardTemplate.id == LoyaltyCardInstance.template_id,
         )
-        .filter(LoyaltyCardTemplate.company_id == company_id)
-        .filter(LoyaltyCardInstance.issued_at.between(start_dt, end_dt))
+        .where(LoyaltyCardTemplate.company_id == company_id)
+        .where(period.filter(LoyaltyCardInstance.issued_at))
     )
     if tpl_id:
-        cards_q = cards_q.filter(LoyaltyCardInstance.template_id == tpl_id)
+        cards_q = cards_q.where(LoyaltyCardInstance.template_id == tpl_id)
 
-    cards = {d: n for d, n in cards_q.group_by("d").all()}
+    cards_q = cards_q.group_by(day_col).subquery()
 
     # resgates por dia ----------------------------------------------------
-    redeem_day = cast(RewardRedemptionCode.expires_at, Date)
+    redeem_day = period.bucket(RewardRedemptionCode.expires_at)
 
     redeems_q = (
-        db.query(redeem_day.label("d"), func.count().label("n"))
+        select(redeem_day.label("bucket"), func.count().label("n"))
         .select_from(RewardRedemptionCode)            # 👈 raíz explícita
         .join(
             TemplateRewardLink,
@@ -156,19 +157,19 @@ def daily_counts(
             LoyaltyCardTemplate,
             LoyaltyCardTemplate.id == TemplateRewardLink.template_id,
         )
-        .filter(LoyaltyCardTemplate.company_id == company_id)
-        .filter(RewardRedemptionCode.used.is_(True))
-        .filter(RewardRedemptionCode.expires_at.between(start_dt, end_dt))
+        .where(LoyaltyCardTemplate.company_id == company_id)
+        .where(RewardRedemptionCode.used.is_(True))
+        .where(period.filter(RewardRedemptionCode.expires_at))
     )
     if tpl_id:
-        redeems_q = redeems_q.filter(
+        redeems_q = redeems_q.where(
             RewardRedemptionCode.instance.has(template_id=tpl_id)
         )
 
-    redeems = {d: n for d, n in redeems_q.group_by("d").all()}
+    redeems_q = redeems_q.group_by(redeem_day).subquery()
 
-    # completa range com zeros -------------------------------------------
+    # range completo com zeros (generate_series) ---------------------------
     return {
-        "cards":   {d: cards.get(d, 0)   for d in full_rng},
-        "redeems": {d: redeems.get(d, 0) for d in full_rng},
+        "cards":   {r.bucket.date(): r.n for r in db.execute(period.zero_filled(cards_q, n=0))},
+        "redeems": {r.bucket.date(): r.n for r in db.execute(period.zero_filled(redeems_q, n=0))},
     }
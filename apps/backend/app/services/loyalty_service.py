@@ -8,6 +8,7 @@ import os
 from pathlib import Path
 from sqlalchemy import select
 from sqlalchemy.orm import Session, selectinload, noload
+from app.core import response_cache
 
 from app.models.loyalty_card import (
     LoyaltyCardTemplate, LoyaltyCardRule, LoyaltyCardInstance,
@@ -33,6 +34,7 @@ def create_template(
         data["stamp_icon_url"] = stamp_icon_url
     tpl = LoyaltyCardTemplate(company_id=company_id, **data)
     db.add(tpl); db.commit(); db.refresh(tpl)
+    response_cache.bump(f"loyalty_templates:{company_id}")
     return tpl
 
 
@@ -62,6 +64,7 @@ def update_template(db, tpl_id, payload, stamp_icon_url):
 
     db.commit()
     db.refresh(tpl)
+    response_cache.bump(f"loyalty_templates:{tpl.company_id}")
     return tpl
 
 
@@ -71,6 +74,7 @@ def add_rule(db: Session, tpl_id: UUID, payload: RuleCreate) -> LoyaltyCardRule:
     if not tpl: raise ValueError("Template not found")
     rule = LoyaltyCardRule(template_id=tpl_id, **payload.model_dump())
     db.add(rule); db.commit(); db.refresh(rule)
+    response_cache.bump(f"loyalty_templates:{tpl.company_id}")
     return rule
 
 # ───────── emissão de cartão ───────────────────────────────────
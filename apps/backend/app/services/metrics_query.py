@@ -0,0 +1,154 @@
+# backend/app/services/metrics_query.py
+#
+# Camada de consultas para dashboards de métricas sobre tabelas de eventos
+# (purchase_logs, …):
+# - summary_with_series: totais, distintos e série diária (dia local, ver
+#   app/core/time_range.py) numa única varredura
+#   (GROUP BY GROUPING SETS ((dia), ()))
+# - ranked_groups: ranking por grupo (top-N) com paginação keyset, sem OFFSET
+# - distinto aproximado (HyperLogLog, extensão `hll`) opcional para períodos
+#   longos; sem a extensão volta para count(DISTINCT)
+
+import base64
+import logging
+from dataclasses import dataclass
+from decimal import Decimal, InvalidOperation
+from typing import Any
+from uuid import UUID
+from fastapi import HTTPException, status
+from sqlalchemy import BigInteger, Text, and_, cast, func, or_, select, text, tuple_
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.time_range import TimeRange
+
+logger = logging.getLogger(__name__)
+
+_hll_available: bool | None = None
+
+
+# ───────────── distinto aproximado ─────────────
+
+def hll_available(db: Session) -> bool:
+    """
+    A extensão `hll` (postgresql-hll) está instalada? Consultado uma vez por
+    processo.
+    """
+    global _hll_available
+    if _hll_available is None:
+        _hll_available = bool(db.execute(
+            text("SELECT EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'hll')")
+        ).scalar())
+        if not _hll_available:
+            logger.info("Extensão hll ausente: distintos de métricas serão exatos")
+    return _hll_available
+
+
+def use_approximate(db: Session, period: TimeRange, requested: bool | None) -> bool:
+    """
+    requested=None decide pelo tamanho do período
+    (METRICS_APPROX_DISTINCT_MIN_DAYS; 0 desliga).
+    """
+    if requested is None:
+        min_days = settings.METRICS_APPROX_DISTINCT_MIN_DAYS
+        requested = bool(min_days) and len(period.days()) >= min_days
+    return requested and hll_available(db)
+
+
+def distinct_count(column, approximate: bool = False):
+    if approximate:
+        return cast(
+            func.hll_cardinality(func.hll_add_agg(func.hll_hash_text(cast(column, Text)))),
+            BigInteger,
+        )
+    return func.count(column.distinct())
+
+
+# ───────────── totais + série ─────────────
+
+@dataclass
+class SummaryResult:
+    totals: dict[str, Any]
+    series: list[dict[str, Any]]
+
+
+def summary_with_series(
+    db: Session,
+    *,
+    period: TimeRange,
+    timestamp,
+    filters: list,
+    measures: dict[str, Any],
+    distinct: dict[str, Any] | None = None,
+) -> SummaryResult:
+    """
+    Uma varredura para os totais do período e a série por dia local:
+    - filters: demais filtros (o período sobre `timestamp` já entra)
+    - measures: agregados calculados nas duas visões (count, sum…)
+    - distinct: agregados só dos totais (ex.: compradores distintos), que
+      ficam nulos nas linhas da série
+    Dias sem eventos não aparecem na série.
+    """
+    day = period.bucket(timestamp)
+    is_total = func.grouping(day).label("is_total")
+    columns = [day.label("day"), is_total]
+    columns += [expr.label(name) for name, expr in measures.items()]
+    # agregados "só totais": avaliados em todas as linhas, descartados na série
+    columns += [expr.label(name) for name, expr in (distinct or {}).items()]
+
+    stmt = (
+        select(*columns)
+        .where(period.filter(timestamp), *filters)
+        .group_by(func.grouping_sets(tuple_(day), tuple_()))
+        .order_by(is_total, day)
+    )
+    totals: dict[str, Any] = {}
+    series: list[dict[str, Any]] = []
+    for row in db.execute(stmt).mappings():
+        if row["is_total"]:
+            totals = {name: row[name] for name in (*measures, *(distinct or {}))}
+        else:
+            series.append({"day": row["day"], **{name: row[name] for name in measures}})
+    return SummaryResult(totals=totals, series=series)
+
+
+# ───────────── ranking com keyset ─────────────
+
+def encode_cursor(value, key) -> str:
+    return base64.urlsafe_b64encode(f"{value}|{key}".encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[Decimal, UUID]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        value, key = raw.rsplit("|", 1)
+        return Decimal(value), UUID(key)
+    except (ValueError, InvalidOperation, UnicodeDecodeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Cursor inválido")
+
+
+def ranked_groups(
+    db: Session,
+    *,
+    key,
+    metric,
+    filters: list,
+    limit: int,
+    after: str | None = None,
+) -> tuple[list, str | None]:
+    """
+    Grupos de `key` ordenados por `metric` desc (empate: key asc), no máximo
+    `limit` por página. `after` é o cursor devolvido pela página anterior;
+    retorna (linhas (key, value), próximo cursor ou None).
+    """
+    value = metric.label("value")
+    stmt = select(key.label("key"), value).where(*filters).group_by(key)
+    if after:
+        last_value, last_key = decode_cursor(after)
+        stmt = stmt.having(or_(metric < last_value, and_(metric == last_value, key > last_key)))
+    rows = db.execute(stmt.order_by(metric.desc(), key).limit(limit + 1)).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].value, rows[-1].key)
+    return rows, next_cursor
@@ -1,92 +1,68 @@
 # backend/app/services/metrics_service.py
 
-from sqlalchemy import func, cast, Numeric, distinct
+from sqlalchemy import func, cast, Numeric, distinct, select
 from sqlalchemy.orm import Session
-from datetime import date, datetime, timedelta
-from calendar import monthrange
+from datetime import date, datetime
+from zoneinfo import ZoneInfo
 import statistics
 
+from app.core.time_range import TimeRange, local_range, resolve_timezone
+
 from app.models.cashback import Cashback
 from app.models.cashback_program import CashbackProgram
 from app.models.user import User
 
-def _date_list(start: date, end: date):
-    days = []
-    d = start
-    while d <= end:
-        days.append(d)
-        d += timedelta(days=1)
-    return days
+def _period(start: date, end: date, tz: ZoneInfo | None) -> TimeRange:
+    return local_range(start, end, tz or resolve_timezone())
 
-def get_daily_spend_range(db: Session, company_id: str, start: date, end: date):
-    q = (
-        db.query(
-            func.date_trunc('day', Cashback.assigned_at).label('day'),
-            func.coalesce(func.sum(Cashback.amount_spent), 0).label('value'),
-        )
-        .join(CashbackProgram, Cashback.program_id==CashbackProgram.id)
-        .filter(
-            CashbackProgram.company_id==company_id,
-            Cashback.assigned_at >= datetime.combine(start, datetime.min.time()),
-            Cashback.assigned_at <= datetime.combine(end,   datetime.max.time()),
-        )
-        .group_by('day')
-        .order_by('day')
+def _daily(db: Session, period: TimeRange, timestamp, value, *filters, join=None) -> list:
+    """
+    Série diária (dia local) com todos os dias do período; dias sem
+    registros saem com 0 (generate_series no banco).
+    """
+    bucket = period.bucket(timestamp)
+    agg = select(bucket.label('bucket'), value.label('value')).select_from(timestamp.class_)
+    if join is not None:
+        agg = agg.join(*join)
+    agg = (
+        agg.where(period.filter(timestamp), *filters)
+           .group_by(bucket)
+           .subquery()
     )
-    data = {r.day.date(): float(r.value) for r in q}
-    return [{"day": d, "value": data.get(d, 0.0)} for d in _date_list(start, end)]
+    return db.execute(period.zero_filled(agg, value=0)).all()
 
-def get_daily_cashback_value_range(db: Session, company_id: str, start: date, end: date):
-    q = (
-        db.query(
-            func.date_trunc('day', Cashback.assigned_at).label('day'),
-            func.coalesce(func.sum(Cashback.cashback_value), 0).label('value'),
-        )
-        .join(CashbackProgram, Cashback.program_id==CashbackProgram.id)
-        .filter(
-            CashbackProgram.company_id==company_id,
-            Cashback.assigned_at >= datetime.combine(start, datetime.min.time()),
-            Cashback.assigned_at <= datetime.combine(end,   datetime.max.time()),
-        )
-        .group_by('day')
-        .order_by('day')
-    )
-    data = {r.day.date(): float(r.value) for r in q}
-    return [{"day": d, "value": data.get(d, 0.0)} for d in _date_list(start, end)]
+_CASHBACK_JOIN = (CashbackProgram, Cashback.program_id == CashbackProgram.id)
 
-def get_daily_cashback_count_range(db: Session, company_id: str, start: date, end: date):
-    q = (
-        db.query(
-            func.date_trunc('day', Cashback.assigned_at).label('day'),
-            func.count(Cashback.id).label('value'),
-        )
-        .join(CashbackProgram, Cashback.program_id==CashbackProgram.id)
-        .filter(
-            CashbackProgram.company_id==company_id,
-            Cashback.assigned_at >= datetime.combine(start, datetime.min.time()),
-            Cashback.assigned_at <= datetime.combine(end,   datetime.max.time()),
-        )
-        .group_by('day')
-        .order_by('day')
+def get_daily_spend_range(db: Session, company_id: str, start: date, end: date, tz: ZoneInfo | None = None):
+    rows = _daily(
+        db, _period(start, end, tz), Cashback.assigned_at,
+        func.coalesce(func.sum(Cashback.amount_spent), 0),
+        CashbackProgram.company_id == company_id,
+        join=_CASHBACK_JOIN,
     )
-    data = {r.day.date(): int(r.value) for r in q}
-    return [{"day": d, "value": data.get(d, 0)} for d in _date_list(start, end)]
-
-def get_daily_new_users_range(db: Session, start: date, end: date):
-    q = (
-        db.query(
-            func.date_trunc('day', User.created_at).label('day'),
-            func.count(User.id).label('value'),
-        )
-        .filter(
-            User.created_at >= datetime.combine(start, datetime.min.time()),
-            User.created_at <= datetime.combine(end,   datetime.max.time()),
-        )
-        .group_by('day')
-        .order_by('day')
+    return [{"day": r.bucket.date(), "value": float(r.value)} for r in rows]
+
+def get_daily_cashback_value_range(db: Session, company_id: str, start: date, end: date, tz: ZoneInfo | None = None):
+    rows = _daily(
+        db, _period(start, end, tz), Cashback.assigned_at,
+        func.coalesce(func.sum(Cashback.cashback_value), 0),
+        CashbackProgram.company_id == company_id,
+        join=_CASHBACK_JOIN,
     )
-    data = {r.day.date(): int(r.value) for r in q}
-    return [{"day": d, "value": data.get(d, 0)} for d in _date_list(start, end)]
+    return [{"day": r.bucket.date(), "value": float(r.value)} for r in rows]
+
+def get_daily_cashback_count_range(db: Session, company_id: str, start: date, end: date, tz: ZoneInfo | None = None):
+    rows = _daily(
+        db, _period(start, end, tz), Cashback.assigned_at,
+        func.count(Cashback.id),
+        CashbackProgram.company_id == company_id,
+        join=_CASHBACK_JOIN,
+    )
+    return [{"day": r.bucket.date(), "value": int(r.value)} for r in rows]
+
+def get_daily_new_users_range(db: Session, start: date, end: date, tz: ZoneInfo | None = None):
+    rows = _daily(db, _period(start, end, tz), User.created_at, func.count(User.id))
+    return [{"day": r.bucket.date(), "value": int(r.value)} for r in rows]
 
 def collect_program_metrics(db: Session, program_id: str):
     # 1) Agregados básicos
@@ -186,14 +162,14 @@ def get_all_programs_metrics(db: Session, company_id: str) -> list[dict]:
         })
     return result
 
-def get_company_metrics_range(db: Session, company_id: str, start: date, end: date):
+def get_company_metrics_range(db: Session, company_id: str, start: date, end: date, tz: ZoneInfo | None = None):
+    period = _period(start, end, tz)
     q = (
         db.query(Cashback)
           .join(CashbackProgram, Cashback.program_id==CashbackProgram.id)
           .filter(
               CashbackProgram.company_id==company_id,
-              Cashback.assigned_at >= datetime.combine(start, datetime.min.time()),
-              Cashback.assigned_at <= datetime.combine(end,   datetime.max.time()),
+              period.filter(Cashback.assigned_at),
           )
     )
     total_cb = float(q.with_entities(func.coalesce(func.sum(Cashback.cashback_value), 0)).scalar() or 0)
@@ -1,11 +1,18 @@
+import time
+import threading
+from bisect import bisect_right
+from dataclasses import dataclass
 from uuid import UUID
 from sqlalchemy.orm import Session, selectinload
 from fastapi import HTTPException
-from sqlalchemy import asc
+from sqlalchemy import func, literal, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from typing import List
 from app.models.milestone          import Milestone
 from app.models.user_milestone     import UserMilestone
 from app.models.user_points_stats  import UserPointsStats
+from app.core import response_cache
+from app.core.config import settings
 
 from app.schemas.milestone import MilestoneCreate, MilestoneUpdate
 
@@ -14,7 +21,10 @@ from app.schemas.milestone import MilestoneCreate, MilestoneUpdate
 def create_milestone(db: Session, payload: MilestoneCreate, image_url: str) -> Milestone:
     m = Milestone(**payload.model_dump(), image_url=image_url)
     db.add(m)
+    db.flush()
+    _award_retroactive(db, m)
     db.commit(); db.refresh(m)
+    _milestones_changed()
     return m
 
 def update_milestone(db: Session, mid: UUID, payload: MilestoneUpdate,
@@ -26,7 +36,10 @@ def update_milestone(db: Session, mid: UUID, payload: MilestoneUpdate,
         setattr(m, k, v)
     if image_url is not None:
         m.image_url = image_url
+    db.flush()
+    _award_retroactive(db, m)
     db.commit(); db.refresh(m)
+    _milestones_changed()
     return m
 
 def delete_milestone(db: Session, mid: UUID):
@@ -34,6 +47,7 @@ def delete_milestone(db: Session, mid: UUID):
     if not m:
         raise HTTPException(404)
     db.delete(m); db.commit()
+    _milestones_changed()
 
 def list_milestones(db: Session, skip: int, limit: int) -> List[Milestone]:
     return (
@@ -44,39 +58,119 @@ def list_milestones(db: Session, skip: int, limit: int) -> List[Milestone]:
     )
 
 
-# ── Lógica de atribuição ao usuário ───────────────────────────
-def _ensure_user_milestones(db: Session, user_id: str):
+# ── Limiares em memória ───────────────────────────────────────
+# Marcos ativos ordenados por pontos + array de limiares para bisect.
+# Válidos enquanto a versão "milestones" do response_cache (bump no CRUD)
+# não mudar; sem Redis, por MILESTONE_CACHE_TTL_SECONDS.
+
+@dataclass(frozen=True)
+class _Thresholds:
+    version: int | None
+    loaded_at: float
+    points: list[int]          # crescente
+    milestones: list[dict]     # alinhado com points
+
+
+_thresholds: _Thresholds | None = None
+_thresholds_lock = threading.Lock()
+
+
+def _milestones_changed() -> None:
+    global _thresholds
+    _thresholds = None
+    response_cache.bump("milestones")
+
+
+def _load_thresholds(db: Session, version: int | None) -> _Thresholds:
+    rows = db.execute(
+        select(Milestone.id, Milestone.title, Milestone.points, Milestone.image_url)
+        .where(Milestone.active.is_(True))
+        .order_by(Milestone.points, Milestone.order)
+    ).mappings().all()
+    return _Thresholds(
+        version=version,
+        loaded_at=time.monotonic(),
+        points=[r["points"] for r in rows],
+        milestones=[dict(r) for r in rows],
+    )
+
+
+def get_thresholds(db: Session) -> _Thresholds:
+    global _thresholds
+    version = response_cache.version("milestones")
+    current = _thresholds
+    if current is not None:
+        if version is not None and current.version == version:
+            return current
+        if version is None and time.monotonic() - current.loaded_at < settings.MILESTONE_CACHE_TTL_SECONDS:
+            return current
+    with _thresholds_lock:
+        if _thresholds is current:
+            _thresholds = _load_thresholds(db, version)
+        return _thresholds
+
+
+def _lifetime_points(db: Session, user_id: str) -> int:
+    return db.execute(
+        select(UserPointsStats.lifetime_points).where(UserPointsStats.user_id == user_id)
+    ).scalar() or 0
+
+
+# ── Atribuição (no crédito de pontos) ─────────────────────────
+def award_milestones(db: Session, user_id: str, previous: int, current: int) -> int:
+    """
+    Registra os marcos cujo limiar foi cruzado por um crédito de pontos
+    (lifetime foi de `previous` para `current`). Roda na mesma transação do
+    lançamento — quem chama faz o commit e, se retornar > 0, o
+    bump("user_milestones:<user_id>").
+    """
+    th = get_thresholds(db)
+    crossed = th.milestones[bisect_right(th.points, previous):bisect_right(th.points, current)]
+    if not crossed:
+        return 0
+    db.execute(
+        pg_insert(UserMilestone)
+        .values([{"user_id": user_id, "milestone_id": m["id"]} for m in crossed])
+        .on_conflict_do_nothing(constraint="uq_user_milestone")
+    )
+    return len(crossed)
+
+
+def _award_retroactive(db: Session, m: Milestone) -> None:
     """
-    Cria registros em user_milestones para todos os marcos cujo
-    limiar já foi atingido pelo usuário, caso ainda não existam.
+    Marco criado/alterado: quem já tem pontos suficientes ganha o marco agora
+    (um INSERT … SELECT). Os endpoints do usuário dependem de "milestones",
+    então o bump do CRUD também invalida o cache deles.
     """
-    stats = db.query(UserPointsStats).filter_by(user_id=user_id).first()
-    lifetime = stats.lifetime_points if stats else 0
-
-    eligible_ids = [
-        str(m.id)
-        for m in db.query(Milestone.id)
-                    .filter(Milestone.active==True, Milestone.points<=lifetime)
-                    .all()
-    ]
-    if not eligible_ids:
+    if not m.active:
         return
+    db.execute(
+        pg_insert(UserMilestone)
+        .from_select(
+            ["id", "user_id", "milestone_id"],
+            select(func.gen_random_uuid(), UserPointsStats.user_id, literal(m.id, Milestone.id.type))
+            .where(UserPointsStats.lifetime_points >= m.points),
+        )
+        .on_conflict_do_nothing(constraint="uq_user_milestone")
+    )
 
-    existing = {
-        str(r.milestone_id)
-        for r in db.query(UserMilestone.milestone_id)
-                   .filter_by(user_id=user_id)
-                   .all()
-    }
-    to_insert = [mid for mid in eligible_ids if mid not in existing]
-    for mid in to_insert:
-        db.add(UserMilestone(user_id=user_id, milestone_id=mid))
-    if to_insert:
-        db.commit()
 
-def get_user_milestones(db: Session, user_id: str) -> list[UserMilestone]:
-    _ensure_user_milestones(db, user_id)
+def backfill_user_milestones(db: Session) -> int:
+    """
+    Concede todos os marcos ativos a quem já atingiu o limiar (uso único no
+    deploy; ver app/scripts/backfill_user_milestones.py). Retorna o número de
+    marcos processados.
+    """
+    ms = db.query(Milestone).filter(Milestone.active.is_(True)).all()
+    for m in ms:
+        _award_retroactive(db, m)
+    db.commit()
+    _milestones_changed()
+    return len(ms)
+
 
+# ── Leituras (sem escrita) ────────────────────────────────────
+def get_user_milestones(db: Session, user_id: str) -> list[UserMilestone]:
     return (
         db.query(UserMilestone)
           .options(selectinload(UserMilestone.milestone))   # ➋ carrega o Milestone
@@ -94,28 +188,21 @@ def get_next_milestone_status(db: Session, user_id: str) -> dict | None:
     e quantos pontos faltam.
     Estrutura já pronta para o schema NextMilestoneRead.
     """
-    stats = db.query(UserPointsStats).filter_by(user_id=user_id).first()
-    user_pts = stats.lifetime_points if stats else 0
+    user_pts = _lifetime_points(db, user_id)
+    th = get_thresholds(db)
 
-    next_m = (
-        db.query(Milestone)
-          .filter(Milestone.active.is_(True))
-          .filter(Milestone.points > user_pts)
-          .order_by(asc(Milestone.points))
-          .first()
-    )
-    if not next_m:
+    i = bisect_right(th.points, user_pts)
+    if i == len(th.points):
         return None
-
-    remaining = next_m.points - user_pts
+    next_m = th.milestones[i]
 
     return {
-        "milestone_id": next_m.id,
-        "title":        next_m.title,
-        "points":       next_m.points,      # <- agora o nome bate com o schema
-        "image_url":    next_m.image_url,
+        "milestone_id": next_m["id"],
+        "title":        next_m["title"],
+        "points":       next_m["points"],
+        "image_url":    next_m["image_url"],
         "user_points":  user_pts,
-        "remaining":    remaining,
+        "remaining":    next_m["points"] - user_pts,
     }
 
 
@@ -125,34 +212,25 @@ def list_all_milestones_with_status(db: Session, user_id: str) -> list[dict]:
 
     Retorno compatível com schema MilestoneStatusRead.
     """
-    # 1) todos os marcos ativos ordenados
-    all_ms = (
-        db.query(Milestone)
-          .filter(Milestone.active.is_(True))
-          .order_by(Milestone.points.asc())
-          .all()
+    # marcos que o usuário já possui  {milestone_id: achieved_at}
+    achieved = dict(
+        db.execute(
+            select(UserMilestone.milestone_id, UserMilestone.achieved_at)
+            .where(UserMilestone.user_id == user_id)
+        ).all()
     )
 
-    # 2) marcos que o usuário já possui  {milestone_id: achieved_at}
-    achieved = {
-        um.milestone_id: um.achieved_at                #  ← campo correto
-        for um in db.query(UserMilestone)
-                    .filter_by(user_id=user_id)
-                    .all()
-    }
-
-    # 3) monta saída
     out = []
-    for m in all_ms:
-        ach_at = achieved.get(m.id)
+    for m in get_thresholds(db).milestones:
+        ach_at = achieved.get(m["id"])
         out.append(
             {
-                "id":          m.id,
-                "title":       m.title,
-                "points":      m.points,    #  ← chave alinhada ao schema
-                "image_url":   m.image_url,
+                "id":          m["id"],
+                "title":       m["title"],
+                "points":      m["points"],
+                "image_url":   m["image_url"],
                 "achieved":    ach_at is not None,
                 "achieved_at": ach_at,
             }
         )
-    return out
\ No newline at end of file
+    return out
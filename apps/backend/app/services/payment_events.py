@@ -0,0 +1,231 @@
+# backend/app/services/payment_events.py
+#
+# Mudanças de status das cobranças (créditos e compras de pontos) empurradas
+# para o portal da empresa, em vez do front consultar a cada N segundos:
+# - o job de reconciliação (webhook da Asaas → reconcile_asaas_payment)
+#   publica no canal Redis "payments:{company_id}" quando o status muda
+# - cada processo da API mantém UMA conexão de pub/sub (PSUBSCRIBE
+#   payments:*), aberta só enquanto há clientes, e repassa os eventos para
+#   as filas dos clientes daquela empresa: SSE em /payment-events e
+#   long-poll (?wait= + If-None-Match) nos GET de status
+# - os GET de status só leem o banco; ETag = status + updated_at
+# Sem Redis os eventos se perdem: o long-poll relê o banco a cada
+# PAYMENT_LONG_POLL_RECHECK_SECONDS e o SSE manda "ready" a cada (re)conexão
+# para o cliente reler o estado.
+
+import asyncio
+import json
+import logging
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable
+from fastapi import Response, status
+from fastapi.concurrency import run_in_threadpool
+from redis import RedisError
+from sqlalchemy.orm import Session
+from app.core import redis_client
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+CHANNEL_PREFIX = "payments:"
+QUEUE_SIZE = 100
+
+COMPANY_PAYMENT = "company_payment"
+POINT_PURCHASE = "point_purchase"
+
+
+def channel(company_id) -> str:
+    return f"{CHANNEL_PREFIX}{company_id}"
+
+
+def etag(obj) -> str:
+    """
+    ETag do estado da cobrança (ORM ou schema): status + updated_at.
+    """
+    stamp = obj.updated_at.timestamp() if obj.updated_at else 0
+    return f'"{obj.status.value}-{stamp:.6f}"'
+
+
+def etag_matches(if_none_match: str | None, tag: str) -> bool:
+    if not if_none_match:
+        return False
+    # aceita lista e ETag fraca (W/), que proxies com gzip costumam gerar
+    candidates = {t.strip().removeprefix("W/") for t in if_none_match.split(",")}
+    return tag in candidates
+
+
+# ───────────── publicação (worker) ─────────────
+
+def publish(kind: str, obj) -> None:
+    """
+    Publica a mudança de status; melhor esforço: sem Redis só registra
+    (o cliente ainda vê o estado novo ao reler).
+    """
+    event = {
+        "kind": kind,
+        "id": str(obj.id),
+        "status": obj.status.value,
+        "etag": etag(obj),
+        "updated_at": obj.updated_at.isoformat() if obj.updated_at else None,
+    }
+    try:
+        redis_client.get_redis().publish(channel(obj.company_id), json.dumps(event))
+    except RedisError as e:
+        logger.warning("evento de pagamento não publicado (%s %s): %s", kind, obj.id, e)
+
+
+# ───────────── assinatura (API) ─────────────
+
+class _Hub:
+    """
+    Uma assinatura por processo repassada às filas locais: o nº de abas
+    abertas não consome conexões do pool do Redis.
+    """
+
+    def __init__(self):
+        self._queues: dict[str, set[asyncio.Queue]] = {}
+        self._task: asyncio.Task | None = None
+
+    def add(self, company_id: str, queue: asyncio.Queue) -> None:
+        self._queues.setdefault(company_id, set()).add(queue)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    def remove(self, company_id: str, queue: asyncio.Queue) -> None:
+        queues = self._queues.get(company_id)
+        if queues is not None:
+            queues.discard(queue)
+            if not queues:
+                del self._queues[company_id]
+
+    def _dispatch(self, message: dict[str, Any]) -> None:
+        company_id = message["channel"].removeprefix(CHANNEL_PREFIX)
+        try:
+            event = json.loads(message["data"])
+        except ValueError:
+            return
+        for queue in self._queues.get(company_id, ()):
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                pass  # cliente parado: a próxima leitura de status resolve
+
+    async def _run(self) -> None:
+        # sai quando o último cliente desconecta, liberando a conexão
+        while self._queues:
+            pubsub = None
+            try:
+                pubsub = redis_client.get_async_redis().pubsub(ignore_subscribe_messages=True)
+                await pubsub.psubscribe(f"{CHANNEL_PREFIX}*")
+                while self._queues:
+                    # timeout explícito: não depende do socket_timeout curto do pool
+                    message = await pubsub.get_message(timeout=1.0)
+                    if message:
+                        self._dispatch(message)
+            except RedisError as e:
+                logger.warning("pub/sub de pagamentos sem Redis: %s", e)
+                await asyncio.sleep(settings.REDIS_RETRY_AFTER_SECONDS)
+            finally:
+                if pubsub is not None:
+                    try:
+                        await pubsub.aclose()
+                    except RedisError:
+                        pass
+
+    async def close(self) -> None:
+        self._queues.clear()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except (asyncio.CancelledError, RedisError):
+                pass
+            self._task = None
+
+
+_hub = _Hub()
+
+
+@asynccontextmanager
+async def listen(company_id: str) -> AsyncIterator[asyncio.Queue]:
+    queue: asyncio.Queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+    _hub.add(company_id, queue)
+    try:
+        yield queue
+    finally:
+        _hub.remove(company_id, queue)
+
+
+async def close() -> None:
+    await _hub.close()
+
+
+async def stream(company_id: str) -> AsyncIterator[str]:
+    """
+    Corpo text/event-stream: "ready" ao conectar, um evento por mudança de
+    status (event: company_payment | point_purchase) e comentário de
+    heartbeat. O Starlette cancela o gerador quando o cliente desconecta.
+    """
+    async with listen(company_id) as queue:
+        yield "retry: 5000\nevent: ready\ndata: {}\n\n"
+        while True:
+            try:
+                event = await asyncio.wait_for(queue.get(), settings.PAYMENT_EVENTS_HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": ping\n\n"
+                continue
+            yield f"event: {event['kind']}\ndata: {json.dumps(event)}\n\n"
+
+
+# ───────────── long-poll ─────────────
+
+async def long_poll(
+    db: Session,
+    company_id: str,
+    load: Callable[[], Any],
+    if_none_match: str | None,
+    wait: int,
+):
+    """
+    Lê o estado com `load` (síncrono, no threadpool). Se ainda bate com
+    If-None-Match e `wait` > 0, espera até `wait` segundos por um evento da
+    empresa e relê. A sessão é fechada a cada leitura para não segurar uma
+    conexão do banco durante a espera; `load` deve devolver o schema já
+    montado (nada carregado depois).
+    """
+    def read():
+        try:
+            return load()
+        finally:
+            db.close()
+
+    current = await run_in_threadpool(read)
+    if current is None or wait <= 0 or not etag_matches(if_none_match, etag(current)):
+        return current
+
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + wait
+    async with listen(company_id) as queue:
+        while True:
+            # relê já inscrito: nada se perde entre a 1ª leitura e a inscrição
+            current = await run_in_threadpool(read)
+            remaining = deadline - loop.time()
+            if current is None or remaining <= 0 or not etag_matches(if_none_match, etag(current)):
+                return current
+            try:
+                await asyncio.wait_for(queue.get(), min(remaining, settings.PAYMENT_LONG_POLL_RECHECK_SECONDS))
+            except asyncio.TimeoutError:
+                pass
+
+
+def conditional(obj, response: Response, if_none_match: str | None):
+    """
+    Resposta dos GET de status: 304 se o cliente já tem este estado, senão o
+    próprio objeto com ETag.
+    """
+    tag = etag(obj)
+    headers = {"ETag": tag, "Cache-Control": "no-cache"}
+    if etag_matches(if_none_match, tag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+    return obj
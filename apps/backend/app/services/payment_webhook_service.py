@@ -0,0 +1,62 @@
+# app/services/payment_webhook_service.py
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+from app.models.company_payment import CompanyPayment
+from app.models.company_point_purchase import CompanyPointPurchase
+from app.models.payment_webhook_event import PaymentWebhookEvent
+from app.services import job_service
+
+
+def _event_id(payload: dict) -> str:
+    # eventos novos da Asaas trazem "id" (evt_...); nos antigos montamos uma chave estável
+    if payload.get("id"):
+        return str(payload["id"])
+    payment = payload.get("payment") or {}
+    return f"{payload.get('event', '')}:{payment.get('id', '')}:{payment.get('status', '')}"
+
+
+def record_event(db: Session, payload: dict) -> bool:
+    """
+    Registra o evento (idempotente) e agenda a reconciliação no job worker.
+    Não chama a Asaas. Retorna False se o evento já tinha sido recebido.
+    """
+    event = (payload.get("event") or "").upper()
+    payment = payload.get("payment") or {}
+    asaas_id = payment.get("id")
+
+    inserted = db.execute(
+        pg_insert(PaymentWebhookEvent)
+        .values(event_id=_event_id(payload)[:120], event=event[:60], asaas_id=asaas_id)
+        .on_conflict_do_nothing(index_elements=[PaymentWebhookEvent.event_id])
+    ).rowcount > 0
+
+    if inserted and event.startswith("PAYMENT_") and asaas_id:
+        # um job por cobrança: rajadas de eventos da mesma cobrança se juntam;
+        # evento que chega com o job já rodando o faz reconsultar ao terminar
+        job_service.enqueue(
+            db,
+            "reconcile_asaas_payment",
+            {"asaas_id": asaas_id},
+            dedupe_key=f"asaas-payment:{asaas_id}",
+            rerun_if_running=True,
+            commit=False,
+        )
+    db.commit()
+    return inserted
+
+
+def reconcile_payment(db: Session, asaas_id: str):
+    """
+    Reconsulta a cobrança na Asaas e aplica o novo status (créditos ou pontos).
+    Executado pelo job worker.
+    """
+    from app.services.company_payment_service import refresh_payment_status
+    from app.services.point_purchase_service import refresh_point_purchase_status
+
+    # verifique primeiro se é uma cobrança de créditos
+    if db.query(CompanyPayment.id).filter_by(asaas_id=asaas_id).first():
+        return refresh_payment_status(db, asaas_id)
+    # senão, pode ser compra de pontos
+    if db.query(CompanyPointPurchase.id).filter_by(asaas_id=asaas_id).first():
+        return refresh_point_purchase_status(db, asaas_id)
+    return None
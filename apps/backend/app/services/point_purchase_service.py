@@ -2,6 +2,7 @@ import logging
 from datetime import datetime
 from decimal import Decimal
 from sqlalchemy.orm import Session, joinedload
+from app.services import payment_events
 from app.services.asaas_client import AsaasClient
 from app.models.company_point_purchase import PurchaseStatus
 from app.services.point_plan_service import get_plan
@@ -78,18 +79,20 @@ def refresh_point_purchase_status(
     """
     Reconsulta o status no Asaas, atualiza e, se ficar PAID, credita pontos.
     """
+    # 1) busca status no Asaas (antes de travar a linha)
+    resp = gateway.get_payment(asaas_id)
+    raw = resp.get("status", "").upper()
+
+    # FOR UPDATE: evita crédito de pontos em dobro em reconciliações concorrentes
     purchase = (
         db.query(CompanyPointPurchase)
           .filter_by(asaas_id=asaas_id)
+          .with_for_update()
           .first()
     )
     if not purchase:
         return None
 
-    # 1) busca status no Asaas
-    resp = gateway.get_payment(asaas_id)
-    raw = resp.get("status", "").upper()
-
     # 2) mapeia para PurchaseStatus
     mapped = STATUS_MAP.get(raw)
     if mapped is None:
@@ -106,6 +109,17 @@ def refresh_point_purchase_status(
         credit_points(db, purchase.company_id, plan.points)
         credit_for_payment(db, purchase)
 
+    # 4) pendente que foi cancelada/recusada: só atualiza o status
+    elif purchase.status == PurchaseStatus.PENDING and mapped != PurchaseStatus.PENDING:
+        purchase.status = mapped
+        db.commit()
+        db.refresh(purchase)
+
+    else:
+        return purchase
+
+    # 5) avisa o portal (SSE/long-poll)
+    payment_events.publish(payment_events.POINT_PURCHASE, purchase)
     return purchase
 
 
@@ -1,29 +1,54 @@
 # backend/app/services/points_admin_service.py
-from sqlalchemy.orm import Session
-from typing import List, Dict, Any, Tuple
-from app.models.points_rule import PointsRule
+from sqlalchemy import select
+from sqlalchemy.orm import Session, selectinload
+from datetime import date
+from uuid import UUID
+from zoneinfo import ZoneInfo
+from app.models.points_rule import PointsRule, RuleType
 from app.models.company import Company
-from app.models.user_points_transaction import UserPointsTransaction
+from app.models.user_points_transaction import UserPointsTransaction, UserPointsTxType
+from app.services import listing
 
 # --- lista paginada de regras ---
 def list_all_rules(
     db: Session,
-    skip: int,
-    limit: int
-) -> Tuple[int, List[Dict[str, Any]]]:
-    base_q = (
-        db.query(PointsRule, Company.name.label("company_name"))
-          .join(Company, Company.id == PointsRule.company_id)
+    *,
+    company_id: UUID | None = None,
+    rule_type: RuleType | None = None,
+    active: bool | None = None,
+    start_date: date | None = None,
+    end_date: date | None = None,
+    tz: ZoneInfo | None = None,
+    limit: int = 10,
+    after: str | None = None,
+    skip: int = 0,
+    exact_total: bool = False,
+) -> listing.Page:
+    filters = listing.date_filters(PointsRule.created_at, start_date, end_date, tz)
+    if company_id:
+        filters.append(PointsRule.company_id == company_id)
+    if rule_type:
+        filters.append(PointsRule.rule_type == rule_type)
+    if active is not None:
+        filters.append(PointsRule.active.is_(active))
+
+    stmt = (
+        select(PointsRule, Company.name.label("company_name"))
+        .join(Company, Company.id == PointsRule.company_id)
+        .where(*filters)
     )
-    total = base_q.count()
-    rows  = (
-        base_q
-        .order_by(PointsRule.created_at.desc())
-        .offset(skip)
-        .limit(limit)
-        .all()
+    page = listing.keyset_page(
+        db, stmt,
+        created_at=PointsRule.created_at,
+        key=PointsRule.id,
+        table="points_rules",
+        filtered=bool(filters),
+        limit=limit,
+        after=after,
+        skip=skip,
+        exact=exact_total,
     )
-    items = [
+    page.rows = [
         {
             "id":           r.PointsRule.id,
             "company_id":   r.PointsRule.company_id,
@@ -36,25 +61,45 @@ def list_all_rules(
             "created_at":   r.PointsRule.created_at,
             "updated_at":   r.PointsRule.updated_at,
         }
-        for r in rows
+        for r in page.rows
     ]
-    return total, items
+    return page
 
 
 # --- lista paginada de transações por rule_id ---
 def list_rule_transactions(
     db: Session,
     rule_id: str,
-    skip: int,
-    limit: int
-):
-    base_q = db.query(UserPointsTransaction).filter_by(rule_id=rule_id)
-    total  = base_q.count()
-    txs    = (
-        base_q
-        .order_by(UserPointsTransaction.created_at.desc())
-        .offset(skip)
-        .limit(limit)
-        .all()
+    *,
+    company_id: UUID | None = None,
+    tx_type: UserPointsTxType | None = None,
+    start_date: date | None = None,
+    end_date: date | None = None,
+    tz: ZoneInfo | None = None,
+    limit: int = 10,
+    after: str | None = None,
+    skip: int = 0,
+    exact_total: bool = False,
+) -> listing.Page:
+    filters = listing.date_filters(UserPointsTransaction.created_at, start_date, end_date, tz)
+    if company_id:
+        filters.append(UserPointsTransaction.company_id == company_id)
+    if tx_type:
+        filters.append(UserPointsTransaction.type == tx_type)
+
+    stmt = select(UserPointsTransaction).where(UserPointsTransaction.rule_id == rule_id, *filters)
+    page = listing.keyset_page(
+        db, stmt,
+        created_at=UserPointsTransaction.created_at,
+        key=UserPointsTransaction.id,
+        table="user_points_transactions",
+        # sempre filtrada pela regra: a estimativa da tabela inteira não serve
+        filtered=True,
+        limit=limit,
+        after=after,
+        skip=skip,
+        exact=exact_total,
+        options=(selectinload(UserPointsTransaction.company),),
     )
-    return total, txs
+    page.rows = [r.UserPointsTransaction for r in page.rows]
+    return page
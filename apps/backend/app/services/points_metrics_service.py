@@ -1,8 +1,10 @@
 # backend/app/services/points_metrics_service.py
 from sqlalchemy.orm import Session
 from sqlalchemy import func
-from datetime import date, datetime
+from datetime import date
 from typing import Tuple, List
+from zoneinfo import ZoneInfo
+from app.core.time_range import TimeRange, month_to_date, resolve_timezone
 from app.models.user import User
 from app.models.user_points_transaction import UserPointsTransaction, UserPointsTxType
 from app.models.points_rule import PointsRule
@@ -16,31 +18,27 @@ from app.schemas.points_metrics import (
     RuleMetricRead,
 )
 
-def _normalize_range(start_date, end_date):
-    today = date.today()
-    if start_date is None:
-        start_date = date(today.year, today.month, 1)
-    if end_date is None:
-        end_date = today
-    return start_date, end_date
+def _period(start_date: date | None, end_date: date | None, tz: ZoneInfo | None) -> TimeRange:
+    """
+    Padrão: mês corrente até hoje; dias no fuso da empresa.
+    """
+    return month_to_date(tz or resolve_timezone(), start_date, end_date)
 
 def get_points_overview(
     db: Session,
     company_id: str,
     start_date: date | None = None,
-    end_date: date | None = None
+    end_date: date | None = None,
+    tz: ZoneInfo | None = None
 ) -> PointsMetricRead:
-    sd, ed = _normalize_range(start_date, end_date)
-    sdt = datetime.combine(sd, datetime.min.time())
-    edt = datetime.combine(ed, datetime.max.time())
+    period = _period(start_date, end_date, tz)
 
     award_q = (
         db.query(UserPointsTransaction)
           .filter(
               UserPointsTransaction.company_id==company_id,
               UserPointsTransaction.type==UserPointsTxType.award,
-              UserPointsTransaction.created_at>=sdt,
-              UserPointsTransaction.created_at<=edt,
+              period.filter(UserPointsTransaction.created_at),
           )
     )
     tx_count     = award_q.count()
@@ -49,8 +47,8 @@ def get_points_overview(
     avg_per_tx   = float(total_pts) / tx_count if tx_count else 0.0
 
     return PointsMetricRead(
-        start_date=sd,
-        end_date=ed,
+        start_date=period.start_date,
+        end_date=period.end_date,
         total_awarded=int(total_pts),
         transaction_count=tx_count,
         unique_users=unique_users,
@@ -61,11 +59,10 @@ def get_rule_metrics(
     db: Session,
     company_id: str,
     start_date: date | None = None,
-    end_date: date | None = None
+    end_date: date | None = None,
+    tz: ZoneInfo | None = None
 ) -> List[RuleMetricRead]:
-    sd, ed = _normalize_range(start_date, end_date)
-    sdt = datetime.combine(sd, datetime.min.time())
-    edt = datetime.combine(ed, datetime.max.time())
+    period = _period(start_date, end_date, tz)
 
     out: List[RuleMetricRead] = []
     for r in db.query(PointsRule).filter_by(company_id=company_id).all():
@@ -75,8 +72,7 @@ def get_rule_metrics(
                   UserPointsTransaction.company_id==company_id,
                   UserPointsTransaction.rule_id==str(r.id),
                   UserPointsTransaction.type==UserPointsTxType.award,
-                  UserPointsTransaction.created_at>=sdt,
-                  UserPointsTransaction.created_at<=edt,
+                  period.filter(UserPointsTransaction.created_at),
               )
         )
         tx_count     = award_q.count()
@@ -86,8 +82,8 @@ def get_rule_metrics(
 
         out.append(RuleMetricRead(
             rule_id=r.id,
-            start_date=sd,
-            end_date=ed,
+            start_date=period.start_date,
+            end_date=period.end_date,
             total_awarded=int(total_pts),
             transaction_count=tx_count,
             unique_users=unique_users,
@@ -100,16 +96,17 @@ def get_single_rule_metric(
     company_id: str,
     rule_id: str,
     start_date: date | None = None,
-    end_date: date | None = None
+    end_date: date | None = None,
+    tz: ZoneInfo | None = None
 ) -> RuleMetricRead:
-    for m in get_rule_metrics(db, company_id, start_date, end_date):
+    for m in get_rule_metrics(db, company_id, start_date, end_date, tz):
         if str(m.rule_id) == rule_id:
             return m
-    sd, ed = _normalize_range(start_date, end_date)
+    period = _period(start_date, end_date, tz)
     return RuleMetricRead(
         rule_id=rule_id,
-        start_date=sd,
-        end_date=ed,
+        start_date=period.start_date,
+        end_date=period.end_date,
         total_awarded=0,
         transaction_count=0,
         unique_users=0,
@@ -120,13 +117,12 @@ def get_points_awarded_chart(
     db: Session,
     company_id: str,
     start_date: date | None = None,
-    end_date:   date | None = None
+    end_date:   date | None = None,
+    tz: ZoneInfo | None = None
 ) -> List[PointsByDay]:
-    sd, ed = _normalize_range(start_date, end_date)
-    sdt = datetime.combine(sd, datetime.min.time())
-    edt = datetime.combine(ed, datetime.max.time())
+    period = _period(start_date, end_date, tz)
 
-    day_trunc = func.date_trunc('day', UserPointsTransaction.created_at)
+    day_trunc = period.bucket(UserPointsTransaction.created_at)
     rows = (
         db.query(
             day_trunc.label('day'),
@@ -135,8 +131,7 @@ def get_points_awarded_chart(
         .filter(
             UserPointsTransaction.company_id==company_id,
             UserPointsTransaction.type==UserPointsTxType.award,
-            UserPointsTransaction.created_at>=sdt,
-            UserPointsTransaction.created_at<=edt,
+            period.filter(UserPointsTransaction.created_at),
         )
         .group_by(day_trunc)
         .order_by(day_trunc)
@@ -151,13 +146,12 @@ def get_points_redeemed_chart(
     db: Session,
     company_id: str,
     start_date: date | None = None,
-    end_date:   date | None = None
+    end_date:   date | None = None,
+    tz: ZoneInfo | None = None
 ) -> List[PointsRedeemedByDay]:
-    sd, ed = _normalize_range(start_date, end_date)
-    sdt = datetime.combine(sd, datetime.min.time())
-    edt = datetime.combine(ed, datetime.max.time())
+    period = _period(start_date, end_date, tz)
 
-    day_trunc = func.date_trunc('day', UserPointsTransaction.created_at)
+    day_trunc = period.bucket(UserPointsTransaction.created_at)
     rows = (
         db.query(
             day_trunc.label('day'),
@@ -166,8 +160,7 @@ def get_points_redeemed_chart(
         .filter(
             UserPointsTransaction.company_id==company_id,
             UserPointsTransaction.type==UserPointsTxType.redeem,
-            UserPointsTransaction.created_at>=sdt,
-            UserPointsTransaction.created_at<=edt,
+            period.filter(UserPointsTransaction.created_at),
         )
         .group_by(day_trunc)
         .order_by(day_trunc)
@@ -182,13 +175,12 @@ def get_tx_vs_users_chart(
     db: Session,
     company_id: str,
     start_date: date | None = None,
-    end_date:   date | None = None
+    end_date:   date | None = None,
+    tz: ZoneInfo | None = None
 ) -> List[TxUserStatsByDay]:
-    sd, ed = _normalize_range(start_date, end_date)
-    sdt = datetime.combine(sd, datetime.min.time())
-    edt = datetime.combine(ed, datetime.max.time())
+    period = _period(start_date, end_date, tz)
 
-    day_trunc = func.date_trunc('day', UserPointsTransaction.created_at)
+    day_trunc = period.bucket(UserPointsTransaction.created_at)
     rows = (
         db.query(
             day_trunc.label('day'),
@@ -197,8 +189,7 @@ def get_tx_vs_users_chart(
         )
         .filter(
             UserPointsTransaction.company_id==company_id,
-            UserPointsTransaction.created_at>=sdt,
-            UserPointsTransaction.created_at<=edt,
+            period.filter(UserPointsTransaction.created_at),
         )
         .group_by(day_trunc)
         .order_by(day_trunc)
@@ -213,13 +204,12 @@ def get_avg_points_per_tx_chart(
     db: Session,
     company_id: str,
     start_date: date | None = None,
-    end_date:   date | None = None
+    end_date:   date | None = None,
+    tz: ZoneInfo | None = None
 ) -> List[AvgPointsPerTxByDay]:
-    sd, ed = _normalize_range(start_date, end_date)
-    sdt = datetime.combine(sd, datetime.min.time())
-    edt = datetime.combine(ed, datetime.max.time())
+    period = _period(start_date, end_date, tz)
 
-    day_trunc = func.date_trunc('day', UserPointsTransaction.created_at)
+    day_trunc = period.bucket(UserPointsTransaction.created_at)
     rows = (
         db.query(
             day_trunc.label('day'),
@@ -230,8 +220,7 @@ def get_avg_points_per_tx_chart(
         .filter(
             UserPointsTransaction.company_id==company_id,
             UserPointsTransaction.type==UserPointsTxType.award,
-            UserPointsTransaction.created_at>=sdt,
-            UserPointsTransaction.created_at<=edt,
+            period.filter(UserPointsTransaction.created_at),
         )
         .group_by(day_trunc)
         .order_by(day_trunc)
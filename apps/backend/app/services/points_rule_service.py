@@ -5,10 +5,13 @@ from math import floor
 from datetime import datetime, timezone, timedelta
 from decimal import Decimal
 from typing import Dict, Any, List, Tuple
+from uuid import UUID
 from app.models.points_rule import PointsRule, RuleType
 from app.models.user_points_wallet import UserPointsWallet
 from app.models.user_points_transaction import UserPointsTransaction, UserPointsTxType
 
+from app.core.config import settings
+from app.services.branch_service import find_branch_at, has_geometry
 from app.services.points_wallet_service import debit_points
 from app.services.wallet_service import get_wallet_balance, debit_wallet
 from app.services.fee_setting_service import get_effective_fee
@@ -17,6 +20,14 @@ from datetime import timedelta
 from app.models.company import Company
 from app.services.purchase_log_service import count_purchases
 from app.models.purchase_log import PurchaseLog
+from app.core import response_cache
+from app.models.user_points_stats import UserPointsStats
+from app.services.milestone_service import award_milestones
+from app.services import digital_rule_cache
+from fastapi import HTTPException, status
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy import case
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
 
 
@@ -83,25 +94,75 @@ def get_rule(db: Session, rule_id: str) -> PointsRule | None:
     return db.get(PointsRule, rule_id)
 
 
+def _sync_slug(rule: PointsRule) -> None:
+    """
+    points_rules.slug espelha config["slug"] das regras digital_behavior
+    (coluna com índice único, usada no lookup dos links rastreados).
+    """
+    slug = (rule.config or {}).get("slug") if rule.rule_type == RuleType.digital_behavior else None
+    rule.slug = slug or None
+
+def _configured_branch_ids(cfg: Dict[str, Any]) -> List[Any]:
+    # config.branch_ids ou o antigo config.branch_id
+    raw = cfg.get("branch_ids") or ([cfg["branch_id"]] if cfg.get("branch_id") else [])
+    return raw if isinstance(raw, list) else [raw]
+
+
+def _valid_branch_ids(raw: List[Any]) -> List[str]:
+    ids = []
+    for value in raw:
+        try:
+            ids.append(str(UUID(str(value))))
+        except ValueError:
+            pass
+    return ids
+
+
+def _validate_config(rule: PointsRule) -> None:
+    if rule.rule_type == RuleType.geolocation:
+        raw = _configured_branch_ids(rule.config or {})
+        if len(_valid_branch_ids(raw)) != len(raw):
+            raise HTTPException(status.HTTP_422_UNPROCESSABLE_ENTITY, "branch_ids deve conter IDs de filiais válidos")
+
+def _commit_rule(db: Session) -> None:
+    try:
+        db.commit()
+    except IntegrityError as e:
+        db.rollback()
+        if "ix_points_rules_slug" in str(e.orig):
+            raise HTTPException(status.HTTP_409_CONFLICT, "Slug já está em uso")
+        raise
+
 def create_rule(db: Session, company_id: str, rule_in):
     rule = PointsRule(company_id=company_id, **rule_in.dict())
+    _validate_config(rule)
+    _sync_slug(rule)
     db.add(rule)
-    db.commit()
+    _commit_rule(db)
     db.refresh(rule)
+    response_cache.bump(f"points_rules:{company_id}")
+    digital_rule_cache.invalidate(rule.slug)  # remove um "não existe" em cache
     return rule
 
 def update_rule(db: Session, rule_id: str, rule_in):
     rule = get_rule(db, rule_id)
+    old_slug = rule.slug
     for field, value in rule_in.dict().items():
         setattr(rule, field, value)
-    db.commit()
+    _validate_config(rule)
+    _sync_slug(rule)
+    _commit_rule(db)
     db.refresh(rule)
+    response_cache.bump(f"points_rules:{rule.company_id}")
+    digital_rule_cache.invalidate(old_slug, rule.slug)
     return rule
 
 def delete_rule(db: Session, rule_id: str):
     rule = get_rule(db, rule_id)
     db.delete(rule)
     db.commit()
+    response_cache.bump(f"points_rules:{rule.company_id}")
+    digital_rule_cache.invalidate(rule.slug)
 
 
 # ─── Carteira de pontos do usuário ────────────────────────────────────────────
@@ -144,11 +205,57 @@ def credit_user_points(
         description=description
     )
     db.add(tx)
+    # estatísticas e marcos entram no mesmo commit do lançamento
+    awarded = record_points_awarded(db, user_id, points)
     db.commit()
     db.refresh(w)
+    if awarded:
+        response_cache.bump(f"user_milestones:{user_id}")
     return w
 
 
+def record_points_awarded(db: Session, user_id: str, points: int) -> bool:
+    """
+    Atualiza user_points_stats e concede os marcos cruzados pelo crédito, sem
+    commit. Retorna True se algum marco foi concedido (quem chama faz o
+    bump("user_milestones:<user_id>") depois do commit).
+    """
+    lifetime = _add_points_stats(db, user_id, points)
+    return award_milestones(db, user_id, lifetime - points, lifetime) > 0
+
+
+def _add_points_stats(db: Session, user_id: str, points: int) -> int:
+    """
+    Soma `points` em user_points_stats (upsert atômico) e retorna o novo
+    lifetime_points. today/month recomeçam se a última pontuação foi em
+    outro dia/mês (mesmo critério de leaderboard_service.rollover_points_stats).
+    """
+    now = datetime.now(timezone.utc)
+    day_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    month_start = day_start.replace(day=1)
+    stmt = (
+        pg_insert(UserPointsStats)
+        .values(user_id=user_id, lifetime_points=points, today_points=points, month_points=points)
+        .on_conflict_do_update(
+            index_elements=[UserPointsStats.user_id],
+            set_={
+                "lifetime_points": UserPointsStats.lifetime_points + points,
+                "today_points": case(
+                    (UserPointsStats.updated_at >= day_start, UserPointsStats.today_points + points),
+                    else_=points,
+                ),
+                "month_points": case(
+                    (UserPointsStats.updated_at >= month_start, UserPointsStats.month_points + points),
+                    else_=points,
+                ),
+                "updated_at": now,
+            },
+        )
+        .returning(UserPointsStats.lifetime_points)
+    )
+    return db.execute(stmt).scalar_one()
+
+
 def list_user_points_transactions(
     db: Session,
     user_id: str,
@@ -194,6 +301,31 @@ def list_user_points_transactions(
 
 # ─── Avaliação e atribuição de pontos ─────────────────────────────────────────
 
+def geolocation_matches(db: Session, company_id: str, pl: Dict[str, Any], cfg: Dict[str, Any]) -> bool:
+    """
+    Regra de geolocalização. Com a coordenada do usuário (lat/lng no payload),
+    vale estar na geofence de uma das filiais da regra (config.branch_ids ou o
+    antigo config.branch_id; sem nenhum, qualquer filial da empresa), com
+    config.radius_m para filiais sem polígono. Sem coordenada, ou se nenhuma
+    dessas filiais tem ponto/polígono ainda (cadastradas antes das geofences),
+    compara o branch_id informado, como antes. IDs malformados (regras salvas
+    antes da validação) são ignorados; se nenhum sobra, a regra não casa.
+    """
+    raw = _configured_branch_ids(cfg)
+    branch_ids = _valid_branch_ids(raw)
+    if raw and not branch_ids:
+        return False
+    lat, lng = pl.get("lat"), pl.get("lng")
+    if lat is not None and lng is not None:
+        radius_m = float(cfg.get("radius_m") or settings.GEOFENCE_DEFAULT_RADIUS_M)
+        if find_branch_at(db, company_id, float(lat), float(lng), radius_m, branch_ids) is not None:
+            return True
+        if has_geometry(db, company_id, branch_ids):
+            return False
+    informed = _valid_branch_ids([pl["branch_id"]] if pl.get("branch_id") else [])
+    return bool(informed) and informed[0] in branch_ids
+
+
 def evaluate_all_rules(
     db: Session,
     user_id: str,
@@ -334,7 +466,7 @@ def evaluate_all_rules(
 
 
         elif rule.rule_type == RuleType.geolocation:
-            if pl.get("branch_id") == cfg.get("branch_id"):
+            if geolocation_matches(db, company_id, pl, cfg):
                 pts = int(cfg.get("points", 0))
 
         # regra não atendida
@@ -1,8 +1,9 @@
 # backend/app/services/purchase_metrics_service.py
-from sqlalchemy import func
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
-from datetime import date, datetime
+from datetime import date
 from typing import List
+from zoneinfo import ZoneInfo
 
 from app.models.purchase_log import PurchaseLog
 from app.schemas.purchase_metrics import (
@@ -11,177 +12,142 @@ from app.schemas.purchase_metrics import (
     PurchasesPerUser,
     RevenuePerUser,
 )
+from app.core.time_range import TimeRange, month_to_date, resolve_timezone
+from app.services.metrics_query import (
+    use_approximate,
+    distinct_count,
+    summary_with_series,
+    ranked_groups,
+)
+
+def _period(start_date: date | None, end_date: date | None, tz: ZoneInfo | None) -> TimeRange:
+    return month_to_date(tz or resolve_timezone(), start_date, end_date)
+
+def _range_filters(company_id: str, period: TimeRange) -> list:
+    return [
+        PurchaseLog.company_id == company_id,
+        period.filter(PurchaseLog.created_at),
+    ]
 
-def _normalize_range(start_date, end_date):
-    today = date.today()
-    if start_date is None:
-        start_date = date(today.year, today.month, 1)
-    if end_date is None:
-        end_date = today
-    return start_date, end_date
+def _sale_by_day(day, num_purchases, revenue) -> SaleByDay:
+    return SaleByDay(day=day.date(), num_purchases=num_purchases, revenue=float(revenue))
 
 def get_purchase_metrics(
     db: Session,
     company_id: str,
     start_date: date | None = None,
-    end_date:   date | None = None
+    end_date:   date | None = None,
+    approximate: bool | None = None,
+    tz: ZoneInfo | None = None
 ) -> PurchaseMetricRead:
-    # normaliza período
-    sd, ed = _normalize_range(start_date, end_date)
-    sdt = datetime.combine(sd, datetime.min.time())
-    edt = datetime.combine(ed, datetime.max.time())
+    # normaliza período (dias no fuso da empresa)
+    period = _period(start_date, end_date, tz)
+    approx = use_approximate(db, period, approximate)
 
-    # totais
-    total_purchases = (
-        db.query(func.count(PurchaseLog.id))
-          .filter(
-              PurchaseLog.company_id == company_id,
-              PurchaseLog.created_at >= sdt,
-              PurchaseLog.created_at <= edt
-          )
-          .scalar()
-        or 0
-    )
-    total_sales = float(
-        db.query(func.coalesce(func.sum(PurchaseLog.amount), 0))
-          .filter(
-              PurchaseLog.company_id == company_id,
-              PurchaseLog.created_at >= sdt,
-              PurchaseLog.created_at <= edt
-          )
-          .scalar()
-    )
-    unique_buyers = (
-        db.query(PurchaseLog.user_id)
-          .filter(
-              PurchaseLog.company_id == company_id,
-              PurchaseLog.created_at >= sdt,
-              PurchaseLog.created_at <= edt
-          )
-          .distinct()
-          .count()
+    # totais, compradores distintos e série diária numa só varredura
+    result = summary_with_series(
+        db,
+        period=period,
+        timestamp=PurchaseLog.created_at,
+        filters=[PurchaseLog.company_id == company_id],
+        measures={
+            "num_purchases": func.count(PurchaseLog.id),
+            "revenue": func.coalesce(func.sum(PurchaseLog.amount), 0),
+        },
+        distinct={"unique_buyers": distinct_count(PurchaseLog.user_id, approx)},
     )
+    totals = result.totals
+    total_purchases = totals.get("num_purchases") or 0
+    total_sales = float(totals.get("revenue") or 0)
+    unique_buyers = totals.get("unique_buyers") or 0
+
     avg_ticket = total_sales / total_purchases if total_purchases else 0.0
     avg_purchases_per_user = total_purchases / unique_buyers if unique_buyers else 0.0
 
-    # série diária
-    day_trunc = func.date_trunc('day', PurchaseLog.created_at)
-    rows = (
-        db.query(
-            day_trunc.label('day'),
-            func.count(PurchaseLog.id).label('num_purchases'),
-            func.coalesce(func.sum(PurchaseLog.amount), 0).label('revenue'),
-        )
-        .filter(
-            PurchaseLog.company_id == company_id,
-            PurchaseLog.created_at >= sdt,
-            PurchaseLog.created_at <= edt
-        )
-        .group_by(day_trunc)
-        .order_by(day_trunc)
-        .all()
-    )
-    sales_by_day = [
-        SaleByDay(day=r.day.date(), num_purchases=r.num_purchases, revenue=float(r.revenue))
-        for r in rows
-    ]
-
     return PurchaseMetricRead(
-        start_date=sd,
-        end_date=ed,
+        start_date=period.start_date,
+        end_date=period.end_date,
         total_purchases=total_purchases,
         total_sales=total_sales,
         avg_ticket=avg_ticket,
         unique_buyers=unique_buyers,
+        unique_buyers_approximate=approx,
         avg_purchases_per_user=avg_purchases_per_user,
-        sales_by_day=sales_by_day
+        sales_by_day=[
+            _sale_by_day(r["day"], r["num_purchases"], r["revenue"]) for r in result.series
+        ]
     )
 
 def get_purchase_chart(
     db: Session,
     company_id: str,
     start_date: date | None = None,
-    end_date:   date | None = None
+    end_date:   date | None = None,
+    tz: ZoneInfo | None = None
 ) -> List[SaleByDay]:
-    sd, ed = _normalize_range(start_date, end_date)
-    sdt = datetime.combine(sd, datetime.min.time())
-    edt = datetime.combine(ed, datetime.max.time())
+    period = _period(start_date, end_date, tz)
 
-    day_trunc = func.date_trunc('day', PurchaseLog.created_at)
-    rows = (
-        db.query(
+    day_trunc = period.bucket(PurchaseLog.created_at)
+    rows = db.execute(
+        select(
             day_trunc.label('day'),
             func.count(PurchaseLog.id).label('num_purchases'),
             func.coalesce(func.sum(PurchaseLog.amount), 0).label('revenue'),
         )
-        .filter(
-            PurchaseLog.company_id == company_id,
-            PurchaseLog.created_at >= sdt,
-            PurchaseLog.created_at <= edt
-        )
+        .where(*_range_filters(company_id, period))
         .group_by(day_trunc)
         .order_by(day_trunc)
-        .all()
-    )
-    return [
-        SaleByDay(day=r.day.date(), num_purchases=r.num_purchases, revenue=float(r.revenue))
-        for r in rows
-    ]
+    ).all()
+    return [_sale_by_day(r.day, r.num_purchases, r.revenue) for r in rows]
 
 def get_purchases_per_user(
     db: Session,
     company_id: str,
     start_date: date | None = None,
-    end_date:   date | None = None
-) -> List[PurchasesPerUser]:
-    sd, ed = _normalize_range(start_date, end_date)
-    sdt = datetime.combine(sd, datetime.min.time())
-    edt = datetime.combine(ed, datetime.max.time())
-
-    rows = (
-        db.query(
-            PurchaseLog.user_id,
-            func.count(PurchaseLog.id).label('purchase_count')
-        )
-        .filter(
-            PurchaseLog.company_id == company_id,
-            PurchaseLog.created_at >= sdt,
-            PurchaseLog.created_at <= edt
-        )
-        .group_by(PurchaseLog.user_id)
-        .order_by(func.count(PurchaseLog.id).desc())
-        .all()
+    end_date:   date | None = None,
+    limit: int = 100,
+    after: str | None = None,
+    tz: ZoneInfo | None = None
+) -> tuple[List[PurchasesPerUser], str | None]:
+    """
+    Ranking por nº de compras (top-N); retorna (página, cursor da próxima).
+    """
+    period = _period(start_date, end_date, tz)
+    rows, next_cursor = ranked_groups(
+        db,
+        key=PurchaseLog.user_id,
+        metric=func.count(PurchaseLog.id),
+        filters=_range_filters(company_id, period),
+        limit=limit,
+        after=after,
     )
     return [
-        PurchasesPerUser(user_id=str(r.user_id), purchase_count=r.purchase_count)
+        PurchasesPerUser(user_id=str(r.key), purchase_count=r.value)
         for r in rows
-    ]
+    ], next_cursor
 
 def get_revenue_per_user(
     db: Session,
     company_id: str,
     start_date: date | None = None,
-    end_date:   date | None = None
-) -> List[RevenuePerUser]:
-    sd, ed = _normalize_range(start_date, end_date)
-    sdt = datetime.combine(sd, datetime.min.time())
-    edt = datetime.combine(ed, datetime.max.time())
-
-    rows = (
-        db.query(
-            PurchaseLog.user_id,
-            func.coalesce(func.sum(PurchaseLog.amount), 0).label('revenue')
-        )
-        .filter(
-            PurchaseLog.company_id == company_id,
-            PurchaseLog.created_at >= sdt,
-            PurchaseLog.created_at <= edt
-        )
-        .group_by(PurchaseLog.user_id)
-        .order_by(func.sum(PurchaseLog.amount).desc())
-        .all()
+    end_date:   date | None = None,
+    limit: int = 100,
+    after: str | None = None,
+    tz: ZoneInfo | None = None
+) -> tuple[List[RevenuePerUser], str | None]:
+    """
+    Ranking por receita (top-N); retorna (página, cursor da próxima).
+    """
+    period = _period(start_date, end_date, tz)
+    rows, next_cursor = ranked_groups(
+        db,
+        key=PurchaseLog.user_id,
+        metric=func.sum(PurchaseLog.amount),
+        filters=_range_filters(company_id, period),
+        limit=limit,
+        after=after,
     )
     return [
-        RevenuePerUser(user_id=str(r.user_id), total_spent=float(r.revenue))
+        RevenuePerUser(user_id=str(r.key), total_spent=float(r.value))
         for r in rows
-    ]
+    ], next_cursor
@@ -1,19 +1,26 @@
 # app/services/reward_service.py
-from sqlalchemy.orm import Session
+from sqlalchemy import func, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, selectinload
 from fastapi import HTTPException, status
 from uuid import UUID
+from datetime import date
 from typing import List
+from zoneinfo import ZoneInfo
 from app.models import (
     RewardCategory, RewardProduct, reward_product_categories,
     RewardOrder, RewardOrderItem, UserPointsWallet,
     UserPointsTransaction, UserPointsTxType, OrderStatus
 )
 from app.schemas.rewards import RewardCategoryCreate, RewardProductUpdate, RewardProductCreate
+from app.core import response_cache
+from app.services import listing
 
 # ---------- Categorias ----------
 def create_category(db: Session, data):
     cat = RewardCategory(**data.model_dump())
     db.add(cat); db.commit(); db.refresh(cat)
+    response_cache.bump("reward_catalog")
     return cat
 
 def list_categories(db: Session):
@@ -34,6 +41,7 @@ def update_category(db: Session, category_id: UUID, payload: RewardCategoryCreat
     cat.slug = payload.slug
     db.commit()
     db.refresh(cat)
+    response_cache.bump("reward_catalog")
     return cat
 
 def delete_category(db: Session, category_id: UUID):
@@ -47,6 +55,8 @@ def delete_category(db: Session, category_id: UUID):
             detail="Não é possível excluir: categoria associada a um produto"
         )
     db.delete(cat)
+    db.commit()
+    response_cache.bump("reward_catalog")
 
 # ---------- Produtos ----------
 # app/services/reward_service.py
@@ -69,6 +79,7 @@ def create_product(db: Session, payload, image_url, pdf_url):
     db.add(prod)
     db.commit()
     db.refresh(prod)
+    response_cache.bump("reward_catalog")
     return prod
 
 
@@ -107,6 +118,21 @@ def update_product(
     prod.categories = cats
     db.commit()
     db.refresh(prod)
+    response_cache.bump("reward_catalog")
+    return prod
+
+def set_product_stock(db: Session, product_id: UUID, stock_qty: int | None) -> RewardProduct:
+    """
+    Ajusta o estoque (reposição), mesmo de produtos que já têm pedidos.
+    None → ilimitado.
+    """
+    prod = db.get(RewardProduct, product_id)
+    if not prod:
+        raise HTTPException(status_code=404, detail="Produto não encontrado")
+    prod.stock_qty = stock_qty
+    db.commit()
+    db.refresh(prod)
+    response_cache.bump("reward_catalog")
     return prod
 
 # — excluir produto —
@@ -122,91 +148,253 @@ def delete_product(db: Session, product_id: UUID):
         )
     db.delete(prod)
     db.commit()
+    response_cache.bump("reward_catalog")
     
 # ---------- Pedidos ----------
+# Débito de pontos e reserva de estoque são UPDATEs condicionais na mesma
+# transação do pedido: dois pedidos simultâneos do mesmo usuário não
+# conseguem passar ambos pela checagem de saldo, e o estoque nunca fica
+# negativo. Ordem dos locks: carteira e depois produtos por id (sem deadlock).
+
+def _order_by_key(db: Session, user_id: str, key: str) -> RewardOrder | None:
+    return (
+        db.query(RewardOrder)
+          .filter(RewardOrder.user_id == user_id, RewardOrder.idempotency_key == key)
+          .first()
+    )
+
+def _debit_points(db: Session, user_id: str, cost: int) -> UUID:
+    """
+    UPDATE … WHERE balance >= :cost RETURNING: debita ou falha sem ler o saldo antes.
+    """
+    wallet_id = db.execute(
+        select(UserPointsWallet.id)
+        .where(UserPointsWallet.user_id == user_id)
+        .order_by(UserPointsWallet.created_at)
+        .limit(1)
+    ).scalar()
+    if wallet_id is None:
+        raise HTTPException(400, "Saldo insuficiente")
+    debited = db.execute(
+        update(UserPointsWallet)
+        .where(UserPointsWallet.id == wallet_id, UserPointsWallet.balance >= cost)
+        .values(balance=UserPointsWallet.balance - cost)
+        .returning(UserPointsWallet.id)
+    ).scalar()
+    if debited is None:
+        raise HTTPException(400, "Saldo insuficiente")
+    return wallet_id
+
+def _reserve_stock(db: Session, product_id: UUID, quantity: int) -> bool:
+    """
+    Baixa `quantity` do estoque se houver. Retorna False para produto sem
+    controle de estoque (stock_qty NULL); 409 se não houver o suficiente.
+    """
+    remaining = db.execute(
+        update(RewardProduct)
+        .where(
+            RewardProduct.id == product_id,
+            RewardProduct.stock_qty.is_not(None),
+            RewardProduct.stock_qty >= quantity,
+        )
+        .values(stock_qty=RewardProduct.stock_qty - quantity)
+        .returning(RewardProduct.stock_qty)
+    ).scalar()
+    if remaining is not None:
+        return True
+    tracked = db.execute(
+        select(RewardProduct.stock_qty.is_not(None)).where(RewardProduct.id == product_id)
+    ).scalar()
+    if tracked:
+        raise HTTPException(409, "Estoque insuficiente")
+    return False
+
 def create_order(db: Session, user_id: str, order_in):
-    # 1) calcula custo total em pontos
+    key = order_in.idempotency_key
+    if key:
+        existing = _order_by_key(db, user_id, key)
+        if existing:
+            return existing
+
+    # 1) quantidades por produto (itens repetidos somados) e custo total
+    quantities: dict[UUID, int] = {}
+    for it in order_in.items:
+        if it.quantity < 1:
+            raise HTTPException(400, "Quantidade inválida")
+        quantities[it.product_id] = quantities.get(it.product_id, 0) + it.quantity
+
     prod_map = {
-        str(p.id): p for p in
-        db.query(RewardProduct).filter(
-            RewardProduct.id.in_([i.product_id for i in order_in.items])
-        ).all()
+        p.id: p for p in
+        db.query(RewardProduct).filter(RewardProduct.id.in_(list(quantities))).all()
     }
-
     total_cost = 0
-    for it in order_in.items:
-        p = prod_map.get(str(it.product_id))
+    for pid, qty in quantities.items():
+        p = prod_map.get(pid)
         if not p:
             raise HTTPException(404, "Produto não encontrado")
-        total_cost += p.points_cost * it.quantity
+        total_cost += p.points_cost * qty
 
-    # 2) verifica saldo
-    wallet = db.query(UserPointsWallet).filter_by(user_id=user_id).first()
-    if not wallet or wallet.balance < total_cost:
-        raise HTTPException(400, "Saldo insuficiente")
-
-    # 3) debita e grava transação
-    wallet.balance -= total_cost
-    tx = UserPointsTransaction(
-        wallet_id = wallet.id,
-        user_id   = user_id,
-        company_id= None,           # prêmio é global
-        rule_id   = None,
-        type      = UserPointsTxType.redeem,
-        amount    = -total_cost,
-        description = "Resgate loja de prêmios"
-    )
-    db.add(tx)
+    try:
+        # 2) debita (falha se o saldo não cobre, mesmo com pedidos concorrentes)
+        wallet_id = _debit_points(db, user_id, total_cost)
 
-    # 4) cria pedido
-    order = RewardOrder(
-        user_id = user_id,
-        **order_in.model_dump(exclude={"items"})
-    )
-    db.add(order); db.flush()  # preenche order.id
+        # 3) reserva estoque, sempre na mesma ordem de ids
+        reserved = {pid: _reserve_stock(db, pid, qty) for pid, qty in sorted(quantities.items(), key=lambda kv: str(kv[0]))}
 
-    # 5) itens do pedido
-    for it in order_in.items:
-        db.add(
-            RewardOrderItem(
-                order_id = order.id,
-                product_id = it.product_id,
-                quantity = it.quantity
-            )
+        # 4) transação de pontos, pedido e itens
+        db.add(UserPointsTransaction(
+            wallet_id = wallet_id,
+            user_id   = user_id,
+            company_id= None,           # prêmio é global
+            rule_id   = None,
+            type      = UserPointsTxType.redeem,
+            amount    = -total_cost,
+            description = "Resgate loja de prêmios"
+        ))
+        order = RewardOrder(
+            user_id = user_id,
+            **order_in.model_dump(exclude={"items"})
         )
+        db.add(order); db.flush()  # preenche order.id
+        for it in order_in.items:
+            db.add(
+                RewardOrderItem(
+                    order_id = order.id,
+                    product_id = it.product_id,
+                    quantity = it.quantity,
+                    reserved = reserved[it.product_id],
+                )
+            )
+        db.commit()
+    except IntegrityError:
+        # mesma chave de idempotência enviada em paralelo: o outro venceu
+        db.rollback()
+        existing = _order_by_key(db, user_id, key) if key else None
+        if existing:
+            return existing
+        raise
+    except Exception:
+        db.rollback()
+        raise
 
-    db.commit(); db.refresh(order)
+    db.refresh(order)
+    if any(reserved.values()):
+        response_cache.bump("reward_catalog")
     return order
 
-def list_user_orders(db: Session, user_id: str):
-    return (
-        db.query(RewardOrder)
-          .filter_by(user_id=user_id)
-          .order_by(RewardOrder.created_at.desc())
+def _release_stock(db: Session, order_id: UUID) -> bool:
+    """
+    Devolve ao estoque as quantidades reservadas pelos itens do pedido.
+    """
+    items = (
+        db.query(RewardOrderItem.product_id, func.sum(RewardOrderItem.quantity))
+          .filter(RewardOrderItem.order_id == order_id, RewardOrderItem.reserved.is_(True))
+          .group_by(RewardOrderItem.product_id)
+          .order_by(RewardOrderItem.product_id)
           .all()
     )
+    for product_id, qty in items:
+        db.execute(
+            update(RewardProduct)
+            .where(RewardProduct.id == product_id, RewardProduct.stock_qty.is_not(None))
+            .values(stock_qty=RewardProduct.stock_qty + qty)
+        )
+    db.execute(
+        update(RewardOrderItem)
+        .where(RewardOrderItem.order_id == order_id, RewardOrderItem.reserved.is_(True))
+        .values(reserved=False)
+    )
+    return bool(items)
 
-def admin_list_orders(db: Session, status: OrderStatus|None):
-    q = db.query(RewardOrder).order_by(RewardOrder.created_at.desc())
+def _orders_page(db: Session, filters: list, *, limit: int, after: str | None, skip: int, exact_total: bool):
+    stmt = select(RewardOrder).where(*filters)
+    page = listing.keyset_page(
+        db, stmt,
+        created_at=RewardOrder.created_at,
+        key=RewardOrder.id,
+        table="reward_orders",
+        filtered=bool(filters),
+        limit=limit,
+        after=after,
+        skip=skip,
+        exact=exact_total,
+        # itens, produtos e categorias em 3 consultas por página (sem N+1)
+        options=(
+            selectinload(RewardOrder.items)
+            .selectinload(RewardOrderItem.product)
+            .selectinload(RewardProduct.categories),
+        ),
+    )
+    page.rows = [r.RewardOrder for r in page.rows]
+    return page
+
+def list_user_orders(
+    db: Session,
+    user_id: str,
+    *,
+    limit: int = 10,
+    after: str | None = None,
+    skip: int = 0,
+) -> listing.Page:
+    # total exato: o índice (user_id, created_at) mantém a contagem barata
+    return _orders_page(
+        db, [RewardOrder.user_id == user_id],
+        limit=limit, after=after, skip=skip, exact_total=True,
+    )
+
+def admin_list_orders(
+    db: Session,
+    status: OrderStatus | None = None,
+    *,
+    user_id: UUID | None = None,
+    product_id: UUID | None = None,
+    start_date: date | None = None,
+    end_date: date | None = None,
+    tz: ZoneInfo | None = None,
+    limit: int = 10,
+    after: str | None = None,
+    skip: int = 0,
+    exact_total: bool = False,
+) -> listing.Page:
+    filters = listing.date_filters(RewardOrder.created_at, start_date, end_date, tz)
     if status:
-        q = q.filter_by(status=status)
-    return q.all()
+        filters.append(RewardOrder.status == status)
+    if user_id:
+        filters.append(RewardOrder.user_id == user_id)
+    if product_id:
+        filters.append(
+            select(RewardOrderItem.id)
+            .where(RewardOrderItem.order_id == RewardOrder.id, RewardOrderItem.product_id == product_id)
+            .exists()
+        )
+    return _orders_page(db, filters, limit=limit, after=after, skip=skip, exact_total=exact_total)
 
 def admin_update_order_status(db: Session, order_id: UUID, approve: bool, msg: str|None):
-    order = db.get(RewardOrder, order_id)
-    if not order:
-        raise HTTPException(404, "Pedido não encontrado")
-    if order.status != OrderStatus.pending:
+    # transição condicional: dois admins não processam o mesmo pedido
+    processed = db.execute(
+        update(RewardOrder)
+        .where(RewardOrder.id == order_id, RewardOrder.status == OrderStatus.pending)
+        .values(status=OrderStatus.approved if approve else OrderStatus.refused, refusal_msg=msg)
+        .returning(RewardOrder.id)
+    ).scalar()
+    if processed is None:
+        db.rollback()
+        if not db.get(RewardOrder, order_id):
+            raise HTTPException(404, "Pedido não encontrado")
         raise HTTPException(400, "Pedido já processado")
 
-    order.status = OrderStatus.approved if approve else OrderStatus.refused
-    order.refusal_msg = msg
-    db.commit(); db.refresh(order)
+    released = False
     if approve:
         # Aqui você avisaria usuário, dispararia e-mail etc.
         pass
     else:
-        # Em caso de recusa você **não** devolve pontos automaticamente;
-        # se quiser devolver, crie uma transação contrária aqui.
-        pass
+        # Na recusa o estoque reservado volta para o catálogo. Os pontos
+        # **não** são devolvidos automaticamente; se quiser devolver, crie
+        # uma transação contrária aqui.
+        released = _release_stock(db, order_id)
+    db.commit()
+    if released:
+        response_cache.bump("reward_catalog")
+    order = db.get(RewardOrder, order_id)
+    db.refresh(order)
     return order
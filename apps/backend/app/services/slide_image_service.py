@@ -3,6 +3,7 @@ from pathlib import Path
 from fastapi import HTTPException
 
 from app.models.slide_image import SlideImage
+from app.core import response_cache
 from app.db.base import Base  # se precisar, para construir path
 
 STATIC_ROOT = Path(os.getcwd()) / "app" / "static" / "rewards" / "slides"
@@ -10,6 +11,7 @@ STATIC_ROOT = Path(os.getcwd()) / "app" / "static" / "rewards" / "slides"
 def create_slide(db, title, image_url, order, active):
     slide = SlideImage(title=title, image_url=image_url, order=order, active=active)
     db.add(slide); db.commit(); db.refresh(slide)
+    response_cache.bump("slides")
     return slide
 
 def list_slides(db, skip, limit):
@@ -42,6 +44,7 @@ def update_slide(db, slide_id, title, new_image_url, order, active):
     slide.active = active
 
     db.commit(); db.refresh(slide)
+    response_cache.bump("slides")
     return slide
 
 def delete_slide(db, slide_id):
@@ -59,3 +62,4 @@ def delete_slide(db, slide_id):
 
     db.delete(slide)
     db.commit()
+    response_cache.bump("slides")
@@ -136,6 +136,7 @@ def create(db: Session, obj_in: UserCreate) -> User:
     email_lower = obj_in.email.lower()
     phone_norm  = obj_in.phone
     cpf_norm    = obj_in.cpf
+    hashed      = hash_password(obj_in.password)  # argon2 roda uma única vez
 
     # 2) Busca todos os leads pré-cadastrados que casem em e-mail, phone ou cpf
     leads = (
@@ -187,7 +188,7 @@ def create(db: Session, obj_in: UserCreate) -> User:
         user = User(
             name            = obj_in.name,
             email           = email_lower,
-            hashed_password = hash_password(obj_in.password),
+            hashed_password = hashed,
             phone           = phone_norm,
             cpf             = cpf_norm,
             accepted_terms  = obj_in.accepted_terms,
@@ -199,7 +200,7 @@ def create(db: Session, obj_in: UserCreate) -> User:
 
     # 5) Atualiza campos obrigatórios (no caso de merge, ou simples criação)
     user.name            = obj_in.name
-    user.hashed_password = hash_password(obj_in.password)
+    user.hashed_password = hashed
     user.email           = email_lower
     user.phone           = phone_norm
     user.cpf             = cpf_norm
@@ -0,0 +1,77 @@
+# apps/backend/app/workers/email_worker.py
+#
+# Uso: python -m app.workers.email_worker
+# Drena a fila `outbound_emails` em lotes, reaproveitando sessões SMTP.
+
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from app.core.config import settings
+from app.core.email_templates import precompile_templates, render_template
+from app.core.email_utils import get_smtp_pool, send_email
+from app.db.session import SessionLocal
+from app.models.outbound_email import OutboundEmail
+from app.services import email_queue_service
+
+logger = logging.getLogger(__name__)
+
+
+def _deliver(email: OutboundEmail) -> tuple[OutboundEmail, str | None]:
+    try:
+        html = email.html
+        if html is None:
+            html = render_template(email.template_name, **(email.template_context or {}))
+        send_email(to=email.to_address, subject=email.subject, html=html)
+        return email, None
+    except Exception as e:
+        return email, f"{type(e).__name__}: {e}"
+
+
+def drain_once(executor: ThreadPoolExecutor) -> int:
+    """
+    Processa um lote da fila. Retorna quantos e-mails foram tentados.
+    """
+    db = SessionLocal()
+    try:
+        batch = email_queue_service.claim_batch(db, settings.EMAIL_QUEUE_BATCH_SIZE)
+        if not batch:
+            return 0
+        for email, error in executor.map(_deliver, batch):
+            if error is None:
+                email_queue_service.mark_sent(email)
+            else:
+                logger.warning("Falha ao enviar e-mail %s: %s", email.id, error)
+                email_queue_service.mark_failed(email, error)
+        db.commit()
+        return len(batch)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def run():
+    precompile_templates()
+    pool = get_smtp_pool()
+    logger.info("email worker iniciado (lote=%s, sessões SMTP=%s)",
+                settings.EMAIL_QUEUE_BATCH_SIZE, pool.size)
+    with ThreadPoolExecutor(max_workers=pool.size) as executor:
+        try:
+            while True:
+                try:
+                    processed = drain_once(executor)
+                except Exception:
+                    logger.exception("Erro ao drenar a fila de e-mails")
+                    processed = 0
+                if processed == 0:
+                    time.sleep(settings.EMAIL_QUEUE_POLL_SECONDS)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            pool.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(format="%(asctime)s %(levelname)s %(name)s %(message)s", level=logging.INFO)
+    run()
@@ -0,0 +1,125 @@
+# apps/backend/app/workers/job_worker.py
+#
+# Uso: python -m app.workers.job_worker [tipo1,tipo2,...]
+# Executa os jobs de `background_jobs`. Sem argumentos atende todos os
+# tipos de app/workers/tasks.py; com lista, só os tipos informados (permite
+# escalar workers por tipo de job de forma independente da API).
+
+import os
+import sys
+import time
+import socket
+import logging
+from concurrent.futures import ThreadPoolExecutor, Future
+from datetime import datetime, timedelta, timezone
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.services import job_service
+from app.workers.tasks import JOBS
+
+logger = logging.getLogger(__name__)
+
+
+def _schedule_next(job_type: str, delay_seconds: int = 0):
+    db = SessionLocal()
+    try:
+        job_service.enqueue(
+            db,
+            job_type,
+            run_at=datetime.now(timezone.utc) + timedelta(seconds=delay_seconds),
+            dedupe_key=f"periodic:{job_type}",
+        )
+    finally:
+        db.close()
+
+
+def _execute(job_id, job_type: str, payload: dict):
+    spec = JOBS[job_type]
+    db = SessionLocal()
+    try:
+        spec.handler(db, payload)
+        db.commit()
+        job_service.complete(db, job_id)
+        logger.info("job %s (%s) concluído", job_id, job_type)
+    except Exception as e:
+        db.rollback()
+        logger.exception("job %s (%s) falhou", job_id, job_type)
+        job_service.fail(db, job_id, f"{type(e).__name__}: {e}")
+    finally:
+        db.close()
+    if spec.every_seconds:
+        _schedule_next(job_type, spec.every_seconds)
+
+
+def _claim(job_types: list[str], free_slots: int, worker_id: str) -> list[tuple]:
+    claimed = []
+    db = SessionLocal()
+    try:
+        for job_type in job_types:
+            if free_slots <= 0:
+                break
+            jobs = job_service.claim(
+                db,
+                job_type=job_type,
+                limit=free_slots,
+                concurrency=JOBS[job_type].concurrency,
+                worker_id=worker_id,
+            )
+            claimed.extend(jobs)
+            free_slots -= len(jobs)
+    finally:
+        db.close()
+    return claimed
+
+
+def run(job_types: list[str] | None = None):
+    job_types = job_types or list(JOBS)
+    unknown = [t for t in job_types if t not in JOBS]
+    if unknown:
+        raise SystemExit(f"Tipos de job desconhecidos: {', '.join(unknown)}")
+
+    worker_id = f"{socket.gethostname()}:{os.getpid()}"
+    threads = settings.JOB_WORKER_THREADS
+    running: set[Future] = set()
+    last_requeue = 0.0
+
+    # garante que cada job periódico tenha uma próxima execução agendada
+    for job_type in job_types:
+        if JOBS[job_type].every_seconds:
+            _schedule_next(job_type)
+
+    logger.info("job worker %s iniciado (tipos=%s, threads=%s)", worker_id, job_types, threads)
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        try:
+            while True:
+                running = {f for f in running if not f.done()}
+
+                if time.monotonic() - last_requeue > 60:
+                    db = SessionLocal()
+                    try:
+                        n = job_service.requeue_stale(db, settings.JOB_STALE_SECONDS)
+                        if n:
+                            logger.warning("%s jobs travados devolvidos para a fila", n)
+                    finally:
+                        db.close()
+                    last_requeue = time.monotonic()
+
+                claimed = []
+                free_slots = threads - len(running)
+                if free_slots > 0:
+                    try:
+                        claimed = _claim(job_types, free_slots, worker_id)
+                    except Exception:
+                        logger.exception("Erro ao buscar jobs")
+                for job_id, job_type, payload in claimed:
+                    running.add(executor.submit(_execute, job_id, job_type, payload))
+
+                if not claimed:
+                    time.sleep(settings.JOB_POLL_SECONDS)
+        except KeyboardInterrupt:
+            logger.info("job worker encerrando; aguardando jobs em andamento")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(format="%(asctime)s %(levelname)s %(name)s %(message)s", level=logging.INFO)
+    run(sys.argv[1].split(",") if len(sys.argv) > 1 else None)
@@ -0,0 +1,77 @@
+# apps/backend/app/workers/tasks.py
+#
+# Registro dos tipos de job executados pelo job worker.
+# Cada handler recebe uma Session própria e o payload (dict) do job.
+
+from dataclasses import dataclass
+from typing import Any, Callable
+from sqlalchemy.orm import Session
+
+
+@dataclass(frozen=True)
+class JobSpec:
+    handler: Callable[[Session, dict[str, Any]], Any]
+    concurrency: int = 4           # máximo de jobs rodando ao mesmo tempo (todos os workers)
+    every_seconds: int | None = None  # se definido, o job é periódico
+
+
+JOBS: dict[str, JobSpec] = {}
+
+
+def job(name: str, *, concurrency: int = 4, every_seconds: int | None = None):
+    def decorator(fn):
+        JOBS[name] = JobSpec(handler=fn, concurrency=concurrency, every_seconds=every_seconds)
+        return fn
+    return decorator
+
+
+# ---------- jobs disparados pela API ----------
+
+@job("geocode_company", concurrency=1)  # Nominatim: 1 req/s
+def geocode_company(db: Session, payload: dict[str, Any]):
+    from app.services.geocode_service import geocode_and_save
+    geocode_and_save(**payload, raise_on_error=True)
+
+
+@job("geocode_branch", concurrency=1)  # mesmo limite do Nominatim
+def geocode_branch(db: Session, payload: dict[str, Any]):
+    from app.services.geocode_service import geocode_branch_and_save
+    geocode_branch_and_save(payload["branch_id"], raise_on_error=True)
+
+
+@job("send_phone_code", concurrency=4)
+def send_phone_code(db: Session, payload: dict[str, Any]):
+    from app.services.sms_service import send_phone_code as _send
+    _send(payload["phone"])
+
+
+@job("reconcile_asaas_payment", concurrency=8)
+def reconcile_asaas_payment(db: Session, payload: dict[str, Any]):
+    from app.services.payment_webhook_service import reconcile_payment
+    reconcile_payment(db, payload["asaas_id"])
+
+
+@job("export_report", concurrency=2)
+def export_report(db: Session, payload: dict[str, Any]):
+    from app.services.export_service import run_job
+    return run_job(db, payload)
+
+
+# ---------- jobs periódicos ----------
+
+@job("expire_cashbacks", concurrency=1, every_seconds=300)
+def expire_cashbacks(db: Session, payload: dict[str, Any]):
+    from app.services.cashback_service import expire_overdue_cashbacks
+    return expire_overdue_cashbacks(db)
+
+
+@job("rollover_points_stats", concurrency=1, every_seconds=600)
+def rollover_points_stats(db: Session, payload: dict[str, Any]):
+    from app.services.leaderboard_service import rollover_points_stats as _rollover
+    return _rollover(db)
+
+
+@job("purge_exports", concurrency=1, every_seconds=3600)
+def purge_exports(db: Session, payload: dict[str, Any]):
+    from app.services.export_service import purge_expired
+    return purge_expired()
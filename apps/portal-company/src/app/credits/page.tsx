@@ -1,7 +1,7 @@
 // src/app/credits/page.tsx
 'use client';
 
-import { useState, useEffect, useRef, FormEvent } from 'react';
+import { useState, useEffect, FormEvent } from 'react';
 import Link from 'next/link';
 import Image from 'next/image';
 import { isAxiosError } from 'axios';
@@ -9,7 +9,8 @@ import Header from '@/components/Header/Header';
 import FloatingLabelInput from '@/components/FloatingLabelInput/FloatingLabelInput';
 import Button from '@/components/Button/Button';
 import Notification from '@/components/Notification/Notification';
-import { buyCredits, getCharge } from '@/services/companyPaymentService';
+import { buyCredits } from '@/services/companyPaymentService';
+import { watchPaymentStatus } from '@/services/paymentEventsService';
 import type { CompanyPaymentRead } from '@/types/companyPayment';
 
 import styles from './page.module.css';
@@ -19,8 +20,6 @@ export default function CreditsPage() {
   const [error, setError] = useState<string | null>(null);
   const [payment, setPayment] = useState<CompanyPaymentRead | null>(null);
   const [status, setStatus] = useState<CompanyPaymentRead['status'] | null>(null);
-  const [countdown, setCountdown] = useState(0);
-  const intervalRef = useRef<number | null>(null);
   const [copied, setCopied] = useState(false);
 
   const handleBuy = async (e: FormEvent) => {
@@ -35,7 +34,6 @@ export default function CreditsPage() {
       const res = await buyCredits({ amount: val });
       setPayment(res.data);
       setStatus(res.data.status);
-      setCountdown(30);
     } catch (err) {
       if (isAxiosError(err)) {
         setError(err.response?.data?.detail || 'Erro ao gerar cobrança.');
@@ -45,33 +43,11 @@ export default function CreditsPage() {
     }
   };
 
+  // Status por SSE (fallback: long-poll), sem consultas periódicas
   useEffect(() => {
-    if (!payment || ['PAID', 'FAILED', 'CANCELLED'].includes(status!)) {
-      if (intervalRef.current !== null) {
-        clearInterval(intervalRef.current);
-        intervalRef.current = null;
-      }
-      return;
-    }
-    if (intervalRef.current === null) {
-      intervalRef.current = window.setInterval(() => {
-        setCountdown(c => {
-          if (c <= 1) {
-            getCharge(payment.id)
-              .then(upd => setStatus(upd.data.status))
-              .catch(() => {});
-            return 30;
-          }
-          return c - 1;
-        });
-      }, 1000);
-    }
-    return () => {
-      if (intervalRef.current !== null) {
-        clearInterval(intervalRef.current);
-      }
-    };
-  }, [payment, status]);
+    if (!payment || ['PAID', 'FAILED', 'CANCELLED'].includes(payment.status)) return;
+    return watchPaymentStatus('company_payment', payment.id, setStatus);
+  }, [payment]);
 
   const qrSrc = payment?.pix_qr_code
     ? payment.pix_qr_code.startsWith('data:')
@@ -168,7 +144,7 @@ export default function CreditsPage() {
                   Expira em: <strong>{new Date(payment.pix_expires_at).toLocaleString()}</strong>
                 </p>
                 <p className={styles.meta}>
-                  Próxima verificação em <strong>{countdown}s</strong>
+                  Aguardando a confirmação do pagamento…
                 </p>
                 {status === 'FAILED' && (
                   <Notification
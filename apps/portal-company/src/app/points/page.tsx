@@ -1,14 +1,15 @@
 // src/app/points/page.tsx
 'use client';
 
-import { useState, useEffect, useRef, useMemo } from 'react';
+import { useState, useEffect, useMemo } from 'react';
 import Link from 'next/link';
 import Image from 'next/image';
 import { isAxiosError } from 'axios';
 import Header from '@/components/Header/Header';
 import Notification from '@/components/Notification/Notification';
 import Button from '@/components/Button/Button';
-import { purchasePoints, getPointPurchase } from '@/services/pointPurchaseService';
+import { purchasePoints } from '@/services/pointPurchaseService';
+import { watchPaymentStatus } from '@/services/paymentEventsService';
 import { listPointPlans } from '@/services/pointPlanService';
 import type { PointPlanRead } from '@/types/pointPlan';
 import type { PointPurchaseRead } from '@/types/pointPurchase';
@@ -21,9 +22,7 @@ export default function PointsPage() {
 
   const [purchase, setPurchase] = useState<PointPurchaseRead | null>(null);
   const [status, setStatus] = useState<PointPurchaseRead['status'] | null>(null);
-  const [countdown, setCountdown] = useState(0);
   const [error, setError] = useState<string | null>(null);
-  const intervalRef = useRef<number | null>(null);
   const [copied, setCopied] = useState(false);
 
   // Carrega planos
@@ -46,7 +45,6 @@ export default function PointsPage() {
       const res = await purchasePoints({ plan_id: planId });
       setPurchase(res.data);
       setStatus(res.data.status);
-      setCountdown(30);
     } catch (err) {
       if (isAxiosError(err)) {
         setError(err.response?.data?.detail || 'Erro ao iniciar a compra.');
@@ -56,36 +54,11 @@ export default function PointsPage() {
     }
   };
 
-  // Poll do status a cada 30s (mostra contagem regressiva)
+  // Status por SSE (fallback: long-poll), sem consultas periódicas
   useEffect(() => {
-    if (!purchase || (status && ['PAID', 'FAILED', 'CANCELLED'].includes(status))) {
-      if (intervalRef.current !== null) {
-        clearInterval(intervalRef.current);
-        intervalRef.current = null;
-      }
-      return;
-    }
-
-    if (intervalRef.current === null) {
-      intervalRef.current = window.setInterval(() => {
-        setCountdown((c) => {
-          if (c <= 1) {
-            getPointPurchase(purchase.id)
-              .then((upd) => setStatus(upd.data.status))
-              .catch(() => {});
-            return 30;
-          }
-          return c - 1;
-        });
-      }, 1000);
-    }
-
-    return () => {
-      if (intervalRef.current !== null) {
-        clearInterval(intervalRef.current);
-      }
-    };
-  }, [purchase, status]);
+    if (!purchase || ['PAID', 'FAILED', 'CANCELLED'].includes(purchase.status)) return;
+    return watchPaymentStatus('point_purchase', purchase.id, setStatus);
+  }, [purchase]);
 
   const qrSrc = purchase?.pix_qr_code
     ? purchase.pix_qr_code.startsWith('data:')
@@ -247,7 +220,7 @@ export default function PointsPage() {
                   <strong>{new Date(purchase.pix_expires_at!).toLocaleString()}</strong>
                 </p>
                 <p className={styles.meta}>
-                  Próxima verificação em <strong>{countdown}s</strong>
+                  Aguardando a confirmação do pagamento…
                 </p>
 
                 {(status === 'FAILED' || status === 'CANCELLED') && (
@@ -0,0 +1,95 @@
+// src/services/paymentEventsService.ts
+import api from './api';
+import type { PaymentStatus as Status } from '@/types/companyPayment';
+
+type PaymentKind = 'company_payment' | 'point_purchase';
+
+const PATHS: Record<PaymentKind, string> = {
+  company_payment: '/credits',
+  point_purchase: '/point-purchases',
+};
+
+const FINAL: Status[] = ['PAID', 'FAILED', 'CANCELLED'];
+const LONG_POLL_WAIT = 25;
+
+/**
+ * Acompanha o status de uma cobrança sem polling periódico:
+ * - SSE em GET /payment-events (um evento por mudança de status)
+ * - sem SSE (ou se a conexão cair), long-poll em GET /credits/{id} ou
+ *   /point-purchases/{id} com If-None-Match e ?wait=
+ * Chama onStatus a cada mudança e para sozinho num status final.
+ * Retorna a função que encerra o acompanhamento.
+ */
+export function watchPaymentStatus(
+  kind: PaymentKind,
+  id: string,
+  onStatus: (status: Status) => void,
+): () => void {
+  let stopped = false;
+  let etag: string | undefined;
+  let source: EventSource | null = null;
+  let polling = false;
+
+  const stop = () => {
+    stopped = true;
+    source?.close();
+  };
+
+  const apply = (status: Status) => {
+    if (stopped) return;
+    onStatus(status);
+    if (FINAL.includes(status)) stop();
+  };
+
+  // relê o estado (estado local do backend; 304 = nada mudou)
+  const read = async (wait = 0) => {
+    const res = await api.get<{ status: Status }>(`${PATHS[kind]}/${id}`, {
+      params: wait ? { wait } : undefined,
+      headers: etag ? { 'If-None-Match': etag } : undefined,
+      validateStatus: s => s === 200 || s === 304,
+      timeout: (wait + 10) * 1000,
+    });
+    if (res.status === 200) {
+      const tag = res.headers['etag'];
+      if (typeof tag === 'string') etag = tag;
+      apply(res.data.status);
+    }
+  };
+
+  const longPoll = async () => {
+    if (polling) return;
+    polling = true;
+    source?.close();
+    while (!stopped) {
+      try {
+        await read(LONG_POLL_WAIT);
+      } catch {
+        await new Promise(r => setTimeout(r, 5000));
+      }
+    }
+  };
+
+  if (typeof EventSource === 'undefined') {
+    longPoll();
+    return stop;
+  }
+
+  source = new EventSource(`${api.defaults.baseURL}/payment-events/`, { withCredentials: true });
+  // "ready" a cada (re)conexão: relê para não perder o que mudou no meio
+  source.addEventListener('ready', () => {
+    read().catch(() => {});
+  });
+  source.addEventListener(kind, e => {
+    const event = JSON.parse((e as MessageEvent).data);
+    if (event.id === id) {
+      etag = event.etag;
+      apply(event.status);
+    }
+  });
+  source.onerror = () => {
+    // CLOSED: o navegador desistiu de reconectar (ex.: 401) → long-poll
+    if (source?.readyState === EventSource.CLOSED) longPoll();
+  };
+
+  return stop;
+}